@@ -11,131 +11,139 @@ import re
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.manseryeok.calculator import ManseryeokCalculator
+from src.manseryeok.matrix import HEAVENLY_STEMS, LEVELS_KO, TENGAN_FLAT, as_dict  # noqa: E402
 
-# 천간 매트릭스 완전 하드코딩
-CHEONGAN_MATRIX = {
+# 천간 관계 설명 (길흉 레벨은 공유 매트릭스에서 부여)
+CHEONGAN_NOTES = {
     '甲': {  # 갑목 일간 → 다른 천간들
-        '甲': ('평', '원국 함께 있을 때 흉'),
-        '乙': ('흉', '을이 갑을 타고 올라서 뺏긴다'),
-        '丙': ('길', '부명이 되게 한다'),
-        '丁': ('길흉', '계절에 따라 다름'),
-        '戊': ('길', '귀명'),
-        '己': ('대흉', '갑기합. 나무를 쓰러뜨린다'),
-        '庚': ('대흉', '갑경충. 나무를 쪼갠다'),
-        '辛': ('흉', '예의 있어지나 신경질적'),
-        '壬': ('흉', '병치례'),
-        '癸': ('길흉', '수생목, 목을 강하게')
+        '甲': '원국 함께 있을 때 흉',
+        '乙': '을이 갑을 타고 올라서 뺏긴다',
+        '丙': '부명이 되게 한다',
+        '丁': '계절에 따라 다름',
+        '戊': '귀명',
+        '己': '갑기합. 나무를 쓰러뜨린다',
+        '庚': '갑경충. 나무를 쪼갠다',
+        '辛': '예의 있어지나 신경질적',
+        '壬': '병치례',
+        '癸': '수생목, 목을 강하게'
     },
     '乙': {  # 을목 일간 → 다른 천간들
-        '甲': ('길', '동료제감 - 갑목을 타고 오른다'),
-        '乙': ('평', '원국 함께 있을 때 흉'),
-        '丙': ('대길', '꽃이 태양을 만나 귀해진다'),
-        '丁': ('길흉', '계절에 따라 다름'),
-        '戊': ('길', '바람을 막아서 부가 된다'),
-        '己': ('길', '들판에 꽃이 되기에 좋다'),
-        '庚': ('대흉', '을경합. 꽃이 죽는다'),
-        '辛': ('흉', '가위로 꽃을 자른다'),
-        '壬': ('흉', '물을 줘서 꽃을 키운다'),
-        '癸': ('길흉', '이슬을 줘서 더욱 예쁜 꽃')
+        '甲': '동료제감 - 갑목을 타고 오른다',
+        '乙': '원국 함께 있을 때 흉',
+        '丙': '꽃이 태양을 만나 귀해진다',
+        '丁': '계절에 따라 다름',
+        '戊': '바람을 막아서 부가 된다',
+        '己': '들판에 꽃이 되기에 좋다',
+        '庚': '을경합. 꽃이 죽는다',
+        '辛': '가위로 꽃을 자른다',
+        '壬': '물을 줘서 꽃을 키운다',
+        '癸': '이슬을 줘서 더욱 예쁜 꽃'
     },
     '丙': {  # 병화 일간 → 다른 천간들
-        '甲': ('길', '합일이 생김 - 나무를 키움'),
-        '乙': ('길', '합일이 생김 - 꽃을 키움'),
-        '丙': ('평', '원국 함께 있을 때 흉'),
-        '丁': ('흉', '불, 여름은 이기고 가을겨울은 당한다'),
-        '戊': ('무', '감탄이 있어야 가치가 있다'),
-        '己': ('무', '태양으로 乙을 키우니 가치가 적다'),
-        '庚': ('흉', '병경합. 태양이 철에 의해 꺼진다'),
-        '辛': ('대흉', '병신합. 빛이 의미 없어진다'),
-        '壬': ('길', '해결사 역할'),
-        '癸': ('길흉', '계절에 따라 다름')
+        '甲': '합일이 생김 - 나무를 키움',
+        '乙': '합일이 생김 - 꽃을 키움',
+        '丙': '원국 함께 있을 때 흉',
+        '丁': '불, 여름은 이기고 가을겨울은 당한다',
+        '戊': '감탄이 있어야 가치가 있다',
+        '己': '태양으로 乙을 키우니 가치가 적다',
+        '庚': '병경합. 태양이 철에 의해 꺼진다',
+        '辛': '병신합. 빛이 의미 없어진다',
+        '壬': '해결사 역할',
+        '癸': '계절에 따라 다름'
     },
     '丁': {  # 정화 일간 → 다른 천간들
-        '甲': ('길', '등불이 나무를 밝힌다'),
-        '乙': ('길', '꽃과 등불의 조화'),
-        '丙': ('흉', '태양에 등불이 무의미'),
-        '丁': ('평', '원국 함께 있을 때 흉'),
-        '戊': ('길', '화생토'),
-        '己': ('길', '화생토'),
-        '庚': ('길', '정화가 금을 단련'),
-        '辛': ('길', '보석을 만든다'),
-        '壬': ('흉', '물이 불을 끈다'),
-        '癸': ('흉', '이슬이 등불을 끈다')
+        '甲': '등불이 나무를 밝힌다',
+        '乙': '꽃과 등불의 조화',
+        '丙': '태양에 등불이 무의미',
+        '丁': '원국 함께 있을 때 흉',
+        '戊': '화생토',
+        '己': '화생토',
+        '庚': '정화가 금을 단련',
+        '辛': '보석을 만든다',
+        '壬': '물이 불을 끈다',
+        '癸': '이슬이 등불을 끈다'
     },
     '戊': {  # 무토 일간 → 다른 천간들
-        '甲': ('대길', '산에 나무가 자라 명산이 된다. 부명'),
-        '乙': ('소길', '큰 산이 묘목을 만나 아산으로'),
-        '丙': ('길', '화생토, 강하게 해준다'),
-        '丁': ('길흉', '강하게 해준다. 목과 같이 있으면 안됨'),
-        '戊': ('평', '원국 함께 있을 때 흉'),
-        '己': ('흉', '산이 땅에 내려왔다. 격이 낮아짐'),
-        '庚': ('흉', '토생금 해서 밑이주느라 힘 빠진다'),
-        '辛': ('흉', '감목은 약하게, 을목은 깨진다'),
-        '壬': ('평', '댐처럼 산이 강을 막아냄'),
-        '癸': ('대흉', '무계합. 병화를 없애서 안 좋다')
+        '甲': '산에 나무가 자라 명산이 된다. 부명',
+        '乙': '큰 산이 묘목을 만나 아산으로',
+        '丙': '화생토, 강하게 해준다',
+        '丁': '강하게 해준다. 목과 같이 있으면 안됨',
+        '戊': '원국 함께 있을 때 흉',
+        '己': '산이 땅에 내려왔다. 격이 낮아짐',
+        '庚': '토생금 해서 밑이주느라 힘 빠진다',
+        '辛': '감목은 약하게, 을목은 깨진다',
+        '壬': '댐처럼 산이 강을 막아냄',
+        '癸': '무계합. 병화를 없애서 안 좋다'
     },
     '己': {  # 기토 일간 → 다른 천간들
-        '甲': ('흉', '갑기합. 욕심부리게 만든다'),
-        '乙': ('길', '들판에 꽃을 피울 수 있다'),
-        '丙': ('길', '乙이오면 수확물이 생긴다'),
-        '丁': ('길', '화생토. 가을겨울에는 필요'),
-        '戊': ('흉', '언제든 당할 위험이 있다'),
-        '己': ('평', '원국 함께 있을 때 흉'),
-        '庚': ('흉', '감목이 우박을 맞는다'),
-        '辛': ('흉', '감목이 우박을 맞는다'),
-        '壬': ('흉', '물바다 된다'),
-        '癸': ('평', '제방, 둑과 같다')
+        '甲': '갑기합. 욕심부리게 만든다',
+        '乙': '들판에 꽃을 피울 수 있다',
+        '丙': '乙이오면 수확물이 생긴다',
+        '丁': '화생토. 가을겨울에는 필요',
+        '戊': '언제든 당할 위험이 있다',
+        '己': '원국 함께 있을 때 흉',
+        '庚': '감목이 우박을 맞는다',
+        '辛': '감목이 우박을 맞는다',
+        '壬': '물바다 된다',
+        '癸': '제방, 둑과 같다'
     },
     '庚': {  # 경금 일간 → 다른 천간들
-        '甲': ('길', '정화 같이 있으면 매우 길'),
-        '乙': ('흉', '을경합. 서로 피곤하다'),
-        '丙': ('길', '찬 金의 성향이 따뜻해진다'),
-        '丁': ('길', '내가 기물이 되어 용도가 좋아진다'),
-        '戊': ('길', '토생금 되어 힘이 강해진다, 약간 우둔'),
-        '己': ('길', '토생금 되어 힘이 강해진다'),
-        '庚': ('평', '원국 함께 있을 때 흉'),
-        '辛': ('흉', '내 것을 나누어 먹으니 좋지 않다'),
-        '壬': ('길', '물을 만들어 낸다'),
-        '癸': ('길흉', '물을 만들어내나 나도 녹슨다')
+        '甲': '정화 같이 있으면 매우 길',
+        '乙': '을경합. 서로 피곤하다',
+        '丙': '찬 金의 성향이 따뜻해진다',
+        '丁': '내가 기물이 되어 용도가 좋아진다',
+        '戊': '토생금 되어 힘이 강해진다, 약간 우둔',
+        '己': '토생금 되어 힘이 강해진다',
+        '庚': '원국 함께 있을 때 흉',
+        '辛': '내 것을 나누어 먹으니 좋지 않다',
+        '壬': '물을 만들어 낸다',
+        '癸': '물을 만들어내나 나도 녹슨다'
     },
     '辛': {  # 신금 일간 → 다른 천간들
-        '甲': ('흉', '보석이 나무에 묻힌다'),
-        '乙': ('길', '보석이 꽃을 장식'),
-        '丙': ('대길', '병신합. 보석이 빛난다'),
-        '丁': ('길', '정화가 보석을 단련'),
-        '戊': ('흉', '보석이 흙에 묻힌다'),
-        '己': ('흉', '보석이 더러워진다'),
-        '庚': ('흉', '큰 금이 작은 금을 압도'),
-        '辛': ('평', '원국 함께 있을 때 흉'),
-        '壬': ('길', '금생수'),
-        '癸': ('길', '금생수')
+        '甲': '보석이 나무에 묻힌다',
+        '乙': '보석이 꽃을 장식',
+        '丙': '병신합. 보석이 빛난다',
+        '丁': '정화가 보석을 단련',
+        '戊': '보석이 흙에 묻힌다',
+        '己': '보석이 더러워진다',
+        '庚': '큰 금이 작은 금을 압도',
+        '辛': '원국 함께 있을 때 흉',
+        '壬': '금생수',
+        '癸': '금생수'
     },
     '壬': {  # 임수 일간 → 다른 천간들
-        '甲': ('길', '수생목'),
-        '乙': ('길', '수생목'),
-        '丙': ('흉', '수극화'),
-        '丁': ('흉', '수극화'),
-        '戊': ('평', '토극수이지만 댐 역할'),
-        '己': ('흉', '토극수'),
-        '庚': ('길', '금생수'),
-        '辛': ('길', '금생수'),
-        '壬': ('평', '원국 함께 있을 때 흉'),
-        '癸': ('흉', '큰 물이 작은 물을 흡수')
+        '甲': '수생목',
+        '乙': '수생목',
+        '丙': '수극화',
+        '丁': '수극화',
+        '戊': '토극수이지만 댐 역할',
+        '己': '토극수',
+        '庚': '금생수',
+        '辛': '금생수',
+        '壬': '원국 함께 있을 때 흉',
+        '癸': '큰 물이 작은 물을 흡수'
     },
     '癸': {  # 계수 일간 → 다른 천간들
-        '甲': ('길', '수생목'),
-        '乙': ('길', '수생목'),
-        '丙': ('길흉', '계절에 따라 다름'),
-        '丁': ('흉', '이슬이 등불을 끈다'),
-        '戊': ('대흉', '무계합'),
-        '己': ('평', '기토가 계수를 막음'),
-        '庚': ('길', '금생수'),
-        '辛': ('길', '금생수'),
-        '壬': ('흉', '작은 물이 큰 물에 흡수'),
-        '癸': ('평', '원국 함께 있을 때 흉')
+        '甲': '수생목',
+        '乙': '수생목',
+        '丙': '계절에 따라 다름',
+        '丁': '이슬이 등불을 끈다',
+        '戊': '무계합',
+        '己': '기토가 계수를 막음',
+        '庚': '금생수',
+        '辛': '금생수',
+        '壬': '작은 물이 큰 물에 흡수',
+        '癸': '원국 함께 있을 때 흉'
     }
 }
 
+# 천간 매트릭스 (길흉 레벨: src/manseryeok/matrix.py 공유 매트릭스, 설명: CHEONGAN_NOTES)
+_TENGAN_LEVELS = as_dict(TENGAN_FLAT, HEAVENLY_STEMS, names=LEVELS_KO)
+CHEONGAN_MATRIX = {
+    stem: {target: (_TENGAN_LEVELS[stem][target], note) for target, note in notes.items()}
+    for stem, notes in CHEONGAN_NOTES.items()
+}
+
 def parse_input(input_str):
     """입력 파싱 및 검증"""
     # 정규식으로 입력 파싱
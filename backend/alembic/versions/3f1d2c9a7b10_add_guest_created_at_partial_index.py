@@ -0,0 +1,33 @@
+"""Add partial index for purging stale guest charts
+
+Revision ID: 3f1d2c9a7b10
+Revises: 82a4797319be
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1d2c9a7b10'
+down_revision: Union[str, None] = '82a4797319be'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_saju_guest_created_at',
+        'saju',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text('user_id IS NULL'),
+        sqlite_where=sa.text('user_id IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_saju_guest_created_at', table_name='saju')
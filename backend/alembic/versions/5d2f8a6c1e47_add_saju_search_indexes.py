@@ -0,0 +1,36 @@
+"""Add composite indexes for saju list and search
+
+Revision ID: 5d2f8a6c1e47
+Revises: e71b5d9c3f20
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8a6c1e47'
+down_revision: Union[str, None] = 'e71b5d9c3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_saju_user_created_at', ['user_id', 'created_at']),
+    ('ix_saju_user_birth_datetime', ['user_id', 'birth_datetime']),
+    ('ix_saju_user_fortune_level', ['user_id', 'fortune_level']),
+    ('ix_saju_user_year_pillar', ['user_id', 'year_stem', 'year_branch']),
+    ('ix_saju_user_month_pillar', ['user_id', 'month_stem', 'month_branch']),
+    ('ix_saju_user_day_pillar', ['user_id', 'day_stem', 'day_branch']),
+    ('ix_saju_user_hour_pillar', ['user_id', 'hour_stem', 'hour_branch']),
+)
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, 'saju', columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name='saju')
@@ -0,0 +1,64 @@
+"""Store refresh tokens as hashes and add lookup/sweep indexes
+
+Revision ID: 9b7e4c1d2a55
+Revises: 3f1d2c9a7b10
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9b7e4c1d2a55'
+down_revision: Union[str, None] = '3f1d2c9a7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_refresh_tokens_token', table_name='refresh_tokens')
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.alter_column(
+            'token',
+            new_column_name='token_hash',
+            existing_type=sa.String(),
+            existing_nullable=False,
+        )
+
+    # 既存の平文トークンをハッシュに置き換える（発行済みのトークンはそのまま使える）
+    conn = op.get_bind()
+    rows = conn.execute(sa.text('SELECT id, token_hash FROM refresh_tokens')).fetchall()
+    for row_id, token in rows:
+        conn.execute(
+            sa.text('UPDATE refresh_tokens SET token_hash = :token_hash WHERE id = :id'),
+            {'token_hash': hashlib.sha256(token.encode('utf-8')).hexdigest(), 'id': row_id},
+        )
+
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+    op.create_index('ix_refresh_tokens_expires_at', 'refresh_tokens', ['expires_at'], unique=False)
+    op.create_index(
+        'ix_refresh_tokens_user_live',
+        'refresh_tokens',
+        ['user_id', 'is_revoked', 'expires_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_user_live', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_expires_at', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    # ハッシュから平文には戻せないため、発行済みのトークンは破棄する（再ログインが必要）
+    op.execute('DELETE FROM refresh_tokens')
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.alter_column(
+            'token_hash',
+            new_column_name='token',
+            existing_type=sa.String(),
+            existing_nullable=False,
+        )
+    op.create_index('ix_refresh_tokens_token', 'refresh_tokens', ['token'], unique=True)
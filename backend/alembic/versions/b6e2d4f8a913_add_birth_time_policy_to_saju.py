@@ -0,0 +1,27 @@
+"""Add birth time policy to saju
+
+Revision ID: b6e2d4f8a913
+Revises: 8a3f6d2b9c14
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d4f8a913'
+down_revision: Union[str, None] = '8a3f6d2b9c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 既存の行はnull（既定ポリシー: 韓国の歴史的なオフセット・夜子時説）
+    op.add_column('saju', sa.Column('birth_time_policy', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('saju', 'birth_time_policy')
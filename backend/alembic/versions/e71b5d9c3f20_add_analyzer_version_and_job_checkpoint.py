@@ -0,0 +1,29 @@
+"""Add analyzer version stamp to saju and checkpoint to jobs
+
+Revision ID: e71b5d9c3f20
+Revises: c4a8e2f61b3d
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71b5d9c3f20'
+down_revision: Union[str, None] = 'c4a8e2f61b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 既存の行はnull（判定ロジックのバージョン不明 = 再計算の対象）
+    op.add_column('saju', sa.Column('analyzer_version', sa.String(), nullable=True))
+    op.add_column('jobs', sa.Column('checkpoint', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'checkpoint')
+    op.drop_column('saju', 'analyzer_version')
@@ -3,10 +3,10 @@
 POST /api/auth/register - 新規登録
 POST /api/auth/login - ログイン
 POST /api/auth/logout - ログアウト
+POST /api/auth/refresh - リフレッシュトークンのローテーション
 GET /api/auth/me - 現在のユーザー情報取得
 """
 import uuid
-from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -14,23 +14,28 @@ from sqlalchemy.orm import Session
 
 from app.core.auth import (
     create_access_token,
-    create_refresh_token,
     decode_access_token,
     get_password_hash,
     get_permissions_for_role,
     verify_password,
 )
-from app.core.config import settings
 from app.db.session import get_db
-from app.models import RefreshToken, User
+from app.models import User
 from app.schemas.auth import (
     AuthResponse,
     LoginRequest,
     LogoutResponse,
+    RefreshTokenRequest,
+    RefreshTokenResponse,
     RegisterRequest,
     UserProfile,
     UserResponse,
 )
+from app.services.refresh_tokens import (
+    issue_refresh_token,
+    revoke_user_tokens,
+    rotate_refresh_token,
+)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
@@ -177,22 +182,9 @@ async def register(data: RegisterRequest, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(new_user)
 
-    # トークン生成
+    # トークン生成（リフレッシュトークンはハッシュだけをDBに保存）
     access_token = create_access_token(data={"sub": user_id, "email": data.email, "role": "user"})
-    refresh_token_str = create_refresh_token()
-
-    # リフレッシュトークンをDBに保存
-    refresh_token_expires = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token_model = RefreshToken(
-        id=str(uuid.uuid4()),
-        user_id=user_id,
-        token=refresh_token_str,
-        expires_at=refresh_token_expires,
-        is_revoked=False,
-    )
-
-    db.add(refresh_token_model)
-    db.commit()
+    refresh_token_str = issue_refresh_token(db, user_id)
 
     return create_user_response(new_user, access_token, refresh_token_str)
 
@@ -237,22 +229,9 @@ async def login(data: LoginRequest, db: Session = Depends(get_db)):
             detail="このアカウントは無効化されています",
         )
 
-    # トークン生成
+    # トークン生成（リフレッシュトークンはハッシュだけをDBに保存）
     access_token = create_access_token(data={"sub": user.id, "email": user.email, "role": user.role})
-    refresh_token_str = create_refresh_token()
-
-    # リフレッシュトークンをDBに保存
-    refresh_token_expires = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token_model = RefreshToken(
-        id=str(uuid.uuid4()),
-        user_id=user.id,
-        token=refresh_token_str,
-        expires_at=refresh_token_expires,
-        is_revoked=False,
-    )
-
-    db.add(refresh_token_model)
-    db.commit()
+    refresh_token_str = issue_refresh_token(db, user.id)
 
     return create_user_response(user, access_token, refresh_token_str)
 
@@ -282,14 +261,43 @@ async def logout(
     user = get_current_user(credentials, db)
 
     # 全てのリフレッシュトークンを無効化
-    db.query(RefreshToken).filter(RefreshToken.user_id == user.id).update(
-        {"is_revoked": True}
-    )
-    db.commit()
+    revoke_user_tokens(db, user.id)
 
     return LogoutResponse(success=True, message="ログアウトしました")
 
 
+@router.post("/refresh", response_model=RefreshTokenResponse)
+async def refresh(data: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """
+    リフレッシュトークンのローテーション
+
+    - 使ったリフレッシュトークンは失効し、新しいアクセストークンとリフレッシュトークンを発行
+    - 失効済みのトークンが再び使われた場合は、そのユーザーの全トークンを失効させる
+
+    Args:
+        data: RefreshTokenRequest（refreshToken）
+        db: データベースセッション
+
+    Returns:
+        RefreshTokenResponse（accessToken, refreshToken）
+
+    Raises:
+        HTTPException 401: トークンが無効・期限切れ・再利用された、またはアカウントが無効
+    """
+    try:
+        user, refresh_token_str = rotate_refresh_token(db, data.refreshToken)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e),
+        )
+
+    access_token = create_access_token(
+        data={"sub": user.id, "email": user.email, "role": user.role}
+    )
+    return RefreshTokenResponse(accessToken=access_token, refreshToken=refresh_token_str)
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_me(current_user: User = Depends(get_current_user)):
     """
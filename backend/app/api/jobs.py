@@ -0,0 +1,129 @@
+"""
+バックグラウンドジョブAPIルーター
+POST /api/jobs - ジョブ投入（export / import / recompute_daeun）
+GET /api/jobs/{id} - ジョブの状態・進捗・結果取得
+"""
+import json
+from typing import Optional, cast
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.auth import get_current_user
+from app.db.session import get_db
+from app.models import Job, User
+from app.schemas.job import JobCreateRequest, JobKind, JobResponse, JobStatus
+from app.services import saju_jobs  # noqa: F401 ジョブ種別の登録
+from app.services.clock import convert_db_datetime_to_kst_iso
+from app.services.job_queue import JobQueue
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+# ジョブキューのシングルトンインスタンス
+_job_queue_instance: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """ジョブキューのインスタンスを取得（シングルトン）"""
+    global _job_queue_instance
+    if _job_queue_instance is None:
+        from app.core.config import settings
+        from app.db.session import SessionLocal
+
+        _job_queue_instance = JobQueue(
+            SessionLocal,
+            workers=settings.JOB_WORKERS,
+            cpu_workers=settings.JOB_CPU_WORKERS,
+            chunk_size=settings.JOB_CHUNK_SIZE,
+        )
+    return _job_queue_instance
+
+
+def to_job_response(job: Job) -> JobResponse:
+    """JobモデルからJobResponseを生成"""
+    return JobResponse(
+        id=job.id,
+        kind=cast(JobKind, job.kind),
+        status=cast(JobStatus, job.status),
+        progress=job.progress,
+        total=job.total,
+        result=json.loads(job.result) if job.result else None,
+        error=job.error,
+        createdAt=convert_db_datetime_to_kst_iso(job.created_at),
+        startedAt=convert_db_datetime_to_kst_iso(job.started_at) if job.started_at else None,
+        finishedAt=convert_db_datetime_to_kst_iso(job.finished_at) if job.finished_at else None,
+    )
+
+
+# ==================== エンドポイント ====================
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    data: JobCreateRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> JobResponse:
+    """
+    ジョブ投入
+
+    - ジョブはキューに入り、バックグラウンドで実行される
+    - 進捗・結果は GET /api/jobs/{id} で取得
+
+    Args:
+        data: JobCreateRequest（kind, params）
+        current_user: 現在のユーザー（Depends経由）
+        db: データベースセッション
+
+    Returns:
+        JobResponse（status=queued）
+
+    Raises:
+        HTTPException 400: パラメータが不正
+        HTTPException 403: 全命式の再計算を管理者以外が投入した
+    """
+    if (
+        data.kind == "recompute_daeun"
+        and data.params.get("scope") == "all"
+        and current_user.role != "admin"
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="全命式の再計算は管理者のみ実行できます",
+        )
+
+    try:
+        job_id = get_job_queue().submit(data.kind, data.params, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return to_job_response(db.get_one(Job, job_id))
+
+
+@router.get("/{id}", response_model=JobResponse)
+async def get_job(
+    id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> JobResponse:
+    """
+    ジョブの状態・進捗・結果取得
+
+    Args:
+        id: ジョブID
+        current_user: 現在のユーザー（Depends経由）
+        db: データベースセッション
+
+    Returns:
+        JobResponse
+
+    Raises:
+        HTTPException 404: ジョブが見つからない（他のユーザーのジョブを含む）
+    """
+    job = db.get(Job, id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="ジョブが見つかりません",
+        )
+    return to_job_response(job)
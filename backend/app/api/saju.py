@@ -3,17 +3,28 @@
 """
 import json
 import uuid
-from datetime import datetime, timezone
-
-from fastapi import APIRouter, HTTPException, status, Depends, Response
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import APIRouter, HTTPException, status, Depends, Header, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.auth import get_current_user
+from app.core.responses import ListShape, RawJSONResponse, splice_json
 from app.db.session import get_db
 from app.models import Saju as SajuModel, User
 from app.schemas.saju import (
     AfterBirth,
     BirthDataRequest,
+    BulkDeleteResponse,
+    BulkSaveRequest,
+    BulkSaveResponse,
+    ChartCacheStatsResponse,
     CurrentFortuneResponse,
     DaeunAnalysisResponse,
     DaeunInfo,
@@ -23,9 +34,11 @@ from app.schemas.saju import (
     ErrorResponse,
     ExportData,
     ExportResponse,
-    ExportSajuItem,
+    FacetCount,
     FortuneDetail,
     ImportResponse,
+    MatchInfo,
+    MatchListResponse,
     MigrateRequest,
     MigrateResponse,
     MonthFortuneInfo,
@@ -34,18 +47,59 @@ from app.schemas.saju import (
     SajuSummary,
     SajuUpdateRequest,
     SaveResponse,
+    TimelineResponse,
     SajuResponse,
+    SajuSearchResponse,
+    SajuStatsResponse,
     YearFortuneInfo,
     YearFortuneListResponse,
 )
 from app.services.saju_calculator import SajuCalculator, SolarTermsDB, KST
+from app.services.fortune_analyzer import (
+    ANALYZER_VERSION,
+    FORTUNE_LEVEL_CODES,
+    FORTUNE_LEVEL_NAMES,
+)
 from app.services.fortune_service import FortuneCalculator
+from app.services.birth_time import BirthTimePolicy
+from app.services.chart_cache import ChartCache, SqliteChartStore
+from app.services.guest_store import GuestWriteBehind
+from app.services.saju_jobs import export_item
+from app.services.saju_search import (
+    FACETS,
+    PILLARS,
+    SajuFilter,
+    delete_sajus,
+    facet_counts,
+    search_sajus,
+)
+from app.services.saju_stats import get_saju_stats, invalidate_saju_stats
+from app.services.saju_upsert import save_row, upsert_sajus
+from app.services.idempotency import (
+    MAX_KEY_LENGTH,
+    IdempotencyKeyReusedError,
+    find_response,
+    record_response,
+    request_fingerprint,
+)
+from app.services.clock import AsOf, convert_datetime_to_db, convert_db_datetime_to_kst_iso
+from app.services.compatibility import MatchIndex
+from app.services.donsagong_matrix import (
+    COLLAPSE_5,
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    LEVELS,
+    TENGAN_FLAT,
+)
+from app.services.ganzhi import Ganzhi
+from app.services.sipsin import branch_sipsin, branch_sipsin_of, stem_sipsin
 
 router = APIRouter(prefix="/api/saju", tags=["saju"])
 
 # 命式計算エンジンのシングルトンインスタンス
 _calculator_instance: SajuCalculator = None
 _fortune_calculator_instance: FortuneCalculator = None
+_guest_writer_instance: Optional[GuestWriteBehind] = None
 
 
 def get_calculator() -> SajuCalculator:
@@ -54,7 +108,11 @@ def get_calculator() -> SajuCalculator:
     if _calculator_instance is None:
         from app.core.config import settings
         solar_terms_db = SolarTermsDB(db_path=settings.SOLAR_TERMS_DB_PATH)
-        _calculator_instance = SajuCalculator(solar_terms_db)
+        store = (
+            SqliteChartStore(settings.CHART_CACHE_DB_PATH) if settings.CHART_CACHE_DB_PATH else None
+        )
+        cache = ChartCache(maxsize=settings.CHART_CACHE_SIZE, store=store)
+        _calculator_instance = SajuCalculator(solar_terms_db, cache=cache)
     return _calculator_instance
 
 
@@ -66,27 +124,246 @@ def get_fortune_calculator() -> FortuneCalculator:
     return _fortune_calculator_instance
 
 
-def convert_db_datetime_to_kst_iso(dt: datetime) -> str:
+def get_guest_writer() -> Optional[GuestWriteBehind]:
+    """ゲスト命式の書き込み遅延キューを取得（シングルトン、無効ならNone）"""
+    global _guest_writer_instance
+    from app.core.config import settings
+    if not settings.GUEST_WRITE_BEHIND:
+        return None
+    if _guest_writer_instance is None:
+        from app.db.session import SessionLocal
+        _guest_writer_instance = GuestWriteBehind(
+            SessionLocal,
+            batch_size=settings.GUEST_WRITE_BEHIND_BATCH,
+            interval=settings.GUEST_WRITE_BEHIND_INTERVAL_SECONDS,
+        )
+    return _guest_writer_instance
+
+
+def get_saju_by_id(db: Session, id: str) -> Optional[SajuModel]:
     """
-    データベースから取得したnaive datetimeをKSTのISO文字列に変換
+    命式をIDで取得
 
-    データベースのDateTimeカラムはタイムゾーン情報を保持しないため、
-    取得したdatetimeはnaive（タイムゾーン情報なし）です。
-    データベースにはUTCで保存されているので、これをUTCとして扱い、
-    KSTに変換してISO文字列として返します。
+    書き込み遅延キューに残っているゲスト命式は先に書き込んでから引く
 
     Args:
-        dt: データベースから取得したnaive datetime（UTC）
+        db: DBセッション
+        id: 命式ID
 
     Returns:
-        KSTのISO文字列（例：'1986-05-26T05:00:00+09:00'）
+        命式（無ければNone）
+    """
+    saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+    if saju_db is None:
+        writer = get_guest_writer()
+        if writer is not None and id in writer:
+            writer.flush()
+            saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+    return saju_db
+
+
+def get_as_of(as_of: Optional[str] = None) -> AsOf:
     """
-    # naive datetimeにUTCタイムゾーンを付与
-    dt_utc = dt.replace(tzinfo=timezone.utc)
-    # KSTに変換
-    dt_kst = dt_utc.astimezone(KST)
-    # ISO文字列として返す
-    return dt_kst.isoformat()
+    リクエストの基準日時を取得（1リクエストで1度だけ決める）
+
+    Args:
+        as_of: 基準日・日時（ISO 8601、省略時は現在時刻）。過去・未来の時点の判定に使う
+
+    Returns:
+        基準日時
+    """
+    try:
+        return AsOf.parse(as_of)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="as_ofの日付形式が不正です",
+        )
+
+
+LIST_FORMATS = ("objects", "columnar")
+
+
+def list_shape(model: Type[BaseModel]) -> Callable[..., ListShape]:
+    """
+    リストAPIのレスポンス形を受け取る依存関係を作成
+
+    Args:
+        model: リストの要素のスキーマ（fieldsに指定できる項目）
+
+    Returns:
+        fields（カンマ区切りの項目名）・format（objects / columnar）を受け取る依存関係
+    """
+
+    def get_list_shape(fields: Optional[str] = None, format: str = "objects") -> ListShape:
+        if format not in LIST_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"formatは{'/'.join(LIST_FORMATS)}のいずれかです",
+            )
+        # 空の指定（?fields= / ?fields=, など）は省略と同じく全項目
+        names = tuple(
+            dict.fromkeys(name.strip() for name in (fields or "").split(",") if name.strip())
+        ) or None
+        if names is not None:
+            unknown = [name for name in names if name not in model.model_fields]
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"不明な項目です: {', '.join(unknown)}",
+                )
+        columnar = format == "columnar"
+        if columnar and names is None:
+            names = tuple(model.model_fields)
+        return ListShape(fields=names, columnar=columnar)
+
+    return get_list_shape
+
+
+def shaped(response: BaseModel, key: str, shape: ListShape):
+    """
+    リストAPIのレスポンスにレスポンス形を適用
+
+    Args:
+        response: レスポンスモデル
+        key: リストの項目名
+        shape: レスポンス形
+
+    Returns:
+        通常の形ならresponseそのもの、それ以外は変換したORJSONResponse
+    """
+    if shape.is_default:
+        return response
+    return ORJSONResponse(shape.apply(response.model_dump(), key))
+
+
+# 相性検索用の索引キャッシュ（(所有者ID, 基準日) → (データ指紋, 性別ごとの索引)）
+# 所有者IDがNoneの場合は全命式が対象
+_match_index_cache: Dict[Tuple[Optional[str], date], Tuple[tuple, Dict[str, MatchIndex]]] = {}
+_MATCH_INDEX_CACHE_SIZE = 64
+
+
+def _current_daeun(
+    birth_datetime: datetime, daeun_list_json: Optional[str], as_of: AsOf
+) -> Optional[Ganzhi]:
+    """
+    保存済みの大運リストから基準日時点の大運を取得
+
+    Args:
+        birth_datetime: 生年月日時
+        daeun_list_json: 大運リスト（JSON文字列）
+        as_of: 基準日時
+
+    Returns:
+        現在の大運（該当なし・不正データの場合はNone）
+    """
+    if not daeun_list_json:
+        return None
+    age = as_of.age_of(birth_datetime)
+    try:
+        for daeun in json.loads(daeun_list_json):
+            if daeun["startAge"] <= age <= daeun["endAge"]:
+                return Ganzhi.from_chars(daeun["daeunStem"], daeun["daeunBranch"])
+    except (ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def get_match_index(db: Session, owner_id: Optional[str], as_of: AsOf) -> Dict[str, MatchIndex]:
+    """
+    相性検索用の索引を取得（性別ごと）
+
+    件数と最終更新日時が変わっていなければ前回構築した索引を再利用する
+
+    Args:
+        db: データベースセッション
+        owner_id: 対象ユーザーID（Noneなら全命式）
+        as_of: 現在の大運を決める基準日時
+
+    Returns:
+        {'male': 男性命式の索引, 'female': 女性命式の索引}
+    """
+    scope_filter = (
+        SajuModel.user_id.isnot(None) if owner_id is None else SajuModel.user_id == owner_id
+    )
+    fingerprint = tuple(
+        db.query(
+            func.count(SajuModel.id), func.max(SajuModel.updated_at), func.max(SajuModel.created_at)
+        )
+        .filter(scope_filter)
+        .one()
+    )
+
+    cache_key = (owner_id, as_of.today)
+    cached = _match_index_cache.get(cache_key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    indexes = {"male": MatchIndex(), "female": MatchIndex()}
+    rows = db.query(
+        SajuModel.id,
+        SajuModel.gender,
+        SajuModel.birth_datetime,
+        SajuModel.month_stem,
+        SajuModel.month_branch,
+        SajuModel.day_stem,
+        SajuModel.day_branch,
+        SajuModel.hour_stem,
+        SajuModel.hour_branch,
+        SajuModel.daeun_list,
+    ).filter(scope_filter)
+    for row in rows:
+        index = indexes.get(row.gender)
+        if index is None:
+            continue
+        try:
+            chart = (
+                Ganzhi.from_chars(row.day_stem, row.day_branch),
+                Ganzhi.from_chars(row.month_stem, row.month_branch),
+                Ganzhi.from_chars(row.hour_stem, row.hour_branch),
+                _current_daeun(row.birth_datetime, row.daeun_list, as_of),
+            )
+        except ValueError:
+            continue
+        index.add(row.id, chart)
+
+    if len(_match_index_cache) >= _MATCH_INDEX_CACHE_SIZE:
+        _match_index_cache.clear()
+    _match_index_cache[cache_key] = (fingerprint, indexes)
+    return indexes
+
+
+def get_birth_time_policy(data, stored: Optional[str] = None) -> BirthTimePolicy:
+    """
+    リクエストの出生地項目から出生時刻ポリシーを作成
+
+    リクエストで指定しなかった項目は保存済みのポリシー（更新時）を引き継ぐ。
+    timeZone / timezoneOffset は組で扱い、どちらかを指定したら両方リクエストの値を使う
+
+    Args:
+        data: BirthDataRequest / SajuUpdateRequest
+        stored: 命式の行に保存した出生時刻ポリシー（Noneなら既定）
+
+    Returns:
+        出生時刻ポリシー
+
+    Raises:
+        ValueError: タイムゾーン名・オフセットが不正な場合
+    """
+    fields = BirthTimePolicy.from_stored(stored).to_request()
+    explicit = data.model_fields_set
+    if explicit & {"timeZone", "timezoneOffset"}:
+        fields["timeZone"] = data.timeZone
+        fields["timezoneOffset"] = data.timezoneOffset
+    for name in ("longitude", "dayBoundary"):
+        if name in explicit:
+            fields[name] = getattr(data, name)
+    return BirthTimePolicy.from_fields(fields)
+
+
+def stored_birth_time_policy(saju_db: SajuModel) -> Optional[Dict[str, Any]]:
+    """命式の行に保存した出生時刻ポリシーをレスポンスの形式に変換（既定ならNone）"""
+    return BirthTimePolicy.from_stored(saju_db.birth_time_policy).to_request() or None
 
 
 @router.post(
@@ -102,15 +379,19 @@ async def calculate_saju(data: BirthDataRequest, db: Session = Depends(get_db)):
     命式計算エンドポイント
 
     生年月日時と性別から四柱推命の命式を計算し、大運リスト・吉凶レベルを返す
-    ゲストモードでもデータベースに保存（user_id=NULL）
+    persist指定時（省略時はGUEST_PERSIST_DEFAULT）はゲスト命式として保存（user_id=NULL）。
+    書き込み遅延キュー（GUEST_WRITE_BEHIND、既定で無効）が有効ならまとめて書き込む。
+    書き込み待ちの行もIDで引くと先に書き込まれるので、続く詳細画面の取得で読める
     """
     try:
-        # ISO 8601文字列をdatetimeに変換
-        birth_datetime = datetime.fromisoformat(data.birthDatetime.replace("Z", "+00:00"))
+        # ISO 8601文字列をdatetimeに変換（保存して読み戻しても同じ命式になる形にそろえる）
+        birth_datetime, policy = get_birth_time_policy(data).canonical(
+            datetime.fromisoformat(data.birthDatetime.replace("Z", "+00:00"))
+        )
 
         # 命式計算
         calculator = get_calculator()
-        result = calculator.calculate(birth_datetime, data.gender, data.name)
+        result = calculator.calculate(birth_datetime, data.gender, data.name, policy=policy)
 
         # UUID生成
         saju_id = f"saju-{uuid.uuid4()}"
@@ -122,30 +403,42 @@ async def calculate_saju(data: BirthDataRequest, db: Session = Depends(get_db)):
             daeun_list.append(DaeunInfo(**daeun))
 
         # 吉凶レベル文字列を数値に変換
-        fortune_level_map = {"大凶": 1, "凶": 2, "平": 3, "吉凶": 4, "吉": 5, "小吉": 6, "大吉": 7}
-        fortune_level_int = fortune_level_map.get(result["fortuneLevel"], 3)  # デフォルト=平
+        fortune_level_int = FORTUNE_LEVEL_CODES.get(result["fortuneLevel"], 3)  # デフォルト=平
 
         # データベースに保存（ゲストモード: user_id=NULL）
-        saju_db = SajuModel(
-            id=saju_id,
-            user_id=None,  # ゲストモード
-            name=result["name"],
-            birth_datetime=birth_datetime,
-            gender=result["gender"],
-            year_stem=result["yearStem"],
-            year_branch=result["yearBranch"],
-            month_stem=result["monthStem"],
-            month_branch=result["monthBranch"],
-            day_stem=result["dayStem"],
-            day_branch=result["dayBranch"],
-            hour_stem=result["hourStem"],
-            hour_branch=result["hourBranch"],
-            daeun_list=json.dumps([daeun.model_dump() for daeun in daeun_list], ensure_ascii=False),
-            fortune_level=fortune_level_int,
-        )
-        db.add(saju_db)
-        db.commit()
-        db.refresh(saju_db)
+        from app.core.config import settings
+        persist = data.persist if data.persist is not None else settings.GUEST_PERSIST_DEFAULT
+        if persist:
+            now = datetime.utcnow()
+            row = dict(
+                id=saju_id,
+                user_id=None,  # ゲストモード
+                name=result["name"],
+                birth_datetime=convert_datetime_to_db(birth_datetime),
+                gender=result["gender"],
+                year_stem=result["yearStem"],
+                year_branch=result["yearBranch"],
+                month_stem=result["monthStem"],
+                month_branch=result["monthBranch"],
+                day_stem=result["dayStem"],
+                day_branch=result["dayBranch"],
+                hour_stem=result["hourStem"],
+                hour_branch=result["hourBranch"],
+                daeun_list=json.dumps(
+                    [daeun.model_dump() for daeun in daeun_list], ensure_ascii=False
+                ),
+                analyzer_version=ANALYZER_VERSION,
+                fortune_level=fortune_level_int,
+                birth_time_policy=policy.stored,
+                created_at=now,
+                updated_at=now,
+            )
+            writer = get_guest_writer()
+            if writer is not None:
+                writer.submit(row)
+            else:
+                db.add(SajuModel(**row))
+                db.commit()
 
         # レスポンス構築
         response = SajuResponse(
@@ -169,6 +462,7 @@ async def calculate_saju(data: BirthDataRequest, db: Session = Depends(get_db)):
             firstDaeunDate=result["firstDaeunDate"],
             daeunList=daeun_list,
             fortuneLevel=result["fortuneLevel"],
+            birthTimePolicy=policy.to_request() or None,
             createdAt=result["createdAt"],
         )
 
@@ -182,78 +476,243 @@ async def calculate_saju(data: BirthDataRequest, db: Session = Depends(get_db)):
         )
 
 
+# 一括保存の上限件数
+BULK_SAVE_LIMIT = 100
+
+
+def run_idempotent(
+    db: Session,
+    user_id: str,
+    idempotency_key: Optional[str],
+    fingerprint: str,
+    status_code: int,
+    handler: Callable[[datetime], Dict],
+) -> ORJSONResponse:
+    """
+    書き込み処理をIdempotency-Key付きで実行
+
+    キーが指定されていれば、同じキー・同じ内容の再送には最初のレスポンスを返す
+    （Idempotent-Replayed: true ヘッダー付き）。
+    処理とレスポンスの記録は同じトランザクションでコミットする
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        idempotency_key: Idempotency-Keyヘッダー（省略可）
+        fingerprint: リクエスト内容の指紋（request_fingerprint）
+        status_code: 成功時のステータスコード
+        handler: 書き込み処理（現在時刻を受け取り、コミットせずにレスポンスボディを返す）
+
+    Returns:
+        ORJSONResponse
+
+    Raises:
+        HTTPException 400: キーが長すぎる
+        HTTPException 422: 同じキーが別の内容のリクエストに使われた
+    """
+    from app.core.config import settings
+
+    ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+    def replay() -> Optional[ORJSONResponse]:
+        try:
+            stored = find_response(
+                db, user_id, idempotency_key, fingerprint, datetime.utcnow(), ttl
+            )
+        except IdempotencyKeyReusedError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        if stored is None:
+            return None
+        return ORJSONResponse(
+            stored[1], status_code=stored[0], headers={"Idempotent-Replayed": "true"}
+        )
+
+    if idempotency_key is not None:
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Keyは1〜{MAX_KEY_LENGTH}文字で指定してください",
+            )
+        stored = replay()
+        if stored is not None:
+            return stored
+
+    now = datetime.utcnow()
+    body = handler(now)
+    if idempotency_key is not None:
+        record_response(db, user_id, idempotency_key, fingerprint, status_code, body, now)
+    try:
+        db.commit()
+    except IntegrityError:
+        # 同じキーの再送が先にコミットされた（処理もロールバックされるので、先のレスポンスを返す）
+        db.rollback()
+        stored = replay() if idempotency_key is not None else None
+        if stored is None:
+            raise
+        return stored
+    return ORJSONResponse(body, status_code=status_code)
+
+
+def _flush_pending_guests(saju_ids):
+    """書き込み待ちのゲスト命式を先に書き込む（保存のUPSERTと後からのINSERTが衝突しないように）"""
+    writer = get_guest_writer()
+    if writer is not None and any(saju_id in writer for saju_id in saju_ids):
+        writer.flush()
+
+
 @router.post(
     "/save",
     response_model=SaveResponse,
     status_code=status.HTTP_201_CREATED,
     responses={
         400: {"model": ErrorResponse, "description": "バリデーションエラー"},
+        403: {"model": ErrorResponse, "description": "この命式にアクセスする権限がありません"},
+        422: {
+            "model": ErrorResponse,
+            "description": "Idempotency-Keyが別の内容のリクエストで使用されています",
+        },
     },
 )
 async def save_saju(
     saju: SajuResponse,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     命式保存エンドポイント
 
-    計算済みの命式をPostgreSQLに保存（UPSERT処理）
-    既に存在する場合はuser_idを更新、存在しない場合は新規作成
+    計算済みの命式を1文のUPSERT（INSERT ... ON CONFLICT DO UPDATE）で保存
+    既に存在する場合はuser_id・名前を更新（ゲスト→ログインユーザー）、存在しない場合は新規作成
+    他のユーザーの命式は更新しない（403）
+    Idempotency-Keyヘッダーを付けると、再送には最初のレスポンスを返す
     """
-    try:
-        # birth_datetimeをdatetimeオブジェクトに変換
-        birth_datetime = datetime.fromisoformat(saju.birthDatetime.replace("Z", "+00:00"))
-
-        # 吉凶レベルを数値に変換
-        fortune_level_map = {"大凶": 1, "凶": 2, "平": 3, "吉凶": 4, "吉": 5, "小吉": 6, "大吉": 7}
-        fortune_level_int = fortune_level_map.get(saju.fortuneLevel, 3)
-
-        # daeunListをJSON文字列に変換
-        daeun_list_json = json.dumps([d.model_dump() for d in saju.daeunList], ensure_ascii=False)
-
-        # 既存レコードを確認
-        existing_saju = db.query(SajuModel).filter(SajuModel.id == saju.id).first()
-
-        if existing_saju:
-            # 既存レコードが存在する場合はuser_idを更新（ゲスト→ログインユーザー）
-            existing_saju.user_id = current_user.id
-            existing_saju.name = saju.name
-            existing_saju.updated_at = datetime.now()
-            db.commit()
-            db.refresh(existing_saju)
-            return SaveResponse(success=True, id=existing_saju.id, message="命式を保存しました")
-        else:
-            # 新規レコードを作成
-            db_saju = SajuModel(
-                id=saju.id,
-                user_id=current_user.id,
-                name=saju.name,
-                birth_datetime=birth_datetime,
-                gender=saju.gender,
-                year_stem=saju.yearStem,
-                year_branch=saju.yearBranch,
-                month_stem=saju.monthStem,
-                month_branch=saju.monthBranch,
-                day_stem=saju.dayStem,
-                day_branch=saju.dayBranch,
-                hour_stem=saju.hourStem,
-                hour_branch=saju.hourBranch,
-                daeun_list=daeun_list_json,
-                fortune_level=fortune_level_int,
+    fingerprint = request_fingerprint("POST", "/api/saju/save", saju.model_dump())
+
+    def save(now: datetime) -> Dict:
+        try:
+            row = save_row(saju, current_user.id, now)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"命式データが不正です: {str(e)}"
+            )
+        _flush_pending_guests([saju.id])
+        if not upsert_sajus(db, [row]):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="この命式にアクセスする権限がありません",
             )
+        return SaveResponse(success=True, id=saju.id, message="命式を保存しました").model_dump()
 
-            # DB保存
-            db.add(db_saju)
-            db.commit()
-            db.refresh(db_saju)
+    try:
+        response = run_idempotent(
+            db, current_user.id, idempotency_key, fingerprint, status.HTTP_201_CREATED, save
+        )
+    except HTTPException:
+        db.rollback()
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"命式データが不正です: {str(e)}",
+        )
+
+    invalidate_saju_stats(current_user.id)
+    return response
+
+
+@router.post(
+    "/save/bulk",
+    response_model=BulkSaveResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"model": ErrorResponse, "description": "バリデーションエラー"},
+        422: {
+            "model": ErrorResponse,
+            "description": "Idempotency-Keyが別の内容のリクエストで使用されています",
+        },
+    },
+)
+async def save_saju_bulk(
+    data: BulkSaveRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    命式一括保存エンドポイント
 
-            return SaveResponse(success=True, id=db_saju.id, message="命式を保存しました")
+    複数の命式（100件まで）を1文のUPSERTでまとめて保存（全件成功または全件失敗）
+    他のユーザーの命式と同じIDはskippedIdsに入れて保存しない
+    Idempotency-Keyヘッダーを付けると、再送には最初のレスポンスを返す
+    """
+    if not data.items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="保存する命式がありません",
+        )
+    if len(data.items) > BULK_SAVE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"一度に保存できる命式は{BULK_SAVE_LIMIT}件までです",
+        )
+    fingerprint = request_fingerprint("POST", "/api/saju/save/bulk", data.model_dump())
+
+    def save(now: datetime) -> Dict:
+        # 同じIDは後勝ち
+        items = {saju.id: saju for saju in data.items}
+        try:
+            rows = [save_row(saju, current_user.id, now) for saju in items.values()]
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"命式データが不正です: {str(e)}"
+            )
+        _flush_pending_guests(items)
+        saved = set(upsert_sajus(db, rows))
+        ids = [saju_id for saju_id in items if saju_id in saved]
+        return BulkSaveResponse(
+            success=True,
+            savedCount=len(ids),
+            ids=ids,
+            skippedIds=[saju_id for saju_id in items if saju_id not in saved],
+            message=f"{len(ids)}件の命式を保存しました",
+        ).model_dump()
 
+    try:
+        response = run_idempotent(
+            db, current_user.id, idempotency_key, fingerprint, status.HTTP_201_CREATED, save
+        )
+    except HTTPException:
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"命式データが不正です: {str(e)}")
 
+    invalidate_saju_stats(current_user.id)
+    return response
+
+
+def to_saju_summary(item: SajuModel) -> SajuSummary:
+    """命式モデルからSajuSummaryを生成"""
+    return SajuSummary(
+        id=item.id,
+        name=item.name,
+        birthDatetime=convert_db_datetime_to_kst_iso(item.birth_datetime),
+        gender=item.gender,
+        fortuneLevel=FORTUNE_LEVEL_NAMES.get(item.fortune_level, "平"),
+        createdAt=convert_db_datetime_to_kst_iso(item.created_at),
+        yearStem=item.year_stem,
+        yearBranch=item.year_branch,
+        monthStem=item.month_stem,
+        monthBranch=item.month_branch,
+        dayStem=item.day_stem,
+        dayBranch=item.day_branch,
+        hourStem=item.hour_stem,
+        hourBranch=item.hour_branch,
+    )
+
 
 @router.get(
     "/list",
@@ -265,6 +724,7 @@ async def get_saju_list(
     limit: int = 20,
     sortBy: str = "createdAt",
     order: str = "desc",
+    shape: ListShape = Depends(list_shape(SajuSummary)),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -273,6 +733,7 @@ async def get_saju_list(
 
     ログインユーザーの命式一覧を取得
     ページネーション、ソート機能付き
+    ?fields=（項目の絞り込み）・?format=columnar（列形式）で軽量なレスポンスにできる
     """
     try:
         # セッションのキャッシュをクリア（最新のデータを取得するため）
@@ -311,35 +772,15 @@ async def get_saju_list(
         offset = (page - 1) * limit
         items_db = query.offset(offset).limit(limit).all()
 
-        # 吉凶レベルを文字列に変換
-        fortune_level_reverse_map = {1: "大凶", 2: "凶", 3: "平", 4: "吉凶", 5: "吉", 6: "小吉", 7: "大吉"}
-
-        items = []
-        for item in items_db:
-            fortune_level_str = fortune_level_reverse_map.get(item.fortune_level, "平")
-            items.append(
-                SajuSummary(
-                    id=item.id,
-                    name=item.name,
-                    birthDatetime=convert_db_datetime_to_kst_iso(item.birth_datetime),
-                    gender=item.gender,
-                    fortuneLevel=fortune_level_str,
-                    createdAt=convert_db_datetime_to_kst_iso(item.created_at),
-                    yearStem=item.year_stem,
-                    yearBranch=item.year_branch,
-                    monthStem=item.month_stem,
-                    monthBranch=item.month_branch,
-                    dayStem=item.day_stem,
-                    dayBranch=item.day_branch,
-                    hourStem=item.hour_stem,
-                    hourBranch=item.hour_branch,
-                )
-            )
+        items = [to_saju_summary(item) for item in items_db]
 
         # 次のページが存在するか
         has_next = (page * limit) < total
 
-        return SajuListResponse(items=items, total=total, page=page, limit=limit, hasNext=has_next)
+        response = SajuListResponse(
+            items=items, total=total, page=page, limit=limit, hasNext=has_next
+        )
+        return shaped(response, "items", shape)
 
     except Exception as e:
         raise HTTPException(
@@ -347,6 +788,211 @@ async def get_saju_list(
         )
 
 
+def _parse_birth_bound(value: Optional[str], end: bool) -> Optional[datetime]:
+    """
+    生年月日時の範囲指定をDBの比較値（naive、UTC）に変換
+
+    Args:
+        value: ISO 8601の日付・日時（日付のみ・タイムゾーンなしはKST）
+        end: 範囲の終わりか（日付のみならその日の終わりまでを含む）
+
+    Returns:
+        比較値（省略時はNone）
+    """
+    if not value:
+        return None
+    bound = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if end and len(value) == 10:
+        bound += timedelta(days=1)
+    if bound.tzinfo is None:
+        bound = bound.replace(tzinfo=KST)
+    return bound.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def get_saju_filter(
+    year_pillar: Optional[str] = Query(None, alias="yearPillar"),
+    month_pillar: Optional[str] = Query(None, alias="monthPillar"),
+    day_pillar: Optional[str] = Query(None, alias="dayPillar"),
+    hour_pillar: Optional[str] = Query(None, alias="hourPillar"),
+    year_stem: Optional[str] = Query(None, alias="yearStem"),
+    year_branch: Optional[str] = Query(None, alias="yearBranch"),
+    month_stem: Optional[str] = Query(None, alias="monthStem"),
+    month_branch: Optional[str] = Query(None, alias="monthBranch"),
+    day_stem: Optional[str] = Query(None, alias="dayStem"),
+    day_branch: Optional[str] = Query(None, alias="dayBranch"),
+    hour_stem: Optional[str] = Query(None, alias="hourStem"),
+    hour_branch: Optional[str] = Query(None, alias="hourBranch"),
+    gender: Optional[str] = None,
+    birth_from: Optional[str] = Query(None, alias="birthFrom"),
+    birth_to: Optional[str] = Query(None, alias="birthTo"),
+    fortune_level: Optional[str] = Query(None, alias="fortuneLevel"),
+) -> SajuFilter:
+    """
+    命式検索の絞り込み条件を取得
+
+    Args:
+        year_pillar〜hour_pillar: 柱（「甲子」形式、クエリはyearPillar〜hourPillar）
+        year_stem〜hour_branch: 天干・地支（柱の指定と併用可、クエリはyearStem〜hourBranch）
+        gender: 性別
+        birth_from / birth_to: 生年月日時の範囲（ISO 8601、クエリはbirthFrom / birthTo。
+            日付のみならbirthToはその日を含む）
+        fortune_level: 吉凶レベル（カンマ区切りでいずれか、クエリはfortuneLevel）
+
+    Returns:
+        絞り込み条件
+    """
+    pillars = {}
+    values = locals()
+    for pillar in PILLARS:
+        text = values[f"{pillar}_pillar"]
+        if text:
+            try:
+                ganzhi = Ganzhi.from_str(text)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            pillars[f"{pillar}_stem"] = ganzhi.stem_char
+            pillars[f"{pillar}_branch"] = ganzhi.branch_char
+        for part, allowed in (("Stem", HEAVENLY_STEMS), ("Branch", EARTHLY_BRANCHES)):
+            value = values[f"{pillar}_{part.lower()}"]
+            if value is None:
+                continue
+            column = f"{pillar}_{part.lower()}"
+            if value not in allowed or pillars.get(column, value) != value:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{pillar}{part}の指定が不正です: {value}",
+                )
+            pillars[column] = value
+
+    if gender is not None and gender not in ("male", "female"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="genderはmale/femaleのいずれかです"
+        )
+
+    fortune_levels = ()
+    if fortune_level:
+        names = [name.strip() for name in fortune_level.split(",") if name.strip()]
+        unknown = [name for name in names if name not in FORTUNE_LEVEL_CODES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"不明な吉凶レベルです: {', '.join(unknown)}",
+            )
+        fortune_levels = tuple(FORTUNE_LEVEL_CODES[name] for name in names)
+
+    try:
+        birth_from = _parse_birth_bound(birth_from, end=False)
+        birth_to = _parse_birth_bound(birth_to, end=True)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="birthFrom/birthToの日付形式が不正です"
+        )
+
+    return SajuFilter(
+        pillars=pillars,
+        gender=gender,
+        birth_from=birth_from,
+        birth_to=birth_to,
+        fortune_levels=fortune_levels,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=SajuSearchResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "検索条件が不正です"},
+    },
+)
+async def search_saju(
+    page: int = 1,
+    limit: int = 20,
+    sort_by: str = Query("createdAt", alias="sortBy"),
+    order: str = "desc",
+    facets: Optional[str] = None,
+    saju_filter: SajuFilter = Depends(get_saju_filter),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    命式検索エンドポイント
+
+    ログインユーザーの命式を四柱・性別・生年月日時の範囲・吉凶レベルで絞り込む
+    facets（カンマ区切り、例: dayPillar,fortuneLevel）を指定すると、
+    絞り込み後の件数を値ごとに集計して返す
+    """
+    facet_names = [name.strip() for name in facets.split(",") if name.strip()] if facets else []
+    unknown = [name for name in facet_names if name not in FACETS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"不明なファセットです: {', '.join(unknown)}",
+        )
+    limit = min(max(limit, 1), 100)
+    page = max(page, 1)
+
+    try:
+        items_db, total = search_sajus(
+            db, current_user.id, saju_filter, sort_by=sort_by, order=order, page=page, limit=limit
+        )
+        facet_data = facet_counts(db, current_user.id, saju_filter, facet_names)
+
+        return SajuSearchResponse(
+            items=[to_saju_summary(item) for item in items_db],
+            total=total,
+            page=page,
+            limit=limit,
+            hasNext=(page * limit) < total,
+            facets={
+                name: [FacetCount(value=value, count=count) for value, count in counts]
+                for name, counts in facet_data.items()
+            },
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"検索中にエラーが発生しました: {str(e)}",
+        )
+
+
+@router.get(
+    "/stats",
+    response_model=SajuStatsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_saju_stats_endpoint(
+    as_of: AsOf = Depends(get_as_of),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    命式集計エンドポイント（ダッシュボード用）
+
+    ログインユーザーの命式の日干・五行・吉凶レベル・現在の大運の吉凶レベルごとの件数を返す
+    集計はSQLで行い、結果は命式の保存・更新・削除までキャッシュする
+    """
+    from app.core.config import settings
+
+    try:
+        stats = get_saju_stats(db, current_user.id, as_of, use_cache=settings.SAJU_STATS_CACHE)
+        return SajuStatsResponse(
+            asOf=as_of.today.isoformat(),
+            total=stats["total"],
+            **{
+                name: [FacetCount(value=value, count=count) for value, count in stats[name]]
+                for name in ("dayStem", "dayElement", "fortuneLevel", "currentDaeunLevel")
+            },
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"集計中にエラーが発生しました: {str(e)}",
+        )
+
+
 # ==================== データ管理エンドポイント ====================
 
 
@@ -377,29 +1023,8 @@ async def export_saju_data(
             .all()
         )
 
-        # ExportSajuItemのリストを作成
-        export_items = []
-        for saju_db in sajus_db:
-            saju_dict = {
-                "year_stem": saju_db.year_stem,
-                "year_branch": saju_db.year_branch,
-                "month_stem": saju_db.month_stem,
-                "month_branch": saju_db.month_branch,
-                "day_stem": saju_db.day_stem,
-                "day_branch": saju_db.day_branch,
-                "hour_stem": saju_db.hour_stem,
-                "hour_branch": saju_db.hour_branch,
-            }
-
-            export_item = ExportSajuItem(
-                id=saju_db.id,
-                name=saju_db.name,
-                birth_datetime=convert_db_datetime_to_kst_iso(saju_db.birth_datetime),
-                gender=saju_db.gender,
-                saju=saju_dict,
-                created_at=convert_db_datetime_to_kst_iso(saju_db.created_at),
-            )
-            export_items.append(export_item)
+        # ExportSajuItemのリストを作成（件数が多い場合は POST /api/jobs の export ジョブを使う）
+        export_items = [export_item(saju_db) for saju_db in sajus_db]
 
         # 現在日時を取得
         now = datetime.now()
@@ -468,9 +1093,6 @@ async def import_saju_data(import_data: ExportData, db: Session = Depends(get_db
                 message="インポートする新しいデータがありません（全て重複）",
             )
 
-        # 吉凶レベルを数値に変換
-        fortune_level_map = {"大凶": 1, "凶": 2, "平": 3, "吉": 4, "大吉": 5}
-
         # トランザクション開始（全成功または全失敗）
         imported_count = 0
         for saju in new_data:
@@ -478,7 +1100,7 @@ async def import_saju_data(import_data: ExportData, db: Session = Depends(get_db
             birth_datetime = datetime.fromisoformat(saju.birthDatetime.replace("Z", "+00:00"))
 
             # 吉凶レベルを数値に変換
-            fortune_level_int = fortune_level_map.get(saju.fortuneLevel, 3)
+            fortune_level_int = FORTUNE_LEVEL_CODES.get(saju.fortuneLevel, 3)
 
             # daeunListをJSON文字列に変換
             daeun_list_json = json.dumps(
@@ -490,7 +1112,7 @@ async def import_saju_data(import_data: ExportData, db: Session = Depends(get_db
                 id=saju.id,
                 user_id=current_user.id,
                 name=saju.name,
-                birth_datetime=birth_datetime,
+                birth_datetime=convert_datetime_to_db(birth_datetime),
                 gender=saju.gender,
                 year_stem=saju.yearStem,
                 year_branch=saju.yearBranch,
@@ -502,6 +1124,7 @@ async def import_saju_data(import_data: ExportData, db: Session = Depends(get_db
                 hour_branch=saju.hourBranch,
                 daeun_list=daeun_list_json,
                 fortune_level=fortune_level_int,
+                birth_time_policy=BirthTimePolicy.from_fields(saju.birthTimePolicy).stored,
             )
 
             db.add(db_saju)
@@ -551,6 +1174,7 @@ async def get_current_fortune(
     birth_hour: int,
     birth_minute: int,
     gender: str,
+    as_of: AsOf = Depends(get_as_of),
     calculator: SajuCalculator = Depends(get_calculator),
 ) -> CurrentFortuneResponse:
     """
@@ -568,74 +1192,42 @@ async def get_current_fortune(
         CurrentFortuneResponse: 今日の年・月・日運情報
     """
     try:
-        # 今日の日付を取得（KST = UTC+9）
-        from datetime import datetime
-        from zoneinfo import ZoneInfo
-
-        now = datetime.now(ZoneInfo("Asia/Seoul"))
+        # 基準日時（KST）
+        now = as_of.now
         today_str = now.strftime("%Y-%m-%d")
 
         # ユーザーの命式を計算して日干を取得
         from lunar_python import Solar as UserSolar
 
         user_solar = UserSolar.fromYmdHms(birth_year, birth_month, birth_day, birth_hour, birth_minute, 0)
-        user_lunar = user_solar.getLunar()
-        user_eight_char = user_lunar.getEightChar()
-        user_day_stem = user_eight_char.getDayGan()  # ユーザーの日干
+        user_day = Ganzhi.from_str(user_solar.getLunar().getEightChar().getDay())  # ユーザーの日柱
 
         # 今日の年・月・日の干支を取得
         from lunar_python import Solar
 
         solar = Solar.fromYmdHms(now.year, now.month, now.day, now.hour, 0, 0)
-        lunar = solar.getLunar()
-        eight_char = lunar.getEightChar()
-
-        # 年・月・日の干支を取得
-        year_stem = eight_char.getYearGan()  # 年干
-        year_branch = eight_char.getYearZhi()  # 年支
-        month_stem = eight_char.getMonthGan()  # 月干
-        month_branch = eight_char.getMonthZhi()  # 月支
-        day_stem = eight_char.getDayGan()  # 日干
-        day_branch = eight_char.getDayZhi()  # 日支
-
-        # 吉凶レベルを計算（ユーザーの日干を基準に判定）
-        from app.services.fortune_analyzer import FortuneAnalyzer
-
-        fortune_analyzer = FortuneAnalyzer()
-
-        # 年運の吉凶レベル（ユーザーの日干 vs 今年の年干）
-        year_tengan_level = fortune_analyzer.tengan_matrix.get(user_day_stem, {}).get(year_stem, "平")
-        year_fortune_level = year_tengan_level
-
-        # 月運の吉凶レベル（ユーザーの日干 vs 今月の月干）
-        month_tengan_level = fortune_analyzer.tengan_matrix.get(user_day_stem, {}).get(month_stem, "平")
-        month_fortune_level = month_tengan_level
-
-        # 日運の吉凶レベル（ユーザーの日干 vs 今日の日干）
-        day_tengan_level = fortune_analyzer.tengan_matrix.get(user_day_stem, {}).get(day_stem, "平")
-        day_fortune_level = day_tengan_level
-
-        # FortuneDetailを構築
-        year_fortune = FortuneDetail(
-            stem=year_stem,
-            branch=year_branch,
-            fortuneLevel=year_fortune_level,
-            description="年運",
+        eight_char = solar.getLunar().getEightChar()
+        year, month, day = (
+            Ganzhi.from_str(eight_char.getYear()),
+            Ganzhi.from_str(eight_char.getMonth()),
+            Ganzhi.from_str(eight_char.getDay()),
         )
 
-        month_fortune = FortuneDetail(
-            stem=month_stem,
-            branch=month_branch,
-            fortuneLevel=month_fortune_level,
-            description="月運",
-        )
+        # 吉凶レベル（ユーザーの日干 vs 年干・月干・日干、5段階縮約）と十神を計算
+        def build_detail(pillar: Ganzhi, description: str) -> FortuneDetail:
+            level = LEVELS[COLLAPSE_5[TENGAN_FLAT[user_day.stem * 10 + pillar.stem]]]
+            return FortuneDetail(
+                stem=pillar.stem_char,
+                branch=pillar.branch_char,
+                fortuneLevel=level,
+                description=description,
+                sipsin=stem_sipsin(user_day.stem, pillar.stem),
+                branchSipsin=branch_sipsin(user_day.stem, pillar.branch),
+            )
 
-        day_fortune = FortuneDetail(
-            stem=day_stem,
-            branch=day_branch,
-            fortuneLevel=day_fortune_level,
-            description="日運",
-        )
+        year_fortune = build_detail(year, "年運")
+        month_fortune = build_detail(month, "月運")
+        day_fortune = build_detail(day, "日運")
 
         return CurrentFortuneResponse(
             date=today_str,
@@ -666,18 +1258,20 @@ async def get_saju_detail(id: str, db: Session = Depends(get_db)):
     """
     try:
         # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+        saju_db = get_saju_by_id(db, id)
 
         if not saju_db:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="命式が見つかりません")
 
         # 吉凶レベルを文字列に変換
-        fortune_level_reverse_map = {1: "大凶", 2: "凶", 3: "平", 4: "吉凶", 5: "吉", 6: "小吉", 7: "大吉"}
-        fortune_level_str = fortune_level_reverse_map.get(saju_db.fortune_level, "平")
+        fortune_level_str = FORTUNE_LEVEL_NAMES.get(saju_db.fortune_level, "平")
+
+        # サーバーが書いた大運リスト（analyzer_versionあり）は検証せずにJSONのまま埋め込む
+        trusted = saju_db.daeun_list is not None and saju_db.analyzer_version is not None
 
         # daeunListをJSONから復元
         daeun_list = []
-        if saju_db.daeun_list:
+        if saju_db.daeun_list and not trusted:
             daeun_list_data = json.loads(saju_db.daeun_list)
             daeun_list = [DaeunInfo(**d) for d in daeun_list_data]
 
@@ -697,9 +1291,16 @@ async def get_saju_detail(id: str, db: Session = Depends(get_db)):
             hourBranch=saju_db.hour_branch,
             daeunList=daeun_list,
             fortuneLevel=fortune_level_str,
+            birthTimePolicy=stored_birth_time_policy(saju_db),
             createdAt=convert_db_datetime_to_kst_iso(saju_db.created_at),
         )
 
+        if trusted:
+            return RawJSONResponse(
+                splice_json(
+                    response.model_dump(exclude={"daeunList"}), "daeunList", saju_db.daeun_list
+                )
+            )
         return response
 
     except HTTPException:
@@ -733,12 +1334,13 @@ async def update_saju(
     指定された命式IDのデータを更新
     認証必須、自分の命式のみ更新可能
 
-    生年月日時・性別が変更された場合は四柱推命を自動で再計算
+    生年月日時・性別・出生時刻ポリシーが変更された場合は四柱推命を自動で再計算
+    （出生時刻ポリシーはリクエストで指定しなかった項目を保存済みの値から引き継ぐ）
     名前のみ変更の場合は再計算不要
     """
     try:
         # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+        saju_db = get_saju_by_id(db, id)
 
         # 存在チェック
         if not saju_db:
@@ -754,22 +1356,27 @@ async def update_saju(
                 detail="この命式にアクセスする権限がありません"
             )
 
-        # 新しい生年月日時をdatetimeオブジェクトに変換
-        new_birth_datetime = datetime.fromisoformat(update_data.birthDatetime.replace("Z", "+00:00"))
+        # 新しい生年月日時をdatetimeオブジェクトに変換（/calculateと同じ形にそろえる）
+        new_birth_datetime, policy = get_birth_time_policy(
+            update_data, saju_db.birth_time_policy
+        ).canonical(datetime.fromisoformat(update_data.birthDatetime.replace("Z", "+00:00")))
 
-        # 変更検出: 生年月日時または性別が変更されたか
-        birth_datetime_changed = new_birth_datetime != saju_db.birth_datetime
+        # 変更検出: 生年月日時・性別・出生時刻ポリシーが変更されたか（保存値どうしで比べる）
+        birth_datetime_changed = convert_datetime_to_db(new_birth_datetime) != saju_db.birth_datetime
         gender_changed = update_data.gender != saju_db.gender
-        needs_recalculation = birth_datetime_changed or gender_changed
+        policy_changed = policy.stored != saju_db.birth_time_policy
+        needs_recalculation = birth_datetime_changed or gender_changed or policy_changed
 
         if needs_recalculation:
             # 四柱推命を再計算
             calculator = get_calculator()
-            result = calculator.calculate(new_birth_datetime, update_data.gender, update_data.name)
+            result = calculator.calculate(
+                new_birth_datetime, update_data.gender, update_data.name, policy=policy
+            )
 
             # 命式データを更新
             saju_db.name = update_data.name
-            saju_db.birth_datetime = new_birth_datetime
+            saju_db.birth_datetime = convert_datetime_to_db(new_birth_datetime)
             saju_db.gender = update_data.gender
             saju_db.year_stem = result["yearStem"]
             saju_db.year_branch = result["yearBranch"]
@@ -787,10 +1394,11 @@ async def update_saju(
                 daeun_list.append(DaeunInfo(**daeun))
 
             saju_db.daeun_list = json.dumps([d.model_dump() for d in daeun_list], ensure_ascii=False)
+            saju_db.analyzer_version = ANALYZER_VERSION
+            saju_db.birth_time_policy = policy.stored
 
             # 吉凶レベルを更新
-            fortune_level_map = {"大凶": 1, "凶": 2, "平": 3, "吉凶": 4, "吉": 5, "小吉": 6, "大吉": 7}
-            saju_db.fortune_level = fortune_level_map.get(result["fortuneLevel"], 3)
+            saju_db.fortune_level = FORTUNE_LEVEL_CODES.get(result["fortuneLevel"], 3)
 
         else:
             # 名前のみ変更（再計算不要）
@@ -802,10 +1410,10 @@ async def update_saju(
         # データベースに保存
         db.commit()
         db.refresh(saju_db)
+        invalidate_saju_stats(current_user.id)
 
         # 吉凶レベルを文字列に変換
-        fortune_level_reverse_map = {1: "大凶", 2: "凶", 3: "平", 4: "吉凶", 5: "吉", 6: "小吉", 7: "大吉"}
-        fortune_level_str = fortune_level_reverse_map.get(saju_db.fortune_level, "平")
+        fortune_level_str = FORTUNE_LEVEL_NAMES.get(saju_db.fortune_level, "平")
 
         # daeunListをJSONから復元
         daeun_list_data = json.loads(saju_db.daeun_list) if saju_db.daeun_list else []
@@ -827,6 +1435,7 @@ async def update_saju(
             hourBranch=saju_db.hour_branch,
             daeunList=daeun_list_response,
             fortuneLevel=fortune_level_str,
+            birthTimePolicy=stored_birth_time_policy(saju_db),
             createdAt=convert_db_datetime_to_kst_iso(saju_db.created_at),
         )
 
@@ -844,6 +1453,60 @@ async def update_saju(
         )
 
 
+# 一括削除でIDを指定できる上限件数
+BULK_DELETE_LIMIT = 100
+
+
+@router.delete(
+    "",
+    response_model=BulkDeleteResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "削除条件が不正です"},
+        401: {"model": ErrorResponse, "description": "認証が必要です"},
+    },
+)
+async def delete_sajus_bulk(
+    ids: Optional[List[str]] = Query(None, description="削除する命式ID（複数指定可、100件まで）"),
+    saju_filter: SajuFilter = Depends(get_saju_filter),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    命式一括削除エンドポイント
+
+    IDのリストまたは絞り込み条件（/search と同じクエリ、併用可）に一致する自分の命式を
+    DELETE 1文でまとめて削除する。他のユーザーの命式・存在しないIDは無視し、削除件数を返す
+    誤って全件削除しないよう、IDか絞り込み条件のどちらかは必須
+    """
+    if ids is not None and len(ids) > BULK_DELETE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"一度に指定できる命式IDは{BULK_DELETE_LIMIT}件までです",
+        )
+    if not ids and saju_filter.is_empty():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="削除する命式のIDまたは絞り込み条件を指定してください",
+        )
+
+    try:
+        deleted = delete_sajus(db, current_user.id, saju_filter, ids or None)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"削除中にエラーが発生しました: {str(e)}"
+        )
+
+    if deleted:
+        invalidate_saju_stats(current_user.id)
+    return BulkDeleteResponse(
+        success=True, deletedCount=deleted, message=f"{deleted}件の命式を削除しました"
+    )
+
+
 @router.delete(
     "/{id}",
     response_model=DeleteResponse,
@@ -864,47 +1527,11 @@ async def delete_saju(
 
     指定された命式IDのデータを削除
     認証必須、自分の命式のみ削除可能
+    所有者を条件にしたDELETE 1文で削除し、削除できなかった場合だけ404/403を判定する
     """
     try:
-        # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
-
-        # 存在チェック
-        if not saju_db:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="命式が見つかりません"
-            )
-
-        # 権限チェック（自分の命式のみ削除可能）
-        if saju_db.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="この命式にアクセスする権限がありません"
-            )
-
-        # 削除前のカウント
-        count_before = db.query(SajuModel).filter(SajuModel.user_id == current_user.id).count()
-        print(f"[DELETE] 削除前のカウント: {count_before}, 削除対象ID: {id}")
-
-        # 削除実行
-        db.delete(saju_db)
+        deleted = delete_sajus(db, current_user.id, SajuFilter(), [id])
         db.commit()
-
-        # セッションのキャッシュをクリア（削除が即座に反映されるようにする）
-        db.expire_all()
-
-        # 削除後のカウント（デバッグ用）
-        count_after = db.query(SajuModel).filter(SajuModel.user_id == current_user.id).count()
-        print(f"[DELETE] 削除後のカウント: {count_after}")
-
-        # レスポンスメッセージに削除後のカウントを含める（デバッグ用）
-        message = f"命式を削除しました（残り{count_after}件）"
-
-        return DeleteResponse(success=True, message=message)
-
-    except HTTPException:
-        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(
@@ -912,6 +1539,21 @@ async def delete_saju(
             detail=f"削除中にエラーが発生しました: {str(e)}"
         )
 
+    if not deleted:
+        # 存在しないか他のユーザーの命式
+        if db.scalar(select(SajuModel.id).where(SajuModel.id == id)) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="命式が見つかりません"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="この命式にアクセスする権限がありません"
+        )
+
+    invalidate_saju_stats(current_user.id)
+    return DeleteResponse(success=True, message="命式を削除しました")
+
 
 # ==================== 大運分析エンドポイント ====================
 
@@ -924,7 +1566,9 @@ async def delete_saju(
         404: {"model": ErrorResponse, "description": "命式が見つかりません"},
     },
 )
-async def get_daeun_analysis(id: str, db: Session = Depends(get_db)):
+async def get_daeun_analysis(
+    id: str, as_of: AsOf = Depends(get_as_of), db: Session = Depends(get_db)
+):
     """
     大運分析取得エンドポイント
 
@@ -932,25 +1576,25 @@ async def get_daeun_analysis(id: str, db: Session = Depends(get_db)):
     """
     try:
         # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+        saju_db = get_saju_by_id(db, id)
 
         if not saju_db:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="命式が見つかりません")
 
-        # daeunListをJSONから復元
-        daeun_list_data = json.loads(saju_db.daeun_list) if saju_db.daeun_list else []
-        daeun_list = [DaeunInfo(**d) for d in daeun_list_data]
+        # daeunListをJSONから復元（サーバーが書いた大運リストは検証しない）
+        daeun_list_data = orjson.loads(saju_db.daeun_list) if saju_db.daeun_list else []
+        trusted = saju_db.analyzer_version is not None
+        daeun_list = daeun_list_data if trusted else [DaeunInfo(**d) for d in daeun_list_data]
 
-        # 現在の年齢を計算
-        birth_datetime = saju_db.birth_datetime
-        today = datetime.now()
-        current_age = today.year - birth_datetime.year
-        if (today.month, today.day) < (birth_datetime.month, birth_datetime.day):
-            current_age -= 1
+        # 基準日時点の年齢を計算
+        current_age = as_of.age_of(saju_db.birth_datetime)
 
         # 各大運にisCurrentフラグを設定
         for daeun in daeun_list:
-            daeun.isCurrent = daeun.startAge <= current_age <= daeun.endAge
+            if trusted:
+                daeun["isCurrent"] = daeun["startAge"] <= current_age <= daeun["endAge"]
+            else:
+                daeun.isCurrent = daeun.startAge <= current_age <= daeun.endAge
 
         # 大運計算情報を取得（calculate時に保存されているはず）
         # TODO: DBに保存されていない場合は再計算が必要
@@ -969,9 +1613,13 @@ async def get_daeun_analysis(id: str, db: Session = Depends(get_db)):
             ),
             firstDaeunDate=first_daeun_date,
             currentAge=current_age,
-            daeunList=daeun_list,
+            daeunList=[] if trusted else daeun_list,
         )
 
+        if trusted:
+            content = response.model_dump()
+            content["daeunList"] = daeun_list
+            return ORJSONResponse(content)
         return response
 
     except HTTPException:
@@ -991,7 +1639,9 @@ async def get_daeun_analysis(id: str, db: Session = Depends(get_db)):
         404: {"model": ErrorResponse, "description": "命式が見つかりません"},
     },
 )
-async def get_current_fortune(id: str, date: str = None, db: Session = Depends(get_db)):
+async def get_current_fortune(
+    id: str, date: str = None, as_of: AsOf = Depends(get_as_of), db: Session = Depends(get_db)
+):
     """
     現在の運勢取得エンドポイント
 
@@ -999,13 +1649,13 @@ async def get_current_fortune(id: str, date: str = None, db: Session = Depends(g
     """
     try:
         # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+        saju_db = get_saju_by_id(db, id)
 
         if not saju_db:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="命式が見つかりません")
 
-        # 対象日付（省略時は今日）
-        target_date = datetime.fromisoformat(date) if date else datetime.now()
+        # 対象日付（省略時は基準日）
+        target_date = datetime.fromisoformat(date) if date else as_of.now
 
         # 年月日運計算エンジン
         fortune_calc = get_fortune_calculator()
@@ -1044,6 +1694,11 @@ async def get_current_fortune(id: str, date: str = None, db: Session = Depends(g
         )
         month_sipsin = fortune_calc._calculate_sipsin(saju_db.day_stem, month_stem)
 
+        # 地支の十神（蔵干本気）
+        year_branch_sipsin = branch_sipsin_of(saju_db.day_stem, year_branch)
+        month_branch_sipsin = branch_sipsin_of(saju_db.day_stem, month_branch)
+        day_branch_sipsin = branch_sipsin_of(saju_db.day_stem, day_branch)
+
         # 五行要素を取得
         year_element = fortune_calc.get_element_from_stem(year_stem)
         month_element = fortune_calc.get_element_from_stem(month_stem)
@@ -1057,6 +1712,8 @@ async def get_current_fortune(id: str, date: str = None, db: Session = Depends(g
                 fortuneLevel=year_fortune_level,
                 description=f"{year_stem}{year_branch}年の運勢",
                 element=year_element,
+                sipsin=year_sipsin,
+                branchSipsin=year_branch_sipsin,
             ),
             monthFortune=FortuneDetail(
                 stem=month_stem,
@@ -1064,6 +1721,8 @@ async def get_current_fortune(id: str, date: str = None, db: Session = Depends(g
                 fortuneLevel=month_fortune_level,
                 description=f"{month_stem}{month_branch}月の運勢",
                 element=month_element,
+                sipsin=month_sipsin,
+                branchSipsin=month_branch_sipsin,
             ),
             dayFortune=FortuneDetail(
                 stem=day_stem,
@@ -1071,6 +1730,8 @@ async def get_current_fortune(id: str, date: str = None, db: Session = Depends(g
                 fortuneLevel=day_fortune_level,
                 description=f"{day_stem}{day_branch}日の運勢",
                 element=day_element,
+                sipsin=day_sipsin,
+                branchSipsin=day_branch_sipsin,
             ),
         )
 
@@ -1093,15 +1754,22 @@ async def get_current_fortune(id: str, date: str = None, db: Session = Depends(g
         404: {"model": ErrorResponse, "description": "命式が見つかりません"},
     },
 )
-async def get_year_fortune_list(id: str, daeun_start_age: int, db: Session = Depends(get_db)):
+async def get_year_fortune_list(
+    id: str,
+    daeun_start_age: int,
+    as_of: AsOf = Depends(get_as_of),
+    shape: ListShape = Depends(list_shape(YearFortuneInfo)),
+    db: Session = Depends(get_db),
+):
     """
     年運リスト取得エンドポイント
 
     指定された大運期間（10年分）の年運リストを取得
+    ?fields=・?format=columnar に対応
     """
     try:
         # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+        saju_db = get_saju_by_id(db, id)
 
         if not saju_db:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="命式が見つかりません")
@@ -1119,6 +1787,7 @@ async def get_year_fortune_list(id: str, daeun_start_age: int, db: Session = Dep
             birth_datetime.day,
             saju_db.day_stem,
             daeun_start_age,
+            as_of=as_of,
         )
 
         # YearFortuneInfoに変換
@@ -1133,7 +1802,7 @@ async def get_year_fortune_list(id: str, daeun_start_age: int, db: Session = Dep
             years=year_list,
         )
 
-        return response
+        return shaped(response, "years", shape)
 
     except HTTPException:
         raise
@@ -1152,15 +1821,22 @@ async def get_year_fortune_list(id: str, daeun_start_age: int, db: Session = Dep
         404: {"model": ErrorResponse, "description": "命式が見つかりません"},
     },
 )
-async def get_month_fortune_list(id: str, year: int, db: Session = Depends(get_db)):
+async def get_month_fortune_list(
+    id: str,
+    year: int,
+    as_of: AsOf = Depends(get_as_of),
+    shape: ListShape = Depends(list_shape(MonthFortuneInfo)),
+    db: Session = Depends(get_db),
+):
     """
     月運リスト取得エンドポイント
 
     指定された年の月運リスト（12ヶ月分）を取得
+    ?fields=・?format=columnar に対応
     """
     try:
         # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+        saju_db = get_saju_by_id(db, id)
 
         if not saju_db:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="命式が見つかりません")
@@ -1172,6 +1848,7 @@ async def get_month_fortune_list(id: str, year: int, db: Session = Depends(get_d
         month_list_data = fortune_calc.calculate_month_list(
             saju_db.day_stem,
             year,
+            as_of=as_of,
         )
 
         # MonthFortuneInfoに変換
@@ -1182,7 +1859,7 @@ async def get_month_fortune_list(id: str, year: int, db: Session = Depends(get_d
             months=month_list,
         )
 
-        return response
+        return shaped(response, "months", shape)
 
     except HTTPException:
         raise
@@ -1202,11 +1879,19 @@ async def get_month_fortune_list(id: str, year: int, db: Session = Depends(get_d
         404: {"model": ErrorResponse, "description": "命式が見つかりません"},
     },
 )
-async def get_day_fortune_list(id: str, year: int, month: int, db: Session = Depends(get_db)):
+async def get_day_fortune_list(
+    id: str,
+    year: int,
+    month: int,
+    as_of: AsOf = Depends(get_as_of),
+    shape: ListShape = Depends(list_shape(DayFortuneInfo)),
+    db: Session = Depends(get_db),
+):
     """
     日運リスト取得エンドポイント
 
     指定された年月の日運リスト（28-31日分）を取得
+    ?fields=・?format=columnar に対応
     """
     try:
         # 月のバリデーション
@@ -1214,7 +1899,7 @@ async def get_day_fortune_list(id: str, year: int, month: int, db: Session = Dep
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="不正な年月指定です")
 
         # DBから命式を取得
-        saju_db = db.query(SajuModel).filter(SajuModel.id == id).first()
+        saju_db = get_saju_by_id(db, id)
 
         if not saju_db:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="命式が見つかりません")
@@ -1222,33 +1907,254 @@ async def get_day_fortune_list(id: str, year: int, month: int, db: Session = Dep
         # 年月日運計算エンジン
         fortune_calc = get_fortune_calculator()
 
-        # 日運リストを計算（28-31日分）
-        day_list_data = fortune_calc.calculate_day_list(
+        # 日運を計算（28-31日分）し、タプルからそのままJSONにする（モデルの検証を通さない）
+        day_rows = fortune_calc.calculate_day_rows(
             saju_db.day_stem,
             year,
             month,
+            as_of=as_of,
         )
+        day_list = [
+            {
+                "id": day,
+                "sajuId": id,
+                "year": year,
+                "month": month,
+                "day": day,
+                "dayStem": stem,
+                "dayBranch": branch,
+                "sipsin": sipsin,
+                "fortuneLevel": level,
+                "isToday": is_today,
+            }
+            for day, stem, branch, level, sipsin, is_today in day_rows
+        ]
 
-        # DayFortuneInfoに変換
-        day_list = [DayFortuneInfo(sajuId=id, **day) for day in day_list_data]
+        content = {"year": year, "month": month, "days": day_list}
+        return ORJSONResponse(content if shape.is_default else shape.apply(content, "days"))
 
-        response = DayFortuneListResponse(
-            year=year,
-            month=month,
-            days=day_list,
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"日運リスト取得中にエラーが発生しました: {str(e)}",
         )
 
-        return response
+
+@router.get(
+    "/{id}/timeline",
+    response_model=TimelineResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "不正な期間指定です"},
+        404: {"model": ErrorResponse, "description": "命式が見つかりません"},
+    },
+)
+async def get_timeline(
+    id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    as_of: AsOf = Depends(get_as_of),
+    db: Session = Depends(get_db),
+):
+    """
+    タイムライン取得エンドポイント
+
+    指定された命式IDの大運→年運→月運をまとめて取得（大運ごとに逐次送信）
+    - start / end: 期間（YYYY-MM-DD、月単位で判定）。省略時は全大運
+    """
+    try:
+        try:
+            start_date = date.fromisoformat(start) if start else None
+            end_date = date.fromisoformat(end) if end else None
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="不正な期間指定です",
+            )
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="不正な期間指定です",
+            )
+
+        # DBから命式を取得
+        saju_db = get_saju_by_id(db, id)
+
+        if not saju_db:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="命式が見つかりません",
+            )
+
+        daeun_list_data = json.loads(saju_db.daeun_list) if saju_db.daeun_list else []
+        birth_datetime = saju_db.birth_datetime
+        timeline = get_fortune_calculator().iter_timeline(
+            birth_datetime,
+            saju_db.day_stem,
+            daeun_list_data,
+            as_of=as_of,
+            start=start_date,
+            end=end_date,
+        )
+        head = {"sajuId": id, "currentAge": as_of.age_of(birth_datetime)}
+
+        def stream():
+            yield orjson.dumps(head)[:-1] + b',"daeunList":['
+            for i, daeun in enumerate(timeline):
+                daeun["sajuId"] = id
+                for year in daeun["years"]:
+                    year["sajuId"] = id
+                    for month in year["months"]:
+                        month["sajuId"] = id
+                yield (b"," if i else b"") + orjson.dumps(daeun)
+            yield b"]}"
+
+        return StreamingResponse(stream(), media_type="application/json")
 
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"日運リスト取得中にエラーが発生しました: {str(e)}",
+            detail=f"タイムライン取得中にエラーが発生しました: {str(e)}",
         )
 
 
+# ==================== 相性検索エンドポイント ====================
+
+
+@router.get(
+    "/{id}/matches",
+    response_model=MatchListResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        400: {"model": ErrorResponse, "description": "バリデーションエラー"},
+        403: {"model": ErrorResponse, "description": "権限がありません"},
+        404: {"model": ErrorResponse, "description": "命式が見つかりません"},
+    },
+)
+async def get_matches(
+    id: str,
+    k: int = 10,
+    scope: str = "account",
+    as_of: AsOf = Depends(get_as_of),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    相性検索エンドポイント
+
+    指定された命式と相性の良い異性の命式を上位k件取得
+    - scope=account: ログインユーザーの命式から検索
+    - scope=all: 全ユーザーの命式から検索（管理者のみ）
+    点数は本人視点と相手視点の合計で順位付けする
+    """
+    try:
+        if scope not in ("account", "all"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="scopeはaccountまたはallを指定してください",
+            )
+        is_admin = current_user.role == "admin"
+        if scope == "all" and not is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="全体検索は管理者のみ利用できます",
+            )
+
+        # バリデーション
+        if k > 100:
+            k = 100
+        if k < 1:
+            k = 1
+
+        saju_db = get_saju_by_id(db, id)
+        if not saju_db or (saju_db.user_id != current_user.id and not is_admin):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="命式が見つかりません",
+            )
+
+        query_chart = (
+            Ganzhi.from_chars(saju_db.day_stem, saju_db.day_branch),
+            Ganzhi.from_chars(saju_db.month_stem, saju_db.month_branch),
+            Ganzhi.from_chars(saju_db.hour_stem, saju_db.hour_branch),
+            _current_daeun(saju_db.birth_datetime, saju_db.daeun_list, as_of),
+        )
+        is_male = saju_db.gender == "male"
+
+        indexes = get_match_index(db, None if scope == "all" else current_user.id, as_of)
+        index = indexes["female" if is_male else "male"]
+        results = index.top_k(query_chart, k, query_is_male=is_male, exclude=saju_db.id)
+
+        # 上位k件のみ詳細を取得
+        rows = {
+            row.id: row
+            for row in db.query(SajuModel).filter(SajuModel.id.in_([r.chart_id for r in results]))
+        }
+
+        matches = []
+        for result in results:
+            row = rows.get(result.chart_id)
+            if row is None:
+                continue
+            matches.append(
+                MatchInfo(
+                    id=row.id,
+                    name=row.name,
+                    birthDatetime=convert_db_datetime_to_kst_iso(row.birth_datetime),
+                    gender=row.gender,
+                    dayStem=row.day_stem,
+                    dayBranch=row.day_branch,
+                    totalScore=result.total,
+                    score=result.score,
+                    partnerScore=result.partner_score,
+                    details=result.details,
+                    partnerDetails=result.partner_details,
+                )
+            )
+
+        return MatchListResponse(
+            sajuId=saju_db.id, scope=scope, candidates=len(index), matches=matches
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"相性検索中にエラーが発生しました: {str(e)}",
+        )
+
+
+# ==================== キャッシュ統計エンドポイント ====================
+
+
+@router.get(
+    "/cache/stats",
+    response_model=ChartCacheStatsResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        403: {"model": ErrorResponse, "description": "権限がありません"},
+    },
+)
+async def get_chart_cache_stats(current_user: User = Depends(get_current_user)):
+    """
+    命式計算結果キャッシュの統計取得エンドポイント（管理者のみ）
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="管理者のみ利用できます")
+
+    cache = get_calculator().cache
+    if cache is None:
+        return ChartCacheStatsResponse(
+            size=0, maxsize=0, hits=0, storeHits=0, misses=0, hitRate=0.0
+        )
+    return ChartCacheStatsResponse(**cache.stats())
+
+
 # ==================== データ移行エンドポイント ====================
 
 
@@ -1288,31 +2194,20 @@ async def migrate_guest_data(
                 message="一度に移行できるデータは100件までです",
             )
 
-        # 吉凶レベルを数値に変換
-        fortune_level_map = {"大凶": 1, "凶": 2, "平": 3, "吉": 4, "大吉": 5}
-
         # 重複チェック（birth_datetime + gender の組み合わせ）
         existing_data_query = (
             db.query(SajuModel.birth_datetime, SajuModel.gender)
             .filter(SajuModel.user_id == current_user.id)
             .all()
         )
-        # タイムスタンプを文字列化して比較（タイムゾーン情報を正規化）
-        existing_keys = set()
-        for row in existing_data_query:
-            # タイムゾーン情報がない場合はそのまま、ある場合はUTCに変換
-            dt = row[0]
-            if dt.tzinfo is None:
-                normalized_dt = dt.isoformat()
-            else:
-                normalized_dt = dt.replace(tzinfo=None).isoformat()
-            existing_keys.add((normalized_dt, row[1]))
+        # 保存値（naive、UTC）どうしで比較
+        existing_keys = {(row[0], row[1]) for row in existing_data_query}
 
         # 重複していないデータのみフィルタリング
         unique_data = []
         for saju in migrate_data.guestData:
             birth_datetime = datetime.fromisoformat(saju.birthDatetime.replace("Z", "+00:00"))
-            key = (birth_datetime.replace(tzinfo=None).isoformat(), saju.gender)
+            key = (convert_datetime_to_db(birth_datetime), saju.gender)
             if key not in existing_keys:
                 unique_data.append(saju)
 
@@ -1333,7 +2228,7 @@ async def migrate_guest_data(
             birth_datetime = datetime.fromisoformat(saju.birthDatetime.replace("Z", "+00:00"))
 
             # 吉凶レベルを数値に変換
-            fortune_level_int = fortune_level_map.get(saju.fortuneLevel, 3)
+            fortune_level_int = FORTUNE_LEVEL_CODES.get(saju.fortuneLevel, 3)
 
             # daeunListのsajuIdを新しいIDに更新
             daeun_list_updated = []
@@ -1350,7 +2245,7 @@ async def migrate_guest_data(
                 id=new_id,
                 user_id=current_user.id,  # ログインユーザーに紐付け
                 name=saju.name,
-                birth_datetime=birth_datetime,
+                birth_datetime=convert_datetime_to_db(birth_datetime),
                 gender=saju.gender,
                 year_stem=saju.yearStem,
                 year_branch=saju.yearBranch,
@@ -1362,6 +2257,7 @@ async def migrate_guest_data(
                 hour_branch=saju.hourBranch,
                 daeun_list=daeun_list_json,
                 fortune_level=fortune_level_int,
+                birth_time_policy=BirthTimePolicy.from_fields(saju.birthTimePolicy).stored,
             )
 
             db.add(db_saju)
@@ -1369,6 +2265,7 @@ async def migrate_guest_data(
 
         # 全てのデータをコミット
         db.commit()
+        invalidate_saju_stats(current_user.id)
 
         return MigrateResponse(
             success=True,
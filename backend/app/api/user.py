@@ -10,8 +10,9 @@ from sqlalchemy.orm import Session
 from app.api.auth import get_current_user, security
 from app.core.auth import get_password_hash, verify_password
 from app.db.session import get_db
-from app.models import RefreshToken, User
+from app.models import User
 from app.schemas.user import PasswordChangeRequest, UpdateResponse, UserSettingsRequest
+from app.services.refresh_tokens import revoke_user_tokens
 
 router = APIRouter(prefix="/api/user", tags=["user"])
 
@@ -72,10 +73,7 @@ async def change_password(
     db.commit()
 
     # セキュリティ強化: 全てのリフレッシュトークンを無効化（再ログイン必須）
-    db.query(RefreshToken).filter(RefreshToken.user_id == current_user.id).update(
-        {"is_revoked": True}
-    )
-    db.commit()
+    revoke_user_tokens(db, current_user.id)
 
     return UpdateResponse(success=True, message="パスワードを変更しました")
 
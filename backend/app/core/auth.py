@@ -2,6 +2,7 @@
 JWT認証ユーティリティ
 トークン生成・検証・パスワードハッシュ化
 """
+import hashlib
 import secrets
 from datetime import datetime, timedelta
 from typing import Optional
@@ -68,6 +69,19 @@ def create_refresh_token() -> str:
     return secrets.token_urlsafe(32)
 
 
+def hash_refresh_token(token: str) -> str:
+    """
+    リフレッシュトークンのハッシュ（DBには平文ではなくこの値を保存する）
+
+    Args:
+        token: リフレッシュトークン文字列
+
+    Returns:
+        SHA-256の16進文字列
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """
     アクセストークン検証・デコード
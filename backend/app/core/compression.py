@@ -0,0 +1,196 @@
+"""
+レスポンス圧縮ミドルウェア（brotli / gzip）
+
+- Accept-Encodingを見てbrotli（brotliパッケージがある場合）→ gzip の順に選ぶ
+- minimum_size未満のレスポンス・Content-Encoding付きのレスポンスは圧縮しない
+- ストリーミングレスポンスはチャンクごとにフラッシュして送る
+"""
+import zlib
+from typing import Dict, Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # 任意の依存（無ければgzipのみ）
+    brotli = None
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """
+    Accept-Encodingヘッダーを符号化方式 → q値に変換
+
+    Args:
+        value: ヘッダーの値（例: "gzip, br;q=0.9"）
+
+    Returns:
+        符号化方式（小文字）→ q値
+    """
+    encodings: Dict[str, float] = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+class _Encoder(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self, data: bytes = b"") -> bytes: ...
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        chunk: bytes = self._compressor.process(data) + self._compressor.flush()
+        return chunk
+
+    def finish(self, data: bytes = b"") -> bytes:
+        chunk: bytes = self._compressor.process(data) + self._compressor.finish()
+        return chunk
+
+
+class CompressionMiddleware:
+    """
+    レスポンス圧縮ミドルウェア
+
+    Args:
+        app: ASGIアプリ
+        minimum_size: 圧縮する最小バイト数（単一ボディのレスポンスのみ判定）
+        gzip_level: gzipの圧縮レベル（1-9）
+        brotli_quality: brotliの品質（0-11）
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def select_encoding(self, accept_encoding: str) -> Optional[str]:
+        """
+        使う符号化方式を選ぶ
+
+        Args:
+            accept_encoding: Accept-Encodingヘッダーの値
+
+        Returns:
+            "br" / "gzip"（どちらも使えなければNone）
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        if brotli is not None and accepted.get("br", wildcard) > 0:
+            return "br"
+        if accepted.get("gzip", wildcard) > 0:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = self.select_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+            if encoding is not None:
+                encoder: _Encoder
+                if encoding == "br":
+                    encoder = _BrotliEncoder(self.brotli_quality)
+                else:
+                    encoder = _GzipEncoder(self.gzip_level)
+                responder = _CompressionResponder(self.app, encoding, encoder, self.minimum_size)
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+async def _unattached_send(message: Message) -> None:
+    raise RuntimeError("send awaitable not set")
+
+
+class _CompressionResponder:
+    """1リクエスト分の圧縮（StarletteのGZipResponderと同じ手順）"""
+
+    def __init__(self, app: ASGIApp, encoding: str, encoder: _Encoder, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.send: Send = _unattached_send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    def _set_headers(self, content_length: Optional[int]) -> None:
+        headers = MutableHeaders(raw=self.initial_message["headers"])
+        headers["Content-Encoding"] = self.encoding
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        headers.add_vary_header("Accept-Encoding")
+
+    async def send_compressed(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # ヘッダーはボディの大きさを見てから送る
+            self.initial_message = message
+            self.passthrough = "content-encoding" in Headers(raw=message["headers"])
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.passthrough:
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            await self.send(message)
+        elif not self.started:
+            self.started = True
+            if not more_body and len(body) < self.minimum_size:
+                await self.send(self.initial_message)
+                await self.send(message)
+            elif not more_body:
+                message["body"] = self.encoder.finish(body)
+                self._set_headers(len(message["body"]))
+                await self.send(self.initial_message)
+                await self.send(message)
+            else:
+                message["body"] = self.encoder.compress(body)
+                self._set_headers(None)
+                await self.send(self.initial_message)
+                await self.send(message)
+        else:
+            message["body"] = (
+                self.encoder.compress(body) if more_body else self.encoder.finish(body)
+            )
+            await self.send(message)
@@ -16,6 +16,12 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # リフレッシュトークン（ユーザーごとの有効数の上限、失効後に再利用検知用に残す時間、
+    # 期限切れの削除）
+    REFRESH_TOKEN_MAX_PER_USER: int = 10
+    REFRESH_TOKEN_REVOKED_RETENTION_HOURS: int = 24
+    REFRESH_TOKEN_SWEEP_BATCH: int = 1000
+    REFRESH_TOKEN_SWEEP_INTERVAL_MINUTES: int = 60  # 0なら定期削除しない
 
     # アプリケーション（全て環境変数から取得、デフォルト値なし）
     BACKEND_URL: str
@@ -26,6 +32,44 @@ class Settings(BaseSettings):
     SOLAR_TERMS_DB_PATH: str = "./solar_terms_1900_2109_JIEQI_ONLY.json"
     DONSAGONG_MASTER_DB_PATH: str = "./docs/DONSAGONG_MASTER_DATABASE.md"
 
+    # 命式計算結果キャッシュ（DBパスが空ならプロセス内LRUのみ）
+    CHART_CACHE_SIZE: int = 4096
+    CHART_CACHE_DB_PATH: str = ""
+
+    # ゲスト命式（/calculate の persist 省略時に保存するか、書き込み遅延キュー、期限切れの削除）
+    # フロントエンドはゲストの計算を persist=true で送る（詳細画面がサーバーの行を引くため。
+    # 同じ入力の計算し直しは保存済みの命式を再利用する）。
+    # 書き込み遅延キュー（GUEST_WRITE_BEHIND）はまとめてINSERTするが、別プロセスからは書き込みが
+    # 最大INTERVAL秒見えないため既定では無効。有効にする場合、書き込み待ちの行はIDで引く
+    # （get_saju_by_id）・保存する（/save）前にflushするので、同じプロセス内では書いた直後に読める。
+    # 複数プロセス・複数インスタンスではセッションアフィニティを付ける
+    GUEST_PERSIST_DEFAULT: bool = False
+    GUEST_WRITE_BEHIND: bool = False
+    GUEST_WRITE_BEHIND_BATCH: int = 100
+    GUEST_WRITE_BEHIND_INTERVAL_SECONDS: float = 1.0
+    GUEST_TTL_DAYS: int = 30
+    GUEST_PURGE_BATCH: int = 500
+    GUEST_PURGE_INTERVAL_MINUTES: int = 60  # 0なら定期削除しない
+
+    # バックグラウンドジョブ（非同期ワーカー数、CPU処理のプロセス数、1チャンクの件数）
+    JOB_WORKERS: int = 2
+    JOB_CPU_WORKERS: int = 2  # 0ならジョブのスレッド内で処理
+    JOB_CHUNK_SIZE: int = 200
+
+    # Idempotency-Key（/api/saju/save）の記録の有効期間と定期削除
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+    IDEMPOTENCY_KEY_PURGE_BATCH: int = 1000
+    IDEMPOTENCY_KEY_PURGE_INTERVAL_MINUTES: int = 60  # 0なら定期削除しない
+
+    # 命式集計（/api/saju/stats）のキャッシュ（保存・更新・削除で破棄）
+    SAJU_STATS_CACHE: bool = True
+
+    # レスポンス圧縮（brotliはbrotliパッケージがある場合のみ。最小バイト数0なら全て圧縮）
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+
     model_config = SettingsConfigDict(
         env_file="../.env.local",  # backend/から見た相対パス
         env_file_encoding="utf-8",
@@ -0,0 +1,76 @@
+"""
+JSONレスポンスユーティリティ（orjson）
+
+- アプリ全体の既定レスポンスはORJSONResponse（app/main.py）
+- 保存済みのJSON文字列（大運リストなど）は読み直さずにレスポンスへ埋め込める
+- リストAPIの軽量表示（?fields= の項目絞り込み・?format=columnar の列形式）
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple, Union
+
+import orjson
+from fastapi.responses import Response
+
+
+class RawJSONResponse(Response):
+    """シリアライズ済みのJSONバイト列をそのまま返すレスポンス"""
+
+    media_type = "application/json"
+
+
+def splice_json(payload: Dict[str, Any], key: str, raw: Union[str, bytes]) -> bytes:
+    """
+    辞書をJSONにして、シリアライズ済みのJSONを1項目として末尾に埋め込む
+
+    Args:
+        payload: 埋め込み先（keyを含まないこと）
+        key: 埋め込む項目名
+        raw: シリアライズ済みのJSON（検証しないため、サーバーが書いたものに限る）
+
+    Returns:
+        JSONバイト列
+    """
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    body = orjson.dumps(payload)
+    separator = b"," if len(body) > 2 else b""
+    return body[:-1] + separator + orjson.dumps(key) + b":" + raw + b"}"
+
+
+@dataclass(frozen=True)
+class ListShape:
+    """
+    リストAPIのレスポンス形（app/api/saju.pyのlist_shapeで作る）
+
+    - fields: 各要素に残す項目（Noneなら全項目）
+    - columnar: Trueなら要素を配列にし、項目名を"columns"に1度だけ入れる
+    """
+
+    fields: Optional[Tuple[str, ...]] = None
+    columnar: bool = False
+
+    @property
+    def is_default(self) -> bool:
+        """通常の形（変換不要）かどうか"""
+        return self.fields is None and not self.columnar
+
+    def apply(self, content: Dict[str, Any], key: str) -> Dict[str, Any]:
+        """
+        レスポンスのリスト項目を変換
+
+        Args:
+            content: レスポンスの辞書（変更しない）
+            key: リストの項目名
+
+        Returns:
+            変換後のレスポンスの辞書
+        """
+        items = content[key]
+        fields = self.fields or (tuple(items[0]) if items else ())
+        content = dict(content)
+        if self.columnar:
+            content["columns"] = list(fields)
+            content[key] = [[item[field] for field in fields] for item in items]
+        else:
+            content[key] = [{field: item[field] for field in fields} for item in items]
+        return content
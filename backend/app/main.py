@@ -1,13 +1,16 @@
 """
 FastAPI メインアプリケーション
 """
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from app.api import auth, saju, user
+from app.api import auth, jobs, saju, user
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -35,18 +38,73 @@ async def lifespan(app: FastAPI):
         print(f"❌ 初期化エラー: {e}")
         raise
 
+    # ゲスト命式の書き込み遅延キューと期限切れの定期削除、
+    # 期限切れリフレッシュトークン・Idempotency-Keyの定期削除
+    from app.api.saju import get_guest_writer
+    from app.db.session import SessionLocal
+    from app.services.guest_store import run_guest_purge
+    from app.services.idempotency import run_idempotency_key_purge
+    from app.services.refresh_tokens import run_refresh_token_sweeper
+
+    guest_writer = get_guest_writer()
+    if guest_writer is not None:
+        guest_writer.start()
+    purge_task = None
+    if settings.GUEST_PURGE_INTERVAL_MINUTES > 0:
+        purge_task = asyncio.create_task(
+            run_guest_purge(
+                SessionLocal,
+                ttl_days=settings.GUEST_TTL_DAYS,
+                batch_size=settings.GUEST_PURGE_BATCH,
+                interval_seconds=settings.GUEST_PURGE_INTERVAL_MINUTES * 60,
+            )
+        )
+    sweep_task = None
+    if settings.REFRESH_TOKEN_SWEEP_INTERVAL_MINUTES > 0:
+        sweep_task = asyncio.create_task(
+            run_refresh_token_sweeper(
+                SessionLocal,
+                batch_size=settings.REFRESH_TOKEN_SWEEP_BATCH,
+                interval_seconds=settings.REFRESH_TOKEN_SWEEP_INTERVAL_MINUTES * 60,
+            )
+        )
+    idempotency_task = None
+    if settings.IDEMPOTENCY_KEY_PURGE_INTERVAL_MINUTES > 0:
+        idempotency_task = asyncio.create_task(
+            run_idempotency_key_purge(
+                SessionLocal,
+                ttl_hours=settings.IDEMPOTENCY_KEY_TTL_HOURS,
+                batch_size=settings.IDEMPOTENCY_KEY_PURGE_BATCH,
+                interval_seconds=settings.IDEMPOTENCY_KEY_PURGE_INTERVAL_MINUTES * 60,
+            )
+        )
+
+    # バックグラウンドジョブのワーカー
+    job_queue = jobs.get_job_queue()
+    await job_queue.start()
+
     yield  # アプリケーション実行中
 
     # シャットダウン
     print("👋 アプリケーションをシャットダウン中...")
-
-
-# FastAPIアプリケーション作成
+    await job_queue.stop()
+    if purge_task is not None:
+        purge_task.cancel()
+    if sweep_task is not None:
+        sweep_task.cancel()
+    if idempotency_task is not None:
+        idempotency_task.cancel()
+    if guest_writer is not None:
+        guest_writer.stop()
+
+
+# FastAPIアプリケーション作成（レスポンスのJSON変換はorjson）
 app = FastAPI(
     title="Golden Saju Fortune API",
     description="ゴールデン四柱推命アプリケーション バックエンドAPI",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS設定（環境変数から読み込み）
@@ -64,10 +122,20 @@ app.add_middleware(
     max_age=3600,
 )
 
+# レスポンス圧縮（Accept-Encodingに応じてbrotli / gzip）
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # ルーター登録
 app.include_router(auth.router)
 app.include_router(saju.router)
 app.include_router(user.router)
+app.include_router(jobs.router)
 
 
 @app.get("/")
@@ -5,7 +5,7 @@ SQLAlchemy 2.0 モデル定義
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -73,6 +73,11 @@ class Saju(Base):
 
     # 大運データ（JSON形式で保存）
     daeun_list: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # 大運の吉凶レベルを判定したロジックのバージョン
+    # （fortune_analyzer.ANALYZER_VERSION、不明ならnull）
+    analyzer_version: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # 四柱を計算した出生時刻ポリシー（BirthTimePolicy.stored のJSON、既定ポリシーならnull）
+    birth_time_policy: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # 吉凶レベル（1-5: 大凶, 凶, 平, 吉, 大吉）
     fortune_level: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -86,6 +91,24 @@ class Saju(Base):
     # リレーション
     user: Mapped[Optional["User"]] = relationship("User", back_populates="sajus")
 
+    __table_args__ = (
+        # 期限切れゲスト命式の削除用（ゲストの行だけを作成日時順に引く部分インデックス）
+        Index(
+            "ix_saju_guest_created_at",
+            "created_at",
+            postgresql_where=text("user_id IS NULL"),
+            sqlite_where=text("user_id IS NULL"),
+        ),
+        # ユーザーごとの一覧・検索用（柱は天干・地支の複合、app/services/saju_search.py）
+        Index("ix_saju_user_created_at", "user_id", "created_at"),
+        Index("ix_saju_user_birth_datetime", "user_id", "birth_datetime"),
+        Index("ix_saju_user_fortune_level", "user_id", "fortune_level"),
+        Index("ix_saju_user_year_pillar", "user_id", "year_stem", "year_branch"),
+        Index("ix_saju_user_month_pillar", "user_id", "month_stem", "month_branch"),
+        Index("ix_saju_user_day_pillar", "user_id", "day_stem", "day_branch"),
+        Index("ix_saju_user_hour_pillar", "user_id", "hour_stem", "hour_branch"),
+    )
+
 
 class RefreshToken(Base):
     """リフレッシュトークンモデル"""
@@ -94,11 +117,68 @@ class RefreshToken(Base):
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
-    token: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
-    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # SHA-256
+    token_hash: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    # 期限切れ削除用
+    expires_at: Mapped[datetime] = mapped_column(DateTime, index=True, nullable=False)
     is_revoked: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     # リレーション
     user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
+
+    __table_args__ = (
+        # ユーザーの有効なトークンの列挙・失効・件数上限の判定用
+        Index("ix_refresh_tokens_user_live", "user_id", "is_revoked", "expires_at"),
+    )
+
+
+class Job(Base):
+    """バックグラウンドジョブモデル（エクスポート・インポート・再計算など）"""
+
+    __tablename__ = "jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    user_id: Mapped[Optional[str]] = mapped_column(
+        String, ForeignKey("users.id"), index=True, nullable=True
+    )
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    # queued / running / succeeded / failed
+    status: Mapped[str] = mapped_column(String, nullable=False)
+
+    # 進捗（処理済み件数 / 全件数）
+    progress: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    checkpoint: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # 再開位置
+
+    # パラメータ・結果（JSON形式で保存）
+    params: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # 起動時に未完了ジョブを作成順に拾い直す用
+        Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Keyごとの最初のレスポンス（再送時に同じレスポンスを返す）"""
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), primary_key=True)
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    # SHA-256（メソッド・パス・ボディ）
+    request_hash: Mapped[str] = mapped_column(String, nullable=False)
+    status_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    # 期限切れの記録の削除用
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True, nullable=False
+    )
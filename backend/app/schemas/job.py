@@ -0,0 +1,35 @@
+"""
+バックグラウンドジョブ用Pydanticスキーマ
+フロントエンドの型定義（frontend/src/types/index.ts）と同期
+"""
+from typing import Any, Dict, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+JobKind = Literal["export", "import", "recompute_daeun"]
+JobStatus = Literal["queued", "running", "succeeded", "failed"]
+
+
+class JobCreateRequest(BaseModel):
+    """ジョブ投入リクエスト"""
+
+    kind: JobKind = Field(..., description="ジョブ種別")
+    params: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="パラメータ（import: エクスポートデータ、recompute_daeun: {scope: own|all}）",
+    )
+
+
+class JobResponse(BaseModel):
+    """ジョブ状態レスポンス"""
+
+    id: str = Field(..., description="ジョブID")
+    kind: JobKind = Field(..., description="ジョブ種別")
+    status: JobStatus = Field(..., description="状態")
+    progress: int = Field(..., description="処理済み件数")
+    total: Optional[int] = Field(None, description="全件数（未確定ならnull）")
+    result: Optional[Any] = Field(None, description="結果（成功時のみ）")
+    error: Optional[str] = Field(None, description="エラーメッセージ（失敗時のみ）")
+    createdAt: str = Field(..., description="投入日時（ISO 8601形式）")
+    startedAt: Optional[str] = Field(None, description="開始日時（ISO 8601形式）")
+    finishedAt: Optional[str] = Field(None, description="終了日時（ISO 8601形式）")
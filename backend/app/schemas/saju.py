@@ -3,7 +3,7 @@
 frontend/src/types/index.ts と完全同期
 """
 from datetime import datetime
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -17,7 +17,22 @@ class BirthDataRequest(BaseModel):
     birthDatetime: str = Field(..., description="生年月日時（ISO 8601形式）")
     gender: Literal["male", "female"] = Field(..., description="性別")
     name: Optional[str] = Field(None, description="名前（オプション）")
-    timezoneOffset: Optional[int] = Field(9, description="タイムゾーンオフセット（KST=9）")
+    timezoneOffset: Optional[float] = Field(
+        9, description="タイムゾーンオフセット（KST=9）。9は韓国の歴史的なオフセットを使う"
+    )
+    timeZone: Optional[str] = Field(
+        None, description="出生地のIANAタイムゾーン名（timezoneOffsetより優先）"
+    )
+    longitude: Optional[float] = Field(
+        None, ge=-180, le=180, description="出生地の経度（指定時は地方平均時で日柱・時柱を判定）"
+    )
+    dayBoundary: Optional[Literal["yaja", "joja"]] = Field(
+        None, description="子時の扱い（yaja: 夜子時説、joja: 朝子時説）"
+    )
+    persist: Optional[bool] = Field(
+        None,
+        description="ゲスト命式としてサーバーに保存するか（省略時はサーバー設定、既定は保存しない）",
+    )
 
     @field_validator("birthDatetime")
     @classmethod
@@ -37,7 +52,18 @@ class SajuUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, description="名前（オプション）")
     birthDatetime: str = Field(..., description="生年月日時（ISO 8601形式）")
     gender: Literal["male", "female"] = Field(..., description="性別")
-    timezoneOffset: Optional[int] = Field(9, description="タイムゾーンオフセット（KST=9）")
+    timezoneOffset: Optional[float] = Field(
+        9, description="タイムゾーンオフセット（KST=9）。9は韓国の歴史的なオフセットを使う"
+    )
+    timeZone: Optional[str] = Field(
+        None, description="出生地のIANAタイムゾーン名（timezoneOffsetより優先）"
+    )
+    longitude: Optional[float] = Field(
+        None, ge=-180, le=180, description="出生地の経度（指定時は地方平均時で日柱・時柱を判定）"
+    )
+    dayBoundary: Optional[Literal["yaja", "joja"]] = Field(
+        None, description="子時の扱い（yaja: 夜子時説、joja: 朝子時説）"
+    )
 
     @field_validator("birthDatetime")
     @classmethod
@@ -100,6 +126,12 @@ class SajuResponse(BaseModel):
     # 吉凶レベル
     fortuneLevel: Literal["大吉", "吉", "中吉", "小吉", "平", "凶", "大凶"] = Field(..., description="吉凶レベル（7段階）")
 
+    # 出生時刻ポリシー（計算時の timeZone / timezoneOffset / longitude / dayBoundary の
+    # うち既定と違うもの）
+    birthTimePolicy: Optional[Dict[str, Any]] = Field(
+        None, description="出生時刻ポリシー（nullは既定）"
+    )
+
     createdAt: str = Field(..., description="作成日時（ISO 8601形式）")
 
     class Config:
@@ -150,6 +182,22 @@ class SaveResponse(BaseModel):
     message: str = Field(..., description="メッセージ")
 
 
+class BulkSaveRequest(BaseModel):
+    """命式一括保存リクエスト"""
+
+    items: List[SajuResponse] = Field(..., description="保存する命式リスト（100件まで）")
+
+
+class BulkSaveResponse(BaseModel):
+    """命式一括保存レスポンス"""
+
+    success: bool = Field(..., description="成功フラグ")
+    savedCount: int = Field(..., description="保存された件数")
+    ids: List[str] = Field(..., description="保存された命式ID")
+    skippedIds: List[str] = Field(..., description="他のユーザーの命式のため保存しなかったID")
+    message: str = Field(..., description="メッセージ")
+
+
 # ==================== エラーレスポンス ====================
 
 
@@ -184,6 +232,37 @@ class SajuListResponse(BaseModel):
     hasNext: bool = Field(..., description="次のページが存在するか")
 
 
+class FacetCount(BaseModel):
+    """ファセットの値ごとの件数"""
+
+    value: str = Field(..., description="値（柱は「甲子」形式）")
+    count: int = Field(..., description="件数")
+
+
+class SajuSearchResponse(SajuListResponse):
+    """命式検索レスポンス"""
+
+    facets: Dict[str, List[FacetCount]] = Field(
+        default_factory=dict, description="ファセット名 → 値ごとの件数（絞り込み後、件数の多い順）"
+    )
+
+
+class SajuStatsResponse(BaseModel):
+    """命式集計レスポンス（ダッシュボード用）"""
+
+    asOf: str = Field(..., description="現在の大運の基準日（YYYY-MM-DD形式）")
+    total: int = Field(..., description="命式の件数")
+    dayStem: List[FacetCount] = Field(..., description="日干ごとの件数（甲〜癸の順）")
+    dayElement: List[FacetCount] = Field(
+        ..., description="日干の五行ごとの件数（wood/fire/earth/metal/water）"
+    )
+    fortuneLevel: List[FacetCount] = Field(..., description="吉凶レベルごとの件数（良い順）")
+    currentDaeunLevel: List[FacetCount] = Field(
+        ...,
+        description="現在の大運の吉凶レベルごとの件数（良い順、現在の大運が無い命式は含まない）",
+    )
+
+
 class DeleteResponse(BaseModel):
     """削除成功レスポンス"""
 
@@ -191,6 +270,14 @@ class DeleteResponse(BaseModel):
     message: str = Field(..., description="メッセージ")
 
 
+class BulkDeleteResponse(BaseModel):
+    """命式一括削除レスポンス"""
+
+    success: bool = Field(..., description="成功フラグ")
+    deletedCount: int = Field(..., description="削除された件数")
+    message: str = Field(..., description="メッセージ")
+
+
 # ==================== エラーレスポンス ====================
 
 
@@ -235,6 +322,8 @@ class FortuneDetail(BaseModel):
     element: Optional[Literal["wood", "fire", "earth", "metal", "water"]] = Field(
         None, description="五行要素"
     )
+    sipsin: Optional[str] = Field(None, description="十神（天干）")
+    branchSipsin: Optional[str] = Field(None, description="十神（地支・蔵干本気）")
 
 
 class CurrentFortuneResponse(BaseModel):
@@ -313,6 +402,71 @@ class DayFortuneListResponse(BaseModel):
     days: List[DayFortuneInfo] = Field(..., description="日運リスト")
 
 
+# ==================== タイムラインレスポンス ====================
+
+
+class TimelineYearInfo(YearFortuneInfo):
+    """タイムラインの年運（月運リスト付き）"""
+
+    months: List[MonthFortuneInfo] = Field(..., description="月運リスト")
+
+
+class TimelineDaeunInfo(DaeunInfo):
+    """タイムラインの大運（年運リスト付き）"""
+
+    years: List[TimelineYearInfo] = Field(..., description="年運リスト")
+
+
+class TimelineResponse(BaseModel):
+    """タイムラインレスポンス（大運→年運→月運）"""
+
+    sajuId: str = Field(..., description="命式ID")
+    currentAge: int = Field(..., description="基準日時点の年齢")
+    daeunList: List[TimelineDaeunInfo] = Field(..., description="大運リスト")
+
+
+# ==================== 相性検索レスポンス ====================
+
+
+class MatchInfo(BaseModel):
+    """相性検索の候補1件"""
+
+    id: str = Field(..., description="命式ID")
+    name: Optional[str] = Field(None, description="名前")
+    birthDatetime: str = Field(..., description="生年月日時（ISO 8601形式）")
+    gender: str = Field(..., description="性別")
+    dayStem: str = Field(..., description="日天干")
+    dayBranch: str = Field(..., description="日地支")
+    totalScore: int = Field(..., description="合計点（本人視点＋相手視点）")
+    score: int = Field(..., description="本人から見た点数")
+    partnerScore: int = Field(..., description="相手から見た点数")
+    details: List[str] = Field(..., description="本人視点の内訳")
+    partnerDetails: List[str] = Field(..., description="相手視点の内訳")
+
+
+class MatchListResponse(BaseModel):
+    """相性検索レスポンス"""
+
+    sajuId: str = Field(..., description="検索元の命式ID")
+    scope: Literal["account", "all"] = Field(..., description="検索範囲")
+    candidates: int = Field(..., description="検索対象の候補数")
+    matches: List[MatchInfo] = Field(..., description="相性上位の候補リスト")
+
+
+# ==================== キャッシュ統計レスポンス ====================
+
+
+class ChartCacheStatsResponse(BaseModel):
+    """命式計算結果キャッシュの統計"""
+
+    size: int = Field(..., description="LRUに保持している件数")
+    maxsize: int = Field(..., description="LRUの上限件数")
+    hits: int = Field(..., description="LRUのヒット数")
+    storeHits: int = Field(..., description="共有ストアのヒット数")
+    misses: int = Field(..., description="ミス数（再計算した回数）")
+    hitRate: float = Field(..., description="ヒット率（0〜1）")
+
+
 # ==================== データ管理レスポンス ====================
 
 
@@ -0,0 +1,357 @@
+"""
+出生時刻ポリシー
+生年月日時（出生地の壁時計）を、四柱の計算に使う時刻に1度だけ変換する
+
+- 出生地のタイムゾーンの歴史的なUTCオフセット（韓国の+8:30時代・夏時間など）で絶対時刻を決める
+  （韓国・日本・中国は同梱の遷移表を二分探索、それ以外はzoneinfo）
+- 年柱・月柱（節入り）は絶対時刻をKSTで表した時刻で判定する（従来どおり）
+- 日柱・時柱は出生地の標準時（夏時間を除く）、経度指定時は地方平均時で判定する
+- 子時（23時台）の扱いは夜子時説（yaja: 日付は0時で変わる）と朝子時説（joja: 23時で変わる）から選ぶ
+- フロントエンドは入力した壁時計に固定の「+09:00」を付けて送るため、既定（timezoneOffset=9）では
+  +09:00付きの日時を絶対時刻ではなく出生地の壁時計として扱い、日柱・時柱は入力した時計の読みの
+  まま判定する（夏時間かどうかを入力させていないため従来どおり）
+- ポリシーは命式の行に保存し（to_request / from_stored）、更新時も同じ条件で再計算する
+- 保存・応答する生年月日時は canonical でそろえ、読み戻して再計算しても時刻がずれないようにする
+- 遷移表に無いゾーンは(ゾーン, 日付)ごとのオフセットをキャッシュするため、補正による遅延はほぼない
+"""
+import json
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .clock import KST
+from .ganzhi import Ganzhi
+from .tz_table import epoch_seconds, load_tz_table
+
+# 子時の扱い
+YAJA = "yaja"  # 夜子時説: 23時台は当日の日柱、時柱は翌日の子時（lunar-pythonのsect=2と同じ）
+JOJA = "joja"  # 朝子時説: 23時から翌日の日柱
+DAY_BOUNDARIES = (YAJA, JOJA)
+
+# 既定の出生地タイムゾーン
+KOREA_ZONE = "Asia/Seoul"
+
+# 既定で壁時計として扱う入力のUTCオフセット（フロントエンドが付ける+09:00）
+KOREA_INPUT_OFFSET = 9 * 3600
+
+# 序数日（date.toordinal）→ 日柱コードのずれ（fortune_calendarと同じ）
+_DAY_PILLAR_OFFSET = 14
+
+
+class BirthTime(NamedTuple):
+    """変換後の出生時刻"""
+
+    kst: datetime  # 絶対時刻をKSTで表した日時（タイムゾーン付き、年柱・月柱・大運用）
+    wall: datetime  # 日柱・時柱を判定する時刻（naive）
+
+
+@lru_cache(maxsize=8)
+def _zone(name: str) -> ZoneInfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"不明なタイムゾーンです: {name}")
+
+
+def _seconds(delta: Optional[timedelta]) -> int:
+    return int(delta.total_seconds()) if delta else 0
+
+
+@lru_cache(maxsize=4096)
+def _day_offsets(zone: str, day: date) -> Optional[Tuple[int, int]]:
+    """
+    (ゾーン, 日付)のUTCオフセットと夏時間分（秒）
+
+    Returns:
+        (UTCオフセット, 夏時間分)。その日のうちに切り替わる場合はNone
+    """
+    tz = _zone(zone)
+    first = datetime.combine(day, time(0, 0), tz)
+    last = datetime.combine(day, time(23, 59), tz)
+    if first.utcoffset() != last.utcoffset() or first.dst() != last.dst():
+        return None
+    return _seconds(first.utcoffset()), _seconds(first.dst())
+
+
+def zone_offsets(zone: str, local: datetime) -> Tuple[int, int]:
+    """
+    出生地の壁時計の日時に対するUTCオフセットと夏時間分（秒）
+
+    Args:
+        zone: IANAタイムゾーン名
+        local: 壁時計の日時（naive）
+
+    Returns:
+        (UTCオフセット, 夏時間分)
+    """
+    transitions = load_tz_table().get(zone)
+    if transitions is not None:
+        return transitions.at_local(epoch_seconds(local))
+    offsets = _day_offsets(zone, local.date())
+    if offsets is not None:
+        return offsets
+    # 切り替え日だけは時刻ごとに求める
+    aware = local.replace(tzinfo=_zone(zone))
+    return _seconds(aware.utcoffset()), _seconds(aware.dst())
+
+
+def utc_zone_offsets(zone: str, instant: datetime) -> Tuple[int, int]:
+    """
+    絶対時刻に対するゾーンのUTCオフセットと夏時間分（秒）
+
+    Args:
+        zone: IANAタイムゾーン名
+        instant: タイムゾーン付きの日時
+
+    Returns:
+        (UTCオフセット, 夏時間分)
+    """
+    transitions = load_tz_table().get(zone)
+    if transitions is not None:
+        return transitions.at_utc(
+            epoch_seconds(instant.astimezone(timezone.utc).replace(tzinfo=None))
+        )
+    local = instant.astimezone(_zone(zone))
+    return _seconds(local.utcoffset()), _seconds(local.dst())
+
+
+def day_hour_pillars(wall: datetime, day_boundary: str = YAJA) -> Tuple[Ganzhi, Ganzhi]:
+    """
+    日柱・時柱を計算
+
+    Args:
+        wall: 日柱・時柱を判定する時刻
+        day_boundary: 子時の扱い（YAJA / JOJA）
+
+    Returns:
+        (日柱, 時柱)
+    """
+    ordinal = wall.toordinal() + _DAY_PILLAR_OFFSET
+    late_zi = wall.hour == 23
+    day = Ganzhi((ordinal + (1 if late_zi and day_boundary == JOJA else 0)) % 60)
+    # 時干は子時の属する日（23時台は翌日）の日干から五鼠遁で決まる
+    branch = ((wall.hour + 1) // 2) % 12
+    zi_day_stem = (ordinal + (1 if late_zi else 0)) % 10
+    hour = Ganzhi.from_parts((zi_day_stem % 5 * 2 + branch) % 10, branch)
+    return day, hour
+
+
+class BirthTimePolicy:
+    """
+    出生時刻ポリシー（読み取り専用）
+
+    - zone: 出生地のIANAタイムゾーン名（歴史的なオフセット・夏時間を反映）
+    - fixed_offset: zoneの代わりに使う固定UTCオフセット（秒）
+    - longitude: 出生地の経度（指定時は日柱・時柱を地方平均時で判定）
+    - day_boundary: 子時の扱い
+    - wall_clock_offset: タイムゾーン付きの入力のうち、このUTCオフセット（秒）のものは
+      絶対時刻ではなく出生地の壁時計として扱い、日柱・時柱は時計の読みのまま判定する
+    """
+
+    __slots__ = ("zone", "fixed_offset", "longitude", "day_boundary", "wall_clock_offset")
+
+    def __init__(
+        self,
+        zone: Optional[str] = KOREA_ZONE,
+        fixed_offset: Optional[int] = None,
+        longitude: Optional[float] = None,
+        day_boundary: str = YAJA,
+        wall_clock_offset: Optional[int] = None,
+    ):
+        if zone is None and fixed_offset is None:
+            raise ValueError("タイムゾーンまたはUTCオフセットが必要です")
+        if zone is not None:
+            _zone(zone)
+        if fixed_offset is not None and not (-14 * 3600 <= fixed_offset <= 14 * 3600):
+            raise ValueError(f"UTCオフセットが範囲外です: {fixed_offset}")
+        if longitude is not None and not (-180 <= longitude <= 180):
+            raise ValueError(f"経度が範囲外です: {longitude}")
+        if day_boundary not in DAY_BOUNDARIES:
+            raise ValueError(
+                f"子時の扱いは{'/'.join(DAY_BOUNDARIES)}のいずれかです: {day_boundary}"
+            )
+        self.zone = zone if fixed_offset is None else None
+        self.fixed_offset = fixed_offset
+        self.longitude = longitude
+        self.day_boundary = day_boundary
+        self.wall_clock_offset = wall_clock_offset if self.zone is not None else None
+
+    def __repr__(self) -> str:
+        where = self.zone or f"UTC{self.fixed_offset / 3600:+g}"
+        return f"BirthTimePolicy({where}, longitude={self.longitude}, {self.day_boundary})"
+
+    @classmethod
+    def from_request(
+        cls,
+        time_zone: Optional[str] = None,
+        timezone_offset: Optional[float] = None,
+        longitude: Optional[float] = None,
+        day_boundary: Optional[str] = None,
+    ) -> "BirthTimePolicy":
+        """
+        リクエストの項目からポリシーを作成
+
+        Args:
+            time_zone: IANAタイムゾーン名（最優先）
+            timezone_offset: UTCオフセット（時間）。省略時・9は韓国の歴史的なオフセットを使い、
+                +09:00付きの日時は壁時計として扱う
+            longitude: 出生地の経度
+            day_boundary: 子時の扱い（省略時は夜子時説）
+
+        Returns:
+            ポリシー
+        """
+        if time_zone:
+            return cls(time_zone, None, longitude, day_boundary or YAJA)
+        if timezone_offset is None or timezone_offset == 9:
+            return cls(KOREA_ZONE, None, longitude, day_boundary or YAJA, KOREA_INPUT_OFFSET)
+        return cls(None, round(timezone_offset * 3600), longitude, day_boundary or YAJA)
+
+    def to_request(self) -> Dict[str, Any]:
+        """
+        from_request で同じポリシーを作り直せるリクエスト項目（既定値の項目は含めない）
+
+        Returns:
+            {"timeZone", "timezoneOffset", "longitude", "dayBoundary"} のうち既定と違うもの
+        """
+        fields: Dict[str, Any] = {}
+        if self.zone is None:
+            fields["timezoneOffset"] = self.fixed_offset / 3600
+        elif self.zone != KOREA_ZONE or self.wall_clock_offset != KOREA_INPUT_OFFSET:
+            fields["timeZone"] = self.zone
+        if self.longitude is not None:
+            fields["longitude"] = self.longitude
+        if self.day_boundary != YAJA:
+            fields["dayBoundary"] = self.day_boundary
+        return fields
+
+    @classmethod
+    def from_fields(cls, fields: Optional[Dict[str, Any]]) -> "BirthTimePolicy":
+        """
+        to_request の結果からポリシーを作成
+
+        Args:
+            fields: リクエスト項目（Noneなら既定ポリシー）
+
+        Returns:
+            ポリシー
+
+        Raises:
+            ValueError: 不明な項目・不正な値
+        """
+        if not fields:
+            return DEFAULT_POLICY
+        unknown = set(fields) - {"timeZone", "timezoneOffset", "longitude", "dayBoundary"}
+        if unknown:
+            raise ValueError(f"不明な出生時刻ポリシーの項目です: {', '.join(sorted(unknown))}")
+        return cls.from_request(
+            fields.get("timeZone"),
+            fields.get("timezoneOffset"),
+            fields.get("longitude"),
+            fields.get("dayBoundary"),
+        )
+
+    @property
+    def stored(self) -> Optional[str]:
+        """命式の行に保存する値（to_request のJSON。既定ポリシーはNone）"""
+        fields = self.to_request()
+        return json.dumps(fields, sort_keys=True) if fields else None
+
+    @classmethod
+    def from_stored(cls, value: Optional[str]) -> "BirthTimePolicy":
+        """
+        命式の行に保存した値からポリシーを作成
+
+        Args:
+            value: stored の値（Noneなら既定ポリシー）
+
+        Returns:
+            ポリシー
+        """
+        return cls.from_fields(json.loads(value) if value else None)
+
+    @property
+    def variant(self) -> str:
+        """
+        命式キャッシュのキーに付ける識別子
+
+        絶対時刻が同じでも結果が変わる項目（経度・子時の扱い）だけを含む。既定なら空文字
+        """
+        if self.longitude is None and self.day_boundary == YAJA:
+            return ""
+        return f"{self.day_boundary}@{'' if self.longitude is None else f'{self.longitude:g}'}"
+
+    def _as_typed(self, birth_datetime: datetime) -> bool:
+        """入力した時計の読みとして扱う日時か（wall_clock_offsetと同じオフセット付き）"""
+        return (
+            birth_datetime.tzinfo is not None
+            and self.wall_clock_offset is not None
+            and _seconds(birth_datetime.utcoffset()) == self.wall_clock_offset
+        )
+
+    def canonical(self, birth_datetime: datetime) -> Tuple[datetime, "BirthTimePolicy"]:
+        """
+        保存・応答に使う生年月日時とポリシー
+
+        保存した日時はKSTの絶対時刻（+09:00付き）で読み戻すため、読み戻した日時を同じポリシーで
+        再計算しても同じ命式になる組にそろえる。
+
+        - 壁時計として扱う+09:00付きの入力: そのまま（入力した時計の読み）
+        - それ以外: 絶対時刻（KST）にし、ポリシーは+09:00付きを絶対時刻として読むものにする
+          （naiveの入力を夏時間込みで解釈した結果を保つ）
+
+        Args:
+            birth_datetime: 生年月日時（resolve と同じ）
+
+        Returns:
+            (タイムゾーン付きの生年月日時, ポリシー)
+        """
+        if self._as_typed(birth_datetime):
+            return birth_datetime, self
+        kst = self.resolve(birth_datetime).kst
+        if self.wall_clock_offset is None:
+            return kst, self
+        return kst, BirthTimePolicy(self.zone, None, self.longitude, self.day_boundary)
+
+    def resolve(self, birth_datetime: datetime) -> BirthTime:
+        """
+        生年月日時を四柱の計算に使う時刻に変換
+
+        Args:
+            birth_datetime: 生年月日時（naiveとwall_clock_offset付きは出生地の壁時計、
+                それ以外のタイムゾーン付きはその絶対時刻）
+
+        Returns:
+            変換後の出生時刻
+        """
+        as_typed = self._as_typed(birth_datetime)
+        if as_typed:
+            birth_datetime = birth_datetime.replace(tzinfo=None)
+
+        if self.zone is None:
+            offset, dst = self.fixed_offset, 0
+        elif birth_datetime.tzinfo is None:
+            offset, dst = zone_offsets(self.zone, birth_datetime)
+        else:
+            offset, dst = utc_zone_offsets(self.zone, birth_datetime)
+
+        if birth_datetime.tzinfo is None:
+            utc = birth_datetime - timedelta(seconds=offset)
+        else:
+            utc = birth_datetime.astimezone(timezone.utc).replace(tzinfo=None)
+
+        kst = (utc + timedelta(hours=9)).replace(tzinfo=KST)
+        if self.longitude is not None:
+            # 地方平均時: 経度15度ごとに1時間
+            wall = utc + timedelta(seconds=round(self.longitude * 240))
+        elif as_typed:
+            # 入力した時計の読み
+            wall = birth_datetime
+        else:
+            # 出生地の標準時（夏時間を除く）
+            wall = utc + timedelta(seconds=offset - dst)
+        return BirthTime(kst, wall)
+
+
+DEFAULT_POLICY = BirthTimePolicy.from_request()
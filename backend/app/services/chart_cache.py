@@ -0,0 +1,201 @@
+"""
+命式計算結果キャッシュ
+命式の計算結果はKSTの生年月日時（分単位）と性別（と出生時刻ポリシー）だけで決まるため、
+時刻に依存しない部分（純粋部分）をキーごとに保持して再計算を省く
+
+- キーには大運の吉凶判定ロジックのバージョン（ANALYZER_VERSION）を含め、
+  ロジック変更後に共有ストアに残った古い結果を使わない
+
+- 1段目: プロセス内のLRU（件数上限あり）
+- 2段目: 任意の共有ストア（SQLiteファイルなど。複数ワーカーで共有できる）
+- 名前・作成日時・大運のisCurrentは読み出し時に呼び出し側で付け直す
+"""
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Protocol
+
+from .fortune_analyzer import ANALYZER_VERSION
+
+
+def chart_cache_key(
+    kst_time: datetime,
+    gender: str,
+    variant: str = "",
+    wall: Optional[datetime] = None,
+    version: str = ANALYZER_VERSION,
+) -> Optional[str]:
+    """
+    キャッシュキーを作成
+
+    Args:
+        kst_time: 生年月日時（KST）
+        gender: 性別（'male' or 'female'）
+        variant: 出生時刻ポリシーの識別子（既定ポリシーは空文字）
+        wall: 日柱・時柱を判定する時刻（絶対時刻のKST表記と同じならキーに含めない）
+        version: 大運の吉凶判定ロジックのバージョン
+
+    Returns:
+        キー文字列（秒以下を含む日時は分単位で同一視できないためNone）
+    """
+    if kst_time.second or kst_time.microsecond:
+        return None
+    key = f"{version}|{kst_time.strftime('%Y-%m-%dT%H:%M')}|{gender}"
+    if variant:
+        key = f"{key}|{variant}"
+    if wall is not None and wall != kst_time.replace(tzinfo=None):
+        # 夏時間・+8:30時代の入力は絶対時刻が同じでも時計の読みで日柱・時柱が変わる
+        key = f"{key}|wall={wall.isoformat()}"
+    return key
+
+
+class ChartStore(Protocol):
+    """共有ストアのインターフェース（値はJSON文字列）"""
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str) -> None: ...
+
+
+class SqliteChartStore:
+    """
+    SQLiteファイルを使った共有ストア
+
+    同じファイルを指定すれば再起動後や複数ワーカー間でも計算結果を再利用できる
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chart_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """スレッドごとの接続を取得"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = (
+            self._connect()
+            .execute("SELECT value FROM chart_cache WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO chart_cache (key, value) VALUES (?, ?)", (key, value)
+            )
+
+
+class ChartCache:
+    """
+    命式計算結果のLRUキャッシュ（スレッドセーフ）
+
+    保持する値は呼び出し側で書き換えない前提で共有する
+    """
+
+    def __init__(self, maxsize: int = 4096, store: Optional[ChartStore] = None):
+        self.maxsize = maxsize
+        self.store = store
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        キャッシュから取得（LRUになければ共有ストアを参照）
+
+        Args:
+            key: chart_cache_keyで作成したキー
+
+        Returns:
+            命式の純粋部分（なければNone）
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        if self.store is not None:
+            raw = self._store_get(key)
+            if raw is not None:
+                value = json.loads(raw)
+                with self._lock:
+                    self.store_hits += 1
+                    self._remember(key, value)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: Dict) -> None:
+        """
+        キャッシュに保存（共有ストアがあれば書き込む）
+
+        Args:
+            key: chart_cache_keyで作成したキー
+            value: 命式の純粋部分（JSONに変換できること）
+        """
+        with self._lock:
+            self._remember(key, value)
+        if self.store is not None:
+            try:
+                self.store.set(key, json.dumps(value, ensure_ascii=False))
+            except sqlite3.Error:
+                # 共有ストアの障害は計算結果に影響させない
+                pass
+
+    def clear(self) -> None:
+        """LRUと統計をクリア（共有ストアは残す）"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.store_hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        """
+        ヒット率などの統計を取得
+
+        Returns:
+            {"size", "maxsize", "hits", "storeHits", "misses", "hitRate"}
+        """
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "storeHits": self.store_hits,
+                "misses": self.misses,
+                "hitRate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+            }
+
+    def _store_get(self, key: str) -> Optional[str]:
+        try:
+            return self.store.get(key)
+        except sqlite3.Error:
+            return None
+
+    def _remember(self, key: str, value: Dict) -> None:
+        """LRUに登録（ロック取得済みで呼ぶ）"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,126 @@
+"""
+基準日時（as-of）コンテキスト
+1リクエスト内で「現在」を1度だけ決めて、年齢・現在の大運・今年/今月/今日の判定に使い回す
+
+- 通常は現在時刻（KST）で作る
+- 日付や日時を指定すれば「その時点で何が現在だったか／になるか」を計算できる（バックテスト用）
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+# 韓国標準時（UTC+9）
+KST = timezone(timedelta(hours=9))
+
+
+class AsOf:
+    """
+    基準日時（読み取り専用）
+
+    - now: 基準日時（KST）
+    - today: 基準日（KST）
+    """
+
+    __slots__ = ("now", "today")
+
+    def __init__(self, now: datetime):
+        if now.tzinfo is None:
+            # naive datetimeはKSTと仮定
+            now = now.replace(tzinfo=KST)
+        self.now = now.astimezone(KST)
+        self.today: date = self.now.date()
+
+    def __repr__(self) -> str:
+        return f"AsOf({self.now.isoformat()})"
+
+    @classmethod
+    def current(cls) -> "AsOf":
+        """現在時刻（KST）の基準日時"""
+        return cls(datetime.now(KST))
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> "AsOf":
+        """
+        ISO 8601の日付・日時文字列から基準日時を作成
+
+        Args:
+            value: "2024-05-01" や "2024-05-01T12:00:00+09:00"（省略時は現在時刻）
+
+        Returns:
+            基準日時
+
+        Raises:
+            ValueError: 日付として解釈できない場合
+        """
+        if not value:
+            return cls.current()
+        return cls(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+    def age_of(self, birth_datetime: datetime) -> int:
+        """
+        基準日時点の満年齢を計算
+
+        Args:
+            birth_datetime: 生年月日時（タイムゾーン付きならKSTに変換、naiveはそのまま）
+
+        Returns:
+            満年齢（生まれる前は0）
+        """
+        if birth_datetime.tzinfo is not None:
+            birth_datetime = birth_datetime.astimezone(KST)
+        age = self.today.year - birth_datetime.year
+        if (self.today.month, self.today.day) < (birth_datetime.month, birth_datetime.day):
+            age -= 1
+        return max(age, 0)
+
+    def is_current_year(self, year: int) -> bool:
+        """基準日が指定年か"""
+        return self.today.year == year
+
+    def is_current_month(self, year: int, month: int) -> bool:
+        """基準日が指定年月か"""
+        return self.today.year == year and self.today.month == month
+
+    def is_today(self, year: int, month: int, day: int) -> bool:
+        """基準日が指定年月日か"""
+        return (self.today.year, self.today.month, self.today.day) == (year, month, day)
+
+
+def convert_db_datetime_to_kst_iso(dt: datetime) -> str:
+    """
+    データベースから取得したnaive datetimeをKSTのISO文字列に変換
+
+    データベースのDateTimeカラムはタイムゾーン情報を保持しないため、
+    取得したdatetimeはnaive（タイムゾーン情報なし）です。
+    データベースにはUTCで保存されているので、これをUTCとして扱い、
+    KSTに変換してISO文字列として返します。
+
+    Args:
+        dt: データベースから取得したnaive datetime（UTC）
+
+    Returns:
+        KSTのISO文字列（例：'1986-05-26T05:00:00+09:00'）
+    """
+    # naive datetimeにUTCタイムゾーンを付与
+    dt_utc = dt.replace(tzinfo=timezone.utc)
+    # KSTに変換
+    dt_kst = dt_utc.astimezone(KST)
+    # ISO文字列として返す
+    return dt_kst.isoformat()
+
+
+def convert_datetime_to_db(dt: datetime) -> datetime:
+    """
+    生年月日時をデータベースに保存するnaive datetime（UTC）に変換
+
+    convert_db_datetime_to_kst_iso の逆変換。タイムゾーン付きの値をそのまま渡すと
+    SQLiteはタイムゾーン情報を捨てて時計の読みを保存するため、保存前にUTCへそろえる。
+
+    Args:
+        dt: 生年月日時（naiveはKSTと仮定）
+
+    Returns:
+        naive datetime（UTC）
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=KST)
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,436 @@
+"""
+相性スコア計算エンジン
+男性N人×女性M人のチャートから相性スコア行列（男性視点・女性視点）を一括計算する
+
+- 採点規則は compatibility_analyzer_complete.calculate_score と同じ
+  （日干±40/30/-30/-20、月干+15/-10、時干+10/-5、季節+15/-5、大運ボーナス+5）
+- 天干の各項は100要素の点数表、季節は4×4の点数表として import時に1度だけ作る
+- チャートは列指向配列（ChartColumns）で保持し、同じ特徴量（日干・月干・時干・季節）の
+  相手はまとめて1回だけ採点してから行へ展開する
+- 1人に対する上位k件の検索は、特徴量キー別にまとめた索引（MatchIndex）で枝刈りする
+"""
+import heapq
+from array import array
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .donsagong_matrix import LEVELS, TENGAN_FLAT
+from .ganzhi import Ganzhi
+
+# 季節（0=春 寅卯辰, 1=夏 巳午未, 2=秋 申酉戌, 3=冬 亥子丑）
+SEASONS = ("春", "夏", "秋", "冬")
+
+# 基本点
+BASE_SCORE = 50
+
+# 大運と相手の日柱が一致したときの加点
+DAEUN_BONUS = 5
+
+# 大運なしを表すコード
+NO_DAEUN = -1
+
+# 項目ごとの判定規則（レベル名に含まれる文字 → (表示ラベル, 点数)）。上から順に判定する
+_DAY_RULES = (("大吉", "大吉", 40), ("吉", "吉", 30), ("大凶", "大凶", -30), ("凶", "凶", -20))
+_MONTH_RULES = (("吉", "吉", 15), ("凶", "凶", -10))
+_HOUR_RULES = (("吉", "吉", 10), ("凶", "凶", -5))
+
+
+def _classify(rules, level_name: str) -> Tuple[Optional[str], int]:
+    """レベル名を規則に当てはめて (表示ラベル, 点数) を求める"""
+    for needle, label, points in rules:
+        if needle in level_name:
+            return label, points
+    return None, 0
+
+
+def _term_table(rules) -> Tuple[Tuple[Optional[str], ...], array]:
+    """天干100マトリックスを (ラベル表, 点数表) に変換"""
+    by_level = [_classify(rules, name) for name in LEVELS]
+    labels = tuple(by_level[code][0] for code in TENGAN_FLAT)
+    points = array("b", (by_level[code][1] for code in TENGAN_FLAT))
+    return labels, points
+
+
+# 天干項の点数表（添字: 自分の天干×10 + 相手の天干）
+DAY_LABELS, DAY_SCORE = _term_table(_DAY_RULES)
+MONTH_LABELS, MONTH_SCORE = _term_table(_MONTH_RULES)
+HOUR_LABELS, HOUR_SCORE = _term_table(_HOUR_RULES)
+
+# 季節項の点数表（添字: 自分の季節×4 + 相手の季節。反対+15、同じ-5）
+SEASON_SCORE = array("b", (
+    15 if (b - a) % 4 == 2 else -5 if a == b else 0 for a in range(4) for b in range(4)
+))
+SEASON_LABELS = tuple(
+    "反対" if (b - a) % 4 == 2 else "同じ" if a == b else None for a in range(4) for b in range(4)
+)
+
+# 特徴量キーの種類数（日干10 × 月干10 × 時干10 × 季節4）
+FEATURE_KEYS = 4000
+
+
+def season_of(branch: int) -> int:
+    """地支コードから季節コードを求める"""
+    return (branch - 2) % 12 // 3
+
+
+def feature_key(day_stem: int, month_stem: int, hour_stem: int, season: int) -> int:
+    """採点に使う特徴量を1つの整数キー（0〜3999）にまとめる"""
+    return ((day_stem * 10 + month_stem) * 10 + hour_stem) * 4 + season
+
+
+def _split_key(key: int) -> Tuple[int, int, int, int]:
+    """特徴量キーを (日干, 月干, 時干, 季節) に戻す"""
+    key, season = divmod(key, 4)
+    key, hour_stem = divmod(key, 10)
+    day_stem, month_stem = divmod(key, 10)
+    return day_stem, month_stem, hour_stem, season
+
+
+# 日干項（基本点込み）の行表: _DAY_FROM[d][x] は日干dから見た日干xの点、_DAY_TO[d][x] はその逆向き
+_DAY_FROM = tuple(tuple(BASE_SCORE + DAY_SCORE[d * 10 + x] for x in range(10)) for d in range(10))
+_DAY_TO = tuple(tuple(BASE_SCORE + DAY_SCORE[x * 10 + d] for x in range(10)) for d in range(10))
+
+
+@lru_cache(maxsize=None)
+def _rest_from(sub: int) -> Tuple[int, ...]:
+    """日干以外（月干・時干・季節）の部分キーsubから見た、全部分キー（400通り）の点"""
+    _, m1, h1, s1 = _split_key(sub)
+    return tuple(
+        MONTH_SCORE[m1 * 10 + m2] + HOUR_SCORE[h1 * 10 + h2] + SEASON_SCORE[s1 * 4 + s2]
+        for m2 in range(10) for h2 in range(10) for s2 in range(4)
+    )
+
+
+@lru_cache(maxsize=None)
+def _rest_to(sub: int) -> Tuple[int, ...]:
+    """全部分キー（400通り）から見た、部分キーsubの点"""
+    return tuple(_rest_from(other)[sub] for other in range(400))
+
+
+def _base_row(own: int, others: Sequence[Tuple[int, int]], reverse: bool = False) -> List[int]:
+    """
+    特徴量キーownと各相手キーの点（大運ボーナスを除く）
+
+    Args:
+        own: 自分側の特徴量キー
+        others: 相手側キーを (日干, 部分キー) に分けたもの
+        reverse: Trueなら相手から見たown側の点を返す
+    """
+    day, sub = divmod(own, 400)
+    if reverse:
+        day_row, rest_row = _DAY_TO[day], _rest_to(sub)
+    else:
+        day_row, rest_row = _DAY_FROM[day], _rest_from(sub)
+    return [day_row[d] + rest_row[r] for d, r in others]
+
+
+class ChartColumns:
+    """
+    相性計算用のチャート特徴量（列指向）
+
+    各列は人数分の整数配列で、i番目の要素がi人目のチャートを表す
+    - day: 日柱（干支コード0〜59）
+    - key: 特徴量キー（日干・月干・時干・季節）
+    - daeun: 現在の大運（干支コード、なければ-1）
+    """
+
+    __slots__ = ("day", "key", "daeun")
+
+    def __init__(self) -> None:
+        self.day = array("b")
+        self.key = array("h")
+        self.daeun = array("b")
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def append(
+        self,
+        day: Ganzhi,
+        month: Ganzhi,
+        hour: Ganzhi,
+        daeun: Optional[Ganzhi] = None,
+    ) -> None:
+        """
+        チャートを1件追加
+
+        Args:
+            day: 日柱
+            month: 月柱
+            hour: 時柱
+            daeun: 現在の大運（不明ならNone）
+        """
+        self.day.append(int(day))
+        self.key.append(feature_key(day.stem, month.stem, hour.stem, season_of(month.branch)))
+        self.daeun.append(NO_DAEUN if daeun is None else int(daeun))
+
+    @classmethod
+    def from_pillars(
+        cls, charts: Iterable[Tuple[Ganzhi, Ganzhi, Ganzhi, Optional[Ganzhi]]]
+    ) -> "ChartColumns":
+        """(日柱, 月柱, 時柱, 大運) のタプル列から作成"""
+        columns = cls()
+        for day, month, hour, daeun in charts:
+            columns.append(day, month, hour, daeun)
+        return columns
+
+    def _groups(self) -> Tuple[List[int], array]:
+        """重複のない特徴量キーの一覧と、各チャートがその何番目かを返す"""
+        slots: Dict[int, int] = {}
+        unique: List[int] = []
+        inverse = array("h")
+        for key in self.key:
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = len(unique)
+                unique.append(key)
+            inverse.append(slot)
+        return unique, inverse
+
+    def _with_daeun_by(self, column: array) -> Dict[int, List[int]]:
+        """大運を持つチャートの番号を、指定列の干支コードごとにまとめる"""
+        index: Dict[int, List[int]] = {}
+        for i, (value, daeun) in enumerate(zip(column, self.daeun)):
+            if daeun != NO_DAEUN:
+                index.setdefault(value, []).append(i)
+        return index
+
+
+class CompatibilityMatrix:
+    """
+    相性スコア行列
+
+    male[i * m + j] は男性iから見た女性jとの点数、
+    female[i * m + j] は女性jから見た男性iとの点数
+    """
+
+    __slots__ = ("n", "m", "male", "female")
+
+    def __init__(self, n: int, m: int, male: array, female: array) -> None:
+        self.n = n
+        self.m = m
+        self.male = male
+        self.female = female
+
+    def pair(self, i: int, j: int) -> Tuple[int, int]:
+        """男性i・女性jの (男性視点, 女性視点) の点数"""
+        k = i * self.m + j
+        return self.male[k], self.female[k]
+
+    def male_row(self, i: int) -> array:
+        """男性iから見た全女性の点数"""
+        return self.male[i * self.m:(i + 1) * self.m]
+
+    def female_row(self, i: int) -> array:
+        """全女性から見た男性iの点数"""
+        return self.female[i * self.m:(i + 1) * self.m]
+
+
+def score_matrix(males: ChartColumns, females: ChartColumns) -> CompatibilityMatrix:
+    """
+    男性N人×女性M人の相性スコア行列を計算
+
+    同じ特徴量キーの組は1度だけ採点し、その結果を各行へ展開する。
+    大運ボーナスは該当する組だけに後から加点する
+
+    Args:
+        males: 男性側のチャート
+        females: 女性側のチャート
+
+    Returns:
+        相性スコア行列
+    """
+    n, m = len(males), len(females)
+    male_keys, male_slot = males._groups()
+    female_keys, female_slot = females._groups()
+
+    # 特徴量キーの組ごとの点数（行: 男性側キー、列: 女性側キー）
+    female_parts = [divmod(key, 400) for key in female_keys]
+    male_base = [_base_row(key, female_parts) for key in male_keys]
+    female_base = [_base_row(key, female_parts, reverse=True) for key in male_keys]
+
+    # 大運ボーナスの対象（大運ありの女性を日柱別・大運別に索引化）
+    females_by_day = females._with_daeun_by(females.day)
+    females_by_daeun = females._with_daeun_by(females.daeun)
+
+    male_scores = array("h")
+    female_scores = array("h")
+    for i in range(n):
+        slot = male_slot[i]
+        male_row = array("h", map(male_base[slot].__getitem__, female_slot))
+        female_row = array("h", map(female_base[slot].__getitem__, female_slot))
+
+        daeun = males.daeun[i]
+        if daeun != NO_DAEUN:
+            for j in females_by_day.get(daeun, ()):
+                male_row[j] += DAEUN_BONUS
+            for j in females_by_daeun.get(males.day[i], ()):
+                female_row[j] += DAEUN_BONUS
+
+        male_scores.extend(male_row)
+        female_scores.extend(female_row)
+
+    return CompatibilityMatrix(n, m, male_scores, female_scores)
+
+
+def score_pair(
+    male: Sequence[Optional[Ganzhi]], female: Sequence[Optional[Ganzhi]]
+) -> Tuple[int, int, List[str], List[str]]:
+    """
+    1組の相性スコアと内訳を計算
+
+    Args:
+        male: 男性の (日柱, 月柱, 時柱, 大運)
+        female: 女性の (日柱, 月柱, 時柱, 大運)
+
+    Returns:
+        (男性視点の点数, 女性視点の点数, 男性側の内訳, 女性側の内訳)
+    """
+    m_day, m_month, m_hour, m_daeun = male
+    f_day, f_month, f_hour, f_daeun = female
+    m_season, f_season = season_of(m_month.branch), season_of(f_month.branch)
+
+    def side(own, other, own_season, other_season):
+        score = BASE_SCORE
+        details = []
+        for name, labels, points, k in (
+            ("日干", DAY_LABELS, DAY_SCORE, own[0].stem * 10 + other[0].stem),
+            ("月干", MONTH_LABELS, MONTH_SCORE, own[1].stem * 10 + other[1].stem),
+            ("時干", HOUR_LABELS, HOUR_SCORE, own[2].stem * 10 + other[2].stem),
+            ("季節", SEASON_LABELS, SEASON_SCORE, own_season * 4 + other_season),
+        ):
+            if labels[k] is not None:
+                score += points[k]
+                details.append(f"{name}：{labels[k]} {points[k]:+d}")
+        return score, details
+
+    score_m, details_m = side(male, female, m_season, f_season)
+    score_f, details_f = side(female, male, f_season, m_season)
+
+    if m_daeun is not None and f_daeun is not None:
+        if m_daeun == f_day:
+            score_m += DAEUN_BONUS
+            details_m.append(f"大運ボーナス +{DAEUN_BONUS}")
+        if f_daeun == m_day:
+            score_f += DAEUN_BONUS
+            details_f.append(f"大運ボーナス +{DAEUN_BONUS}")
+
+    return score_m, score_f, details_m, details_f
+
+
+# (日柱, 月柱, 時柱, 大運) の組
+Chart = Tuple[Ganzhi, Ganzhi, Ganzhi, Optional[Ganzhi]]
+
+
+class MatchResult(NamedTuple):
+    """相手候補1件の相性結果（点数・内訳は検索した本人視点と相手視点）"""
+
+    chart_id: Hashable
+    total: int
+    score: int
+    partner_score: int
+    details: List[str]
+    partner_details: List[str]
+
+
+def _chart_key(chart: Chart) -> int:
+    """チャートの特徴量キー"""
+    day, month, hour, _ = chart
+    return feature_key(day.stem, month.stem, hour.stem, season_of(month.branch))
+
+
+def _key_score(own: int, other: int) -> int:
+    """特徴量キー同士の点（own視点、大運ボーナスを除く）"""
+    d1, s1 = divmod(own, 400)
+    d2, s2 = divmod(other, 400)
+    return _DAY_FROM[d1][d2] + _rest_from(s1)[s2]
+
+
+class MatchIndex:
+    """
+    相手候補の索引（特徴量キー別のグループ）
+
+    top_kは特徴量キーの組の点（大運ボーナス前、双方視点の合計）が高いグループから調べ、
+    残りのグループの上限点がk位の点に届かなくなった時点で打ち切る
+    """
+
+    __slots__ = ("_groups", "_size")
+
+    def __init__(self) -> None:
+        self._groups: Dict[int, List[Tuple[Hashable, Chart]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, chart_id: Hashable, chart: Chart) -> None:
+        """
+        候補を1件追加
+
+        Args:
+            chart_id: 候補のID
+            chart: 候補の (日柱, 月柱, 時柱, 大運)
+        """
+        self._groups.setdefault(_chart_key(chart), []).append((chart_id, chart))
+        self._size += 1
+
+    def top_k(
+        self,
+        query: Chart,
+        k: int,
+        query_is_male: bool = True,
+        exclude: Optional[Hashable] = None,
+    ) -> List[MatchResult]:
+        """
+        相性の合計点（本人視点＋相手視点）が高い順にk件の候補を求める
+
+        Args:
+            query: 本人の (日柱, 月柱, 時柱, 大運)
+            k: 取得件数
+            query_is_male: 本人が男性側ならTrue（採点時の男女の向き）
+            exclude: 除外する候補ID（本人など）
+
+        Returns:
+            合計点の降順の結果リスト（同点は先に調べた候補を優先）
+        """
+        if k <= 0:
+            return []
+
+        query_key = _chart_key(query)
+        query_day, query_daeun = query[0], query[3]
+        max_bonus = 0 if query_daeun is None else 2 * DAEUN_BONUS
+
+        ranked = sorted(
+            (-(_key_score(query_key, key) + _key_score(key, query_key)), key)
+            for key in self._groups
+        )
+
+        heap: List[Tuple[int, int, Hashable, Chart]] = []
+        seq = 0
+        for neg_base, key in ranked:
+            base = -neg_base
+            if len(heap) == k and base + max_bonus <= heap[0][0]:
+                break
+            for chart_id, chart in self._groups[key]:
+                if chart_id == exclude:
+                    continue
+                total = base
+                if query_daeun is not None and chart[3] is not None:
+                    total += DAEUN_BONUS * ((query_daeun == chart[0]) + (chart[3] == query_day))
+                seq += 1
+                item = (total, -seq, chart_id, chart)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        results = []
+        for total, _, chart_id, chart in sorted(heap, reverse=True):
+            if query_is_male:
+                score, partner_score, details, partner_details = score_pair(query, chart)
+            else:
+                partner_score, score, partner_details, details = score_pair(chart, query)
+            results.append(
+                MatchResult(chart_id, total, score, partner_score, details, partner_details)
+            )
+        return results
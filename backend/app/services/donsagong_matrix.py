@@ -0,0 +1,155 @@
+"""
+ドンサゴン関係マトリックス（単一真実源）
+天干100・地支144・調候144の吉凶表を密なint8配列として保持する
+
+- 各表はレベルコード（int8）の平坦配列 + 2次元memoryviewビュー
+- 文字列の辞書ビューは互換用に導出するのみ（表の実体は本モジュールだけに置く）
+- 日本語/韓国語の表記は同じレベルコードの別名として扱う
+"""
+from array import array
+from typing import Dict, Optional, Sequence
+
+# 10天干 (漢字)
+HEAVENLY_STEMS = ("甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸")
+
+# 12地支 (漢字)
+EARTHLY_BRANCHES = ("子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥")
+
+STEM_INDEX: Dict[str, int] = {stem: i for i, stem in enumerate(HEAVENLY_STEMS)}
+BRANCH_INDEX: Dict[str, int] = {branch: i for i, branch in enumerate(EARTHLY_BRANCHES)}
+
+# 吉凶レベルコード（凶→吉の順。コード値は配列のインデックス）
+LEVELS = ("大凶", "中大凶", "凶", "無", "平", "吉凶", "小吉", "吉", "中吉", "中大吉", "大吉")
+LEVELS_KO = ("대흉", "중대흉", "흉", "무", "평", "길흉", "소길", "길", "중길", "중대길", "대길")
+
+LEVEL_INDEX: Dict[str, int] = {name: i for i, name in enumerate(LEVELS)}
+LEVEL_INDEX.update({name: i for i, name in enumerate(LEVELS_KO)})
+
+DAEHYUNG = LEVEL_INDEX["大凶"]
+HYUNG = LEVEL_INDEX["凶"]
+PYEONG = LEVEL_INDEX["平"]
+GIL = LEVEL_INDEX["吉"]
+DAEGIL = LEVEL_INDEX["大吉"]
+
+# 5段階（大凶/凶/平/吉/大吉）への縮約（FortuneAnalyzerの判定粒度）
+COLLAPSE_5 = array("b", [
+    DAEHYUNG, DAEHYUNG, HYUNG, PYEONG, PYEONG, GIL, GIL, GIL, GIL, DAEGIL, DAEGIL
+])
+
+# 縮約後のスコア（大吉+2 / 吉+1 / 平0 / 凶-1 / 大凶-2）
+SCORE_5 = array("b", [-2, -2, -1, 0, 0, 1, 1, 1, 1, 2, 2])
+
+# 天干100マトリックス（行: 基準天干、列: 対象天干 甲〜癸）
+_TENGAN_ROWS = {
+    "甲": "平 凶 吉 吉凶 吉 大凶 大凶 凶 凶 吉凶",
+    "乙": "吉 平 大吉 吉凶 吉 吉 大凶 凶 凶 吉凶",
+    "丙": "吉 吉 平 凶 無 無 凶 大凶 吉 凶",
+    "丁": "吉 吉 凶 平 吉 吉 吉 大凶 大凶 凶",
+    "戊": "大吉 小吉 吉 吉凶 平 凶 凶 凶 平 大凶",
+    "己": "凶 吉 吉 吉 凶 平 凶 凶 凶 平",
+    "庚": "吉 凶 吉 吉 吉 吉 平 凶 吉 吉凶",
+    "辛": "吉 吉 大凶 大凶 凶 平 凶 平 大吉 吉",
+    "壬": "吉 吉 吉 大凶 吉凶 凶 大吉 凶 平 凶",
+    "癸": "吉 吉 凶 凶 凶 凶 吉 凶 凶 平",
+}
+
+# 地支144マトリックス（行: 基準地支、列: 対象地支 子〜亥）
+# 合は吉、冲は凶、三合は大吉
+_JIJI_ROWS = {
+    "子": "平 大凶 吉 吉 吉 平 凶 凶 吉 平 凶 大凶",
+    "丑": "吉 平 吉 吉 凶 吉 大吉 凶 平 吉 凶 平",
+    "寅": "凶 凶 平 凶 吉 吉 大吉 吉 大凶 大凶 吉 平",
+    "卯": "凶 凶 吉 平 吉 吉 平 大吉 大凶 大凶 平 平",
+    "辰": "平 大凶 吉 吉 平 大凶 凶 凶 平 凶 大凶 平",
+    "巳": "凶 吉 吉 吉 大凶 平 大凶 凶 凶 吉 凶 大凶",
+    "午": "凶 吉 吉 吉 大凶 凶 平 凶 平 凶 大吉 平",
+    "未": "大吉 凶 吉 大吉 凶 凶 凶 平 吉 平 凶 大吉",
+    "申": "吉 凶 平 凶 吉 平 平 平 平 平 凶 平",
+    "酉": "凶 吉 凶 凶 凶 吉 凶 凶 凶 平 凶 凶",
+    "戌": "平 凶 大吉 凶 大凶 平 大吉 凶 吉 平 平 平",
+    "亥": "凶 凶 吉 大吉 凶 大凶 凶 大吉 平 平 大吉 平",
+}
+
+# 調候用神吉凶表（行: 原局月地支、列: 大運地支 子〜亥）
+# DONSAGONG_MASTER_DATABASE.md「조후용신 호흉표」。表に記載のない子子・丑丑は平
+_JOHOO_ROWS = {
+    "子": "平 中大凶 小吉 小吉 小吉 大吉 大吉 大吉 凶 凶 大吉 中大凶",
+    "丑": "中大吉 平 吉 吉 吉 大吉 大吉 大吉 凶 凶 吉 中大吉",
+    "寅": "大凶 大凶 小吉 小吉 小吉 中吉 大吉 中吉 大凶 大凶 大凶 大凶",
+    "卯": "凶 凶 小吉 小吉 小吉 大吉 大吉 大吉 凶 凶 凶 凶",
+    "辰": "凶 凶 吉 吉 吉 吉 吉 吉 吉 吉 凶 凶",
+    "巳": "吉 吉 小吉 小吉 小吉 凶 凶 凶 小吉 小吉 小吉 吉",
+    "午": "大吉 大吉 中吉 小吉 小吉 凶 凶 凶 吉 吉 吉 大吉",
+    "未": "大吉 吉 小吉 小吉 小吉 凶 凶 凶 小吉 小吉 凶 大吉",
+    "申": "凶 凶 吉 吉 吉 大吉 大吉 大吉 凶 凶 吉 凶",
+    "酉": "凶 凶 小吉 小吉 小吉 大吉 大吉 大吉 凶 凶 凶 凶",
+    "戌": "凶 凶 小吉 小吉 小吉 吉 吉 吉 小吉 小吉 小吉 凶",
+    "亥": "中大凶 中大凶 小吉 小吉 小吉 大吉 大吉 大吉 凶 凶 中吉 中大凶",
+}
+
+
+def _build(rows: Dict[str, str], keys: Sequence[str]) -> array:
+    """行文字列からレベルコードの平坦配列を構築"""
+    flat = array("b")
+    for key in keys:
+        cells = rows[key].split()
+        if len(cells) != len(keys):
+            raise ValueError(f"マトリックス行の要素数が不正です: {key}")
+        flat.extend(LEVEL_INDEX[cell] for cell in cells)
+    return flat
+
+
+TENGAN_FLAT = _build(_TENGAN_ROWS, HEAVENLY_STEMS)
+JIJI_FLAT = _build(_JIJI_ROWS, EARTHLY_BRANCHES)
+JOHOO_FLAT = _build(_JOHOO_ROWS, EARTHLY_BRANCHES)
+
+# 2次元ビュー（TENGAN[i, j] でレベルコードを取得）
+TENGAN = memoryview(TENGAN_FLAT).cast("b", (10, 10))
+JIJI = memoryview(JIJI_FLAT).cast("b", (12, 12))
+JOHOO = memoryview(JOHOO_FLAT).cast("b", (12, 12))
+
+
+def tengan_level(from_stem: str, to_stem: str) -> int:
+    """天干関係のレベルコードを取得"""
+    return TENGAN_FLAT[STEM_INDEX[from_stem] * 10 + STEM_INDEX[to_stem]]
+
+
+def jiji_level(from_branch: str, to_branch: str) -> int:
+    """地支関係のレベルコードを取得"""
+    return JIJI_FLAT[BRANCH_INDEX[from_branch] * 12 + BRANCH_INDEX[to_branch]]
+
+
+def johoo_level(month_branch: str, daeun_branch: str) -> int:
+    """調候のレベルコードを取得"""
+    return JOHOO_FLAT[BRANCH_INDEX[month_branch] * 12 + BRANCH_INDEX[daeun_branch]]
+
+
+def as_dict(
+    flat: array,
+    keys: Sequence[str],
+    names: Sequence[str] = LEVELS,
+    collapse: Optional[array] = None,
+) -> Dict[str, Dict[str, str]]:
+    """
+    平坦配列から {行: {列: レベル名}} の文字列ビューを生成
+
+    Args:
+        flat: レベルコードの平坦配列
+        keys: 行・列のラベル（天干または地支）
+        names: レベル名の並び（LEVELS または LEVELS_KO）
+        collapse: レベルコードの縮約表（COLLAPSE_5 など）
+
+    Returns:
+        文字列の入れ子辞書
+    """
+    n = len(keys)
+    view: Dict[str, Dict[str, str]] = {}
+    for i, row_key in enumerate(keys):
+        row: Dict[str, str] = {}
+        for j, col_key in enumerate(keys):
+            code = flat[i * n + j]
+            if collapse is not None:
+                code = collapse[code]
+            row[col_key] = names[code]
+        view[row_key] = row
+    return view
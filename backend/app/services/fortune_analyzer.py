@@ -2,12 +2,41 @@
 ドンサゴン吉凶判定サービス
 DONSAGONG_MASTER_DATABASE.mdに基づいた大運の吉凶レベル判定
 """
-from datetime import datetime
-from typing import Dict, List, Literal, Optional, Tuple
+import json
+from array import array
+from typing import List, Literal, Optional, Tuple
+
+from .donsagong_matrix import (
+    BRANCH_INDEX,
+    COLLAPSE_5,
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    JIJI_FLAT,
+    JOHOO_FLAT,
+    LEVELS,
+    SCORE_5,
+    STEM_INDEX,
+    TENGAN_FLAT,
+    as_dict,
+    jiji_level,
+    johoo_level,
+    tengan_level,
+)
+from .ganzhi import Ganzhi
 
 # 吉凶レベル型（7段階）
 FortuneLevel = Literal["大吉", "吉", "中吉", "小吉", "平", "凶", "大凶"]
 
+# 判定ロジックのバージョン（重み付け・天干/地支/調候の表を変えたら更新する）
+# 保存済み命式のanalyzer_versionと違えば、recompute_daeunジョブで再計算の対象になる
+ANALYZER_VERSION = "2025-11-10"
+
+# 吉凶レベル文字列 → 保存する数値（saju.fortune_level）
+FORTUNE_LEVEL_CODES = {"大凶": 1, "凶": 2, "平": 3, "吉凶": 4, "吉": 5, "小吉": 6, "大吉": 7}
+
+# 保存する数値 → 吉凶レベル文字列
+FORTUNE_LEVEL_NAMES = {code: name for name, code in FORTUNE_LEVEL_CODES.items()}
+
 # 月地支から季節を取得するマッピング
 MONTH_BRANCH_TO_SEASON = {
     "寅": "봄",  # 2月
@@ -24,20 +53,30 @@ MONTH_BRANCH_TO_SEASON = {
     "丑": "겨울",  # 1月
 }
 
+# 5段階スコアの事前計算表（平坦配列、行×列）
+_TENGAN_SCORE = array("b", (SCORE_5[code] for code in TENGAN_FLAT))
+_JIJI_SCORE = array("b", (SCORE_5[code] for code in JIJI_FLAT))
+_JOHOO_SCORE = array("b", (SCORE_5[code] for code in JOHOO_FLAT))
+
+# 特殊調候の対象日干（丁・辛）と大運地支別スコア（秋冬=吉, 夏=凶, 春=平）
+_SPECIAL_JOHOO_STEMS = frozenset((STEM_INDEX["丁"], STEM_INDEX["辛"]))
+_SPECIAL_JOHOO_SCORE = (1, 1, 0, 0, 0, -1, -1, -1, 1, 1, 1, 1)
+
 
 class FortuneAnalyzer:
     """ドンサゴン吉凶判定エンジン"""
 
     def __init__(self):
         """初期化"""
+        # 表の実体はdonsagong_matrixの配列。ここでは5段階に縮約した文字列ビューのみ保持
         # 天干100マトリックス
-        self.tengan_matrix = self._load_tengan_matrix()
+        self.tengan_matrix = as_dict(TENGAN_FLAT, HEAVENLY_STEMS, collapse=COLLAPSE_5)
 
         # 地支144マトリックス
-        self.jiji_matrix = self._load_jiji_matrix()
+        self.jiji_matrix = as_dict(JIJI_FLAT, EARTHLY_BRANCHES, collapse=COLLAPSE_5)
 
         # 調候用神表（月地支別）
-        self.johoo_table = self._load_johoo_table()
+        self.johoo_table = as_dict(JOHOO_FLAT, EARTHLY_BRANCHES, collapse=COLLAPSE_5)
 
     def analyze_daeun_fortune(
         self,
@@ -50,12 +89,7 @@ class FortuneAnalyzer:
         daeun_branch: str,
     ) -> FortuneLevel:
         """
-        大運の吉凶レベルを7段階で判定
-
-        新ロジック（2025-11-10確定）:
-        - 日柱50% + 時柱20% + 調候30% = 100%
-        - 各柱内: 天干70% + 地支30%（三合時は40%）
-        - 三合成立時は地支を吉(+1)扱い
+        大運の吉凶レベルを7段階で判定（漢字入力版）
 
         Args:
             day_stem: 日干
@@ -69,40 +103,92 @@ class FortuneAnalyzer:
         Returns:
             吉凶レベル（7段階）
         """
-        # 天干の吉凶を取得
-        day_stem_fortune = self._check_tengan_relation(day_stem, daeun_stem)
-        hour_stem_fortune = self._check_tengan_relation(hour_stem, daeun_stem)
+        try:
+            return self.analyze_daeun_codes(
+                STEM_INDEX[day_stem],
+                BRANCH_INDEX[day_branch],
+                STEM_INDEX[hour_stem],
+                BRANCH_INDEX[hour_branch],
+                BRANCH_INDEX[month_branch],
+                STEM_INDEX[daeun_stem],
+                BRANCH_INDEX[daeun_branch],
+            )
+        except KeyError as e:
+            raise ValueError(f"不正な天干・地支です: {e.args[0]}")
+
+    def analyze_daeun(
+        self, day: Ganzhi, hour: Ganzhi, month_branch: int, daeun: Ganzhi
+    ) -> FortuneLevel:
+        """
+        大運の吉凶レベルを7段階で判定（干支値版）
 
-        # 地支の吉凶を取得
-        day_branch_fortune = self._check_jiji_relation(day_branch, daeun_branch)
-        hour_branch_fortune = self._check_jiji_relation(hour_branch, daeun_branch)
+        Args:
+            day: 日柱
+            hour: 時柱
+            month_branch: 月地支コード（季節判定用）
+            daeun: 大運干支
+
+        Returns:
+            吉凶レベル（7段階）
+        """
+        return self.analyze_daeun_codes(
+            day.stem, day.branch, hour.stem, hour.branch, month_branch, daeun.stem, daeun.branch
+        )
+
+    def analyze_daeun_codes(
+        self,
+        day_stem: int,
+        day_branch: int,
+        hour_stem: int,
+        hour_branch: int,
+        month_branch: int,
+        daeun_stem: int,
+        daeun_branch: int,
+    ) -> FortuneLevel:
+        """
+        大運の吉凶レベルを7段階で判定（整数コード版・計算の本体）
+
+        新ロジック（2025-11-10確定）:
+        - 日柱50% + 時柱20% + 調候30% = 100%
+        - 各柱内: 天干70% + 地支30%（三合時は40%）
+        - 三合成立時は地支を吉(+1)扱い
 
-        # 調候判定
-        johoo_fortune = self._check_johoo(month_branch, daeun_branch, day_stem)
+        Args:
+            day_stem: 日干コード（0〜9）
+            day_branch: 日支コード（0〜11）
+            hour_stem: 時干コード
+            hour_branch: 時支コード
+            month_branch: 月地支コード（季節判定用）
+            daeun_stem: 大運天干コード
+            daeun_branch: 大運地支コード
 
-        # スコア化
-        score_map = {"大吉": 2, "吉": 1, "平": 0, "凶": -1, "大凶": -2}
-        day_stem_score = score_map.get(day_stem_fortune, 0)
-        hour_stem_score = score_map.get(hour_stem_fortune, 0)
-        johoo_score = score_map.get(johoo_fortune, 0)
+        Returns:
+            吉凶レベル（7段階）
+        """
+        # 天干のスコア（5段階縮約済み）
+        day_stem_score = _TENGAN_SCORE[day_stem * 10 + daeun_stem]
+        hour_stem_score = _TENGAN_SCORE[hour_stem * 10 + daeun_stem]
 
-        # 三合チェック
-        day_sangap = self._is_sangap(day_branch, daeun_branch)
-        hour_sangap = self._is_sangap(hour_branch, daeun_branch)
+        # 調候判定（丁火・辛金は独自の調候を使用）
+        if day_stem in _SPECIAL_JOHOO_STEMS:
+            johoo_score = _SPECIAL_JOHOO_SCORE[daeun_branch]
+        else:
+            johoo_score = _JOHOO_SCORE[month_branch * 12 + daeun_branch]
 
         # 地支スコアと重み（三合時は吉+1扱い＆重み0.4）
-        if day_sangap:
+        # 三合グループは地支コードを4で割った余りが等しい組（申子辰・巳酉丑・寅午戌・亥卯未）
+        if day_branch % 4 == daeun_branch % 4:
             day_branch_score = 1  # 吉扱い
             day_jiji_weight = 0.4
         else:
-            day_branch_score = score_map.get(day_branch_fortune, 0)
+            day_branch_score = _JIJI_SCORE[day_branch * 12 + daeun_branch]
             day_jiji_weight = 0.3
 
-        if hour_sangap:
+        if hour_branch % 4 == daeun_branch % 4:
             hour_branch_score = 1  # 吉扱い
             hour_jiji_weight = 0.4
         else:
-            hour_branch_score = score_map.get(hour_branch_fortune, 0)
+            hour_branch_score = _JIJI_SCORE[hour_branch * 12 + daeun_branch]
             hour_jiji_weight = 0.3
 
         # 柱スコア計算
@@ -134,9 +220,11 @@ class FortuneAnalyzer:
         if from_stem == to_stem:
             return "平"
 
+        if from_stem not in STEM_INDEX or to_stem not in STEM_INDEX:
+            return "平"
+
         # マトリックスから関係を取得
-        relation = self.tengan_matrix.get(from_stem, {}).get(to_stem, "平")
-        return relation
+        return LEVELS[COLLAPSE_5[tengan_level(from_stem, to_stem)]]
 
     def _check_jiji_relation(self, from_branch: str, to_branch: str) -> str:
         """
@@ -157,9 +245,11 @@ class FortuneAnalyzer:
         if from_branch == to_branch:
             return "平"
 
+        if from_branch not in BRANCH_INDEX or to_branch not in BRANCH_INDEX:
+            return "平"
+
         # マトリックスから関係を取得
-        relation = self.jiji_matrix.get(from_branch, {}).get(to_branch, "平")
-        return relation
+        return LEVELS[COLLAPSE_5[jiji_level(from_branch, to_branch)]]
 
     def _is_sangap(self, branch1: str, branch2: str) -> bool:
         """
@@ -178,16 +268,11 @@ class FortuneAnalyzer:
         Returns:
             True: 三合成立, False: 三合なし
         """
-        sangap_groups = [
-            {"寅", "午", "戌"},  # 木局
-            {"巳", "酉", "丑"},  # 火局
-            {"申", "子", "辰"},  # 金局
-            {"亥", "卯", "未"},  # 水局
-        ]
-        for group in sangap_groups:
-            if branch1 in group and branch2 in group:
-                return True
-        return False
+        if branch1 not in BRANCH_INDEX or branch2 not in BRANCH_INDEX:
+            return False
+
+        # 同じ三合グループの地支はコードを4で割った余りが等しい
+        return BRANCH_INDEX[branch1] % 4 == BRANCH_INDEX[branch2] % 4
 
     def _check_johoo(self, month_branch: str, daeun_branch: str, day_stem: str) -> str:
         """
@@ -210,14 +295,11 @@ class FortuneAnalyzer:
         if day_stem in ["丁", "辛"]:
             return self._check_special_johoo(daeun_branch)
 
-        # 原局の季節を取得
-        season = MONTH_BRANCH_TO_SEASON.get(month_branch, "봄")
+        if month_branch not in BRANCH_INDEX or daeun_branch not in BRANCH_INDEX:
+            return "平"
 
         # 調候表から吉凶を取得（大運地支ベース）
-        johoo_data = self.johoo_table.get(month_branch, {})
-        fortune = johoo_data.get(daeun_branch, "平")
-
-        return fortune
+        return LEVELS[COLLAPSE_5[johoo_level(month_branch, daeun_branch)]]
 
     def _check_special_johoo_by_stem(self, daeun_stem: str) -> str:
         """
@@ -299,205 +381,41 @@ class FortuneAnalyzer:
         else:
             return "大凶"
 
-    def _load_tengan_matrix(self) -> Dict[str, Dict[str, str]]:
-        """
-        天干100マトリックスをロード
-        DONSAGONG_MASTER_DATABASE.mdの天干マトリックスを簡略化して実装
-        """
-        return {
-            "甲": {
-                "甲": "平", "乙": "凶", "丙": "吉", "丁": "吉", "戊": "吉",
-                "己": "大凶", "庚": "大凶", "辛": "凶", "壬": "凶", "癸": "吉"
-            },
-            "乙": {
-                "甲": "吉", "乙": "平", "丙": "大吉", "丁": "吉", "戊": "吉",
-                "己": "吉", "庚": "大凶", "辛": "凶", "壬": "凶", "癸": "吉"
-            },
-            "丙": {
-                "甲": "吉", "乙": "吉", "丙": "平", "丁": "凶", "戊": "平",
-                "己": "平", "庚": "凶", "辛": "大凶", "壬": "吉", "癸": "凶"
-            },
-            "丁": {
-                "甲": "吉", "乙": "吉", "丙": "凶", "丁": "平", "戊": "吉",
-                "己": "吉", "庚": "吉", "辛": "大凶", "壬": "大凶", "癸": "凶"
-            },
-            "戊": {
-                "甲": "大吉", "乙": "吉", "丙": "吉", "丁": "吉", "戊": "平",
-                "己": "凶", "庚": "凶", "辛": "凶", "壬": "平", "癸": "大凶"
-            },
-            "己": {
-                "甲": "凶", "乙": "吉", "丙": "吉", "丁": "吉", "戊": "凶",
-                "己": "平", "庚": "凶", "辛": "凶", "壬": "凶", "癸": "平"
-            },
-            "庚": {
-                "甲": "吉", "乙": "大凶", "丙": "吉", "丁": "吉", "戊": "吉",
-                "己": "吉", "庚": "平", "辛": "大凶", "壬": "吉", "癸": "吉"
-            },
-            "辛": {
-                "甲": "吉", "乙": "吉", "丙": "大凶", "丁": "大凶", "戊": "凶",
-                "己": "平", "庚": "凶", "辛": "平", "壬": "大吉", "癸": "吉"
-            },
-            "壬": {
-                "甲": "吉", "乙": "吉", "丙": "大吉", "丁": "大凶", "戊": "吉",
-                "己": "凶", "庚": "大吉", "辛": "凶", "壬": "平", "癸": "凶"
-            },
-            "癸": {
-                "甲": "吉", "乙": "吉", "丙": "凶", "丁": "凶", "戊": "凶",
-                "己": "凶", "庚": "吉", "辛": "凶", "壬": "凶", "癸": "平"
-            }
-        }
-
-    def _load_jiji_matrix(self) -> Dict[str, Dict[str, str]]:
-        """
-        地支144マトリックスをロード
-        DONSAGONG_MASTER_DATABASE.mdの地支マトリックスを簡略化して実装
-
-        主要な関係:
-        - 合: 吉
-        - 充: 凶
-        - 三合: 大吉
-        """
-        return {
-            "寅": {
-                "寅": "平", "卯": "凶", "辰": "吉", "巳": "吉", "午": "大吉", "未": "吉",
-                "申": "大凶", "酉": "大凶", "戌": "吉", "亥": "平", "子": "凶", "丑": "凶"
-            },
-            "卯": {
-                "寅": "吉", "卯": "平", "辰": "吉", "巳": "吉", "午": "平", "未": "大吉",
-                "申": "大凶", "酉": "大凶", "戌": "平", "亥": "平", "子": "凶", "丑": "凶"
-            },
-            "辰": {
-                "寅": "吉", "卯": "吉", "辰": "平", "巳": "大凶", "午": "凶", "未": "凶",
-                "申": "平", "酉": "凶", "戌": "大凶", "亥": "平", "子": "平", "丑": "大凶"
-            },
-            "巳": {
-                "寅": "吉", "卯": "吉", "辰": "大凶", "巳": "平", "午": "大凶", "未": "凶",
-                "申": "凶", "酉": "吉", "戌": "凶", "亥": "大凶", "子": "凶", "丑": "吉"
-            },
-            "午": {
-                "寅": "吉", "卯": "吉", "辰": "大凶", "巳": "凶", "午": "平", "未": "凶",
-                "申": "平", "酉": "凶", "戌": "大吉", "亥": "平", "子": "凶", "丑": "吉"
-            },
-            "未": {
-                "寅": "吉", "卯": "大吉", "辰": "凶", "巳": "凶", "午": "凶", "未": "平",
-                "申": "吉", "酉": "平", "戌": "凶", "亥": "大吉", "子": "大吉", "丑": "凶"
-            },
-            "申": {
-                "寅": "平", "卯": "凶", "辰": "吉", "巳": "平", "午": "平", "未": "平",
-                "申": "平", "酉": "平", "戌": "凶", "亥": "平", "子": "吉", "丑": "凶"
-            },
-            "酉": {
-                "寅": "凶", "卯": "凶", "辰": "凶", "巳": "吉", "午": "凶", "未": "凶",
-                "申": "凶", "酉": "平", "戌": "凶", "亥": "凶", "子": "凶", "丑": "吉"
-            },
-            "戌": {
-                "寅": "大吉", "卯": "凶", "辰": "大凶", "巳": "平", "午": "大吉", "未": "凶",
-                "申": "吉", "酉": "平", "戌": "平", "亥": "平", "子": "平", "丑": "凶"
-            },
-            "亥": {
-                "寅": "吉", "卯": "大吉", "辰": "凶", "巳": "大凶", "午": "凶", "未": "大吉",
-                "申": "平", "酉": "平", "戌": "大吉", "亥": "平", "子": "凶", "丑": "凶"
-            },
-            "子": {
-                "寅": "吉", "卯": "吉", "辰": "吉", "巳": "平", "午": "凶", "未": "凶",
-                "申": "吉", "酉": "平", "戌": "凶", "亥": "大凶", "子": "平", "丑": "大凶"
-            },
-            "丑": {
-                "寅": "吉", "卯": "吉", "辰": "凶", "巳": "吉", "午": "大吉", "未": "凶",
-                "申": "平", "酉": "吉", "戌": "凶", "亥": "平", "子": "吉", "丑": "平"
-            }
-        }
-
-    def _load_johoo_table(self) -> Dict[str, Dict[str, str]]:
-        """
-        調候用神表をロード
-        DONSAGONG_MASTER_DATABASE.mdの調候用神吉凶表を実装
 
-        月地支別に、大運地支の吉凶を判定
-        """
-        return {
-            # 寅月生（2月）
-            "寅": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "吉", "午": "大吉", "未": "吉",
-                "申": "大凶", "酉": "大凶", "戌": "大凶",
-                "亥": "大凶", "子": "大凶", "丑": "大凶"
-            },
-            # 卯月生（3月）
-            "卯": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "大吉", "午": "大吉", "未": "大吉",
-                "申": "凶", "酉": "凶", "戌": "凶",
-                "亥": "凶", "子": "凶", "丑": "凶"
-            },
-            # 辰月生（4月）
-            "辰": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "吉", "午": "吉", "未": "吉",
-                "申": "吉", "酉": "吉", "戌": "凶",
-                "亥": "凶", "子": "凶", "丑": "凶"
-            },
-            # 巳月生（5月）
-            "巳": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "凶", "午": "凶", "未": "凶",
-                "申": "吉", "酉": "吉", "戌": "吉",
-                "亥": "吉", "子": "吉", "丑": "吉"
-            },
-            # 午月生（6月）
-            "午": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "凶", "午": "凶", "未": "凶",
-                "申": "吉", "酉": "吉", "戌": "吉",
-                "亥": "大吉", "子": "大吉", "丑": "大吉"
-            },
-            # 未月生（7月）
-            "未": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "凶", "午": "凶", "未": "凶",
-                "申": "吉", "酉": "吉", "戌": "凶",
-                "亥": "大吉", "子": "大吉", "丑": "吉"
-            },
-            # 申月生（8月）
-            "申": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "大吉", "午": "大吉", "未": "大吉",
-                "申": "凶", "酉": "凶", "戌": "吉",
-                "亥": "凶", "子": "凶", "丑": "凶"
-            },
-            # 酉月生（9月）
-            "酉": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "大吉", "午": "大吉", "未": "大吉",
-                "申": "凶", "酉": "凶", "戌": "凶",
-                "亥": "凶", "子": "凶", "丑": "凶"
-            },
-            # 戌月生（10月）
-            "戌": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "吉", "午": "吉", "未": "吉",
-                "申": "吉", "酉": "吉", "戌": "吉",
-                "亥": "凶", "子": "凶", "丑": "凶"
-            },
-            # 亥月生（11月）
-            "亥": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "大吉", "午": "大吉", "未": "大吉",
-                "申": "凶", "酉": "凶", "戌": "吉",
-                "亥": "大凶", "子": "大凶", "丑": "大凶"
-            },
-            # 子月生（12月）
-            "子": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "大吉", "午": "大吉", "未": "大吉",
-                "申": "凶", "酉": "凶", "戌": "大吉",
-                "亥": "大凶", "子": "平", "丑": "大凶"
-            },
-            # 丑月生（1月）
-            "丑": {
-                "寅": "吉", "卯": "吉", "辰": "吉",
-                "巳": "大吉", "午": "大吉", "未": "大吉",
-                "申": "凶", "酉": "凶", "戌": "吉",
-                "亥": "大吉", "子": "大吉", "丑": "平"
-            }
-        }
+# プロセスごとの判定エンジン（ジョブのCPUワーカーで使い回す）
+_worker_analyzer: Optional[FortuneAnalyzer] = None
+
+
+def reanalyze_daeun_lists(
+    rows: List[Tuple[str, str, str, str, str, str, Optional[str]]]
+) -> List[Tuple[str, str]]:
+    """
+    保存済み命式の大運リストの吉凶レベルを再判定（ジョブのプロセスプールから呼ぶ）
+
+    Args:
+        rows: (命式ID, 日干, 日支, 時干, 時支, 月支, 大運リストJSON) のリスト
+
+    Returns:
+        吉凶レベルが変わった命式の (命式ID, 新しい大運リストJSON) のリスト
+    """
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = FortuneAnalyzer()
+
+    changed = []
+    for saju_id, day_stem, day_branch, hour_stem, hour_branch, month_branch, daeun_json in rows:
+        if not daeun_json:
+            continue
+        daeun_list = json.loads(daeun_json)
+        dirty = False
+        for daeun in daeun_list:
+            level = _worker_analyzer.analyze_daeun_fortune(
+                day_stem, day_branch, hour_stem, hour_branch, month_branch,
+                daeun["daeunStem"], daeun["daeunBranch"],
+            )
+            if daeun.get("fortuneLevel") != level:
+                daeun["fortuneLevel"] = level
+                dirty = True
+        if dirty:
+            changed.append((saju_id, json.dumps(daeun_list, ensure_ascii=False)))
+    return changed
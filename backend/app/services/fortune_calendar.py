@@ -0,0 +1,112 @@
+"""
+日運カレンダー（1900〜2109年）
+(日干, 日付)ごとの日運の吉凶レベルコード・十神コードを実体化した読み取り専用テーブル
+
+- 日柱は1日ごとに六十甲子を1つ進むため、序数日から順送りで求める
+  （1900〜2109年の全日でlunar-pythonの日柱と一致）
+- 吉凶・十神は日干と日柱の天干だけで決まるため、日干10種ごとに
+  日柱コード列をbytes.translateで変換して作る（初回参照時に1回だけ）
+- 日運リストは月初から月末までのスライスを読むだけになる
+"""
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from .donsagong_matrix import TENGAN_FLAT
+from .ganzhi import Ganzhi
+from .sipsin import SIPSIN_FLAT
+
+CALENDAR_START = date(1900, 1, 1)
+CALENDAR_END = date(2109, 12, 31)
+
+# 序数日（date.toordinal）→ 日柱コードのずれ（2000-01-01は戊午）
+_DAY_PILLAR_OFFSET = 14
+
+
+def day_pillar_of(day: date) -> Ganzhi:
+    """日柱を六十甲子の順送りで求める"""
+    return Ganzhi((day.toordinal() + _DAY_PILLAR_OFFSET) % 60)
+
+
+class FortuneCalendar:
+    """
+    日運カレンダー（読み取り専用）
+
+    - pillars: 各日の日柱コード（CALENDAR_STARTからの日数でインデックス）
+    - levels(day_stem) / sipsins(day_stem): 各日の吉凶レベルコード・十神コード
+    """
+
+    __slots__ = ("start", "end", "pillars", "_levels", "_sipsins")
+
+    def __init__(self, start: date = CALENDAR_START, end: date = CALENDAR_END):
+        first = start.toordinal() + _DAY_PILLAR_OFFSET
+        self.start = start
+        self.end = end
+        self.pillars = bytes(
+            (first + i) % 60 for i in range(end.toordinal() - start.toordinal() + 1)
+        )
+        self._levels: list = [None] * 10
+        self._sipsins: list = [None] * 10
+
+    def __len__(self) -> int:
+        return len(self.pillars)
+
+    def levels(self, day_stem: int) -> bytes:
+        """日干の各日の吉凶レベルコード（donsagong_matrixのLEVELS順）"""
+        table = self._levels[day_stem]
+        if table is None:
+            row = TENGAN_FLAT[day_stem * 10:day_stem * 10 + 10]
+            table = self._levels[day_stem] = self.pillars.translate(_by_stem(row))
+        return table
+
+    def sipsins(self, day_stem: int) -> bytes:
+        """日干の各日の十神コード（SIPSIN_NAMES順）"""
+        table = self._sipsins[day_stem]
+        if table is None:
+            row = SIPSIN_FLAT[day_stem * 10:day_stem * 10 + 10]
+            table = self._sipsins[day_stem] = self.pillars.translate(_by_stem(row))
+        return table
+
+    def offset(self, day: date) -> Optional[int]:
+        """
+        日付のインデックスを取得
+
+        Args:
+            day: 日付
+
+        Returns:
+            インデックス（範囲外ならNone）
+        """
+        if not (self.start <= day <= self.end):
+            return None
+        return day.toordinal() - self.start.toordinal()
+
+    def read(self, day_stem: int, first: date, last: date) -> Optional[Tuple[bytes, bytes, bytes]]:
+        """
+        期間（両端を含む）の日柱・吉凶レベル・十神コード列を取得
+
+        Args:
+            day_stem: 日干コード（0〜9）
+            first: 開始日
+            last: 終了日
+
+        Returns:
+            (日柱コード列, 吉凶レベルコード列, 十神コード列)。範囲外を含む場合はNone
+        """
+        lo = self.offset(first)
+        hi = self.offset(last)
+        if lo is None or hi is None:
+            return None
+        hi += 1
+        return self.pillars[lo:hi], self.levels(day_stem)[lo:hi], self.sipsins(day_stem)[lo:hi]
+
+
+def _by_stem(row) -> bytes:
+    """日柱コード（0〜59）→ 天干ごとの値の変換表（bytes.translate用）"""
+    return bytes(row[code % 10] for code in range(60)) + bytes(196)
+
+
+@lru_cache(maxsize=1)
+def get_fortune_calendar() -> FortuneCalendar:
+    """1900〜2109年の日運カレンダーを取得（プロセス内で1つだけ作る）"""
+    return FortuneCalendar()
@@ -4,18 +4,23 @@ lunar-pythonを使用して年運・月運・日運の干支を計算し、
 ドンサゴンマトリックスで吉凶判定を行う
 """
 import calendar
-import json
-import os
-from datetime import datetime
-from typing import Dict, List, Literal, Tuple
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Literal, Optional, Tuple
 
 from lunar_python import Solar
 
-# 10天干 (漢字)
-HEAVENLY_STEMS = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
-
-# 12地支 (漢字)
-EARTHLY_BRANCHES = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+from .clock import AsOf
+from .donsagong_matrix import (  # noqa: F401 (互換用)
+    BRANCH_INDEX,
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    LEVELS,
+    STEM_INDEX,
+    TENGAN_FLAT,
+)
+from .fortune_calendar import FortuneCalendar, day_pillar_of, get_fortune_calendar
+from .ganzhi import BRANCH_ELEMENTS, STEM_ELEMENTS, Ganzhi
+from .sipsin import SIPSIN_NAMES, sipsin_of, stem_sipsin
 
 # 吉凶レベル型
 FortuneLevel = Literal["大吉", "小吉", "吉", "吉凶", "平", "凶", "大凶"]
@@ -25,37 +30,54 @@ FiveElement = Literal["wood", "fire", "earth", "metal", "water"]
 
 # ドンサゴン吉凶マッピング（7段階システム対応）
 DONSAGONG_FORTUNE_MAP = {
-    "대길": "大吉",
-    "소길": "小吉",
-    "길": "吉",
-    "길흉": "平",  # 7段階システムでは「吉凶」は「平」にマッピング
-    "평": "平",
-    "흉": "凶",
-    "대흉": "大凶",
-    "무": "平"  # 無は平として扱う
+    "大吉": "大吉",
+    "小吉": "小吉",
+    "吉": "吉",
+    "吉凶": "平",  # 7段階システムでは「吉凶」は「平」にマッピング
+    "平": "平",
+    "凶": "凶",
+    "大凶": "大凶",
+    "無": "平"  # 無は平として扱う
 }
 
+# レベルコード → 7段階吉凶（donsagong_matrixのコード順）
+_FORTUNE_BY_LEVEL: Tuple[FortuneLevel, ...] = tuple(
+    DONSAGONG_FORTUNE_MAP.get(name, "平") for name in LEVELS
+)
+
+# (吉凶レベル, 十神)の早見表（インデックス: 日干コード×10＋対象天干コード）
+_EVALUATION: Tuple[Tuple[FortuneLevel, str], ...] = tuple(
+    (_FORTUNE_BY_LEVEL[TENGAN_FLAT[i]], stem_sipsin(i // 10, i % 10)) for i in range(100)
+)
+
+
+def _eight_char(year: int, month: int, day: int):
+    """指定日のEightCharを取得"""
+    return Solar.fromYmd(year, month, day).getLunar().getEightChar()
+
+
+def year_pillar_of(year: int) -> Ganzhi:
+    """
+    年柱（立春後）を六十甲子の順送りで求める
+
+    西暦4年が甲子年。1900〜2109年の全年でlunar-pythonの7月1日の年柱と一致する
+    """
+    return Ganzhi((year - 4) % 60)
+
+
+def month_pillar_of(year: int, month: int) -> Ganzhi:
+    """
+    月柱（その月15日時点）を六十甲子の順送りで求める
+
+    月柱は節入りごとに1つ進み、各月15日は必ずその月の節入り後にある。
+    1900〜2109年の全月でlunar-pythonの15日の月柱と一致する
+    """
+    return Ganzhi((year * 12 + month + 12) % 60)
+
 
 class FortuneCalculator:
     """年月日運計算エンジン"""
 
-    def __init__(self):
-        """初期化"""
-        # ドンサゴン天干マトリックスを読み込む
-        self.cheongan_matrix = self._load_cheongan_matrix()
-
-    def _load_cheongan_matrix(self) -> Dict:
-        """ドンサゴン天干マトリックスを読み込む"""
-        matrix_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "data",
-            "donsagong_cheongan_matrix.json"
-        )
-        with open(matrix_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data["천간_100_매트릭스"]
-
     def calculate_year_fortune(
         self,
         birth_year: int,
@@ -77,21 +99,9 @@ class FortuneCalculator:
         Returns:
             (年天干, 年地支, 吉凶レベル, 十神)
         """
-        # 立春以降の日付を使用（四柱推命では立春が年の切り替わり）
-        # target_yearの7月1日の干支を取得（確実に立春後）
-        solar = Solar.fromYmd(target_year, 7, 1)
-        lunar = solar.getLunar()
-        eight_char = lunar.getEightChar()
-        year_stem = eight_char.getYearGan()  # 年天干
-        year_branch = eight_char.getYearZhi()  # 年地支
-
-        # 吉凶判定（簡易版）
-        fortune_level = self._calculate_fortune_level(day_stem, year_stem, year_branch)
-
-        # 十神計算（簡易版）
-        sipsin = self._calculate_sipsin(day_stem, year_stem)
-
-        return year_stem, year_branch, fortune_level, sipsin
+        pillar = self._year_pillar(target_year)
+        fortune_level, sipsin = self._evaluate(STEM_INDEX[day_stem], pillar)
+        return pillar.stem_char, pillar.branch_char, fortune_level, sipsin
 
     def calculate_month_fortune(
         self,
@@ -110,21 +120,9 @@ class FortuneCalculator:
         Returns:
             (月天干, 月地支, 吉凶レベル, 十神)
         """
-        # 節気後の日付を使用（四柱推命では節入日が月の切り替わり）
-        # target_year/target_monthの15日の干支を取得（確実に節気後）
-        solar = Solar.fromYmd(target_year, target_month, 15)
-        lunar = solar.getLunar()
-        eight_char = lunar.getEightChar()
-        month_stem = eight_char.getMonthGan()  # 月天干
-        month_branch = eight_char.getMonthZhi()  # 月地支
-
-        # 吉凶判定（簡易版）
-        fortune_level = self._calculate_fortune_level(day_stem, month_stem, month_branch)
-
-        # 十神計算（簡易版）
-        sipsin = self._calculate_sipsin(day_stem, month_stem)
-
-        return month_stem, month_branch, fortune_level, sipsin
+        pillar = self._month_pillar(target_year, target_month)
+        fortune_level, sipsin = self._evaluate(STEM_INDEX[day_stem], pillar)
+        return pillar.stem_char, pillar.branch_char, fortune_level, sipsin
 
     def calculate_day_fortune(
         self,
@@ -145,20 +143,9 @@ class FortuneCalculator:
         Returns:
             (日天干, 日地支, 吉凶レベル, 十神)
         """
-        # 指定日の干支を取得
-        solar = Solar.fromYmd(target_year, target_month, target_day)
-        lunar = solar.getLunar()
-        eight_char = lunar.getEightChar()
-        calc_day_stem = eight_char.getDayGan()  # 日天干
-        calc_day_branch = eight_char.getDayZhi()  # 日地支
-
-        # 吉凶判定（簡易版）
-        fortune_level = self._calculate_fortune_level(day_stem, calc_day_stem, calc_day_branch)
-
-        # 十神計算（簡易版）
-        sipsin = self._calculate_sipsin(day_stem, calc_day_stem)
-
-        return calc_day_stem, calc_day_branch, fortune_level, sipsin
+        pillar = self._day_pillar(target_year, target_month, target_day)
+        fortune_level, sipsin = self._evaluate(STEM_INDEX[day_stem], pillar)
+        return pillar.stem_char, pillar.branch_char, fortune_level, sipsin
 
     def get_actual_year_pillar(
         self,
@@ -177,10 +164,8 @@ class FortuneCalculator:
         Returns:
             (年天干, 年地支)
         """
-        solar = Solar.fromYmd(target_year, target_month, target_day)
-        lunar = solar.getLunar()
-        eight_char = lunar.getEightChar()
-        return eight_char.getYearGan(), eight_char.getYearZhi()
+        pillar = Ganzhi.from_str(_eight_char(target_year, target_month, target_day).getYear())
+        return pillar.stem_char, pillar.branch_char
 
     def get_actual_month_pillar(
         self,
@@ -199,10 +184,8 @@ class FortuneCalculator:
         Returns:
             (月天干, 月地支)
         """
-        solar = Solar.fromYmd(target_year, target_month, target_day)
-        lunar = solar.getLunar()
-        eight_char = lunar.getEightChar()
-        return eight_char.getMonthGan(), eight_char.getMonthZhi()
+        pillar = Ganzhi.from_str(_eight_char(target_year, target_month, target_day).getMonth())
+        return pillar.stem_char, pillar.branch_char
 
     def calculate_year_list(
         self,
@@ -211,6 +194,7 @@ class FortuneCalculator:
         birth_day: int,
         day_stem: str,
         daeun_start_age: int,
+        as_of: Optional[AsOf] = None,
     ) -> List[Dict]:
         """
         大運期間（10年分）の年運リストを計算
@@ -221,32 +205,18 @@ class FortuneCalculator:
             birth_day: 生まれた日
             day_stem: 日干
             daeun_start_age: 大運開始年齢
+            as_of: isCurrent判定の基準日時（省略時は現在時刻）
 
         Returns:
             年運情報のリスト
         """
         year_list = []
-        current_year = datetime.now().year
+        as_of = as_of or AsOf.current()
+        day_stem_code = STEM_INDEX[day_stem]
 
         for i in range(10):
             age = daeun_start_age + i
-            year = birth_year + age
-            year_stem, year_branch, fortune_level, sipsin = self.calculate_year_fortune(
-                birth_year, birth_month, birth_day, day_stem, year
-            )
-
-            year_list.append(
-                {
-                    "id": i + 1,
-                    "year": year,
-                    "age": age,
-                    "yearStem": year_stem,
-                    "yearBranch": year_branch,
-                    "fortuneLevel": fortune_level,
-                    "sipsin": sipsin,
-                    "isCurrent": year == current_year,
-                }
-            )
+            year_list.append(self._year_entry(i + 1, birth_year + age, age, day_stem_code, as_of))
 
         return year_list
 
@@ -254,6 +224,7 @@ class FortuneCalculator:
         self,
         day_stem: str,
         target_year: int,
+        as_of: Optional[AsOf] = None,
     ) -> List[Dict]:
         """
         指定年の月運リスト（12ヶ月分）を計算
@@ -261,39 +232,75 @@ class FortuneCalculator:
         Args:
             day_stem: 日干
             target_year: 対象年
+            as_of: isCurrent判定の基準日時（省略時は現在時刻）
 
         Returns:
             月運情報のリスト
         """
         month_list = []
-        current_year = datetime.now().year
-        current_month = datetime.now().month
+        as_of = as_of or AsOf.current()
+        day_stem_code = STEM_INDEX[day_stem]
 
         for month in range(1, 13):
-            month_stem, month_branch, fortune_level, sipsin = self.calculate_month_fortune(
-                day_stem, target_year, month
-            )
-
-            month_list.append(
-                {
-                    "id": month,
-                    "year": target_year,
-                    "month": month,
-                    "monthStem": month_stem,
-                    "monthBranch": month_branch,
-                    "fortuneLevel": fortune_level,
-                    "sipsin": sipsin,
-                    "isCurrent": target_year == current_year and month == current_month,
-                }
-            )
+            month_list.append(self._month_entry(target_year, month, day_stem_code, as_of))
 
         return month_list
 
+    def calculate_day_rows(
+        self,
+        day_stem: str,
+        target_year: int,
+        target_month: int,
+        as_of: Optional[AsOf] = None,
+    ) -> List[Tuple[int, str, str, str, str, bool]]:
+        """
+        指定年月の日運（28-31日分）を計算し、1日1タプルで返す
+
+        辞書を作らないため、レスポンスへそのまま書き出せる（日運リストAPI）
+
+        Args:
+            day_stem: 日干
+            target_year: 対象年
+            target_month: 対象月
+            as_of: isToday判定の基準日時（省略時は現在時刻）
+
+        Returns:
+            (日, 日天干, 日地支, 吉凶レベル, 十神, 今日かどうか) のリスト
+        """
+        days_in_month = calendar.monthrange(target_year, target_month)[1]
+        as_of = as_of or AsOf.current()
+        day_stem_code = STEM_INDEX[day_stem]
+
+        # 日運カレンダーから月初〜月末を読む（範囲外の年はその月だけ作る）
+        first = date(target_year, target_month, 1)
+        last = date(target_year, target_month, days_in_month)
+        window = get_fortune_calendar().read(day_stem_code, first, last)
+        if window is None:
+            window = FortuneCalendar(first, last).read(day_stem_code, first, last)
+        pillars, levels, sipsins = window
+
+        rows = []
+        for i in range(days_in_month):
+            pillar = Ganzhi(pillars[i])
+            day = i + 1
+            rows.append(
+                (
+                    day,
+                    pillar.stem_char,
+                    pillar.branch_char,
+                    _FORTUNE_BY_LEVEL[levels[i]],
+                    SIPSIN_NAMES[sipsins[i]],
+                    as_of.is_today(target_year, target_month, day),
+                )
+            )
+        return rows
+
     def calculate_day_list(
         self,
         day_stem: str,
         target_year: int,
         target_month: int,
+        as_of: Optional[AsOf] = None,
     ) -> List[Dict]:
         """
         指定年月の日運リスト（28-31日分）を計算
@@ -302,40 +309,150 @@ class FortuneCalculator:
             day_stem: 日干
             target_year: 対象年
             target_month: 対象月
+            as_of: isToday判定の基準日時（省略時は現在時刻）
 
         Returns:
             日運情報のリスト
         """
-        day_list = []
-        days_in_month = calendar.monthrange(target_year, target_month)[1]
-        today = datetime.now().date()
-
-        for day in range(1, days_in_month + 1):
-            calc_day_stem, calc_day_branch, fortune_level, sipsin = self.calculate_day_fortune(
-                day_stem, target_year, target_month, day
+        return [
+            {
+                "id": day,
+                "year": target_year,
+                "month": target_month,
+                "day": day,
+                "dayStem": stem,
+                "dayBranch": branch,
+                "fortuneLevel": level,
+                "sipsin": sipsin,
+                "isToday": is_today,
+            }
+            for day, stem, branch, level, sipsin, is_today in self.calculate_day_rows(
+                day_stem, target_year, target_month, as_of=as_of
             )
+        ]
 
-            is_today = (
-                target_year == today.year
-                and target_month == today.month
-                and day == today.day
-            )
+    def iter_timeline(
+        self,
+        birth_datetime: datetime,
+        day_stem: str,
+        daeun_list: Iterable[Dict],
+        as_of: Optional[AsOf] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Iterator[Dict]:
+        """
+        大運→年運→月運の入れ子のタイムラインを大運ごとに順に生成
+
+        干支は六十甲子の順送り、吉凶・十神は早見表から引くため、lunar-pythonを呼ばずに1回で計算する
+
+        Args:
+            birth_datetime: 生年月日時
+            day_stem: 日干
+            daeun_list: 保存済みの大運リスト（startAge/endAgeを含む辞書）
+            as_of: isCurrent判定の基準日時（省略時は現在時刻）
+            start: この日を含む月より前の年運・月運を除く（省略時は制限なし）
+            end: この日を含む月より後の年運・月運を除く（省略時は制限なし）
 
-            day_list.append(
-                {
-                    "id": day,
-                    "year": target_year,
-                    "month": target_month,
-                    "day": day,
-                    "dayStem": calc_day_stem,
-                    "dayBranch": calc_day_branch,
-                    "fortuneLevel": fortune_level,
-                    "sipsin": sipsin,
-                    "isToday": is_today,
+        Yields:
+            大運情報（isCurrentと"years"を付与。年運には"months"を付与。範囲外の大運は出さない）
+        """
+        as_of = as_of or AsOf.current()
+        day_stem_code = STEM_INDEX[day_stem]
+        birth_year = birth_datetime.year
+        current_age = as_of.age_of(birth_datetime)
+        first = (start.year, start.month) if start else (0, 1)
+        last = (end.year, end.month) if end else (9999, 12)
+
+        for daeun in daeun_list:
+            start_age = daeun["startAge"]
+            years = []
+            for i in range(daeun["endAge"] - start_age + 1):
+                age = start_age + i
+                year = birth_year + age
+                months = [
+                    self._month_entry(year, month, day_stem_code, as_of)
+                    for month in range(1, 13)
+                    if first <= (year, month) <= last
+                ]
+                if not months:
+                    continue
+                year_entry = self._year_entry(i + 1, year, age, day_stem_code, as_of)
+                year_entry["daeunStartAge"] = start_age
+                year_entry["months"] = months
+                years.append(year_entry)
+
+            if years:
+                yield {
+                    **daeun,
+                    "isCurrent": start_age <= current_age <= daeun["endAge"],
+                    "years": years,
                 }
-            )
 
-        return day_list
+    def _year_entry(
+        self, entry_id: int, year: int, age: int, day_stem_code: int, as_of: AsOf
+    ) -> Dict:
+        """年運1件分の辞書を作成"""
+        pillar = year_pillar_of(year)
+        fortune_level, sipsin = _EVALUATION[day_stem_code * 10 + pillar.stem]
+        return {
+            "id": entry_id,
+            "year": year,
+            "age": age,
+            "yearStem": pillar.stem_char,
+            "yearBranch": pillar.branch_char,
+            "fortuneLevel": fortune_level,
+            "sipsin": sipsin,
+            "isCurrent": as_of.is_current_year(year),
+        }
+
+    def _month_entry(self, year: int, month: int, day_stem_code: int, as_of: AsOf) -> Dict:
+        """月運1件分の辞書を作成"""
+        pillar = month_pillar_of(year, month)
+        fortune_level, sipsin = _EVALUATION[day_stem_code * 10 + pillar.stem]
+        return {
+            "id": month,
+            "year": year,
+            "month": month,
+            "monthStem": pillar.stem_char,
+            "monthBranch": pillar.branch_char,
+            "fortuneLevel": fortune_level,
+            "sipsin": sipsin,
+            "isCurrent": as_of.is_current_month(year, month),
+        }
+
+    def _year_pillar(self, target_year: int) -> Ganzhi:
+        """
+        年柱を取得
+
+        立春以降の日付を使用（四柱推命では立春が年の切り替わり）
+        """
+        return year_pillar_of(target_year)
+
+    def _month_pillar(self, target_year: int, target_month: int) -> Ganzhi:
+        """
+        月柱を取得
+
+        節気後の日付を使用（四柱推命では節入日が月の切り替わり）
+        target_year/target_monthの15日の干支（確実に節気後）
+        """
+        return month_pillar_of(target_year, target_month)
+
+    def _day_pillar(self, target_year: int, target_month: int, target_day: int) -> Ganzhi:
+        """日柱を取得"""
+        return day_pillar_of(date(target_year, target_month, target_day))
+
+    def _evaluate(self, day_stem: int, pillar: Ganzhi) -> Tuple[FortuneLevel, str]:
+        """
+        日干コードと対象干支から吉凶レベルと十神を求める
+
+        Args:
+            day_stem: 日干コード（0〜9）
+            pillar: 対象の干支
+
+        Returns:
+            (吉凶レベル, 十神)
+        """
+        return _EVALUATION[day_stem * 10 + pillar.stem]
 
     def _calculate_fortune_level(
         self,
@@ -354,14 +471,12 @@ class FortuneCalculator:
         Returns:
             吉凶レベル
         """
-        # ドンサゴン天干マトリックスから吉凶を取得
-        if day_stem in self.cheongan_matrix and target_stem in self.cheongan_matrix[day_stem]:
-            donsagong_result = self.cheongan_matrix[day_stem][target_stem]["길흉"]
-            # 韓国語の吉凶を日本語にマッピング
-            return DONSAGONG_FORTUNE_MAP.get(donsagong_result, "平")
-
         # マトリックスにない場合はデフォルト
-        return "平"
+        if day_stem not in STEM_INDEX or target_stem not in STEM_INDEX:
+            return "平"
+
+        # ドンサゴン天干マトリックスから吉凶を取得
+        return _FORTUNE_BY_LEVEL[TENGAN_FLAT[STEM_INDEX[day_stem] * 10 + STEM_INDEX[target_stem]]]
 
     def _is_合(self, stem1: str, stem2: str) -> bool:
         """天干の合（合化）判定"""
@@ -376,7 +491,7 @@ class FortuneCalculator:
 
     def _calculate_sipsin(self, day_stem: str, target_stem: str) -> str:
         """
-        十神を計算（簡易版）
+        十神を計算
 
         Args:
             day_stem: 日干
@@ -385,65 +500,14 @@ class FortuneCalculator:
         Returns:
             十神名
         """
-        # TODO: 正確な十神計算ロジックを実装
-        # 現在は簡易的な実装
-        if day_stem == target_stem:
-            return "比肩"
-
-        # 五行相生相剋による十神判定（簡易版）
-        stem_to_element = {
-            "甲": "wood",
-            "乙": "wood",
-            "丙": "fire",
-            "丁": "fire",
-            "戊": "earth",
-            "己": "earth",
-            "庚": "metal",
-            "辛": "metal",
-            "壬": "water",
-            "癸": "water",
-        }
-
-        day_element = stem_to_element.get(day_stem, "")
-        target_element = stem_to_element.get(target_stem, "")
-
-        # 簡易的な十神マッピング
-        if day_element == target_element:
-            return "比肩" if day_stem == target_stem else "劫財"
-
-        # デフォルト
-        return "正官"
+        return sipsin_of(day_stem, target_stem)
 
     def get_element_from_stem(self, stem: str) -> FiveElement:
         """天干から五行要素を取得"""
-        element_map: Dict[str, FiveElement] = {
-            "甲": "wood",
-            "乙": "wood",
-            "丙": "fire",
-            "丁": "fire",
-            "戊": "earth",
-            "己": "earth",
-            "庚": "metal",
-            "辛": "metal",
-            "壬": "water",
-            "癸": "water",
-        }
-        return element_map.get(stem, "earth")
+        index = STEM_INDEX.get(stem)
+        return STEM_ELEMENTS[index] if index is not None else "earth"
 
     def get_element_from_branch(self, branch: str) -> FiveElement:
         """地支から五行要素を取得"""
-        element_map: Dict[str, FiveElement] = {
-            "寅": "wood",
-            "卯": "wood",
-            "巳": "fire",
-            "午": "fire",
-            "辰": "earth",
-            "戌": "earth",
-            "丑": "earth",
-            "未": "earth",
-            "申": "metal",
-            "酉": "metal",
-            "亥": "water",
-            "子": "water",
-        }
-        return element_map.get(branch, "earth")
+        index = BRANCH_INDEX.get(branch)
+        return BRANCH_ELEMENTS[index] if index is not None else "earth"
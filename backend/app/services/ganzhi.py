@@ -0,0 +1,135 @@
+"""
+干支値型
+六十甲子を0〜59の整数で表し、天干(0〜9)・地支(0〜11)をプロパティとして持つ
+
+- 計算コアでは天干・地支を整数コードのまま扱い、文字列への変換はAPI境界でのみ行う
+- Ganzhiはintのサブクラスで、60個のインスタンスを事前生成して使い回す（インターン）
+"""
+from typing import Dict, Tuple
+
+from .donsagong_matrix import BRANCH_INDEX, EARTHLY_BRANCHES, HEAVENLY_STEMS, STEM_INDEX
+
+# 天干の五行（甲乙=木, 丙丁=火, 戊己=土, 庚辛=金, 壬癸=水）
+STEM_ELEMENTS = (
+    "wood",
+    "wood",
+    "fire",
+    "fire",
+    "earth",
+    "earth",
+    "metal",
+    "metal",
+    "water",
+    "water",
+)
+
+# 地支の五行（子〜亥）
+BRANCH_ELEMENTS = (
+    "water", "earth", "wood", "wood", "earth", "fire",
+    "fire", "earth", "metal", "metal", "earth", "water",
+)
+
+
+class Ganzhi(int):
+    """六十甲子（0=甲子 〜 59=癸亥）"""
+
+    __slots__ = ()
+
+    def __new__(cls, index: int) -> "Ganzhi":
+        # 負のインデックスは末尾からの参照になるので範囲を明示的に確認する
+        try:
+            if 0 <= index < 60:
+                return _POOL[index]
+        except TypeError:
+            pass
+        raise ValueError(f"干支インデックスは0〜59である必要があります: {index}")
+
+    @property
+    def stem(self) -> int:
+        """天干コード（0=甲 〜 9=癸）"""
+        return int(self) % 10
+
+    @property
+    def branch(self) -> int:
+        """地支コード（0=子 〜 11=亥）"""
+        return int(self) % 12
+
+    @property
+    def stem_char(self) -> str:
+        """天干（漢字）"""
+        return HEAVENLY_STEMS[int(self) % 10]
+
+    @property
+    def branch_char(self) -> str:
+        """地支（漢字）"""
+        return EARTHLY_BRANCHES[int(self) % 12]
+
+    def shift(self, offset: int) -> "Ganzhi":
+        """六十甲子上でoffset個進めた干支（負数で逆行）"""
+        return _POOL[(int(self) + offset) % 60]
+
+    @classmethod
+    def from_parts(cls, stem: int, branch: int) -> "Ganzhi":
+        """
+        天干・地支コードから干支を取得
+
+        Args:
+            stem: 天干コード（0〜9）
+            branch: 地支コード（0〜11）
+
+        Returns:
+            干支
+        """
+        if (stem - branch) % 2:
+            raise ValueError(f"陰陽の異なる天干・地支は組み合わせられません: {stem}, {branch}")
+        return _POOL[(6 * stem - 5 * branch) % 60]
+
+    @classmethod
+    def from_chars(cls, stem: str, branch: str) -> "Ganzhi":
+        """天干・地支の漢字から干支を取得"""
+        try:
+            return cls.from_parts(STEM_INDEX[stem], BRANCH_INDEX[branch])
+        except KeyError:
+            raise ValueError(f"不正な干支です: {stem}{branch}")
+
+    @classmethod
+    def from_str(cls, text: str) -> "Ganzhi":
+        """'甲子' 形式の文字列から干支を取得"""
+        try:
+            return _BY_NAME[text]
+        except KeyError:
+            raise ValueError(f"不正な干支です: {text}")
+
+    def __str__(self) -> str:
+        return _NAMES[int(self)]
+
+    def __repr__(self) -> str:
+        return f"Ganzhi({int(self)}:{_NAMES[int(self)]})"
+
+    def __reduce__(self):
+        return (Ganzhi, (int(self),))
+
+
+_POOL: Tuple[Ganzhi, ...] = tuple(int.__new__(Ganzhi, i) for i in range(60))
+_NAMES: Tuple[str, ...] = tuple(
+    HEAVENLY_STEMS[i % 10] + EARTHLY_BRANCHES[i % 12] for i in range(60)
+)
+_BY_NAME: Dict[str, Ganzhi] = {name: _POOL[i] for i, name in enumerate(_NAMES)}
+
+
+def pillars_from_eight_char(eight_char) -> Tuple[Ganzhi, Ganzhi, Ganzhi, Ganzhi]:
+    """
+    lunar-pythonのEightCharから四柱を干支値で取得
+
+    Args:
+        eight_char: lunar-pythonのEightCharオブジェクト
+
+    Returns:
+        (年柱, 月柱, 日柱, 時柱)
+    """
+    return (
+        _BY_NAME[eight_char.getYear()],
+        _BY_NAME[eight_char.getMonth()],
+        _BY_NAME[eight_char.getDay()],
+        _BY_NAME[eight_char.getTime()],
+    )
@@ -0,0 +1,235 @@
+"""
+ゲスト命式の保存と期限切れゲスト命式の削除
+
+ゲストの命式はフロントエンドのLocalStorageが正本で、サーバーの行は
+詳細画面の年運・月運・日運の取得と /migrate までのつなぎとしてのみ使う
+
+- GuestWriteBehind: ゲストの行をメモリに貯め、件数か経過時間でまとめて1回のINSERTで書き込む
+  （GUEST_WRITE_BEHIND で有効にする。書き込み待ちの行をIDで引く・保存する場合は呼び出し側が
+  先にflushするため、同じプロセス内では書いた直後に読める:
+  app.api.saju の get_saju_by_id / _flush_pending_guests）
+  バルクINSERTが失敗したら1行ずつ書き直し、書けない行は捨てる
+- purge_stale_guests: user_id IS NULL かつ作成から期限を過ぎた行を、件数上限つきのバッチで削除する
+  （部分インデックス ix_saju_guest_created_at を使う）
+"""
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.orm import Session
+
+from app.models import Saju
+
+
+class GuestWriteBehind:
+    """
+    ゲスト命式の書き込み遅延キュー
+
+    - submit: 行（Sajuの属性名 → 値）を貯める
+    - flush: 貯めた行を1トランザクションのバルクINSERTで書き込む
+      （失敗したら1行ずつ書き直し、制約違反などで書けない行は捨てて dropped に数える）
+    - start / stop: batch_size件たまるかinterval秒ごとに書き込むバックグラウンドスレッド
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], Session], batch_size: int = 100, interval: float = 1.0
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self._pending: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def __contains__(self, saju_id: str) -> bool:
+        with self._lock:
+            return saju_id in self._pending
+
+    def submit(self, row: Dict):
+        """
+        行を書き込み待ちにする
+
+        Args:
+            row: Sajuの属性名 → 値（idは必須）
+        """
+        with self._lock:
+            self._pending[row["id"]] = row
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """
+        書き込み待ちの行をまとめて書き込む
+
+        バルクINSERTが失敗したら1行ずつ書き直し、書けない行（制約違反・不正な値）は捨てる。
+        1行のせいで後続の行がすべて書けなくなる（IDで引くたびに例外になる）のを防ぐ
+
+        Returns:
+            書き込んだ件数
+
+        Raises:
+            OperationalError / InterfaceError: DBに接続できない場合（残りの行は次回に持ち越す）
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows = list(self._pending.values())
+            if not rows:
+                return 0
+            done = []  # 書き込んだ・捨てた行
+            written = 0
+            try:
+                try:
+                    self._insert(rows)
+                    done, written = rows, len(rows)
+                except (OperationalError, InterfaceError):
+                    raise
+                except Exception as e:
+                    print(f"⚠️ ゲスト命式のバルクINSERTに失敗（1行ずつ書き直し）: {e}")
+                    for row in rows:
+                        try:
+                            self._insert([row])
+                            written += 1
+                        except (OperationalError, InterfaceError):
+                            raise
+                        except Exception as row_error:
+                            print(f"❌ ゲスト命式を破棄 {row['id']}: {row_error}")
+                            self.dropped += 1
+                        done.append(row)
+            finally:
+                with self._lock:
+                    for row in done:
+                        if self._pending.get(row["id"]) is row:
+                            del self._pending[row["id"]]
+                self.written += written
+            self.batches += 1
+            return written
+
+    def _insert(self, rows: List[Dict]):
+        session = self.session_factory()
+        try:
+            session.execute(insert(Saju), rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def start(self):
+        """バックグラウンドの書き込みスレッドを開始"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="guest-write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """書き込みスレッドを止め、残りを書き込む"""
+        if self._thread is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ ゲスト命式の書き込みエラー（次回再試行）: {e}")
+
+
+def purge_stale_guests(
+    session: Session,
+    older_than: datetime,
+    batch_size: int = 500,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    期限切れのゲスト命式を削除
+
+    1バッチごとにコミットするため、長いロックを取らずに少しずつ消せる
+
+    Args:
+        session: DBセッション
+        older_than: これより前に作成されたゲスト命式を削除（naive、UTC）
+        batch_size: 1回のDELETEで消す最大件数
+        max_batches: 最大バッチ数（省略時は全件）
+
+    Returns:
+        削除した件数
+    """
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = session.scalars(
+            select(Saju.id)
+            .where(Saju.user_id.is_(None), Saju.created_at < older_than)
+            .order_by(Saju.created_at)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        session.execute(
+            delete(Saju)
+            .where(Saju.id.in_(ids), Saju.user_id.is_(None))
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        deleted += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+    return deleted
+
+
+async def run_guest_purge(
+    session_factory: Callable[[], Session],
+    ttl_days: int,
+    batch_size: int,
+    interval_seconds: float,
+):
+    """
+    期限切れゲスト命式の定期削除（lifespanでタスクとして起動し、終了時にキャンセルする）
+
+    Args:
+        session_factory: DBセッションの作成関数
+        ttl_days: ゲスト命式の保持日数
+        batch_size: 1回のDELETEで消す最大件数
+        interval_seconds: 実行間隔（秒）
+    """
+
+    def purge_once() -> int:
+        session = session_factory()
+        try:
+            return purge_stale_guests(
+                session, datetime.utcnow() - timedelta(days=ttl_days), batch_size
+            )
+        finally:
+            session.close()
+
+    while True:
+        try:
+            deleted = await asyncio.to_thread(purge_once)
+            if deleted:
+                print(f"🧹 期限切れゲスト命式を削除: {deleted}件")
+        except Exception as e:
+            print(f"❌ ゲスト命式の削除エラー: {e}")
+        await asyncio.sleep(interval_seconds)
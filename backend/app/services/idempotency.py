@@ -0,0 +1,185 @@
+"""
+Idempotency-Keyヘッダーによる再送の重複防止
+
+- (ユーザーID, キー) ごとにリクエスト内容の指紋と最初のレスポンスを保存し、
+  同じキー・同じ内容の再送には保存したレスポンスをそのまま返す
+- 同じキーで内容の違うリクエストはエラー（IdempotencyKeyReusedError）
+- 記録は処理本体と同じトランザクションで行う。同時に届いた再送は主キーの衝突で検出する
+- 期限（ttl）を過ぎた記録は無視し、定期削除で消す
+"""
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReusedError(ValueError):
+    """同じIdempotency-Keyが別の内容のリクエストに使われた"""
+
+
+def request_fingerprint(method: str, path: str, payload: Any) -> str:
+    """
+    リクエスト内容の指紋
+
+    Args:
+        method: HTTPメソッド
+        path: パス
+        payload: リクエストボディ（JSONに変換可能なもの）
+
+    Returns:
+        SHA-256の16進文字列
+    """
+    body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(f"{method} {path}\n".encode() + body).hexdigest()
+
+
+def find_response(
+    db: Session, user_id: str, key: str, fingerprint: str, now: datetime, ttl: timedelta
+) -> Optional[Tuple[int, Dict[str, Any]]]:
+    """
+    保存済みのレスポンスを取得
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        key: Idempotency-Key
+        fingerprint: request_fingerprint の結果
+        now: 現在時刻（naive、UTC）
+        ttl: 記録の有効期間
+
+    Returns:
+        (ステータスコード, レスポンスボディ)（未記録・期限切れならNone）
+
+    Raises:
+        IdempotencyKeyReusedError: 同じキーが別の内容のリクエストに使われた
+    """
+    record = db.get(IdempotencyKey, (user_id, key))
+    if record is None:
+        return None
+    if record.created_at <= now - ttl:
+        # 期限切れの記録は消して新しいリクエストとして扱う
+        db.delete(record)
+        db.flush()
+        return None
+    if record.request_hash != fingerprint:
+        raise IdempotencyKeyReusedError("Idempotency-Keyが別の内容のリクエストで使用されています")
+    return record.status_code, json.loads(record.response)
+
+
+def record_response(
+    db: Session,
+    user_id: str,
+    key: str,
+    fingerprint: str,
+    status_code: int,
+    body: Dict[str, Any],
+    now: datetime,
+):
+    """
+    レスポンスを記録（コミットは呼び出し側。同じキーの記録が先にコミットされていればコミット時に
+    IntegrityErrorになる）
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        key: Idempotency-Key
+        fingerprint: request_fingerprint の結果
+        status_code: ステータスコード
+        body: レスポンスボディ
+        now: 現在時刻（naive、UTC）
+    """
+    db.add(
+        IdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_hash=fingerprint,
+            status_code=status_code,
+            response=json.dumps(body, ensure_ascii=False),
+            created_at=now,
+        )
+    )
+
+
+def purge_expired_keys(
+    session: Session,
+    older_than: datetime,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    期限切れの記録を削除（1バッチごとにコミット）
+
+    Args:
+        session: DBセッション
+        older_than: この日時以前に作成された記録を削除（naive、UTC）
+        batch_size: 1回のDELETEで消す最大件数
+        max_batches: 最大バッチ数（省略時は全件）
+
+    Returns:
+        削除した件数
+    """
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        keys = session.execute(
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.created_at <= older_than)
+            .order_by(IdempotencyKey.created_at)
+            .limit(batch_size)
+        ).all()
+        if not keys:
+            break
+        session.execute(
+            delete(IdempotencyKey)
+            .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(keys))
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        deleted += len(keys)
+        batches += 1
+        if len(keys) < batch_size:
+            break
+    return deleted
+
+
+async def run_idempotency_key_purge(
+    session_factory: Callable[[], Session],
+    ttl_hours: float,
+    batch_size: int,
+    interval_seconds: float,
+):
+    """
+    期限切れの記録の定期削除（lifespanでタスクとして起動し、終了時にキャンセルする）
+
+    Args:
+        session_factory: DBセッションの作成関数
+        ttl_hours: 記録の有効期間（時間）
+        batch_size: 1回のDELETEで消す最大件数
+        interval_seconds: 実行間隔（秒）
+    """
+
+    def purge_once() -> int:
+        session = session_factory()
+        try:
+            older_than = datetime.utcnow() - timedelta(hours=ttl_hours)
+            return purge_expired_keys(session, older_than, batch_size=batch_size)
+        finally:
+            session.close()
+
+    while True:
+        try:
+            deleted = await asyncio.to_thread(purge_once)
+            if deleted:
+                print(f"🧹 期限切れのIdempotency-Keyを削除: {deleted}件")
+        except Exception as e:
+            print(f"❌ Idempotency-Keyの削除エラー: {e}")
+        await asyncio.sleep(interval_seconds)
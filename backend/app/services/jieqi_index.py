@@ -0,0 +1,154 @@
+"""
+節入日（12節気）索引
+節気DB（JSON）を1度だけ読み込み、全年の節入時刻を昇順の配列にして二分探索で引く
+
+- 索引はファイルパスとタイムゾーンごとにプロセス内で1つだけ作り、読み取り専用で共有する
+  （SolarTermsDB・AccurateDaeunCalculator・ManseryeokCalculatorが同じ索引を使う）
+- DBの各年のデータは「その年の立春〜翌年1月の小寒」の12節気で、小寒だけは翌年の日時として扱う
+- DBの時刻をどのタイムゾーンの壁時計とみなすかは利用側が指定する
+"""
+import json
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# 節名 → 節入りの月（小寒のみ翌年1月）
+JEOL_MONTHS: Dict[str, int] = {
+    "立春": 2,
+    "驚蟄": 3,
+    "清明": 4,
+    "立夏": 5,
+    "芒種": 6,
+    "小暑": 7,
+    "立秋": 8,
+    "白露": 9,
+    "寒露": 10,
+    "立冬": 11,
+    "大雪": 12,
+    "小寒": 1,
+}
+
+
+class JieqiIndex:
+    """
+    節入日の索引（読み取り専用）
+
+    - data: DBの年別データ（{"1900": {"立春": {...}, ...}, ...}）
+    - instants: 全節入時刻（昇順）
+    - names: instantsと同じ順の節名
+    """
+
+    __slots__ = ("data", "instants", "names", "_by_key")
+
+    def __init__(self, data: Dict[str, Dict], tz: tzinfo):
+        entries = []
+        by_key: Dict[Tuple[int, str], datetime] = {}
+        for year_key, year_data in data.items():
+            try:
+                year = int(year_key)
+            except ValueError:
+                continue
+            for name, term in year_data.items():
+                month = JEOL_MONTHS.get(name)
+                if month is None:
+                    continue
+                try:
+                    instant = datetime(
+                        year + 1 if month == 1 else year,
+                        month,
+                        term["day"],
+                        term["hour"],
+                        term["minute"],
+                        term.get("second", 0),
+                        tzinfo=tz,
+                    )
+                except (KeyError, TypeError, ValueError):
+                    # 日時として不正なデータはスキップ
+                    continue
+                by_key[(year, name)] = instant
+                entries.append((instant, name))
+
+        entries.sort(key=lambda entry: entry[0])
+        self.data = data
+        self.instants: Tuple[datetime, ...] = tuple(entry[0] for entry in entries)
+        self.names: Tuple[str, ...] = tuple(entry[1] for entry in entries)
+        self._by_key = by_key
+
+    def __len__(self) -> int:
+        return len(self.instants)
+
+    def has_year(self, year: int) -> bool:
+        """DBに指定年のデータがあるか"""
+        return str(year) in self.data
+
+    def get(self, year: int, name: str) -> Optional[datetime]:
+        """
+        指定年の節入時刻を取得
+
+        Args:
+            year: DB上の年（小寒は翌年1月の時刻が返る）
+            name: 節名（例: "立春"）
+
+        Returns:
+            節入時刻（データがなければNone）
+        """
+        return self._by_key.get((year, name))
+
+    def next_after(self, dt: datetime) -> Optional[Tuple[str, datetime]]:
+        """
+        指定日時より後の最初の節入りを取得
+
+        Args:
+            dt: 基準日時（タイムゾーン付き）
+
+        Returns:
+            (節名, 節入時刻)。索引の範囲外ならNone
+        """
+        i = bisect_right(self.instants, dt)
+        if i == len(self.instants):
+            return None
+        return self.names[i], self.instants[i]
+
+    def previous_before(self, dt: datetime) -> Optional[Tuple[str, datetime]]:
+        """
+        指定日時より前の最後の節入りを取得
+
+        Args:
+            dt: 基準日時（タイムゾーン付き）
+
+        Returns:
+            (節名, 節入時刻)。索引の範囲外ならNone
+        """
+        i = bisect_left(self.instants, dt)
+        if i == 0:
+            return None
+        return self.names[i - 1], self.instants[i - 1]
+
+
+@lru_cache(maxsize=None)
+def _load(real_path: str, tz: tzinfo) -> JieqiIndex:
+    with open(real_path, "r", encoding="utf-8") as f:
+        raw_data = json.load(f)
+    return JieqiIndex(raw_data.get("solar_terms_data", {}), tz)
+
+
+def load_jieqi_index(path, tz: tzinfo) -> JieqiIndex:
+    """
+    節気DBの索引を取得（同じファイル・タイムゾーンなら2回目以降は読み込み済みの索引を返す）
+
+    Args:
+        path: 節気DB（JSON）のパス
+        tz: DBの時刻をどのタイムゾーンの壁時計とみなすか
+
+    Returns:
+        節入日索引
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+    """
+    real_path = os.path.realpath(path)
+    if not os.path.exists(real_path):
+        raise FileNotFoundError(f"節気DBが見つかりません: {real_path}")
+    return _load(real_path, tz)
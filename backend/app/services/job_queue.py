@@ -0,0 +1,329 @@
+"""
+プロセス内ジョブキュー（外部ブローカー不要）
+
+- ジョブはjobsテーブルに保存し、状態（queued → running → succeeded / failed）・進捗・結果を記録する
+- asyncioのワーカーがキューからジョブIDを受け取り、処理本体はスレッドで実行する
+  （CPU処理はJobContext.mapでプロセスプールに分散できる）
+- 起動時にrunningのまま残ったジョブ（前回の異常終了）はqueuedに戻して再実行する
+  （チェックポイントを記録するジョブは、その位置と進捗から再開できる）
+- 停止時に実行中のジョブはチャンクの区切り（JobContext.advance）で中断し、queuedに戻す
+- ジョブ種別ごとの処理は job_handler デコレータで登録する（app/services/saju_jobs.py）
+"""
+import asyncio
+import json
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Job
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class JobInterruptedError(Exception):
+    """キューの停止でジョブを中断した（次回起動時に再実行する）"""
+
+
+class JobContext:
+    """
+    ジョブ処理本体に渡すコンテキスト
+
+    - session(): 処理用のDBセッションを作成（閉じるのは呼び出し側）
+    - set_total / advance: 進捗・チェックポイントをjobsテーブルに書き込む
+      （処理側のトランザクションとは別）
+    - checkpoint / progress: 再実行時は前回記録したチェックポイント・進捗（初回はNone / 0）
+    - map: CPU処理をプロセスプールで並列実行（プールが無ければその場で実行）
+    """
+
+    def __init__(self, queue: "JobQueue", job: Job):
+        self.job_id = job.id
+        self.user_id = job.user_id
+        self.params: Dict[str, Any] = json.loads(job.params) if job.params else {}
+        self.checkpoint: Optional[str] = job.checkpoint
+        self.progress: int = job.progress
+        self.chunk_size = queue.chunk_size
+        self.parallelism = max(queue.cpu_workers, 1)
+        self._queue = queue
+
+    def session(self) -> Session:
+        return self._queue.session_factory()
+
+    def set_total(self, total: int) -> None:
+        """全件数を記録"""
+        self._queue._update(self.job_id, total=total)
+
+    def advance(self, count: int, checkpoint: Optional[str] = None) -> None:
+        """
+        処理済み件数を加算
+
+        Args:
+            count: 今回処理した件数
+            checkpoint: 再開位置（ここまでの処理結果をコミットした後に渡す）
+
+        Raises:
+            JobInterruptedError: キューが停止中の場合（記録した進捗・チェックポイントから再開する）
+        """
+        values: Dict[str, Any] = {"progress": Job.progress + count}
+        if checkpoint is not None:
+            values["checkpoint"] = checkpoint
+            self.checkpoint = checkpoint
+        self.progress += count
+        self._queue._update(self.job_id, **values)
+        if self._queue.stopping:
+            raise JobInterruptedError(f"キューの停止で中断しました（{self.progress}件処理済み）")
+
+    def map(self, fn: Callable, chunks: Iterable) -> Iterator:
+        """
+        チャンクごとの処理を並列実行（結果は入力順）
+
+        Args:
+            fn: モジュールレベルの関数（プロセス間で受け渡せるもの）
+            chunks: 入力のチャンク
+
+        Returns:
+            結果のイテレータ
+        """
+        executor = self._queue.executor
+        if executor is None:
+            return map(fn, chunks)
+        return executor.map(fn, chunks)
+
+
+# ジョブの処理本体
+JobHandler = Callable[[JobContext], Any]
+
+# ジョブ種別 → (処理本体, パラメータ検証)
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+JOB_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+
+
+def job_handler(
+    kind: str, validate: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Callable[[JobHandler], JobHandler]:
+    """
+    ジョブ種別の処理本体を登録するデコレータ
+
+    Args:
+        kind: ジョブ種別
+        validate: 投入時のパラメータ検証（不正ならValueErrorを送出）
+    """
+
+    def register(fn: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = fn
+        if validate is not None:
+            JOB_VALIDATORS[kind] = validate
+        return fn
+
+    return register
+
+
+class JobQueue:
+    """
+    ジョブキュー
+
+    - submit: ジョブをjobsテーブルに登録してキューに入れる
+    - start / stop: asyncioワーカー（lifespanで起動・停止する）
+    - run_job: 1件を同期実行（ワーカーから呼ばれる。テストからも直接呼べる）
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        workers: int = 2,
+        cpu_workers: int = 0,
+        chunk_size: int = 200,
+    ):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.cpu_workers = cpu_workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional["asyncio.Queue[str]"] = None
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = threading.Event()
+
+    @property
+    def stopping(self) -> bool:
+        """停止中か（処理中のジョブはチャンクの区切りで中断する）"""
+        return self._stopping.is_set()
+
+    @property
+    def executor(self) -> Optional[ProcessPoolExecutor]:
+        """CPU処理用のプロセスプール（初回利用時に作成、cpu_workers=0ならNone）"""
+        if self.cpu_workers > 0 and self._executor is None:
+            # スレッドを持つプロセスからのforkを避ける
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.cpu_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def submit(
+        self, kind: str, params: Optional[Dict[str, Any]] = None, user_id: Optional[str] = None
+    ) -> str:
+        """
+        ジョブを登録
+
+        Args:
+            kind: ジョブ種別
+            params: パラメータ（JSONに変換可能なもの）
+            user_id: 投入したユーザーID
+
+        Returns:
+            ジョブID
+
+        Raises:
+            ValueError: 不明なジョブ種別、またはパラメータが不正な場合
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"不明なジョブ種別です: {kind}")
+        params = params or {}
+        validate = JOB_VALIDATORS.get(kind)
+        if validate is not None:
+            validate(params)
+
+        job_id = f"job-{uuid.uuid4()}"
+        session = self.session_factory()
+        try:
+            session.add(
+                Job(
+                    id=job_id,
+                    user_id=user_id,
+                    kind=kind,
+                    status=JOB_QUEUED,
+                    progress=0,
+                    params=json.dumps(params, ensure_ascii=False),
+                    created_at=datetime.utcnow(),
+                )
+            )
+            session.commit()
+        finally:
+            session.close()
+
+        if self._loop is not None and self._queue is not None:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, job_id)
+        return job_id
+
+    def run_job(self, job_id: str) -> bool:
+        """
+        ジョブを1件実行
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            実行した場合True（他のワーカーが実行中・実行済み、またはキューが停止中ならFalse）
+        """
+        if self.stopping:
+            return False
+        session = self.session_factory()
+        try:
+            # queued → running の条件付きUPDATEで1つのワーカーだけが実行する
+            # （チェックポイントが無ければ進捗は最初から）
+            claimed = session.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JOB_QUEUED)
+                .values(
+                    status=JOB_RUNNING,
+                    progress=case((Job.checkpoint.is_(None), 0), else_=Job.progress),
+                    started_at=datetime.utcnow(),
+                )
+            ).rowcount
+            session.commit()
+            if claimed != 1:
+                return False
+            job = session.get_one(Job, job_id)
+            context = JobContext(self, job)
+        finally:
+            session.close()
+
+        try:
+            result = JOB_HANDLERS[job.kind](context)
+        except Exception as e:
+            if self.stopping:
+                # 停止による中断（プロセスプールのキャンセルを含む）は失敗にせず次回起動時に再実行
+                print(f"⏸ ジョブ中断 {job_id} ({job.kind}): {e!r}")
+                self._update(job_id, status=JOB_QUEUED)
+                return True
+            print(f"❌ ジョブ失敗 {job_id} ({job.kind}): {e!r}")
+            self._update(
+                job_id,
+                status=JOB_FAILED,
+                error=str(e) or type(e).__name__,
+                finished_at=datetime.utcnow(),
+            )
+        else:
+            self._update(
+                job_id,
+                status=JOB_SUCCEEDED,
+                result=json.dumps(result, ensure_ascii=False),
+                finished_at=datetime.utcnow(),
+            )
+        return True
+
+    async def start(self) -> None:
+        """ワーカーを起動（前回の未完了ジョブを拾い直す）"""
+        if self._tasks:
+            return
+        self._stopping.clear()
+        self._loop = asyncio.get_running_loop()
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queue = queue
+        for job_id in await asyncio.to_thread(self._recover):
+            queue.put_nowait(job_id)
+        self._tasks = [
+            asyncio.create_task(self._worker(queue), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """ワーカーを停止（実行中のジョブはチャンクの区切りで中断し、次回起動時に再実行される）"""
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _worker(self, queue: "asyncio.Queue[str]") -> None:
+        while True:
+            job_id = await queue.get()
+            try:
+                await asyncio.to_thread(self.run_job, job_id)
+            except Exception as e:
+                print(f"❌ ジョブの実行エラー {job_id}: {e}")
+            finally:
+                queue.task_done()
+
+    def _recover(self) -> List[str]:
+        session = self.session_factory()
+        try:
+            session.execute(update(Job).where(Job.status == JOB_RUNNING).values(status=JOB_QUEUED))
+            session.commit()
+            return list(
+                session.scalars(
+                    select(Job.id).where(Job.status == JOB_QUEUED).order_by(Job.created_at)
+                )
+            )
+        finally:
+            session.close()
+
+    def _update(self, job_id: str, **values: Any) -> None:
+        session = self.session_factory()
+        try:
+            session.execute(update(Job).where(Job.id == job_id).values(**values))
+            session.commit()
+        finally:
+            session.close()
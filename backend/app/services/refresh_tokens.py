@@ -0,0 +1,229 @@
+"""
+リフレッシュトークンの発行・ローテーション・失効・期限切れ削除
+
+- DBには平文ではなくSHA-256ハッシュ（token_hash）だけを保存する
+- rotate_refresh_token: 使ったトークンを条件付きUPDATEで1度だけ失効させ、新しいトークンを発行する
+  （失効済みのトークンが再び使われた場合は漏えいとみなし、そのユーザーの全トークンを失効させる）
+- 失効させた行は再利用の検知用に一定時間だけ残し、expires_atをその時刻まで縮める
+  （削除は期限切れの行だけを対象にする sweep_expired_refresh_tokens に任せる）
+- ユーザーごとの有効なトークン数には上限があり、超えた分は古い順に削除する
+  （失効ではなく削除にするのは、追い出された端末のリフレッシュを再利用と誤検知しないため）
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.orm import Session
+
+from app.core.auth import create_refresh_token, hash_refresh_token
+from app.core.config import settings
+from app.models import RefreshToken, User
+
+
+def _revoke_values(now: datetime) -> dict:
+    """失効させるUPDATEの値（expires_atは再利用検知の保持期間まで縮める）"""
+    keep_until = now + timedelta(hours=settings.REFRESH_TOKEN_REVOKED_RETENTION_HOURS)
+    return {
+        "is_revoked": True,
+        "expires_at": case(
+            (RefreshToken.expires_at > keep_until, keep_until), else_=RefreshToken.expires_at
+        ),
+    }
+
+
+def issue_refresh_token(db: Session, user_id: str, now: Optional[datetime] = None) -> str:
+    """
+    リフレッシュトークンを発行して保存（コミットまで行う）
+
+    Args:
+        db: DBセッション
+        user_id: ユーザーID
+        now: 現在時刻（naive、UTC。省略時はdatetime.utcnow()）
+
+    Returns:
+        リフレッシュトークン（平文。クライアントにだけ返す）
+    """
+    now = now or datetime.utcnow()
+    token = create_refresh_token()
+    db.add(
+        RefreshToken(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            is_revoked=False,
+            created_at=now,
+        )
+    )
+    db.flush()
+
+    # 上限を超えた有効なトークンを古い順に削除（失効済みとして残すと、その端末のリフレッシュが
+    # 再利用とみなされて全セッションが失効してしまう）
+    overflow = db.scalars(
+        select(RefreshToken.id)
+        .where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.is_revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .order_by(RefreshToken.created_at.desc(), RefreshToken.id)
+        .offset(settings.REFRESH_TOKEN_MAX_PER_USER)
+    ).all()
+    if overflow:
+        db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(overflow))
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return token
+
+
+def revoke_user_tokens(db: Session, user_id: str, now: Optional[datetime] = None) -> int:
+    """
+    ユーザーの有効なリフレッシュトークンをすべて失効（コミットまで行う）
+
+    Args:
+        db: DBセッション
+        user_id: ユーザーID
+        now: 現在時刻（naive、UTC）
+
+    Returns:
+        失効させた件数
+    """
+    now = now or datetime.utcnow()
+    result = db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.is_revoked.is_(False))
+        .values(**_revoke_values(now))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def rotate_refresh_token(
+    db: Session, token: str, now: Optional[datetime] = None
+) -> Tuple[User, str]:
+    """
+    リフレッシュトークンをローテーション
+
+    Args:
+        db: DBセッション
+        token: クライアントから受け取ったリフレッシュトークン
+        now: 現在時刻（naive、UTC）
+
+    Returns:
+        (ユーザー, 新しいリフレッシュトークン)
+
+    Raises:
+        ValueError: トークンが無効・期限切れ・再利用された場合、またはユーザーが無効な場合
+    """
+    now = now or datetime.utcnow()
+    row = db.scalars(
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
+    ).first()
+    if row is None:
+        raise ValueError("リフレッシュトークンが無効です")
+
+    # 同じトークンでの同時リクエストは1つだけが成功する
+    result = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == row.id,
+            RefreshToken.is_revoked.is_(False),
+            RefreshToken.expires_at > now,
+        )
+        .values(**_revoke_values(now))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.rollback()
+        if row.is_revoked:
+            revoke_user_tokens(db, row.user_id, now)
+            raise ValueError("リフレッシュトークンは既に使用されています。再度ログインしてください")
+        raise ValueError("リフレッシュトークンの有効期限が切れています")
+
+    user = db.get(User, row.user_id)
+    if user is None or not user.is_active:
+        db.commit()
+        raise ValueError("このアカウントは無効化されています")
+    return user, issue_refresh_token(db, user.id, now)
+
+
+def sweep_expired_refresh_tokens(
+    session: Session,
+    now: Optional[datetime] = None,
+    batch_size: int = 1000,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    期限切れのリフレッシュトークン（失効後の保持期間を過ぎた行を含む）を削除
+
+    1バッチごとにコミットするため、長いロックを取らずに少しずつ消せる
+
+    Args:
+        session: DBセッション
+        now: 現在時刻（naive、UTC）
+        batch_size: 1回のDELETEで消す最大件数
+        max_batches: 最大バッチ数（省略時は全件）
+
+    Returns:
+        削除した件数
+    """
+    now = now or datetime.utcnow()
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = session.scalars(
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at <= now)
+            .order_by(RefreshToken.expires_at)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        session.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        deleted += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+    return deleted
+
+
+async def run_refresh_token_sweeper(
+    session_factory: Callable[[], Session],
+    batch_size: int,
+    interval_seconds: float,
+):
+    """
+    期限切れリフレッシュトークンの定期削除（lifespanでタスクとして起動し、終了時にキャンセルする）
+
+    Args:
+        session_factory: DBセッションの作成関数
+        batch_size: 1回のDELETEで消す最大件数
+        interval_seconds: 実行間隔（秒）
+    """
+
+    def sweep_once() -> int:
+        session = session_factory()
+        try:
+            return sweep_expired_refresh_tokens(session, batch_size=batch_size)
+        finally:
+            session.close()
+
+    while True:
+        try:
+            deleted = await asyncio.to_thread(sweep_once)
+            if deleted:
+                print(f"🧹 期限切れリフレッシュトークンを削除: {deleted}件")
+        except Exception as e:
+            print(f"❌ リフレッシュトークンの削除エラー: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -2,23 +2,20 @@
 命式計算サービス
 lunar-python + 210年節気DBを使用した正確な四柱推命計算
 """
-import json
 import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from lunar_python import EightChar, Lunar, Solar
+from .birth_time import DEFAULT_POLICY, BirthTime, BirthTimePolicy, day_hour_pillars
+from .chart_cache import ChartCache, chart_cache_key
+from .clock import KST, AsOf
+from .donsagong_matrix import EARTHLY_BRANCHES, HEAVENLY_STEMS  # noqa: F401 (互換用)
 from .fortune_analyzer import FortuneAnalyzer
-
-# 韓国標準時 (UTC+9)
-KST = timezone(timedelta(hours=9))
-
-# 10天干 (漢字)
-HEAVENLY_STEMS = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]
-
-# 12地支 (漢字)
-EARTHLY_BRANCHES = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "戌", "亥"]
+from .ganzhi import Ganzhi, pillars_from_eight_char
+from .jieqi_index import JieqiIndex, load_jieqi_index
+from .sipsin import stem_sipsin
 
 # 吉凶レベルマッピング
 FORTUNE_LEVEL_MAP = {1: "大凶", 2: "凶", 3: "平", 4: "吉", 5: "大吉"}
@@ -26,8 +23,12 @@ FORTUNE_LEVEL_MAP = {1: "大凶", 2: "凶", 3: "平", 4: "吉", 5: "大吉"}
 FORTUNE_LEVEL_REVERSE_MAP = {"大凶": 1, "凶": 2, "平": 3, "吉": 4, "大吉": 5}
 
 
+# 節気DBの時刻は北京時間（UTC+8）
+BEIJING = timezone(timedelta(hours=8))
+
+
 class SolarTermsDB:
-    """210年節気データベースローダー"""
+    """210年節気データベースローダー（索引はプロセス内で共有）"""
 
     def __init__(self, db_path: Optional[str] = None):
         if db_path is None:
@@ -36,17 +37,17 @@ class SolarTermsDB:
             db_path = project_root / "solar_terms_1900_2109_JIEQI_ONLY.json"
 
         self.db_path = Path(db_path)
+        self.index: JieqiIndex
         self.data: Dict = {}
         self._load_db()
 
     def _load_db(self):
-        """210年節気DBを読み込み"""
+        """210年節気DBを読み込み（読み込み済みなら共有索引を再利用）"""
         try:
-            with open(self.db_path, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-                # データ構造: {"solar_terms_data": {"1900": {...}, "1901": {...}}}
-                self.data = raw_data.get("solar_terms_data", {})
-                print(f"✅ 210年節気DB読み込み成功: {len(self.data)}年分")
+            self.index = load_jieqi_index(self.db_path, BEIJING)
+            # データ構造: {"1900": {...}, "1901": {...}}
+            self.data = self.index.data
+            print(f"✅ 210年節気DB読み込み成功: {len(self.data)}年分")
         except FileNotFoundError:
             raise FileNotFoundError(f"210年節気DBが見つかりません: {self.db_path}")
         except Exception as e:
@@ -66,28 +67,15 @@ class SolarTermsDB:
         if not (1900 <= year <= 2109):
             raise ValueError(f"対応範囲外の年: {year} (1900-2109年のみ対応)")
 
-        year_data = self.data.get(str(year))
-        if not year_data:
+        if not self.index.has_year(year):
             raise ValueError(f"節気データなし: {year}年")
 
-        jieqi_data = year_data.get(jieqi_name)
-        if not jieqi_data:
+        jieqi_dt = self.index.get(year, jieqi_name)
+        if jieqi_dt is None:
             raise ValueError(f"節気データなし: {year}年 {jieqi_name}")
 
-        # 節気データから日時を構築
-        # 注意: DBは北京時間（UTC+8）なので、KSTに変換（+1時間）
-        dt = datetime(
-            year,
-            jieqi_data["month"],
-            jieqi_data["day"],
-            jieqi_data["hour"],
-            jieqi_data["minute"],
-            jieqi_data.get("second", 0),
-            tzinfo=timezone(timedelta(hours=8)),  # 北京時間
-        )
-
-        # KSTに変換
-        return dt.astimezone(KST)
+        # DBは北京時間（UTC+8）なので、KSTに変換（+1時間）
+        return jieqi_dt.astimezone(KST)
 
     def get_next_jieqi(self, dt: datetime) -> Tuple[str, datetime]:
         """
@@ -99,39 +87,10 @@ class SolarTermsDB:
         Returns:
             (節気名, 節気日時)
         """
-        year = dt.year
-
-        # 節気リスト（月節のみ、12個）
-        jieqi_names = [
-            "立春",
-            "驚蟄",
-            "清明",
-            "立夏",
-            "芒種",
-            "小暑",
-            "立秋",
-            "白露",
-            "寒露",
-            "立冬",
-            "大雪",
-            "小寒",
-        ]
-
-        # 今年の節気をチェック
-        for jieqi_name in jieqi_names:
-            try:
-                jieqi_dt = self.get_jieqi_datetime(year, jieqi_name)
-                if jieqi_dt > dt:
-                    return jieqi_name, jieqi_dt
-            except ValueError:
-                continue
-
-        # 今年の節気が全て過ぎていたら、来年の立春
-        try:
-            next_year_lichun = self.get_jieqi_datetime(year + 1, "立春")
-            return "立春", next_year_lichun
-        except ValueError:
+        found = self.index.next_after(dt)
+        if found is None:
             raise ValueError(f"次の節気が見つかりません: {dt}")
+        return found[0], found[1].astimezone(KST)
 
     def get_previous_jieqi(self, dt: datetime) -> Tuple[str, datetime]:
         """
@@ -143,56 +102,40 @@ class SolarTermsDB:
         Returns:
             (節気名, 節気日時)
         """
-        year = dt.year
-
-        # 節気リスト（逆順）
-        jieqi_names = [
-            "小寒",
-            "大雪",
-            "立冬",
-            "寒露",
-            "白露",
-            "立秋",
-            "小暑",
-            "芒種",
-            "立夏",
-            "清明",
-            "驚蟄",
-            "立春",
-        ]
-
-        # 今年の節気をチェック（逆順）
-        for jieqi_name in jieqi_names:
-            try:
-                jieqi_dt = self.get_jieqi_datetime(year, jieqi_name)
-                if jieqi_dt < dt:
-                    return jieqi_name, jieqi_dt
-            except ValueError:
-                continue
-
-        # 今年の節気が全て後なら、去年の小寒
-        try:
-            prev_year_xiaohan = self.get_jieqi_datetime(year - 1, "小寒")
-            return "小寒", prev_year_xiaohan
-        except ValueError:
+        found = self.index.previous_before(dt)
+        if found is None:
             raise ValueError(f"前の節気が見つかりません: {dt}")
+        return found[0], found[1].astimezone(KST)
 
 
 class SajuCalculator:
     """命式計算エンジン"""
 
-    def __init__(self, solar_terms_db: Optional[SolarTermsDB] = None):
+    def __init__(
+        self, solar_terms_db: Optional[SolarTermsDB] = None, cache: Optional[ChartCache] = None
+    ):
         self.solar_terms_db = solar_terms_db or SolarTermsDB()
         self.fortune_analyzer = FortuneAnalyzer()
+        self.cache = cache
 
-    def calculate(self, birth_datetime: datetime, gender: str, name: Optional[str] = None) -> Dict:
+    def calculate(
+        self,
+        birth_datetime: datetime,
+        gender: str,
+        name: Optional[str] = None,
+        as_of: Optional[AsOf] = None,
+        policy: Optional[BirthTimePolicy] = None,
+    ) -> Dict:
         """
         命式計算のメインメソッド
 
         Args:
-            birth_datetime: 生年月日時（ISO 8601形式、KST推奨）
+            birth_datetime: 生年月日時（naiveは出生地の壁時計、タイムゾーン付きはその絶対時刻）。
+                応答のbirthDatetimeは入力のまま（保存用にそろえるのは BirthTimePolicy.canonical）
             gender: 性別（'male' or 'female'）
             name: 名前（オプション）
+            as_of: 現在の大運判定の基準日時（省略時は現在時刻）
+            policy: 出生時刻ポリシー（省略時は韓国の歴史的なオフセット・夜子時説）
 
         Returns:
             命式データ（辞書形式）
@@ -200,10 +143,52 @@ class SajuCalculator:
         # 1. 入力バリデーション
         self._validate_input(birth_datetime, gender)
 
-        # 2. KSTに変換
-        kst_time = self._to_kst(birth_datetime)
+        # 2. 出生時刻ポリシーで絶対時刻（KST）と日柱・時柱の判定時刻に変換
+        policy = policy or DEFAULT_POLICY
+        birth = policy.resolve(birth_datetime)
+        kst_time = birth.kst
+
+        # 3. 命式の純粋部分を計算（キャッシュにあれば再利用）
+        key = (
+            chart_cache_key(kst_time, gender, policy.variant, birth.wall)
+            if self.cache is not None
+            else None
+        )
+        chart = self.cache.get(key) if key is not None else None
+        if chart is None:
+            chart = self._calculate_chart(birth, gender, policy.day_boundary)
+            if key is not None:
+                self.cache.put(key, chart)
+
+        # 4. 時刻に依存する項目を付けてレスポンス構築
+        as_of = as_of or AsOf.current()
+        current_age = as_of.age_of(kst_time)
+        return {
+            "name": name,
+            **chart,
+            "birthDatetime": birth_datetime.isoformat(),
+            "daeunList": [
+                {**daeun, "isCurrent": daeun["startAge"] <= current_age <= daeun["endAge"]}
+                for daeun in chart["daeunList"]
+            ],
+            "createdAt": datetime.now(KST).isoformat(),
+        }
+
+    def _calculate_chart(self, birth: BirthTime, gender: str, day_boundary: str) -> Dict:
+        """
+        命式の純粋部分を計算（名前・作成日時・isCurrentを含まない）
+
+        Args:
+            birth: 出生時刻ポリシーで変換した出生時刻
+            gender: 性別（'male' or 'female'）
+            day_boundary: 子時の扱い
+
+        Returns:
+            命式データ（辞書形式、JSONに変換可能）
+        """
+        kst_time = birth.kst
 
-        # 3. lunar-pythonで四柱計算
+        # lunar-pythonで年柱・月柱・大運を計算
         solar = Solar.fromYmdHms(
             kst_time.year,
             kst_time.month,
@@ -215,40 +200,28 @@ class SajuCalculator:
         lunar = solar.getLunar()
         eight_char = lunar.getEightChar()
 
-        # 4. 四柱データ取得
-        year_stem = eight_char.getYearGan()
-        year_branch = eight_char.getYearZhi()
-        month_stem = eight_char.getMonthGan()
-        month_branch = eight_char.getMonthZhi()
-        day_stem = eight_char.getDayGan()
-        day_branch = eight_char.getDayZhi()
-        hour_stem = eight_char.getTimeGan()
-        hour_branch = eight_char.getTimeZhi()
-
-        # 5. 大運計算（吉凶判定を含む）
-        daeun_info = self._calculate_daeun(
-            eight_char, kst_time, gender,
-            day_stem, day_branch, month_branch, hour_stem, hour_branch
-        )
+        # 四柱データ取得（干支値）。日柱・時柱はポリシーの判定時刻から求める
+        year, month, _, _ = pillars_from_eight_char(eight_char)
+        day, hour = day_hour_pillars(birth.wall, day_boundary)
 
-        # 6. 吉凶レベル判定（原局全体）
-        fortune_level = self._calculate_fortune_level(
-            year_stem, year_branch, month_stem, month_branch, day_stem, day_branch, hour_stem, hour_branch
-        )
+        # 大運計算（吉凶判定を含む）
+        daeun_info = self._calculate_daeun(eight_char, kst_time, gender, day, month, hour)
+
+        # 吉凶レベル判定（原局全体）
+        fortune_level = self._calculate_fortune_level(year, month, day, hour)
 
-        # 7. レスポンス構築
+        # ここで漢字に変換
         return {
-            "name": name,
             "birthDatetime": kst_time.isoformat(),
             "gender": gender,
-            "yearStem": year_stem,
-            "yearBranch": year_branch,
-            "monthStem": month_stem,
-            "monthBranch": month_branch,
-            "dayStem": day_stem,
-            "dayBranch": day_branch,
-            "hourStem": hour_stem,
-            "hourBranch": hour_branch,
+            "yearStem": year.stem_char,
+            "yearBranch": year.branch_char,
+            "monthStem": month.stem_char,
+            "monthBranch": month.branch_char,
+            "dayStem": day.stem_char,
+            "dayBranch": day.branch_char,
+            "hourStem": hour.stem_char,
+            "hourBranch": hour.branch_char,
             "daeunNumber": daeun_info["daeunNumber"],
             "isForward": daeun_info["isForward"],
             "afterBirthYears": daeun_info["afterBirthYears"],
@@ -257,7 +230,6 @@ class SajuCalculator:
             "firstDaeunDate": daeun_info["firstDaeunDate"],
             "daeunList": daeun_info["daeunList"],
             "fortuneLevel": fortune_level,
-            "createdAt": datetime.now(KST).isoformat(),
         }
 
     def _validate_input(self, birth_datetime: datetime, gender: str):
@@ -271,23 +243,14 @@ class SajuCalculator:
         if gender not in ["male", "female"]:
             raise ValueError("genderは'male'または'female'である必要があります")
 
-    def _to_kst(self, dt: datetime) -> datetime:
-        """KST（韓国標準時 UTC+9）に変換"""
-        if dt.tzinfo is None:
-            # naive datetimeはKSTと仮定
-            return dt.replace(tzinfo=KST)
-        return dt.astimezone(KST)
-
     def _calculate_daeun(
         self,
         eight_char: EightChar,
         birth_datetime: datetime,
         gender: str,
-        day_stem: str,
-        day_branch: str,
-        month_branch: str,
-        hour_stem: str,
-        hour_branch: str
+        day: Ganzhi,
+        month: Ganzhi,
+        hour: Ganzhi,
     ) -> Dict:
         """
         大運計算（吉凶判定を含む）
@@ -296,11 +259,9 @@ class SajuCalculator:
             eight_char: lunar-pythonのEightCharオブジェクト
             birth_datetime: 生年月日時（KST）
             gender: 性別（'male' or 'female'）
-            day_stem: 日干
-            day_branch: 日支
-            month_branch: 月地支（調候判定用）
-            hour_stem: 時干
-            hour_branch: 時支
+            day: 日柱
+            month: 月柱（月地支を調候判定に使用）
+            hour: 時柱
 
         Returns:
             大運情報
@@ -351,36 +312,23 @@ class SajuCalculator:
             end_age = start_age + 9
 
             # 干支取得
-            gan_zhi = da_yun.getGanZhi()
-            daeun_stem = gan_zhi[0] if len(gan_zhi) >= 1 else ""
-            daeun_branch = gan_zhi[1] if len(gan_zhi) >= 2 else ""
+            daeun = Ganzhi.from_str(da_yun.getGanZhi())
 
             # 吉凶レベル判定（ドンサゴン分析）
-            fortune_level_str = self.fortune_analyzer.analyze_daeun_fortune(
-                day_stem=day_stem,
-                day_branch=day_branch,
-                hour_stem=hour_stem,
-                hour_branch=hour_branch,
-                month_branch=month_branch,
-                daeun_stem=daeun_stem,
-                daeun_branch=daeun_branch
+            fortune_level_str = self.fortune_analyzer.analyze_daeun(
+                day, hour, month.branch, daeun
             )
 
-            # 現在の大運かどうか判定
-            current_age = self._calculate_current_age(birth_datetime)
-            is_current = start_age <= current_age <= end_age
-
             daeun_list.append(
                 {
                     "id": idx + 1,  # 1から開始するID
                     "sajuId": "",  # エンドポイントで設定
                     "startAge": start_age,
                     "endAge": end_age,
-                    "daeunStem": daeun_stem,
-                    "daeunBranch": daeun_branch,
+                    "daeunStem": daeun.stem_char,
+                    "daeunBranch": daeun.branch_char,
                     "fortuneLevel": fortune_level_str,
-                    "sipsin": None,  # 将来実装
-                    "isCurrent": is_current,
+                    "sipsin": stem_sipsin(day.stem, daeun.stem),
                 }
             )
 
@@ -394,24 +342,8 @@ class SajuCalculator:
             "daeunList": daeun_list,
         }
 
-    def _calculate_current_age(self, birth_datetime: datetime) -> int:
-        """現在の年齢を計算"""
-        now = datetime.now(KST)
-        age = now.year - birth_datetime.year
-        if (now.month, now.day) < (birth_datetime.month, birth_datetime.day):
-            age -= 1
-        return max(age, 0)
-
     def _calculate_fortune_level(
-        self,
-        year_stem: str,
-        year_branch: str,
-        month_stem: str,
-        month_branch: str,
-        day_stem: str,
-        day_branch: str,
-        hour_stem: str,
-        hour_branch: str,
+        self, year: Ganzhi, month: Ganzhi, day: Ganzhi, hour: Ganzhi
     ) -> str:
         """
         吉凶レベル判定（暫定実装）
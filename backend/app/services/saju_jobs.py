@@ -0,0 +1,319 @@
+"""
+命式データのジョブ（エクスポート・インポート・大運吉凶レベルの再計算）
+
+どれもチャンク単位で処理し、チャンクごとに進捗を記録する
+- export: ユーザーの全命式をエクスポート形式にして結果に保存
+- import: エクスポートデータ（v1.0.0）を取り込む。チャンクごとにコミットし、既存IDは飛ばすため
+  途中で失敗しても同じデータで再投入すれば続きから取り込める
+- recompute_daeun: 判定ロジックのバージョンが古い命式の大運リストの吉凶レベルを再計算
+  （判定はプロセスプールで並列に行い、バッチごとのバルクUPDATEで書き戻す。チェックポイントから再開可能）
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Tuple, cast
+
+from sqlalchemy import ColumnElement, Table, bindparam, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Saju
+from app.schemas.saju import ExportData, ExportResponse, ExportSajuItem, SajuResponse
+from app.services.birth_time import BirthTimePolicy
+from app.services.clock import convert_datetime_to_db, convert_db_datetime_to_kst_iso
+from app.services.fortune_analyzer import (
+    ANALYZER_VERSION,
+    FORTUNE_LEVEL_CODES,
+    reanalyze_daeun_lists,
+)
+from app.services.job_queue import JobContext, job_handler
+from app.services.saju_stats import invalidate_saju_stats
+
+RECOMPUTE_SCOPES = ("own", "all")
+
+
+def export_item(saju_db: Saju) -> ExportSajuItem:
+    """
+    命式をエクスポート形式に変換
+
+    Args:
+        saju_db: 命式
+
+    Returns:
+        ExportSajuItem
+    """
+    return ExportSajuItem(
+        id=saju_db.id,
+        name=saju_db.name,
+        birth_datetime=convert_db_datetime_to_kst_iso(saju_db.birth_datetime),
+        gender=saju_db.gender,
+        saju={
+            "year_stem": saju_db.year_stem,
+            "year_branch": saju_db.year_branch,
+            "month_stem": saju_db.month_stem,
+            "month_branch": saju_db.month_branch,
+            "day_stem": saju_db.day_stem,
+            "day_branch": saju_db.day_branch,
+            "hour_stem": saju_db.hour_stem,
+            "hour_branch": saju_db.hour_branch,
+        },
+        created_at=convert_db_datetime_to_kst_iso(saju_db.created_at),
+    )
+
+
+def import_row(saju: SajuResponse, user_id: str, now: datetime) -> Dict[str, Any]:
+    """
+    インポートする命式をSajuの行（属性名 → 値）に変換
+
+    Args:
+        saju: インポートデータの命式
+        user_id: 取り込み先のユーザーID
+        now: 作成日時（naive、UTC）
+
+    Returns:
+        Sajuの属性名 → 値
+    """
+    return dict(
+        id=saju.id,
+        user_id=user_id,
+        name=saju.name,
+        birth_datetime=convert_datetime_to_db(
+            datetime.fromisoformat(saju.birthDatetime.replace("Z", "+00:00"))
+        ),
+        gender=saju.gender,
+        year_stem=saju.yearStem,
+        year_branch=saju.yearBranch,
+        month_stem=saju.monthStem,
+        month_branch=saju.monthBranch,
+        day_stem=saju.dayStem,
+        day_branch=saju.dayBranch,
+        hour_stem=saju.hourStem,
+        hour_branch=saju.hourBranch,
+        daeun_list=json.dumps([d.model_dump() for d in saju.daeunList], ensure_ascii=False),
+        fortune_level=FORTUNE_LEVEL_CODES.get(saju.fortuneLevel, 3),
+        birth_time_policy=BirthTimePolicy.from_fields(saju.birthTimePolicy).stored,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _owner(ctx: JobContext) -> str:
+    """ジョブを投入したユーザーID（ユーザーの命式を扱うジョブ用）"""
+    if ctx.user_id is None:
+        raise ValueError("ジョブを投入したユーザーが必要です")
+    return ctx.user_id
+
+
+# ==================== エクスポート ====================
+
+
+@job_handler("export")
+def export_job(ctx: JobContext) -> Dict[str, Any]:
+    """ユーザーの全命式をエクスポート（結果はExportResponse形式）"""
+    user_id = _owner(ctx)
+    session = ctx.session()
+    try:
+        ids = session.scalars(
+            select(Saju.id).where(Saju.user_id == user_id).order_by(Saju.created_at.desc())
+        ).all()
+        ctx.set_total(len(ids))
+
+        items: List[ExportSajuItem] = []
+        for start in range(0, len(ids), ctx.chunk_size):
+            chunk = ids[start : start + ctx.chunk_size]
+            rows = {row.id: row for row in session.scalars(select(Saju).where(Saju.id.in_(chunk)))}
+            items.extend(export_item(rows[saju_id]) for saju_id in chunk if saju_id in rows)
+            session.expunge_all()
+            ctx.advance(len(chunk))
+
+        return ExportResponse(
+            exported_at=datetime.now().isoformat(),
+            user_id=user_id,
+            count=len(items),
+            data=items,
+        ).model_dump()
+    finally:
+        session.close()
+
+
+# ==================== インポート ====================
+
+
+def validate_import(params: Dict[str, Any]) -> None:
+    """インポートデータを検証（不正ならValueError）"""
+    data = ExportData.model_validate(params)
+    if data.version != "1.0.0":
+        raise ValueError(f"サポートされていないバージョンです: {data.version}")
+
+
+@job_handler("import", validate=validate_import)
+def import_job(ctx: JobContext) -> Dict[str, Any]:
+    """エクスポートデータを取り込む（既存IDは飛ばす）"""
+    user_id = _owner(ctx)
+    data = ExportData.model_validate(ctx.params)
+    ctx.set_total(len(data.data))
+
+    imported = 0
+    session = ctx.session()
+    try:
+        for start in range(0, len(data.data), ctx.chunk_size):
+            chunk = data.data[start : start + ctx.chunk_size]
+            existing = set(
+                session.scalars(select(Saju.id).where(Saju.id.in_([saju.id for saju in chunk])))
+            )
+            now = datetime.utcnow()
+            # 同じチャンク内の重複IDは先勝ち
+            rows: Dict[str, Dict[str, Any]] = {}
+            for saju in chunk:
+                if saju.id not in existing and saju.id not in rows:
+                    rows[saju.id] = import_row(saju, user_id, now)
+            if rows:
+                session.execute(insert(Saju), list(rows.values()))
+            session.commit()
+            imported += len(rows)
+            ctx.advance(len(chunk))
+    finally:
+        session.close()
+
+    invalidate_saju_stats(user_id)
+    return {
+        "importedCount": imported,
+        "skippedCount": len(data.data) - imported,
+        "message": f"{imported}件のデータをインポートしました",
+    }
+
+
+# ==================== 大運吉凶レベルの再計算 ====================
+
+
+def validate_recompute(params: Dict[str, Any]) -> None:
+    """再計算の対象範囲を検証（不正ならValueError）"""
+    if params.get("scope", "own") not in RECOMPUTE_SCOPES:
+        raise ValueError(f"scopeは{'/'.join(RECOMPUTE_SCOPES)}のいずれかです")
+
+
+def _stale_condition() -> ColumnElement[bool]:
+    """現在の判定ロジックで判定されていない行"""
+    return or_(Saju.analyzer_version.is_(None), Saju.analyzer_version != ANALYZER_VERSION)
+
+
+# 判定結果の書き戻し（executemanyのバルクUPDATE）
+# 読んだ後に命式更新APIなどで変更された行（updated_atが変わった行）は上書きしない
+_SAJU_TABLE = cast(Table, Saju.__table__)
+_WRITE_BACK = (
+    update(_SAJU_TABLE)
+    .where(
+        _SAJU_TABLE.c.id == bindparam("b_id"),
+        _SAJU_TABLE.c.updated_at == bindparam("b_read_updated_at"),
+    )
+    .values(
+        daeun_list=bindparam("b_daeun_list"),
+        analyzer_version=ANALYZER_VERSION,
+        updated_at=bindparam("b_updated_at"),
+    )
+)
+
+
+def _read_window(
+    session: Session, conditions: List[Any], after_id: str, window: int, batch_size: int
+) -> Tuple[List[List[Tuple[Any, ...]]], Dict[str, datetime]]:
+    """
+    再開位置より後の行を1ウィンドウ分読み、判定用のバッチに分ける
+
+    yield_perでバッチごとに取り出し、ウィンドウを読み終えてから書き込むため
+    読み取りのカーソル・トランザクションを書き込み中に持ち続けない
+
+    Returns:
+        (判定用のバッチのリスト, 命式ID → 読んだ時点のupdated_at)
+    """
+    result = session.execute(
+        select(
+            Saju.id,
+            Saju.day_stem,
+            Saju.day_branch,
+            Saju.hour_stem,
+            Saju.hour_branch,
+            Saju.month_branch,
+            Saju.daeun_list,
+            Saju.updated_at,
+        )
+        .where(*conditions, Saju.id > after_id)
+        .order_by(Saju.id)
+        .limit(window)
+        .execution_options(yield_per=batch_size)
+    )
+    batches: List[List[Tuple[Any, ...]]] = []
+    read_at: Dict[str, datetime] = {}
+    for partition in result.partitions():
+        batches.append([tuple(row[:7]) for row in partition])
+        read_at.update((row[0], row[7]) for row in partition)
+    session.rollback()
+    return batches, read_at
+
+
+@job_handler("recompute_daeun", validate=validate_recompute)
+def recompute_daeun_job(ctx: JobContext) -> Dict[str, Any]:
+    """
+    大運リストの吉凶レベルを再計算
+
+    - 対象はanalyzer_versionが現在のANALYZER_VERSIONと違う行（force=trueなら全行）
+      scope=allは全ユーザー・ゲストの命式が対象
+    - ID順にウィンドウ単位で読み、バッチごとにプロセスプールで判定し、バッチごとのバルクUPDATEで
+      バージョンを付けて書き戻す（行ロックはバッチのUPDATEの間だけ）
+    - バッチごとに最後のIDをチェックポイントに記録し、再実行時はその続きから処理する
+    - 読んだ後に更新された行は書き戻さずバージョンも古いままにする（次回の実行で拾い直す）
+    """
+    conditions = [] if ctx.params.get("scope") == "all" else [Saju.user_id == ctx.user_id]
+    if not ctx.params.get("force"):
+        conditions.append(_stale_condition())
+    after_id = ctx.checkpoint or ""
+    window = ctx.chunk_size * ctx.parallelism * 2
+
+    scanned = updated = 0
+    session = ctx.session()
+    try:
+        remaining = session.scalar(
+            select(func.count()).select_from(Saju).where(*conditions, Saju.id > after_id)
+        )
+        ctx.set_total(ctx.progress + (remaining or 0))
+
+        while True:
+            batches, read_at = _read_window(session, conditions, after_id, window, ctx.chunk_size)
+            if not batches:
+                break
+            for batch, changed in zip(batches, ctx.map(reanalyze_daeun_lists, batches)):
+                now = datetime.utcnow()
+                changed_ids = {saju_id for saju_id, _ in changed}
+                if changed:
+                    session.execute(
+                        _WRITE_BACK,
+                        [
+                            {
+                                "b_id": saju_id,
+                                "b_read_updated_at": read_at[saju_id],
+                                "b_daeun_list": daeun_json,
+                                "b_updated_at": now,
+                            }
+                            for saju_id, daeun_json in changed
+                        ],
+                    )
+                # 判定が変わらなかった行はバージョンだけを付ける（updated_atは変えない）
+                unchanged_ids = [row[0] for row in batch if row[0] not in changed_ids]
+                if unchanged_ids:
+                    session.execute(
+                        update(Saju)
+                        .where(Saju.id.in_(unchanged_ids), _stale_condition())
+                        .values(analyzer_version=ANALYZER_VERSION, updated_at=Saju.updated_at)
+                        .execution_options(synchronize_session=False)
+                    )
+                session.commit()
+                scanned += len(batch)
+                updated += len(changed)
+                after_id = batch[-1][0]
+                ctx.advance(len(batch), checkpoint=after_id)
+    finally:
+        session.close()
+
+    if ctx.params.get("scope") == "all":
+        invalidate_saju_stats()
+    else:
+        invalidate_saju_stats(ctx.user_id)
+    return {"scannedCount": scanned, "updatedCount": updated, "analyzerVersion": ANALYZER_VERSION}
@@ -0,0 +1,171 @@
+"""
+保存済み命式の絞り込み検索・ファセット集計・一括削除
+
+- 条件は四柱（天干・地支）・性別・生年月日時の範囲・吉凶レベル
+- 絞り込み・件数・ファセットはすべてSQLで行う（ファセットはGROUP BY）
+- 一括削除は所有者の条件付きのDELETE 1文で行う
+- (user_id, 天干, 地支) などの複合インデックス（app/models）で引く
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Saju
+from app.services.fortune_analyzer import FORTUNE_LEVEL_NAMES
+
+PILLARS = ("year", "month", "day", "hour")
+
+# ファセット名 → GROUP BYする列
+FACETS = {
+    **{f"{pillar}Pillar": (f"{pillar}_stem", f"{pillar}_branch") for pillar in PILLARS},
+    **{f"{pillar}Stem": (f"{pillar}_stem",) for pillar in PILLARS},
+    **{f"{pillar}Branch": (f"{pillar}_branch",) for pillar in PILLARS},
+    "gender": ("gender",),
+    "fortuneLevel": ("fortune_level",),
+}
+
+# 並び順に指定できる項目 → 列
+SORT_COLUMNS = {
+    "createdAt": "created_at",
+    "birthDatetime": "birth_datetime",
+    "fortuneLevel": "fortune_level",
+}
+
+
+@dataclass
+class SajuFilter:
+    """
+    命式の絞り込み条件（Noneの項目は条件にしない）
+
+    - pillars: 列名（"day_stem" など）→ 値
+    - birth_from / birth_to: 生年月日時の範囲（naive、UTC。birth_toは含まない）
+    - fortune_levels: 吉凶レベル（数値、いずれかに一致）
+    """
+
+    pillars: Dict[str, str] = field(default_factory=dict)
+    gender: Optional[str] = None
+    birth_from: Optional[datetime] = None
+    birth_to: Optional[datetime] = None
+    fortune_levels: Tuple[int, ...] = ()
+
+    def is_empty(self) -> bool:
+        """条件が1つも指定されていないか"""
+        return not (
+            self.pillars
+            or self.gender is not None
+            or self.birth_from is not None
+            or self.birth_to is not None
+            or self.fortune_levels
+        )
+
+    def conditions(self, user_id: str) -> List:
+        """WHERE条件のリスト"""
+        conditions = [Saju.user_id == user_id]
+        conditions.extend(getattr(Saju, column) == value for column, value in self.pillars.items())
+        if self.gender is not None:
+            conditions.append(Saju.gender == self.gender)
+        if self.birth_from is not None:
+            conditions.append(Saju.birth_datetime >= self.birth_from)
+        if self.birth_to is not None:
+            conditions.append(Saju.birth_datetime < self.birth_to)
+        if self.fortune_levels:
+            conditions.append(Saju.fortune_level.in_(self.fortune_levels))
+        return conditions
+
+
+def search_sajus(
+    db: Session,
+    user_id: str,
+    saju_filter: SajuFilter,
+    sort_by: str = "createdAt",
+    order: str = "desc",
+    page: int = 1,
+    limit: int = 20,
+) -> Tuple[List[Saju], int]:
+    """
+    条件に一致する命式を1ページ分取得
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        saju_filter: 絞り込み条件
+        sort_by: 並び順（SORT_COLUMNSのキー）
+        order: "asc" / "desc"
+        page: ページ番号（1始まり）
+        limit: 1ページの件数
+
+    Returns:
+        (命式のリスト, 総件数)
+    """
+    conditions = saju_filter.conditions(user_id)
+    total = db.scalar(select(func.count()).select_from(Saju).where(*conditions))
+
+    column = getattr(Saju, SORT_COLUMNS.get(sort_by, "created_at"))
+    items = db.scalars(
+        select(Saju)
+        .where(*conditions)
+        .order_by(column.asc() if order == "asc" else column.desc(), Saju.id)
+        .offset((page - 1) * limit)
+        .limit(limit)
+    ).all()
+    return list(items), total
+
+
+def facet_counts(
+    db: Session, user_id: str, saju_filter: SajuFilter, names: Sequence[str]
+) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    絞り込み後の命式のファセットごとの件数をGROUP BYで集計
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        saju_filter: 絞り込み条件
+        names: ファセット名（FACETSのキー）
+
+    Returns:
+        ファセット名 → (値, 件数) のリスト（件数の多い順）
+    """
+    conditions = saju_filter.conditions(user_id)
+    facets = {}
+    for name in names:
+        columns = [getattr(Saju, column) for column in FACETS[name]]
+        count = func.count().label("count")
+        rows = db.execute(
+            select(*columns, count)
+            .where(*conditions)
+            .group_by(*columns)
+            .order_by(count.desc(), *columns)
+        ).all()
+        if name == "fortuneLevel":
+            facets[name] = [(FORTUNE_LEVEL_NAMES.get(row[0], "平"), row[-1]) for row in rows]
+        else:
+            facets[name] = [("".join(row[:-1]), row[-1]) for row in rows]
+    return facets
+
+
+def delete_sajus(
+    db: Session, user_id: str, saju_filter: SajuFilter, ids: Optional[Sequence[str]] = None
+) -> int:
+    """
+    条件に一致する自分の命式をDELETE 1文で削除（コミットしない）
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID（他のユーザーの命式は条件に一致しても削除しない）
+        saju_filter: 絞り込み条件
+        ids: 命式ID（指定時はこのIDのうち条件に一致するものだけ）
+
+    Returns:
+        削除した件数
+    """
+    conditions = saju_filter.conditions(user_id)
+    if ids is not None:
+        conditions.append(Saju.id.in_(ids))
+    result = db.execute(
+        delete(Saju).where(*conditions).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -0,0 +1,155 @@
+"""
+保存済み命式の集計（ダッシュボード用）
+
+- 日干・日干の五行・吉凶レベルの分布はSQLのGROUP BYで集計し、命式モデルを作らない
+- 現在の大運の吉凶レベルは大運リストがJSON列のため、(生年月日時, 大運リスト) の列だけを
+  yield_perで流しながら数える
+- 集計結果は (ユーザーID, 基準日) ごとにキャッシュし、命式の保存・更新・削除時に
+  invalidate_saju_stats で捨てる
+"""
+import json
+import threading
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models import Saju
+from app.services.clock import AsOf
+from app.services.donsagong_matrix import HEAVENLY_STEMS
+from app.services.fortune_analyzer import FORTUNE_LEVEL_CODES, FORTUNE_LEVEL_NAMES
+from app.services.ganzhi import STEM_ELEMENTS
+
+ELEMENTS = ("wood", "fire", "earth", "metal", "water")
+
+# 吉凶レベル（良い順）
+FORTUNE_LEVELS = tuple(sorted(FORTUNE_LEVEL_CODES, key=FORTUNE_LEVEL_CODES.get, reverse=True))
+
+# 日干 → 五行（SQLのCASE式）
+_DAY_ELEMENT = case(dict(zip(HEAVENLY_STEMS, STEM_ELEMENTS)), value=Saju.day_stem, else_="unknown")
+
+_STATS_CACHE_SIZE = 256
+_stats_cache: Dict[Tuple[str, date], Dict] = {}
+_stats_cache_lock = threading.Lock()
+# 無効化の回数（集計中に無効化された結果をキャッシュしないため）
+_stats_generation = 0
+
+
+def _ordered(counts: Dict[str, int], domain: Tuple[str, ...]) -> List[Tuple[str, int]]:
+    """定義域の順に件数を並べる（0件も含め、定義域外の値は末尾）"""
+    extra = sorted(value for value in counts if value not in domain)
+    return [(value, counts.get(value, 0)) for value in (*domain, *extra)]
+
+
+def _current_daeun_level(
+    birth_datetime: datetime, daeun_list_json: Optional[str], as_of: AsOf
+) -> Optional[str]:
+    """基準日時点の大運の吉凶レベル（該当なし・不正データはNone）"""
+    if not daeun_list_json:
+        return None
+    age = as_of.age_of(birth_datetime)
+    try:
+        for daeun in json.loads(daeun_list_json):
+            if daeun["startAge"] <= age <= daeun["endAge"]:
+                return daeun["fortuneLevel"]
+    except (ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def compute_saju_stats(db: Session, user_id: str, as_of: AsOf, batch_size: int = 500) -> Dict:
+    """
+    ユーザーの命式の分布を集計
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        as_of: 現在の大運を決める基準日時
+        batch_size: 大運リストを読む際のyield_perの件数
+
+    Returns:
+        {"total", "dayStem", "dayElement", "fortuneLevel", "currentDaeunLevel"}
+        （分布は (値, 件数) のリスト）
+    """
+    owned = Saju.user_id == user_id
+
+    def grouped(column) -> Dict:
+        return dict(db.execute(select(column, func.count()).where(owned).group_by(column)).all())
+
+    day_stems = grouped(Saju.day_stem)
+    day_elements = grouped(_DAY_ELEMENT)
+    fortune_levels = {
+        FORTUNE_LEVEL_NAMES.get(level, str(level)): count
+        for level, count in grouped(Saju.fortune_level).items()
+    }
+
+    daeun_levels = Counter()
+    rows = db.execute(
+        select(Saju.birth_datetime, Saju.daeun_list)
+        .where(owned)
+        .execution_options(yield_per=batch_size)
+    )
+    for birth_datetime, daeun_list_json in rows:
+        level = _current_daeun_level(birth_datetime, daeun_list_json, as_of)
+        if level is not None:
+            daeun_levels[level] += 1
+
+    return {
+        "total": sum(day_stems.values()),
+        "dayStem": _ordered(day_stems, HEAVENLY_STEMS),
+        "dayElement": _ordered(day_elements, ELEMENTS),
+        "fortuneLevel": _ordered(fortune_levels, FORTUNE_LEVELS),
+        "currentDaeunLevel": _ordered(daeun_levels, FORTUNE_LEVELS),
+    }
+
+
+def get_saju_stats(db: Session, user_id: str, as_of: AsOf, use_cache: bool = True) -> Dict:
+    """
+    ユーザーの命式の分布を取得（キャッシュがあれば再利用）
+
+    Args:
+        db: データベースセッション
+        user_id: ユーザーID
+        as_of: 現在の大運を決める基準日時
+        use_cache: キャッシュを使うか
+
+    Returns:
+        compute_saju_stats の結果
+    """
+    if not use_cache:
+        return compute_saju_stats(db, user_id, as_of)
+
+    key = (user_id, as_of.today)
+    with _stats_cache_lock:
+        cached = _stats_cache.get(key)
+        generation = _stats_generation
+    if cached is not None:
+        return cached
+
+    stats = compute_saju_stats(db, user_id, as_of)
+    with _stats_cache_lock:
+        if generation == _stats_generation:
+            if len(_stats_cache) >= _STATS_CACHE_SIZE:
+                _stats_cache.clear()
+            _stats_cache[key] = stats
+    return stats
+
+
+def invalidate_saju_stats(*user_ids: Optional[str]):
+    """
+    ユーザーの集計キャッシュを捨てる（命式の保存・更新・削除後に呼ぶ）
+
+    Args:
+        user_ids: ユーザーID（Noneは無視。引数なしなら全ユーザー）
+    """
+    global _stats_generation
+    with _stats_cache_lock:
+        _stats_generation += 1
+        if not user_ids:
+            _stats_cache.clear()
+            return
+        targets = {user_id for user_id in user_ids if user_id is not None}
+        for key in [key for key in _stats_cache if key[0] in targets]:
+            del _stats_cache[key]
@@ -0,0 +1,154 @@
+"""
+命式の保存（/save）のUPSERT
+
+- PostgreSQL・SQLiteは INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING id の1文で書き込む
+  （複数件でも1往復。SQLiteは3.35以降でRETURNINGに対応）
+- それ以外のDBは同じトランザクション内でSELECT → INSERT / UPDATE に切り替える
+- 既存の行はゲストの行（user_id IS NULL）か自分の行だけを更新し、他のユーザーの行は返さない
+- コミットは呼び出し側で行う（冪等キーの記録と同じトランザクションにするため）
+- 大運リストの吉凶レベルは保存時に現在の判定ロジックで判定し直し、ANALYZER_VERSIONを付ける
+  （送られてきた判定を信用しない。再計算ジョブの対象にならず、詳細APIはそのまま埋め込める）
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Saju
+from app.schemas.saju import SajuResponse
+from app.services.birth_time import BirthTimePolicy
+from app.services.clock import convert_datetime_to_db
+from app.services.fortune_analyzer import (
+    ANALYZER_VERSION,
+    FORTUNE_LEVEL_CODES,
+    reanalyze_daeun_lists,
+)
+
+# 既存の行で更新する列（四柱・大運は計算結果なので保存時には変えない）
+UPSERT_UPDATE_COLUMNS = ("user_id", "name", "updated_at")
+
+
+def current_daeun_list(saju: SajuResponse) -> str:
+    """
+    大運リストを現在の判定ロジック（ANALYZER_VERSION）で判定し直したJSON
+
+    Args:
+        saju: 計算済みの命式
+
+    Returns:
+        大運リストのJSON文字列
+    """
+    daeun_json = json.dumps([d.model_dump() for d in saju.daeunList], ensure_ascii=False)
+    changed = reanalyze_daeun_lists(
+        [
+            (
+                saju.id,
+                saju.dayStem,
+                saju.dayBranch,
+                saju.hourStem,
+                saju.hourBranch,
+                saju.monthBranch,
+                daeun_json,
+            )
+        ]
+    )
+    return changed[0][1] if changed else daeun_json
+
+
+def save_row(saju: SajuResponse, user_id: str, now: datetime) -> Dict[str, Any]:
+    """
+    保存する命式をSajuの行（属性名 → 値）に変換
+
+    Args:
+        saju: 計算済みの命式
+        user_id: 保存するユーザーID
+        now: 作成・更新日時（naive、UTC）
+
+    Returns:
+        Sajuの属性名 → 値
+    """
+    return dict(
+        id=saju.id,
+        user_id=user_id,
+        name=saju.name,
+        birth_datetime=convert_datetime_to_db(
+            datetime.fromisoformat(saju.birthDatetime.replace("Z", "+00:00"))
+        ),
+        gender=saju.gender,
+        year_stem=saju.yearStem,
+        year_branch=saju.yearBranch,
+        month_stem=saju.monthStem,
+        month_branch=saju.monthBranch,
+        day_stem=saju.dayStem,
+        day_branch=saju.dayBranch,
+        hour_stem=saju.hourStem,
+        hour_branch=saju.hourBranch,
+        daeun_list=current_daeun_list(saju),
+        analyzer_version=ANALYZER_VERSION,
+        fortune_level=FORTUNE_LEVEL_CODES.get(saju.fortuneLevel, 3),
+        birth_time_policy=BirthTimePolicy.from_fields(saju.birthTimePolicy).stored,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _dialect_insert(db: Session):
+    """ON CONFLICTに対応したINSERT（非対応のDBならNone）"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def upsert_sajus(db: Session, rows: Sequence[Dict[str, Any]]) -> List[str]:
+    """
+    命式をまとめてUPSERT（コミットしない）
+
+    Args:
+        db: データベースセッション
+        rows: save_row の結果（同じユーザー、IDの重複なし）
+
+    Returns:
+        保存できた命式ID（他のユーザーの行と衝突したIDは含まない）
+    """
+    if not rows:
+        return []
+
+    dialect_insert = _dialect_insert(db)
+    if dialect_insert is not None:
+        stmt = dialect_insert(Saju).values(list(rows))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Saju.id],
+            set_={column: stmt.excluded[column] for column in UPSERT_UPDATE_COLUMNS},
+            where=or_(Saju.user_id.is_(None), Saju.user_id == stmt.excluded.user_id),
+        ).returning(Saju.id)
+        return list(db.scalars(stmt))
+
+    # ON CONFLICT非対応のDB
+    owners = dict(
+        db.execute(select(Saju.id, Saju.user_id).where(Saju.id.in_([r["id"] for r in rows])))
+    )
+    saved = []
+    new_rows = []
+    for row in rows:
+        if row["id"] not in owners:
+            new_rows.append(row)
+        elif owners[row["id"]] in (None, row["user_id"]):
+            db.execute(
+                update(Saju)
+                .where(Saju.id == row["id"])
+                .values({column: row[column] for column in UPSERT_UPDATE_COLUMNS})
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            continue
+        saved.append(row["id"])
+    if new_rows:
+        db.execute(insert(Saju), new_rows)
+    return saved
@@ -0,0 +1,134 @@
+"""
+十神（通変星）計算エンジン
+日干と対象天干の五行・陰陽関係から十神を求める
+
+- 10×10の十神表はimport時に1度だけ計算し、以降は配列参照のみ
+- 地支は蔵干（本気・中気・余気）を介して十神に展開する
+"""
+from array import array
+from typing import Tuple
+
+from .donsagong_matrix import BRANCH_INDEX, STEM_INDEX
+
+# 十神名（コード順: 関係×2 + 陰陽差）
+SIPSIN_NAMES = ("比肩", "劫財", "食神", "傷官", "偏財", "正財", "偏官", "正官", "偏印", "印綬")
+
+# 地支の蔵干（天干コード、本気→中気→余気の順）
+HIDDEN_STEMS: Tuple[Tuple[int, ...], ...] = (
+    (9,),  # 子: 癸
+    (5, 9, 7),  # 丑: 己 癸 辛
+    (0, 2, 4),  # 寅: 甲 丙 戊
+    (1,),  # 卯: 乙
+    (4, 1, 9),  # 辰: 戊 乙 癸
+    (2, 6, 4),  # 巳: 丙 庚 戊
+    (3, 5),  # 午: 丁 己
+    (5, 3, 1),  # 未: 己 丁 乙
+    (6, 8, 4),  # 申: 庚 壬 戊
+    (7,),  # 酉: 辛
+    (4, 7, 3),  # 戌: 戊 辛 丁
+    (8, 0),  # 亥: 壬 甲
+)
+
+
+def _sipsin(day_stem: int, target_stem: int) -> int:
+    """
+    十神コードを計算
+
+    五行（天干コード÷2）の差で関係を決め、陰陽（天干コードの偶奇）が同じなら偏、異なれば正
+    - 0: 同じ五行（比肩・劫財）
+    - 1: 日干が生じる（食神・傷官）
+    - 2: 日干が剋す（偏財・正財）
+    - 3: 日干を剋す（偏官・正官）
+    - 4: 日干を生じる（偏印・印綬）
+    """
+    relation = (target_stem // 2 - day_stem // 2) % 5
+    return relation * 2 + (day_stem - target_stem) % 2
+
+
+# 天干十神表（行: 日干、列: 対象天干）
+SIPSIN_FLAT = array("b", (_sipsin(d, t) for d in range(10) for t in range(10)))
+SIPSIN = memoryview(SIPSIN_FLAT).cast("b", (10, 10))
+
+# 十神名の平坦表（行: 日干、列: 対象天干）
+_STEM_NAMES: Tuple[str, ...] = tuple(SIPSIN_NAMES[code] for code in SIPSIN_FLAT)
+
+# 地支十神表（本気基準、行: 日干、列: 地支）
+_BRANCH_NAMES: Tuple[str, ...] = tuple(
+    SIPSIN_NAMES[SIPSIN_FLAT[d * 10 + HIDDEN_STEMS[b][0]]] for d in range(10) for b in range(12)
+)
+
+
+def stem_sipsin(day_stem: int, target_stem: int) -> str:
+    """
+    天干の十神名を取得
+
+    Args:
+        day_stem: 日干コード（0〜9）
+        target_stem: 対象天干コード（0〜9）
+
+    Returns:
+        十神名
+    """
+    return _STEM_NAMES[day_stem * 10 + target_stem]
+
+
+def branch_sipsin(day_stem: int, branch: int) -> str:
+    """
+    地支の十神名を取得（蔵干の本気基準）
+
+    Args:
+        day_stem: 日干コード（0〜9）
+        branch: 地支コード（0〜11）
+
+    Returns:
+        十神名
+    """
+    return _BRANCH_NAMES[day_stem * 12 + branch]
+
+
+def branch_sipsin_all(day_stem: int, branch: int) -> Tuple[str, ...]:
+    """
+    地支の全蔵干の十神名を取得（本気→中気→余気の順）
+
+    Args:
+        day_stem: 日干コード（0〜9）
+        branch: 地支コード（0〜11）
+
+    Returns:
+        十神名のタプル
+    """
+    return tuple(_STEM_NAMES[day_stem * 10 + stem] for stem in HIDDEN_STEMS[branch])
+
+
+def sipsin_of(day_stem: str, target_stem: str) -> str:
+    """
+    天干の十神名を取得（漢字入力版）
+
+    Args:
+        day_stem: 日干
+        target_stem: 対象天干
+
+    Returns:
+        十神名
+    """
+    try:
+        return _STEM_NAMES[STEM_INDEX[day_stem] * 10 + STEM_INDEX[target_stem]]
+    except KeyError as e:
+        raise ValueError(f"不正な天干です: {e.args[0]}")
+
+
+def branch_sipsin_of(day_stem: str, branch: str) -> str:
+    """
+    地支の十神名を取得（漢字入力版、蔵干の本気基準）
+
+    Args:
+        day_stem: 日干
+        branch: 地支
+
+    Returns:
+        十神名
+    """
+    try:
+        return _BRANCH_NAMES[STEM_INDEX[day_stem] * 12 + BRANCH_INDEX[branch]]
+    except KeyError as e:
+        raise ValueError(f"不正な天干・地支です: {e.args[0]}")
@@ -0,0 +1,98 @@
+"""
+歴史的タイムゾーン遷移表（1900〜2109年、韓国・日本・中国）
+app/data/tz_transitions_1900_2109.json（generate_tz_transitions.pyで生成）を1度だけ読み込み、
+UTCオフセットの切り替わりを昇順の配列にして二分探索で引く
+
+- 韓国の+8:30時代・夏時間、日本・中国の夏時間を含む
+- 壁時計（naive）からの検索はzoneinfoのfold=0と同じ解釈
+  （夏時間開始で飛ばされた時刻・終了で重複する時刻は切り替わり前のオフセット）
+- 表に無いゾーンは呼び出し側でzoneinfoにフォールバックする
+"""
+import json
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+TZ_TABLE_PATH = Path(__file__).parent.parent / "data" / "tz_transitions_1900_2109.json"
+
+# date.toordinal() の1970-01-01
+_EPOCH_ORDINAL = 719163
+
+
+def epoch_seconds(dt: datetime) -> int:
+    """naive datetimeを（そのまま）1970-01-01からの秒数に変換"""
+    return (dt.toordinal() - _EPOCH_ORDINAL) * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+class ZoneTransitions:
+    """
+    1ゾーンの遷移表（読み取り専用）
+
+    - utc_starts: 各オフセットが始まるUTCのエポック秒（昇順）
+    - local_starts: 各オフセットが始まる壁時計のエポック秒（fold=0の解釈）
+    - offsets / dsts: UTCオフセット・夏時間分（秒）
+    """
+
+    __slots__ = ("utc_starts", "local_starts", "offsets", "dsts")
+
+    def __init__(self, rows):
+        self.utc_starts = array("q", (row[0] for row in rows))
+        self.offsets = array("l", (row[1] for row in rows))
+        self.dsts = array("l", (row[2] for row in rows))
+        # 切り替わり前後の大きい方のオフセットで壁時計に直すと、
+        # 飛ばされた時刻・重複する時刻はどちらも切り替わり前に入る
+        self.local_starts = array(
+            "q",
+            (
+                start + max(offset, self.offsets[i - 1] if i else offset)
+                for i, (start, offset) in enumerate(zip(self.utc_starts, self.offsets))
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.utc_starts)
+
+    def at_utc(self, utc_epoch: int) -> Tuple[int, int]:
+        """UTCのエポック秒に対する(UTCオフセット, 夏時間分)"""
+        i = max(bisect_right(self.utc_starts, utc_epoch) - 1, 0)
+        return self.offsets[i], self.dsts[i]
+
+    def at_local(self, local_epoch: int) -> Tuple[int, int]:
+        """壁時計のエポック秒に対する(UTCオフセット, 夏時間分)"""
+        i = max(bisect_right(self.local_starts, local_epoch) - 1, 0)
+        return self.offsets[i], self.dsts[i]
+
+
+class TzTable:
+    """ゾーン名 → 遷移表"""
+
+    __slots__ = ("zones",)
+
+    def __init__(self, data: Dict):
+        self.zones: Dict[str, ZoneTransitions] = {
+            name: ZoneTransitions(rows) for name, rows in data.get("zones", {}).items()
+        }
+
+    def get(self, zone: str) -> Optional[ZoneTransitions]:
+        return self.zones.get(zone)
+
+
+@lru_cache(maxsize=4)
+def load_tz_table(path: Path = TZ_TABLE_PATH) -> TzTable:
+    """
+    遷移表を読み込み（パスごとにプロセス内で1つだけ作る）
+
+    Args:
+        path: 遷移表JSONのパス
+
+    Returns:
+        遷移表（ファイルが無ければ空の表）
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return TzTable(json.load(f))
+    except FileNotFoundError:
+        return TzTable({})
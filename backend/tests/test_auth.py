@@ -4,17 +4,22 @@
 - POST /api/auth/register
 - POST /api/auth/login
 - POST /api/auth/logout
+- POST /api/auth/refresh
 - GET /api/auth/me
 """
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core.auth import hash_refresh_token
 from app.core.config import settings
 from app.db.session import Base, get_db
 from app.main import app
 from app.models import RefreshToken, User
+from app.services.refresh_tokens import sweep_expired_refresh_tokens
 
 # テスト用データベース（.env.localと同じデータベースを使用）
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
@@ -289,6 +294,111 @@ def test_logout_no_token():
     assert response.status_code == 403  # HTTPBearer requires Authorization header
 
 
+# ==================== リフレッシュテスト ====================
+
+
+def _register(email: str) -> dict:
+    response = client.post(
+        "/api/auth/register", json={"email": email, "password": "SecurePass2025!"}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_refresh_rotation():
+    """リフレッシュ成功: 新しいトークンを発行し、使ったトークンは失効"""
+    old_token = _register("test_refresh@example.com")["refreshToken"]
+
+    response = client.post("/api/auth/refresh", json={"refreshToken": old_token})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["refreshToken"] != old_token
+    me = client.get("/api/auth/me", headers={"Authorization": f"Bearer {data['accessToken']}"})
+    assert me.json()["email"] == "test_refresh@example.com"
+
+    # DBには平文ではなくハッシュだけが保存されている
+    db = TestingSessionLocal()
+    try:
+        rows = db.query(RefreshToken).join(User).filter(User.email == "test_refresh@example.com")
+        hashes = {row.token_hash for row in rows}
+        assert hash_refresh_token(data["refreshToken"]) in hashes
+        assert old_token not in hashes and data["refreshToken"] not in hashes
+    finally:
+        db.close()
+
+
+def test_refresh_reuse_revokes_all():
+    """失効済みトークンの再利用は401になり、そのユーザーの全トークンを失効"""
+    old_token = _register("test_refresh_reuse@example.com")["refreshToken"]
+    response = client.post("/api/auth/refresh", json={"refreshToken": old_token})
+    new_token = response.json()["refreshToken"]
+
+    response = client.post("/api/auth/refresh", json={"refreshToken": old_token})
+    assert response.status_code == 401
+    assert client.post("/api/auth/refresh", json={"refreshToken": new_token}).status_code == 401
+
+
+def test_refresh_invalid_token():
+    """存在しないトークンは401"""
+    response = client.post("/api/auth/refresh", json={"refreshToken": "invalid_refresh_token"})
+    assert response.status_code == 401
+
+
+def test_refresh_token_cap(monkeypatch):
+    """ユーザーごとの有効なトークン数の上限を超えると古い順に削除"""
+    monkeypatch.setattr(settings, "REFRESH_TOKEN_MAX_PER_USER", 2)
+    first = _register("test_refresh_cap@example.com")["refreshToken"]
+    logins = [
+        client.post(
+            "/api/auth/login",
+            json={"email": "test_refresh_cap@example.com", "password": "SecurePass2025!"},
+        ).json()["refreshToken"]
+        for _ in range(2)
+    ]
+
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "test_refresh_cap@example.com").first()
+        live = db.query(RefreshToken).filter(
+            RefreshToken.user_id == user.id, RefreshToken.is_revoked.is_(False)
+        )
+        assert live.count() == 2
+    finally:
+        db.close()
+    assert client.post("/api/auth/refresh", json={"refreshToken": first}).status_code == 401
+
+    # 追い出された端末のリフレッシュは再利用とみなさず、他のセッションは有効なまま
+    for token in logins:
+        assert client.post("/api/auth/refresh", json={"refreshToken": token}).status_code == 200
+
+
+def test_sweep_expired_refresh_tokens():
+    """期限切れの行だけをバッチで削除"""
+    _register("test_refresh_sweep@example.com")
+    db = TestingSessionLocal()
+    try:
+        user = db.query(User).filter(User.email == "test_refresh_sweep@example.com").first()
+        now = datetime.utcnow()
+        for i in range(3):
+            db.add(
+                RefreshToken(
+                    id=f"test-sweep-{user.id}-{i}",
+                    user_id=user.id,
+                    token_hash=hash_refresh_token(f"expired-{user.id}-{i}"),
+                    expires_at=now - timedelta(days=1),
+                    is_revoked=bool(i % 2),
+                )
+            )
+        db.commit()
+
+        assert sweep_expired_refresh_tokens(db, now, batch_size=2, max_batches=1) == 2
+        sweep_expired_refresh_tokens(db, now, batch_size=2)
+        remaining = db.query(RefreshToken).filter(RefreshToken.user_id == user.id).all()
+        assert len(remaining) == 1 and remaining[0].expires_at > now
+    finally:
+        db.close()
+
+
 # ==================== 統合テスト ====================
 
 
@@ -0,0 +1,362 @@
+"""
+出生時刻ポリシーのテスト
+"""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi.testclient import TestClient
+from lunar_python import Solar
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import RefreshToken, Saju, User
+from app.services.birth_time import JOJA, YAJA, BirthTimePolicy, day_hour_pillars
+from app.services.chart_cache import ChartCache
+from app.services.clock import KST
+from app.services.ganzhi import pillars_from_eight_char
+from app.services.saju_calculator import SajuCalculator, SolarTermsDB
+from app.services.tz_table import TzTable, epoch_seconds, load_tz_table
+
+client = TestClient(app)
+
+PILLARS = ("year", "month", "day", "hour")
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return SajuCalculator(SolarTermsDB(), cache=ChartCache())
+
+
+def _lunar_day_hour(dt: datetime, sect: int):
+    eight_char = (
+        Solar.fromYmdHms(dt.year, dt.month, dt.day, dt.hour, dt.minute, 0).getLunar().getEightChar()
+    )
+    eight_char.setSect(sect)
+    return pillars_from_eight_char(eight_char)[2:]
+
+
+class TestDayHourPillars:
+    """日柱・時柱の計算のテストクラス"""
+
+    @pytest.mark.parametrize(
+        "dt",
+        [
+            datetime(1900, 1, 1, 0, 30),
+            datetime(1986, 5, 26, 5, 0),
+            datetime(1999, 12, 31, 23, 30),
+            datetime(2024, 2, 29, 22, 59),
+            datetime(2109, 12, 31, 23, 0),
+        ],
+    )
+    def test_matches_lunar_python(self, dt):
+        """夜子時説はlunar-pythonのsect=2、朝子時説はsect=1と一致"""
+        assert day_hour_pillars(dt, YAJA) == _lunar_day_hour(dt, 2)
+        assert day_hour_pillars(dt, JOJA) == _lunar_day_hour(dt, 1)
+
+    def test_late_zi_hour(self):
+        """23時台は時柱が翌日の子時になり、朝子時説だけ日柱も翌日になる"""
+        day, hour = day_hour_pillars(datetime(1990, 3, 15, 23, 30), YAJA)
+        next_day, next_zi = day_hour_pillars(datetime(1990, 3, 16, 0, 30), YAJA)
+        assert hour == next_zi and day == next_day.shift(-1)
+        assert day_hour_pillars(datetime(1990, 3, 15, 23, 30), JOJA) == (next_day, next_zi)
+
+
+class TestBirthTimePolicy:
+    """出生時刻ポリシーのテストクラス"""
+
+    def test_korea_historical_offsets(self):
+        """韓国の+8:30時代と夏時間を反映し、日柱・時柱は標準時で判定する"""
+        policy = BirthTimePolicy()
+        # 1955年は+8:30
+        birth = policy.resolve(datetime(1955, 5, 1, 10, 0))
+        assert birth.kst == datetime(1955, 5, 1, 10, 30, tzinfo=KST)
+        assert birth.wall == datetime(1955, 5, 1, 10, 0)
+        # 1988年夏は夏時間（+10）。日柱・時柱は夏時間を除いた時刻
+        birth = policy.resolve(datetime(1988, 7, 1, 10, 0))
+        assert birth.kst == datetime(1988, 7, 1, 9, 0, tzinfo=KST)
+        assert birth.wall == datetime(1988, 7, 1, 9, 0)
+        # それ以外は従来どおりKST
+        birth = policy.resolve(datetime(1990, 7, 1, 10, 0))
+        assert (birth.kst, birth.wall) == (
+            datetime(1990, 7, 1, 10, 0, tzinfo=KST),
+            datetime(1990, 7, 1, 10, 0),
+        )
+
+    def test_aware_datetime_is_absolute(self):
+        """タイムゾーン付きの日時はその絶対時刻として扱う"""
+        birth = BirthTimePolicy().resolve(datetime(1990, 3, 15, 5, 30, tzinfo=timezone.utc))
+        assert birth.kst == datetime(1990, 3, 15, 14, 30, tzinfo=KST)
+        assert birth.wall == datetime(1990, 3, 15, 14, 30)
+
+    def test_frontend_input_is_wall_clock(self):
+        """既定ポリシーでは+09:00付きの入力を壁時計として扱い、日柱・時柱は時計の読みのまま"""
+        policy = BirthTimePolicy.from_request(timezone_offset=9)
+        # +8:30時代: 絶対時刻は30分後、日柱・時柱は入力どおり
+        birth = policy.resolve(datetime(1910, 3, 3, 23, 10, tzinfo=KST))
+        assert birth.kst == datetime(1910, 3, 3, 23, 40, tzinfo=KST)
+        assert birth.wall == datetime(1910, 3, 3, 23, 10)
+        # 夏時間も入力どおり
+        birth = policy.resolve(datetime(1955, 6, 1, 0, 10, tzinfo=KST))
+        assert birth.wall == datetime(1955, 6, 1, 0, 10)
+        # +09:00以外は絶対時刻
+        birth = policy.resolve(datetime(1990, 3, 15, 5, 30, tzinfo=timezone.utc))
+        assert birth.wall == datetime(1990, 3, 15, 14, 30)
+
+    def test_stored_round_trip(self):
+        """保存値から同じポリシーを作り直せ、既定ポリシーはNone"""
+        assert BirthTimePolicy.from_request().stored is None
+        assert BirthTimePolicy.from_stored(None).stored is None
+        for policy in (
+            BirthTimePolicy.from_request(day_boundary=JOJA, longitude=127.0),
+            BirthTimePolicy.from_request(timezone_offset=-5),
+            BirthTimePolicy.from_request(time_zone="Asia/Seoul"),
+            BirthTimePolicy.from_request(time_zone="America/New_York"),
+        ):
+            restored = BirthTimePolicy.from_stored(policy.stored)
+            assert restored.stored == policy.stored
+            assert restored.resolve(datetime(1955, 6, 1, 0, 10, tzinfo=KST)) == policy.resolve(
+                datetime(1955, 6, 1, 0, 10, tzinfo=KST)
+            )
+        with pytest.raises(ValueError):
+            BirthTimePolicy.from_fields({"zone": "Asia/Seoul"})
+
+    def test_fixed_offset_and_longitude(self):
+        """9以外のオフセットは固定オフセット、経度指定時は地方平均時"""
+        policy = BirthTimePolicy.from_request(timezone_offset=-5)
+        birth = policy.resolve(datetime(1990, 7, 1, 10, 0))
+        assert birth.kst == datetime(1990, 7, 2, 0, 0, tzinfo=KST)
+        assert birth.wall == datetime(1990, 7, 1, 10, 0)
+
+        birth = BirthTimePolicy(longitude=127.0).resolve(datetime(1990, 7, 1, 10, 0))
+        assert birth.wall == datetime(1990, 7, 1, 9, 28)
+
+    def test_zone_name(self):
+        """IANAタイムゾーン名は夏時間を反映"""
+        birth = BirthTimePolicy.from_request(time_zone="America/New_York").resolve(
+            datetime(1990, 7, 1, 10, 0)
+        )
+        assert birth.kst == datetime(1990, 7, 1, 23, 0, tzinfo=KST)
+        assert birth.wall == datetime(1990, 7, 1, 9, 0)
+
+    def test_invalid(self):
+        """不正なタイムゾーン・経度・子時の扱いはValueError"""
+        with pytest.raises(ValueError):
+            BirthTimePolicy("Mars/Olympus_Mons")
+        with pytest.raises(ValueError):
+            BirthTimePolicy(longitude=200)
+        with pytest.raises(ValueError):
+            BirthTimePolicy(day_boundary="noon")
+
+    def test_variant(self):
+        """キャッシュの識別子は経度・子時の扱いが既定のとき空"""
+        assert BirthTimePolicy().variant == ""
+        assert BirthTimePolicy.from_request(timezone_offset=-5).variant == ""
+        assert (
+            BirthTimePolicy(day_boundary=JOJA).variant != BirthTimePolicy(longitude=127.0).variant
+        )
+
+
+class TestTzTable:
+    """同梱のタイムゾーン遷移表のテストクラス"""
+
+    @pytest.mark.parametrize("zone", ["Asia/Seoul", "Asia/Tokyo", "Asia/Shanghai"])
+    def test_matches_zoneinfo_around_transitions(self, zone):
+        """遷移の前後で壁時計・UTCどちらから引いてもzoneinfo（fold=0）と一致"""
+        transitions = load_tz_table().get(zone)
+        tz = ZoneInfo(zone)
+        for start in transitions.utc_starts[1:]:
+            for minutes in range(-120, 121, 30):
+                dt = datetime(1970, 1, 1) + timedelta(seconds=start, minutes=minutes)
+                local = dt.replace(tzinfo=tz)
+                assert transitions.at_local(epoch_seconds(dt)) == (
+                    local.utcoffset().total_seconds(),
+                    local.dst().total_seconds(),
+                )
+                instant = dt.replace(tzinfo=timezone.utc).astimezone(tz)
+                assert transitions.at_utc(epoch_seconds(dt)) == (
+                    instant.utcoffset().total_seconds(),
+                    instant.dst().total_seconds(),
+                )
+
+    def test_korean_eras(self):
+        """韓国の+8:30時代と夏時間が入っている"""
+        seoul = load_tz_table().get("Asia/Seoul")
+        assert seoul.at_local(epoch_seconds(datetime(1910, 1, 1))) == (8 * 3600 + 1800, 0)
+        assert seoul.at_local(epoch_seconds(datetime(1958, 7, 1))) == (9 * 3600 + 1800, 3600)
+        assert seoul.at_local(epoch_seconds(datetime(1987, 7, 1))) == (10 * 3600, 3600)
+        assert seoul.at_local(epoch_seconds(datetime(2000, 7, 1))) == (9 * 3600, 0)
+
+    def test_missing_zone_falls_back(self, tmp_path):
+        """表に無いゾーン・表ファイルが無い場合は空"""
+        assert load_tz_table().get("Europe/Paris") is None
+        assert isinstance(load_tz_table(tmp_path / "missing.json"), TzTable)
+        assert load_tz_table(tmp_path / "missing.json").get("Asia/Seoul") is None
+
+
+class TestSajuCalculatorPolicy:
+    """SajuCalculatorのポリシー利用のテストクラス"""
+
+    def test_default_policy_unchanged(self, calculator):
+        """既定ポリシーでは従来どおりlunar-pythonの四柱と一致"""
+        dt = datetime(1990, 3, 15, 23, 30)
+        result = calculator.calculate(dt, "male")
+        day, hour = _lunar_day_hour(dt, 2)
+        assert (result["dayStem"], result["dayBranch"]) == (day.stem_char, day.branch_char)
+        assert (result["hourStem"], result["hourBranch"]) == (hour.stem_char, hour.branch_char)
+
+    def test_joja_cached_separately(self, calculator):
+        """朝子時説は23時台の日柱が翌日になり、キャッシュも別になる"""
+        dt = datetime(1990, 3, 16, 23, 30)
+        yaja = calculator.calculate(dt, "female")
+        joja = calculator.calculate(dt, "female", policy=BirthTimePolicy(day_boundary=JOJA))
+        assert joja["dayStem"] != yaja["dayStem"]
+        assert joja["hourStem"] == yaja["hourStem"]
+        assert joja["birthDatetime"] == yaja["birthDatetime"]
+
+
+class TestCalculateApiPolicy:
+    """命式計算APIのポリシー項目のテストクラス"""
+
+    def test_day_boundary_and_time_zone(self):
+        """dayBoundary・timeZoneが計算に反映される"""
+        base = {"birthDatetime": "1990-03-16T23:30:00", "gender": "male"}
+        yaja = client.post("/api/saju/calculate", json=base).json()
+        joja = client.post("/api/saju/calculate", json={**base, "dayBoundary": "joja"}).json()
+        assert joja["dayStem"] != yaja["dayStem"]
+
+        seoul = client.post("/api/saju/calculate", json={**base, "timeZone": "Asia/Seoul"}).json()
+        assert seoul["birthDatetime"] == yaja["birthDatetime"]
+        tokyo_noon = client.post(
+            "/api/saju/calculate",
+            json={**base, "birthDatetime": "1990-03-16T12:00:00", "timezoneOffset": 8},
+        ).json()
+        assert tokyo_noon["birthDatetime"] == (datetime(1990, 3, 16, 13, 0, tzinfo=KST)).isoformat()
+
+    def test_invalid_time_zone(self):
+        """不明なタイムゾーン名は400"""
+        response = client.post(
+            "/api/saju/calculate",
+            json={
+                "birthDatetime": "1990-03-16T12:00:00",
+                "gender": "male",
+                "timeZone": "Nowhere/City",
+            },
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize(
+        "birth_datetime, day, hour",
+        [
+            ("1955-06-01T00:10:00+09:00", "癸巳", "壬子"),
+            ("1910-03-03T23:10:00+09:00", "丁卯", "壬子"),
+            ("1905-03-03T11:10:00+09:00", "辛丑", "甲午"),
+        ],
+    )
+    def test_frontend_payload(self, birth_datetime, day, hour):
+        """フロントエンドの送信形式（+09:00付き・timezoneOffset=9）は入力した時計の読みで日柱・時柱を判定"""
+        response = client.post(
+            "/api/saju/calculate",
+            json={
+                "name": "テスト",
+                "birthDatetime": birth_datetime,
+                "gender": "male",
+                "timezoneOffset": 9,
+                "persist": False,
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["dayStem"] + data["dayBranch"] == day
+        assert data["hourStem"] + data["hourBranch"] == hour
+        assert data["birthTimePolicy"] is None
+
+
+class TestUpdateApiPolicy:
+    """命式更新APIの出生時刻ポリシー引き継ぎのテストクラス"""
+
+    EMAIL = "test_birth_time_policy@example.com"
+
+    @pytest.fixture(autouse=True)
+    def cleanup(self):
+        yield
+        db = SessionLocal()
+        try:
+            user_ids = db.query(User.id).filter(User.email == self.EMAIL)
+            for model in (Saju, RefreshToken):
+                db.query(model).filter(model.user_id.in_(user_ids)).delete(synchronize_session=False)
+            db.query(User).filter(User.email == self.EMAIL).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def test_update_keeps_stored_policy(self):
+        """保存したポリシーは更新時に引き継ぎ、指定した項目だけ変わる"""
+        response = client.post(
+            "/api/auth/register", json={"email": self.EMAIL, "password": "TestPassword2025!"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['accessToken']}"}
+        base = {"birthDatetime": "1990-03-16T23:30:00+09:00", "gender": "male"}
+        saju = client.post(
+            "/api/saju/calculate", json={**base, "dayBoundary": "joja", "persist": False}
+        ).json()
+        assert saju["birthTimePolicy"] == {"dayBoundary": "joja"}
+        assert client.post("/api/saju/save", json=saju, headers=headers).status_code == 201
+
+        # EditSajuModalと同じく出生時刻ポリシーの項目を送らない
+        updated = client.put(
+            f"/api/saju/{saju['id']}", json={**base, "name": "改名"}, headers=headers
+        ).json()
+        assert updated["birthTimePolicy"] == {"dayBoundary": "joja"}
+        assert (updated["dayStem"], updated["hourStem"]) == (saju["dayStem"], saju["hourStem"])
+        assert client.get(f"/api/saju/{saju['id']}").json()["birthTimePolicy"] == {
+            "dayBoundary": "joja"
+        }
+
+        # 指定した項目は上書きして再計算
+        updated = client.put(
+            f"/api/saju/{saju['id']}", json={**base, "dayBoundary": "yaja"}, headers=headers
+        ).json()
+        assert updated["birthTimePolicy"] is None
+        assert updated["dayStem"] != saju["dayStem"]
+
+    @pytest.mark.parametrize(
+        "birth_datetime",
+        [
+            "1988-07-01T09:30:00+09:00",  # 夏時間
+            "1955-06-01T10:00:00+09:00",  # +8:30時代の夏時間
+            "1905-03-03T11:10:00+09:00",  # 地方平均時
+            "1988-07-01T09:30:00",  # naive（夏時間込みで解釈）
+        ],
+    )
+    def test_recalculation_is_idempotent(self, birth_datetime):
+        """返した生年月日時をそのまま送り直しても時刻・命式がずれない（保存・ゲスト保存とも同じ値）"""
+        response = client.post(
+            "/api/auth/register", json={"email": self.EMAIL, "password": "TestPassword2025!"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['accessToken']}"}
+        base = {"birthDatetime": birth_datetime, "gender": "male"}
+        saju = client.post("/api/saju/calculate", json={**base, "persist": False}).json()
+        if birth_datetime.endswith("+09:00"):
+            assert saju["birthDatetime"] == birth_datetime
+        guest = client.post("/api/saju/calculate", json={**base, "persist": True}).json()
+        assert client.post("/api/saju/save", json=saju, headers=headers).status_code == 201
+
+        pillars = [saju[f"{pillar}{part}"] for pillar in PILLARS for part in ("Stem", "Branch")]
+        detail = client.get(f"/api/saju/{saju['id']}").json()
+        assert detail["birthDatetime"] == saju["birthDatetime"]
+        guest_detail = client.get(f"/api/saju/{guest['id']}").json()
+        assert guest_detail["birthDatetime"] == saju["birthDatetime"]
+
+        # EditSajuModalと同じく表示中の生年月日時を送り直す
+        for _ in range(2):
+            detail = client.put(
+                f"/api/saju/{saju['id']}",
+                json={"birthDatetime": detail["birthDatetime"], "gender": "male", "name": "再計算"},
+                headers=headers,
+            ).json()
+            assert detail["birthDatetime"] == saju["birthDatetime"]
+            assert detail["birthTimePolicy"] == saju["birthTimePolicy"]
+            assert [
+                detail[f"{pillar}{part}"] for pillar in PILLARS for part in ("Stem", "Branch")
+            ] == pillars
@@ -0,0 +1,144 @@
+"""
+命式計算結果キャッシュのテスト
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from app.services.chart_cache import ChartCache, SqliteChartStore, chart_cache_key
+from app.services.clock import AsOf
+from app.services.fortune_analyzer import ANALYZER_VERSION
+from app.services.saju_calculator import KST, SajuCalculator, SolarTermsDB
+
+
+@pytest.fixture(scope="module")
+def solar_terms_db():
+    return SolarTermsDB()
+
+
+def _without_created_at(result: dict) -> dict:
+    return {key: value for key, value in result.items() if key != "createdAt"}
+
+
+class TestChartCache:
+    """キャッシュ単体のテストクラス"""
+
+    def test_key_is_kst_minute_and_gender(self):
+        """キーは判定ロジックのバージョン・KSTの分・性別。秒以下を含む日時はキャッシュしない"""
+        birth = datetime(1990, 5, 15, 14, 30, tzinfo=KST)
+        assert chart_cache_key(birth, "male") == f"{ANALYZER_VERSION}|1990-05-15T14:30|male"
+        assert chart_cache_key(birth, "male", version="old") != chart_cache_key(birth, "male")
+        assert chart_cache_key(datetime(1990, 5, 15, 14, 30, 5, tzinfo=KST), "male") is None
+
+    def test_lru_eviction_and_stats(self):
+        """上限を超えると最も古く使われたものから捨てる"""
+        cache = ChartCache(maxsize=2)
+        cache.put("a", {"v": 1})
+        cache.put("b", {"v": 2})
+        assert cache.get("a") == {"v": 1}
+        cache.put("c", {"v": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert len(cache) == 2
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["storeHits"]) == (2, 1, 0)
+        assert stats["hitRate"] == pytest.approx(2 / 3)
+
+    def test_sqlite_store_shared(self, tmp_path):
+        """共有ストアの内容は別のキャッシュからも読める"""
+        path = str(tmp_path / "chart_cache.sqlite")
+        ChartCache(store=SqliteChartStore(path)).put("k", {"daeunList": [{"startAge": 3}]})
+
+        other = ChartCache(store=SqliteChartStore(path))
+        assert other.get("k") == {"daeunList": [{"startAge": 3}]}
+        assert other.get("k") is not None
+        assert (other.store_hits, other.hits, other.misses) == (1, 1, 0)
+
+
+class TestSajuCalculatorCache:
+    """SajuCalculatorのキャッシュ利用のテストクラス"""
+
+    def test_cached_result_matches_uncached(self, solar_terms_db):
+        """キャッシュ経由でも結果は同じで、名前と作成日時は呼び出しごとに付く"""
+        plain = SajuCalculator(solar_terms_db)
+        cached = SajuCalculator(solar_terms_db, cache=ChartCache())
+        birth = datetime(1990, 3, 15, 14, 30)
+
+        first = cached.calculate(birth, "male", "太郎")
+        # 同じKSTの分（UTC表記）は同じキーになる
+        second = cached.calculate(datetime(1990, 3, 15, 5, 30, tzinfo=timezone.utc), "male", "次郎")
+
+        assert cached.cache.stats()["hits"] == 1
+        assert second["name"] == "次郎"
+        assert "createdAt" in second
+        assert _without_created_at(first) == _without_created_at(
+            plain.calculate(birth, "male", "太郎")
+        )
+        # 生年月日時は入力のまま返す
+        assert second["birthDatetime"] == "1990-03-15T05:30:00+00:00"
+        assert {
+            **_without_created_at(second),
+            "name": "太郎",
+            "birthDatetime": first["birthDatetime"],
+        } == _without_created_at(first)
+
+    def test_wall_clock_cached_separately(self, solar_terms_db):
+        """絶対時刻が同じでも時計の読みが違う入力（夏時間）は別のキーになる"""
+        plain = SajuCalculator(solar_terms_db)
+        cached = SajuCalculator(solar_terms_db, cache=ChartCache())
+        # 1988年7月の韓国は夏時間（+10:00）。+09:00付きは入力した時計の読み、naiveは夏時間込み
+        typed = datetime(1988, 7, 1, 9, 30, tzinfo=KST)
+        naive = datetime(1988, 7, 1, 9, 30)
+
+        for birth in (typed, naive, typed, naive):
+            result = cached.calculate(birth, "male")
+            assert result["hourBranch"] == plain.calculate(birth, "male")["hourBranch"]
+        assert cached.calculate(typed, "male")["hourBranch"] == "巳"
+        assert cached.calculate(naive, "male")["hourBranch"] == "辰"
+
+    def test_is_current_not_cached(self, solar_terms_db):
+        """isCurrentは読み出し時の基準日時から付け直す"""
+        calculator = SajuCalculator(solar_terms_db, cache=ChartCache())
+        birth = datetime(1990, 3, 15, 14, 30)
+        first = calculator.calculate(birth, "female")
+        first_current = [d["id"] for d in first["daeunList"] if d["isCurrent"]]
+
+        last_start = first["daeunList"][-1]["startAge"]
+        later = calculator.calculate(birth, "female", as_of=AsOf(datetime(1990 + last_start, 6, 1)))
+
+        assert calculator.cache.stats()["hits"] == 1
+        assert [d["id"] for d in later["daeunList"] if d["isCurrent"]] == [
+            later["daeunList"][-1]["id"]
+        ]
+        assert first_current != [later["daeunList"][-1]["id"]]
+        # キャッシュ本体にはisCurrentを持たない
+        cached = calculator.cache.get(
+            chart_cache_key(datetime(1990, 3, 15, 14, 30, tzinfo=KST), "female")
+        )
+        assert all("isCurrent" not in d for d in cached["daeunList"])
+
+    def test_store_entries_of_old_analyzer_version_are_ignored(self, solar_terms_db, tmp_path):
+        """判定ロジックのバージョンが違う共有ストアの結果は使わない"""
+        path = str(tmp_path / "chart_cache.sqlite")
+        birth = datetime(1990, 3, 15, 14, 30)
+        fresh = SajuCalculator(solar_terms_db).calculate(birth, "male")
+        stale = {**fresh, "daeunList": [{**d, "fortuneLevel": "大凶"} for d in fresh["daeunList"]]}
+        ChartCache(store=SqliteChartStore(path)).put(
+            chart_cache_key(birth.replace(tzinfo=KST), "male", version="old"), stale
+        )
+
+        calculator = SajuCalculator(solar_terms_db, cache=ChartCache(store=SqliteChartStore(path)))
+        result = calculator.calculate(birth, "male")
+
+        assert calculator.cache.stats()["storeHits"] == 0
+        assert [d["fortuneLevel"] for d in result["daeunList"]] == [
+            d["fortuneLevel"] for d in fresh["daeunList"]
+        ]
+
+    def test_seconds_bypass_cache(self, solar_terms_db):
+        """秒を含む生年月日時はキャッシュを使わない"""
+        calculator = SajuCalculator(solar_terms_db, cache=ChartCache())
+        calculator.calculate(datetime(1990, 3, 15, 14, 30, 10), "male")
+        assert len(calculator.cache) == 0
+        assert calculator.cache.stats()["misses"] == 0
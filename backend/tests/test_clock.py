@@ -0,0 +1,39 @@
+"""
+基準日時（AsOf）のテスト
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.clock import KST, AsOf
+
+
+class TestAsOf:
+    """基準日時のテストクラス"""
+
+    def test_normalized_to_kst(self):
+        """naiveはKST、タイムゾーン付きはKSTに変換して日付を決める"""
+        assert AsOf(datetime(2024, 1, 1, 12)).now == datetime(2024, 1, 1, 12, tzinfo=KST)
+        # UTCの12/31 20:00はKSTでは翌日
+        as_of = AsOf(datetime(2023, 12, 31, 20, tzinfo=timezone.utc))
+        assert as_of.today.isoformat() == "2024-01-01"
+        assert AsOf.parse("2024-01-01").today == as_of.today
+        with pytest.raises(ValueError):
+            AsOf.parse("2024-13-01")
+
+    def test_age_of(self):
+        """満年齢は誕生日当日に1つ上がり、生まれる前は0"""
+        birth = datetime(1990, 3, 15, 14, 30)
+        assert AsOf(datetime(2020, 3, 14)).age_of(birth) == 29
+        assert AsOf(datetime(2020, 3, 15)).age_of(birth) == 30
+        assert AsOf(datetime(1980, 1, 1)).age_of(birth) == 0
+        # タイムゾーン付きの生年月日時はKSTの日付で判定
+        utc_birth = datetime(1990, 3, 14, 16, tzinfo=timezone(timedelta(0)))
+        assert AsOf(datetime(2020, 3, 15)).age_of(utc_birth) == 30
+
+    def test_current_flags(self):
+        """今年・今月・今日の判定"""
+        as_of = AsOf(datetime(2025, 11, 3, 9))
+        assert as_of.is_current_year(2025) and not as_of.is_current_year(2024)
+        assert as_of.is_current_month(2025, 11) and not as_of.is_current_month(2024, 11)
+        assert as_of.is_today(2025, 11, 3) and not as_of.is_today(2025, 11, 4)
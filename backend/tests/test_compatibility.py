@@ -0,0 +1,127 @@
+"""
+相性スコア計算エンジンのテスト
+"""
+import random
+
+from app.services.compatibility import (
+    BASE_SCORE,
+    ChartColumns,
+    MatchIndex,
+    score_matrix,
+    score_pair,
+    season_of,
+)
+from app.services.ganzhi import Ganzhi
+
+
+def _chart(day: str, month: str, hour: str, daeun=None):
+    return (
+        Ganzhi.from_str(day),
+        Ganzhi.from_str(month),
+        Ganzhi.from_str(hour),
+        Ganzhi.from_str(daeun) if daeun else None,
+    )
+
+
+class TestCompatibility:
+    """相性エンジンのテストクラス"""
+
+    def test_season_of(self):
+        """地支から季節コード（春夏秋冬）"""
+        assert [season_of(b) for b in range(12)] == [3, 3, 0, 0, 0, 1, 1, 1, 2, 2, 2, 3]
+
+    def test_score_pair_breakdown(self):
+        """日干・月干・時干・季節の内訳"""
+        # 戊→甲は大吉、甲→戊は吉。寅月（春）と申月（秋）は反対季節
+        male = _chart("戊子", "戊寅", "戊午")
+        female = _chart("甲子", "甲申", "甲子")
+
+        score_m, score_f, details_m, details_f = score_pair(male, female)
+
+        assert details_m == ["日干：大吉 +40", "月干：吉 +15", "時干：吉 +10", "季節：反対 +15"]
+        assert score_m == BASE_SCORE + 40 + 15 + 10 + 15
+        assert details_f[0] == "日干：吉 +30"
+        assert details_f[-1] == "季節：反対 +15"
+        assert score_f == BASE_SCORE + 30 + 15 + 10 + 15
+
+    def test_daeun_bonus_requires_both(self):
+        """大運ボーナスは双方の大運がある場合のみ"""
+        male = _chart("甲子", "丙寅", "甲子", "乙丑")
+        female = _chart("乙丑", "丙寅", "甲子")
+
+        with_bonus = score_pair(male, female[:3] + (Ganzhi.from_str("甲子"),))
+        without = score_pair(male, female)
+
+        assert with_bonus[0] == without[0] + 5
+        assert with_bonus[1] == without[1] + 5
+        assert with_bonus[2][-1] == "大運ボーナス +5"
+
+    def test_matrix_matches_pairwise(self):
+        """行列計算の結果が1組ずつの計算と一致する"""
+        rng = random.Random(0)
+
+        def random_chart():
+            day = Ganzhi(rng.randrange(60))
+            daeun = rng.choice([None, day, Ganzhi(rng.randrange(60))])
+            return (day, Ganzhi(rng.randrange(60)), Ganzhi(rng.randrange(60)), daeun)
+
+        males = [random_chart() for _ in range(40)]
+        females = [random_chart() for _ in range(30)]
+        # 大運ボーナスが必ず発生する組を含める
+        females[0] = (males[0][3] or males[0][0], females[0][1], females[0][2], males[0][0])
+
+        matrix = score_matrix(ChartColumns.from_pillars(males), ChartColumns.from_pillars(females))
+
+        assert (matrix.n, matrix.m) == (40, 30)
+        for i, male in enumerate(males):
+            for j, female in enumerate(females):
+                assert matrix.pair(i, j) == score_pair(male, female)[:2]
+        assert list(matrix.male_row(1)) == [score_pair(males[1], f)[0] for f in females]
+
+    def test_empty(self):
+        """空の入力"""
+        matrix = score_matrix(
+            ChartColumns(), ChartColumns.from_pillars([_chart("甲子", "丙寅", "甲子")])
+        )
+        assert len(matrix.male) == 0
+
+    def test_match_index_top_k_matches_brute_force(self):
+        """索引による上位k件検索が全件採点と一致する"""
+        rng = random.Random(1)
+
+        def random_chart():
+            day = Ganzhi(rng.randrange(60))
+            return (
+                day,
+                Ganzhi(rng.randrange(60)),
+                Ganzhi(rng.randrange(60)),
+                rng.choice([None, Ganzhi(rng.randrange(60))]),
+            )
+
+        candidates = [random_chart() for _ in range(200)]
+        index = MatchIndex()
+        for i, chart in enumerate(candidates):
+            index.add(i, chart)
+        assert len(index) == 200
+
+        for query_is_male in (True, False):
+            query = random_chart()
+            results = index.top_k(query, 15, query_is_male=query_is_male)
+
+            def total(chart):
+                pair = score_pair(query, chart) if query_is_male else score_pair(chart, query)
+                return pair[0] + pair[1]
+
+            expected = sorted((total(chart) for chart in candidates), reverse=True)[:15]
+            assert [r.total for r in results] == expected
+            for r in results:
+                assert r.total == r.score + r.partner_score
+                assert r.total == total(candidates[r.chart_id])
+
+    def test_match_index_exclude(self):
+        """除外IDは結果に含まれない"""
+        chart = _chart("甲子", "丙寅", "甲子")
+        index = MatchIndex()
+        index.add("self", chart)
+        index.add("other", chart)
+        assert [r.chart_id for r in index.top_k(chart, 5, exclude="self")] == ["other"]
@@ -0,0 +1,74 @@
+"""
+レスポンス圧縮ミドルウェアのテスト
+"""
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, parse_accept_encoding
+
+BODY = "甲子日の運勢" * 200
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+
+@app.get("/large")
+def large():
+    return PlainTextResponse(BODY)
+
+
+@app.get("/small")
+def small():
+    return PlainTextResponse("ok")
+
+
+@app.get("/stream")
+def stream():
+    return StreamingResponse(iter([BODY.encode(), BODY.encode()]), media_type="text/plain")
+
+
+client = TestClient(app)
+
+
+def _raw_get(path: str, accept_encoding: str):
+    # httpxの自動展開を避けるためストリームで生のバイト列を読む
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_gzip_large_response():
+    """閾値以上のレスポンスはgzipで圧縮し、Varyを付ける"""
+    response, raw = _raw_get("/large", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-length"] == str(len(raw))
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert gzip.decompress(raw).decode() == BODY
+    assert len(raw) < len(BODY.encode())
+
+
+def test_small_or_unaccepted_response_not_compressed():
+    """閾値未満・Accept-Encodingで受け付けない場合は圧縮しない"""
+    response, raw = _raw_get("/small", "gzip")
+    assert "content-encoding" not in response.headers and raw == b"ok"
+
+    response, raw = _raw_get("/large", "gzip;q=0, identity")
+    assert "content-encoding" not in response.headers and raw.decode() == BODY
+
+
+def test_streaming_response():
+    """ストリーミングレスポンスはContent-Lengthなしでチャンクごとに圧縮"""
+    response, raw = _raw_get("/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == BODY * 2
+
+
+def test_parse_accept_encoding():
+    """Accept-Encodingのq値を解釈"""
+    assert parse_accept_encoding("gzip, br;q=0.5, *;q=0") == {"gzip": 1.0, "br": 0.5, "*": 0.0}
+    middleware = CompressionMiddleware(app)
+    assert middleware.select_encoding("deflate") is None
+    assert middleware.select_encoding("*") in ("br", "gzip")
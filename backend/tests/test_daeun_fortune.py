@@ -233,3 +233,128 @@ def test_all_endpoints_not_found():
         response = client.get(endpoint)
         assert response.status_code == status.HTTP_404_NOT_FOUND
         assert "命式が見つかりません" in response.json()["detail"]
+
+
+def test_as_of_fixes_current_flags(test_saju_data):
+    """基準日時（as_of）指定 - その時点の年齢・現在フラグで返す"""
+    response = client.get("/api/saju/test-saju-001/daeun?as_of=2010-06-01")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["currentAge"] == 20
+    assert [d["id"] for d in data["daeunList"] if d["isCurrent"]] == [2]
+
+    response = client.get("/api/saju/test-saju-001/day/2025/11?as_of=2025-11-03T09:00:00%2B09:00")
+    assert [d["day"] for d in response.json()["days"] if d["isToday"]] == [3]
+
+    response = client.get("/api/saju/test-saju-001/month/2025?as_of=2025-11-03")
+    assert [m["month"] for m in response.json()["months"] if m["isCurrent"]] == [11]
+
+    response = client.get("/api/saju/test-saju-001/current?as_of=2025-11-02")
+    assert response.json()["date"] == "2025-11-02"
+
+
+def test_as_of_invalid(test_saju_data):
+    """基準日時（as_of）指定 - 不正な形式"""
+    response = client.get("/api/saju/test-saju-001/daeun?as_of=not-a-date")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "as_of" in response.json()["detail"]
+
+
+def test_get_timeline_matches_list_endpoints(test_saju_data):
+    """タイムライン取得 - 年運・月運リストAPIと同じ内容を1回で返す"""
+    response = client.get("/api/saju/test-saju-001/timeline?as_of=2020-06-01")
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+
+    assert data["sajuId"] == "test-saju-001"
+    assert data["currentAge"] == 30
+    assert [d["isCurrent"] for d in data["daeunList"]] == [False, False, True]
+
+    daeun = data["daeunList"][2]
+    years = client.get("/api/saju/test-saju-001/year/28?as_of=2020-06-01").json()["years"]
+    assert [{k: v for k, v in y.items() if k != "months"} for y in daeun["years"]] == years
+
+    year = daeun["years"][2]
+    response = client.get(f"/api/saju/test-saju-001/month/{year['year']}?as_of=2020-06-01")
+    assert year["months"] == response.json()["months"]
+
+
+def test_get_timeline_range(test_saju_data):
+    """タイムライン取得 - 期間指定"""
+    response = client.get("/api/saju/test-saju-001/timeline?start=2009-11-20&end=2010-02-01")
+    data = response.json()
+
+    assert [d["startAge"] for d in data["daeunList"]] == [18]
+    years = data["daeunList"][0]["years"]
+    assert [(y["year"], [m["month"] for m in y["months"]]) for y in years] == [
+        (2009, [11, 12]),
+        (2010, [1, 2]),
+    ]
+
+    response = client.get("/api/saju/test-saju-001/timeline?start=2010-01-01&end=2009-01-01")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get("/api/saju/nonexistent/timeline")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_pillar_arithmetic_matches_lunar():
+    """年柱・月柱の順送り計算がlunar-pythonと一致する"""
+    from app.services.fortune_service import _eight_char, month_pillar_of, year_pillar_of
+
+    for year in (1900, 1984, 2024, 2109):
+        assert str(year_pillar_of(year)) == _eight_char(year, 7, 1).getYear()
+        for month in (1, 2, 12):
+            assert str(month_pillar_of(year, month)) == _eight_char(year, month, 15).getMonth()
+
+
+def test_trusted_daeun_list_matches_validated(test_saju_data, db):
+    """サーバーが書いた大運リスト（analyzer_versionあり）を埋め込んでも検証した場合と同じ内容"""
+    urls = ["/api/saju/test-saju-001", "/api/saju/test-saju-001/daeun?as_of=2010-06-01"]
+    validated = [client.get(url).json() for url in urls]
+
+    test_saju_data.analyzer_version = "test"
+    db.commit()
+    trusted = [client.get(url) for url in urls]
+
+    assert [r.headers["content-type"] for r in trusted] == ["application/json"] * 2
+    assert [r.json() for r in trusted] == validated
+
+
+def test_day_fortune_list_matches_schema(test_saju_data):
+    """日運リスト - タプルから直接作ったレスポンスがスキーマどおり"""
+    from app.api.saju import get_fortune_calculator
+    from app.schemas.saju import DayFortuneInfo, DayFortuneListResponse
+
+    data = client.get("/api/saju/test-saju-001/day/2024/2").json()
+    days = get_fortune_calculator().calculate_day_list("丙", 2024, 2)
+    expected = DayFortuneListResponse(
+        year=2024, month=2, days=[DayFortuneInfo(sajuId="test-saju-001", **day) for day in days]
+    )
+    assert data == expected.model_dump()
+
+
+def test_list_fields_and_columnar(test_saju_data):
+    """リストAPIの軽量表示 - ?fields= で項目を絞り、?format=columnar で列形式"""
+    full = client.get("/api/saju/test-saju-001/month/2025").json()
+
+    data = client.get("/api/saju/test-saju-001/month/2025?fields=month,fortuneLevel").json()
+    assert data["year"] == 2025
+    assert data["months"] == [
+        {"month": m["month"], "fortuneLevel": m["fortuneLevel"]} for m in full["months"]
+    ]
+
+    data = client.get("/api/saju/test-saju-001/day/2025/11?format=columnar").json()
+    assert data["columns"][:3] == ["id", "sajuId", "year"]
+    assert len(data["days"]) == 30 and len(data["days"][0]) == len(data["columns"])
+
+    data = client.get("/api/saju/test-saju-001/year/28?format=columnar&fields=year,age").json()
+    assert data["columns"] == ["year", "age"]
+    assert data["years"][0] == [2018, 28]
+
+    for query in ("fields=unknown", "format=csv"):
+        response = client.get(f"/api/saju/test-saju-001/day/2025/11?{query}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # 空の指定は省略と同じく全項目
+    for query in ("fields=", "fields=,", "fields=%20"):
+        assert client.get(f"/api/saju/test-saju-001/month/2025?{query}").json() == full
@@ -0,0 +1,70 @@
+"""
+ドンサゴン関係マトリックス（単一真実源）のテスト
+"""
+import json
+import os
+
+from app.services import donsagong_matrix as dm
+from app.services.fortune_analyzer import FortuneAnalyzer
+from app.services.fortune_service import FortuneCalculator
+
+
+class TestDonsagongMatrix:
+    """donsagong_matrixのテストクラス"""
+
+    def test_shapes(self):
+        """配列サイズと2次元ビューの形状"""
+        assert len(dm.TENGAN_FLAT) == 100
+        assert len(dm.JIJI_FLAT) == 144
+        assert len(dm.JOHOO_FLAT) == 144
+        assert dm.TENGAN.shape == (10, 10)
+        assert dm.JIJI.shape == (12, 12)
+        assert dm.JOHOO.shape == (12, 12)
+        assert dm.TENGAN_FLAT.itemsize == 1
+
+    def test_view_matches_accessor(self):
+        """2次元ビューとアクセサ関数が同じ値を返す"""
+        i, j = dm.STEM_INDEX["甲"], dm.STEM_INDEX["己"]
+        assert dm.TENGAN[i, j] == dm.tengan_level("甲", "己") == dm.LEVEL_INDEX["大凶"]
+
+        m, d = dm.BRANCH_INDEX["午"], dm.BRANCH_INDEX["子"]
+        assert dm.JOHOO[m, d] == dm.johoo_level("午", "子") == dm.LEVEL_INDEX["大吉"]
+
+    def test_tengan_matches_cheongan_json(self):
+        """天干表がドンサゴン天干マトリックスJSONの吉凶と一致する"""
+        path = os.path.join(
+            os.path.dirname(__file__), "..", "app", "data", "donsagong_cheongan_matrix.json"
+        )
+        with open(path, "r", encoding="utf-8") as f:
+            matrix = json.load(f)["천간_100_매트릭스"]
+
+        korean_view = dm.as_dict(dm.TENGAN_FLAT, dm.HEAVENLY_STEMS, names=dm.LEVELS_KO)
+        for from_stem, row in matrix.items():
+            for to_stem, cell in row.items():
+                assert korean_view[from_stem][to_stem] == cell["길흉"]
+
+    def test_johoo_unlisted_diagonal_is_neutral(self):
+        """マスターDBに記載のない子子・丑丑は平"""
+        assert dm.johoo_level("子", "子") == dm.PYEONG
+        assert dm.johoo_level("丑", "丑") == dm.PYEONG
+        assert dm.johoo_level("亥", "亥") == dm.LEVEL_INDEX["中大凶"]
+
+    def test_collapse_5(self):
+        """5段階縮約とスコア"""
+        collapsed = {dm.LEVELS[dm.COLLAPSE_5[i]] for i in range(len(dm.LEVELS))}
+        assert collapsed == {"大凶", "凶", "平", "吉", "大吉"}
+        assert dm.SCORE_5[dm.LEVEL_INDEX["中大吉"]] == 2
+        assert dm.SCORE_5[dm.LEVEL_INDEX["無"]] == 0
+
+    def test_consumers_share_matrix(self):
+        """FortuneAnalyzerとFortuneCalculatorが同じ表を参照する"""
+        analyzer = FortuneAnalyzer()
+        calculator = FortuneCalculator()
+
+        # 庚→乙はマスター表で凶（旧ハードコード値の大凶ではない）
+        assert analyzer._check_tengan_relation("庚", "乙") == "凶"
+        assert calculator._calculate_fortune_level("庚", "乙", "子") == "凶"
+
+        # 戊→乙は小吉（Analyzerは5段階に縮約して吉）
+        assert calculator._calculate_fortune_level("戊", "乙", "子") == "小吉"
+        assert analyzer._check_tengan_relation("戊", "乙") == "吉"
@@ -0,0 +1,62 @@
+"""
+日運カレンダーのテスト
+"""
+from datetime import date, timedelta
+
+from app.services.donsagong_matrix import TENGAN_FLAT
+from app.services.fortune_calendar import (
+    CALENDAR_END,
+    CALENDAR_START,
+    FortuneCalendar,
+    day_pillar_of,
+    get_fortune_calendar,
+)
+from app.services.fortune_service import FortuneCalculator, _eight_char
+from app.services.sipsin import SIPSIN_FLAT
+
+
+class TestFortuneCalendar:
+    """日運カレンダーのテストクラス"""
+
+    def test_day_pillar_matches_lunar(self):
+        """日柱の順送り計算がlunar-pythonと一致する"""
+        for day in (
+            CALENDAR_START,
+            date(1984, 2, 2),
+            date(2000, 1, 1),
+            date(2024, 12, 31),
+            CALENDAR_END,
+        ):
+            assert str(day_pillar_of(day)) == _eight_char(day.year, day.month, day.day).getDay()
+
+    def test_covers_range(self):
+        """1900〜2109年の全日を持ち、範囲外はNone"""
+        cal = get_fortune_calendar()
+        assert cal is get_fortune_calendar()
+        assert len(cal) == (CALENDAR_END - CALENDAR_START).days + 1
+        assert cal.offset(CALENDAR_START - timedelta(days=1)) is None
+        assert cal.read(0, date(2109, 12, 1), date(2110, 1, 1)) is None
+
+    def test_read_matches_tables(self):
+        """期間の読み出しは日干×日柱天干の吉凶・十神表と一致する"""
+        cal = get_fortune_calendar()
+        pillars, levels, sipsins = cal.read(3, date(2024, 2, 1), date(2024, 2, 29))
+        assert len(pillars) == 29
+        assert pillars[0] == day_pillar_of(date(2024, 2, 1))
+        for pillar, level, sipsin in zip(pillars, levels, sipsins):
+            assert level == TENGAN_FLAT[30 + pillar % 10]
+            assert sipsin == SIPSIN_FLAT[30 + pillar % 10]
+
+        # 部分カレンダーも同じ値
+        partial = FortuneCalendar(date(2024, 2, 1), date(2024, 2, 29))
+        assert partial.read(3, date(2024, 2, 1), date(2024, 2, 29)) == (
+            pillars,
+            levels,
+            sipsins,
+        )
+
+    def test_day_list_outside_calendar(self):
+        """カレンダー範囲外の年でも日運リストを計算できる"""
+        days = FortuneCalculator().calculate_day_list("甲", 2110, 2)
+        assert len(days) == 28
+        assert days[0]["dayStem"] + days[0]["dayBranch"] == str(day_pillar_of(date(2110, 2, 1)))
@@ -0,0 +1,63 @@
+"""
+干支値型（Ganzhi）のテスト
+"""
+import pickle
+
+import pytest
+
+from app.services.fortune_analyzer import FortuneAnalyzer
+from app.services.ganzhi import Ganzhi
+
+
+class TestGanzhi:
+    """Ganzhiのテストクラス"""
+
+    def test_interned(self):
+        """同じインデックスは同一インスタンス"""
+        assert Ganzhi(0) is Ganzhi(0)
+        assert Ganzhi.from_str("甲子") is Ganzhi(0)
+        assert pickle.loads(pickle.dumps(Ganzhi(59))) is Ganzhi(59)
+
+    def test_properties(self):
+        """天干・地支プロパティ"""
+        gz = Ganzhi.from_str("庚午")
+        assert int(gz) == 6
+        assert gz.stem == 6
+        assert gz.branch == 6
+        assert gz.stem_char == "庚"
+        assert gz.branch_char == "午"
+        assert str(gz) == "庚午"
+
+    def test_roundtrip_all_60(self):
+        """60干支すべてが文字列・コードと相互変換できる"""
+        for i in range(60):
+            gz = Ganzhi(i)
+            assert Ganzhi.from_str(str(gz)) is gz
+            assert Ganzhi.from_parts(gz.stem, gz.branch) is gz
+            assert Ganzhi.from_chars(gz.stem_char, gz.branch_char) is gz
+
+    def test_shift(self):
+        """六十甲子上の順行・逆行"""
+        assert str(Ganzhi.from_str("癸亥").shift(1)) == "甲子"
+        assert str(Ganzhi.from_str("甲子").shift(-1)) == "癸亥"
+
+    def test_invalid(self):
+        """不正な干支はValueError"""
+        with pytest.raises(ValueError):
+            Ganzhi(60)
+        with pytest.raises(ValueError):
+            Ganzhi(-1)  # 負のインデックスで癸亥にならない
+        with pytest.raises(ValueError):
+            Ganzhi.from_parts(0, 1)  # 甲丑は存在しない
+        with pytest.raises(ValueError):
+            Ganzhi.from_str("甲甲")
+
+    def test_analyzer_ganzhi_matches_string_api(self):
+        """干支値版と漢字版の大運判定が一致する"""
+        analyzer = FortuneAnalyzer()
+        day, hour, daeun = Ganzhi.from_str("辛未"), Ganzhi.from_str("辛卯"), Ganzhi.from_str("癸酉")
+        month_branch = Ganzhi.from_str("癸巳").branch
+
+        assert analyzer.analyze_daeun(day, hour, month_branch, daeun) == (
+            analyzer.analyze_daeun_fortune("辛", "未", "辛", "卯", "巳", "癸", "酉")
+        )
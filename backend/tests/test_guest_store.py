@@ -0,0 +1,173 @@
+"""
+ゲスト命式の保存・書き込み遅延キュー・期限切れ削除のテスト
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import saju as saju_api
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Saju, User
+from app.services.guest_store import GuestWriteBehind, purge_stale_guests
+
+client = TestClient(app)
+
+BIRTH = {"birthDatetime": "1990-03-15T14:30:00+09:00", "gender": "male"}
+
+
+def _guest_row(created_at: datetime, user_id=None) -> dict:
+    return dict(
+        id=f"saju-{uuid.uuid4()}",
+        user_id=user_id,
+        name=None,
+        birth_datetime=datetime(1990, 3, 15, 14, 30),
+        gender="male",
+        year_stem="庚",
+        year_branch="午",
+        month_stem="己",
+        month_branch="卯",
+        day_stem="己",
+        day_branch="卯",
+        hour_stem="辛",
+        hour_branch="未",
+        daeun_list="[]",
+        fortune_level=3,
+        created_at=created_at,
+        updated_at=created_at,
+    )
+
+
+@pytest.fixture
+def test_user(db):
+    """テスト用ユーザーを作成（終了時に命式ごと削除）"""
+    user = User(
+        id=f"test-user-guest-{uuid.uuid4()}",
+        email=f"guest-{uuid.uuid4()}@test.com",
+        hashed_password="x",
+        profile_name="Guest Purge Test",
+        role="user",
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    yield user
+    db.query(Saju).filter(Saju.user_id == user.id).delete()
+    db.delete(user)
+    db.commit()
+
+
+@pytest.fixture
+def write_behind(monkeypatch):
+    """書き込み遅延キューを有効にする（バックグラウンドスレッドは使わない）"""
+    writer = GuestWriteBehind(SessionLocal, batch_size=10, interval=60)
+    monkeypatch.setattr(settings, "GUEST_WRITE_BEHIND", True)
+    monkeypatch.setattr(saju_api, "_guest_writer_instance", writer)
+    yield writer
+    writer.flush()
+
+
+class TestCalculatePersist:
+    """/calculate の保存モードのテストクラス"""
+
+    def test_not_persisted_by_default(self, db):
+        """persist省略時（既定設定）は行を作らない"""
+        response = client.post("/api/saju/calculate", json=BIRTH)
+        assert response.status_code == 200
+        assert db.get(Saju, response.json()["id"]) is None
+
+    def test_write_behind_disabled_by_default(self):
+        """書き込み遅延キューは既定で無効（別プロセスから書き込み待ちの行が見えないため）"""
+        assert type(settings).model_fields["GUEST_WRITE_BEHIND"].default is False
+
+    def test_persisted_when_requested(self, db, monkeypatch):
+        """persist=trueならゲスト命式として保存し、IDで引ける（書き込み遅延キュー無効時はすぐ書き込む）"""
+        monkeypatch.setattr(settings, "GUEST_WRITE_BEHIND", False)
+        response = client.post("/api/saju/calculate", json={**BIRTH, "persist": True})
+        saju_id = response.json()["id"]
+        row = db.get(Saju, saju_id)
+        assert row is not None and row.user_id is None
+        assert client.get(f"/api/saju/{saju_id}/daeun").status_code == 200
+
+    def test_write_behind_read_your_writes(self, db, write_behind):
+        """書き込み待ちの行もIDで引くと先に書き込まれる"""
+        response = client.post("/api/saju/calculate", json={**BIRTH, "persist": True})
+        saju_id = response.json()["id"]
+        assert saju_id in write_behind
+        assert db.get(Saju, saju_id) is None
+
+        assert client.get(f"/api/saju/{saju_id}/daeun").status_code == 200
+        assert saju_id not in write_behind
+        assert write_behind.written == 1
+
+
+class TestGuestWriteBehind:
+    """書き込み遅延キューのテストクラス"""
+
+    def test_batched_insert(self, db):
+        """貯めた行を1回でまとめて書き込む"""
+        writer = GuestWriteBehind(SessionLocal, batch_size=100)
+        rows = [_guest_row(datetime.utcnow()) for _ in range(5)]
+        for row in rows:
+            writer.submit(row)
+        assert len(writer) == 5
+
+        assert writer.flush() == 5
+        assert (writer.written, writer.batches, len(writer)) == (5, 1, 0)
+        assert db.query(Saju).filter(Saju.id.in_([row["id"] for row in rows])).count() == 5
+        assert writer.flush() == 0
+
+    def test_bad_row_dropped(self, db):
+        """書けない行はその行だけ捨て、残りは書き込む（以後のflushを止めない）"""
+        writer = GuestWriteBehind(SessionLocal, batch_size=100)
+        good = [_guest_row(datetime.utcnow()) for _ in range(2)]
+        bad = {**_guest_row(datetime.utcnow()), "gender": None}
+        for row in (good[0], bad, good[1]):
+            writer.submit(row)
+
+        assert writer.flush() == 2
+        assert (writer.written, writer.dropped, len(writer)) == (2, 1, 0)
+        assert db.query(Saju).filter(Saju.id.in_([row["id"] for row in good])).count() == 2
+        assert db.get(Saju, bad["id"]) is None
+
+        later = _guest_row(datetime.utcnow())
+        writer.submit(later)
+        assert writer.flush() == 1
+
+    def test_background_thread_flushes_on_stop(self, db):
+        """停止時に残りを書き込む"""
+        writer = GuestWriteBehind(SessionLocal, batch_size=100, interval=60)
+        writer.start()
+        row = _guest_row(datetime.utcnow())
+        writer.submit(row)
+        writer.stop()
+        assert db.get(Saju, row["id"]) is not None
+
+
+class TestPurgeStaleGuests:
+    """期限切れゲスト命式の削除のテストクラス"""
+
+    def test_purges_only_stale_guest_rows(self, db, test_user):
+        """期限切れのゲスト行だけをバッチで削除し、ユーザーの行・新しい行は残す"""
+        old = datetime.utcnow() - timedelta(days=100)
+        stale = [_guest_row(old) for _ in range(5)]
+        fresh = _guest_row(datetime.utcnow())
+        owned = _guest_row(old, user_id=test_user.id)
+        for row in stale + [fresh, owned]:
+            db.add(Saju(**row))
+        db.commit()
+
+        cutoff = datetime.utcnow() - timedelta(days=30)
+        # バッチ数の上限を守る
+        assert purge_stale_guests(db, cutoff, batch_size=2, max_batches=1) == 2
+        assert purge_stale_guests(db, cutoff, batch_size=2) >= 3
+
+        remaining = {
+            row.id for row in db.query(Saju.id).filter(Saju.id.in_([r["id"] for r in stale]))
+        }
+        assert remaining == set()
+        assert db.get(Saju, fresh["id"]) is not None
+        assert db.get(Saju, owned["id"]) is not None
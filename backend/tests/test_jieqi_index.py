@@ -0,0 +1,80 @@
+"""
+節入日索引（JieqiIndex）のテスト
+"""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.jieqi_index import JEOL_MONTHS, load_jieqi_index
+from app.services.saju_calculator import KST, SolarTermsDB
+
+UTC8 = timezone(timedelta(hours=8))
+
+
+def _term(day: int, hour: int = 12, minute: int = 0) -> dict:
+    return {"day": day, "hour": hour, "minute": minute, "second": 0}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """2年分（各12節）の最小節気DB"""
+    data = {
+        str(year): {name: _term(6 if name == "小寒" else 5) for name in JEOL_MONTHS}
+        for year in (2000, 2001)
+    }
+    data["2001"]["立春"] = _term(4, 1, 30)
+    path = tmp_path / "jieqi.json"
+    path.write_text(json.dumps({"solar_terms_data": data}), encoding="utf-8")
+    return path
+
+
+class TestJieqiIndex:
+    """節入日索引のテストクラス"""
+
+    def test_shared_instance(self, db_path):
+        """同じファイル・タイムゾーンでは同じ索引を共有する"""
+        assert load_jieqi_index(db_path, UTC8) is load_jieqi_index(str(db_path), UTC8)
+        assert load_jieqi_index(db_path, UTC8) is not load_jieqi_index(db_path, KST)
+
+    def test_sorted_and_xiaohan_next_year(self, db_path):
+        """節入時刻は昇順で、小寒は翌年1月として扱う"""
+        index = load_jieqi_index(db_path, UTC8)
+        assert len(index) == 24
+        assert list(index.instants) == sorted(index.instants)
+        assert index.get(2000, "小寒") == datetime(2001, 1, 6, 12, 0, tzinfo=UTC8)
+        assert index.get(1999, "立春") is None
+        assert index.has_year(2001) and not index.has_year(2002)
+
+    def test_next_and_previous(self, db_path):
+        """前後の節入りを年をまたいで検索できる"""
+        index = load_jieqi_index(db_path, UTC8)
+
+        # 1月上旬は前年データの小寒が次の節
+        assert index.next_after(datetime(2001, 1, 2, tzinfo=UTC8)) == (
+            "小寒",
+            datetime(2001, 1, 6, 12, 0, tzinfo=UTC8),
+        )
+        assert index.previous_before(datetime(2001, 1, 20, tzinfo=UTC8)) == (
+            "小寒",
+            datetime(2001, 1, 6, 12, 0, tzinfo=UTC8),
+        )
+        # 節入時刻ちょうどは「後」「前」のどちらにも含めない
+        lichun = datetime(2001, 2, 4, 1, 30, tzinfo=UTC8)
+        assert index.next_after(lichun)[0] == "驚蟄"
+        assert index.previous_before(lichun)[0] == "小寒"
+        # 範囲外
+        assert index.previous_before(datetime(2000, 1, 1, tzinfo=UTC8)) is None
+        assert index.next_after(datetime(2002, 2, 1, tzinfo=UTC8)) is None
+
+    def test_solar_terms_db_converts_to_kst(self, db_path):
+        """SolarTermsDBは北京時間のDBをKSTに変換して返す"""
+        solar_terms_db = SolarTermsDB(db_path=str(db_path))
+
+        assert solar_terms_db.get_jieqi_datetime(2001, "立春") == datetime(
+            2001, 2, 4, 2, 30, tzinfo=KST
+        )
+        name, dt = solar_terms_db.get_next_jieqi(datetime(2001, 2, 4, 2, 0, tzinfo=KST))
+        assert (name, dt.utcoffset()) == ("立春", timedelta(hours=9))
+        with pytest.raises(ValueError):
+            solar_terms_db.get_jieqi_datetime(2002, "立春")
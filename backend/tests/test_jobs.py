@@ -0,0 +1,361 @@
+"""
+バックグラウンドジョブのテスト
+テスト対象:
+- POST /api/jobs
+- GET /api/jobs/{id}
+- JobQueue（asyncioワーカー・プロセスプール）
+"""
+import asyncio
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import jobs as jobs_api
+from app.api import saju as saju_api
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import Job, RefreshToken, Saju, User
+from app.services.fortune_analyzer import ANALYZER_VERSION
+from app.services.job_queue import JOB_QUEUED, JOB_SUCCEEDED, JobQueue
+
+client = TestClient(app)
+
+BIRTH = {"birthDatetime": "1990-03-15T14:30:00+09:00", "gender": "male"}
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_data():
+    """各テスト後にテストデータを削除"""
+    yield
+    db = SessionLocal()
+    try:
+        user_ids = db.query(User.id).filter(User.email.like("test_jobs_%@example.com"))
+        db.query(Job).filter(Job.user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(Saju).filter(Saju.user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(RefreshToken).filter(RefreshToken.user_id.in_(user_ids)).delete(
+            synchronize_session=False
+        )
+        db.query(User).filter(User.email.like("test_jobs_%@example.com")).delete(
+            synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    """ワーカーを起動しないジョブキュー（テストからrun_jobで実行する）"""
+    job_queue = JobQueue(SessionLocal, cpu_workers=0, chunk_size=2)
+    monkeypatch.setattr(jobs_api, "_job_queue_instance", job_queue)
+    return job_queue
+
+
+def _login(email: str):
+    response = client.post(
+        "/api/auth/register", json={"email": email, "password": "TestPassword2025!"}
+    )
+    data = response.json()
+    return data["user"]["id"], {"Authorization": f"Bearer {data['accessToken']}"}
+
+
+def _add_sajus(user_id: str, count: int):
+    db = SessionLocal()
+    try:
+        for _ in range(count):
+            saju = client.post("/api/saju/calculate", json=BIRTH).json()
+            db.add(
+                Saju(
+                    id=saju["id"],
+                    user_id=user_id,
+                    birth_datetime=datetime(1990, 3, 15, 5, 30),
+                    gender="male",
+                    year_stem=saju["yearStem"],
+                    year_branch=saju["yearBranch"],
+                    month_stem=saju["monthStem"],
+                    month_branch=saju["monthBranch"],
+                    day_stem=saju["dayStem"],
+                    day_branch=saju["dayBranch"],
+                    hour_stem=saju["hourStem"],
+                    hour_branch=saju["hourBranch"],
+                    daeun_list=json.dumps(saju["daeunList"], ensure_ascii=False),
+                    fortune_level=3,
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def _run(queue: JobQueue, headers: dict, kind: str, params: dict = None) -> dict:
+    response = client.post(
+        "/api/jobs", json={"kind": kind, "params": params or {}}, headers=headers
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == JOB_QUEUED
+    assert queue.run_job(job["id"]) is True
+    return client.get(f"/api/jobs/{job['id']}", headers=headers).json()
+
+
+class TestJobApi:
+    """ジョブAPIのテストクラス"""
+
+    def test_export(self, queue):
+        """エクスポートはチャンクごとに進捗を記録し、結果にエクスポートデータを保存"""
+        user_id, headers = _login("test_jobs_export@example.com")
+        _add_sajus(user_id, 3)
+
+        job = _run(queue, headers, "export")
+        assert job["status"] == JOB_SUCCEEDED
+        assert (job["progress"], job["total"]) == (3, 3)
+        assert job["result"]["count"] == 3 and job["result"]["user_id"] == user_id
+        assert queue.run_job(job["id"]) is False
+
+    def test_import_skips_existing(self, queue):
+        """インポートは既存IDを飛ばすため、再投入しても重複しない"""
+        _, headers = _login("test_jobs_import@example.com")
+        data = [client.post("/api/saju/calculate", json=BIRTH).json() for _ in range(3)]
+        params = {"version": "1.0.0", "exportDate": "2026-10-19T00:00:00+09:00", "data": data}
+
+        job = _run(queue, headers, "import", params)
+        assert job["result"]["importedCount"] == 3
+        job = _run(queue, headers, "import", params)
+        assert (job["result"]["importedCount"], job["result"]["skippedCount"]) == (0, 3)
+
+    def test_recompute_daeun(self, queue):
+        """大運の吉凶レベルが現在の判定と違う行だけを更新"""
+        user_id, headers = _login("test_jobs_recompute@example.com")
+        _add_sajus(user_id, 3)
+        db = SessionLocal()
+        try:
+            stale = db.query(Saju).filter(Saju.user_id == user_id).first()
+            daeun_list = json.loads(stale.daeun_list)
+            expected = daeun_list[0]["fortuneLevel"]
+            daeun_list[0]["fortuneLevel"] = "大凶" if expected != "大凶" else "大吉"
+            stale.daeun_list = json.dumps(daeun_list, ensure_ascii=False)
+            db.commit()
+
+            job = _run(queue, headers, "recompute_daeun")
+            assert job["result"]["scannedCount"] == 3 and job["result"]["updatedCount"] == 1
+            db.refresh(stale)
+            assert json.loads(stale.daeun_list)[0]["fortuneLevel"] == expected
+        finally:
+            db.close()
+
+    def test_invalid_requests(self, queue):
+        """不正なパラメータは400、管理者以外の全件再計算は403、他人のジョブは404"""
+        _, headers = _login("test_jobs_invalid@example.com")
+        _, other_headers = _login("test_jobs_other@example.com")
+
+        response = client.post(
+            "/api/jobs", json={"kind": "import", "params": {"version": "9.9"}}, headers=headers
+        )
+        assert response.status_code == 400
+        response = client.post(
+            "/api/jobs",
+            json={"kind": "recompute_daeun", "params": {"scope": "all"}},
+            headers=headers,
+        )
+        assert response.status_code == 403
+
+        job_id = client.post("/api/jobs", json={"kind": "export"}, headers=headers).json()["id"]
+        assert client.get(f"/api/jobs/{job_id}", headers=other_headers).status_code == 404
+        assert client.get(f"/api/jobs/job-{uuid.uuid4()}", headers=headers).status_code == 404
+
+
+class TestRecomputePipeline:
+    """大運吉凶レベルの再計算パイプラインのテストクラス"""
+
+    def test_version_stamp(self, queue):
+        """再計算した行にバージョンを付け、2回目はバージョンの古い行だけが対象"""
+        user_id, headers = _login("test_jobs_version@example.com")
+        _add_sajus(user_id, 3)
+
+        job = _run(queue, headers, "recompute_daeun")
+        assert job["result"]["scannedCount"] == 3
+        assert job["result"]["analyzerVersion"] == ANALYZER_VERSION
+        db = SessionLocal()
+        try:
+            versions = {
+                row.analyzer_version for row in db.query(Saju).filter(Saju.user_id == user_id)
+            }
+        finally:
+            db.close()
+        assert versions == {ANALYZER_VERSION}
+
+        assert _run(queue, headers, "recompute_daeun")["result"]["scannedCount"] == 0
+        job = _run(queue, headers, "recompute_daeun", {"force": True})
+        assert job["result"]["scannedCount"] == 3
+
+    def test_calculate_stamps_version(self, db):
+        """/calculate で保存した行は現在のバージョン"""
+        saju_id = client.post("/api/saju/calculate", json={**BIRTH, "persist": True}).json()["id"]
+        writer = saju_api.get_guest_writer()
+        if writer is not None:
+            writer.flush()
+        row = db.get(Saju, saju_id)
+        assert row.analyzer_version == ANALYZER_VERSION
+        db.delete(row)
+        db.commit()
+
+    def test_resume_from_checkpoint(self, queue):
+        """異常終了したジョブはチェックポイントの続きから再開し、進捗を引き継ぐ"""
+        user_id, headers = _login("test_jobs_resume@example.com")
+        _add_sajus(user_id, 3)
+        job_id = client.post("/api/jobs", json={"kind": "recompute_daeun"}, headers=headers).json()[
+            "id"
+        ]
+
+        db = SessionLocal()
+        try:
+            first_id = min(row.id for row in db.query(Saju.id).filter(Saju.user_id == user_id))
+            # 1件目まで処理したところで止まったジョブ
+            job = db.get(Job, job_id)
+            job.checkpoint, job.progress = first_id, 1
+            db.commit()
+        finally:
+            db.close()
+
+        assert queue.run_job(job_id) is True
+        job = client.get(f"/api/jobs/{job_id}", headers=headers).json()
+        assert job["result"]["scannedCount"] == 2
+        assert (job["progress"], job["total"]) == (3, 3)
+
+    def test_concurrent_update_not_overwritten(self, queue, monkeypatch):
+        """読んだ後に更新された行は書き戻さない（次回の対象に残る）"""
+        from app.services import saju_jobs
+
+        user_id, headers = _login("test_jobs_concurrent@example.com")
+        _add_sajus(user_id, 1)
+        db = SessionLocal()
+        try:
+            row = db.query(Saju).filter(Saju.user_id == user_id).one()
+            daeun_list = json.loads(row.daeun_list)
+            level = daeun_list[0]["fortuneLevel"]
+            daeun_list[0]["fortuneLevel"] = "大凶" if level != "大凶" else "大吉"
+            row.daeun_list = json.dumps(daeun_list, ensure_ascii=False)
+            db.commit()
+            saju_id = row.id
+        finally:
+            db.close()
+
+        original = saju_jobs.reanalyze_daeun_lists
+
+        def reanalyze_then_user_edits(rows):
+            # 判定中にユーザーが名前を変更した
+            session = SessionLocal()
+            try:
+                session.get(Saju, saju_id).name = "変更後"
+                session.commit()
+            finally:
+                session.close()
+            return original(rows)
+
+        monkeypatch.setattr(saju_jobs, "reanalyze_daeun_lists", reanalyze_then_user_edits)
+        job = _run(queue, headers, "recompute_daeun")
+        assert job["result"]["updatedCount"] == 1
+
+        db = SessionLocal()
+        try:
+            row = db.get(Saju, saju_id)
+            assert row.name == "変更後"
+            assert json.loads(row.daeun_list)[0]["fortuneLevel"] == daeun_list[0]["fortuneLevel"]
+            # バージョンは古いままなので次回の再計算で拾い直される
+            assert row.analyzer_version is None
+        finally:
+            db.close()
+
+
+class TestJobQueue:
+    """ジョブキュー本体のテストクラス"""
+
+    def test_workers_run_submitted_jobs(self):
+        """起動したワーカーが投入済み・投入されたジョブを実行する"""
+        user_id, _ = _login("test_jobs_workers@example.com")
+        job_queue = JobQueue(SessionLocal, workers=2, chunk_size=2)
+        before_start = job_queue.submit("export", user_id=user_id)
+
+        async def scenario():
+            await job_queue.start()
+            after_start = job_queue.submit("export", user_id=user_id)
+            for _ in range(200):
+                await asyncio.sleep(0.02)
+                db = SessionLocal()
+                try:
+                    statuses = {
+                        db.get(Job, job_id).status for job_id in (before_start, after_start)
+                    }
+                finally:
+                    db.close()
+                if statuses == {JOB_SUCCEEDED}:
+                    break
+            await job_queue.stop()
+            return statuses
+
+        assert asyncio.run(scenario()) == {JOB_SUCCEEDED}
+
+    def test_process_pool(self):
+        """CPU処理をプロセスプールで実行しても結果は同じ"""
+        user_id, _ = _login("test_jobs_pool@example.com")
+        _add_sajus(user_id, 3)
+        job_queue = JobQueue(SessionLocal, cpu_workers=1, chunk_size=2)
+        try:
+            job_id = job_queue.submit("recompute_daeun", user_id=user_id)
+            assert job_queue.run_job(job_id) is True
+        finally:
+            job_queue.executor.shutdown()
+
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            assert job.status == JOB_SUCCEEDED
+            result = json.loads(job.result)
+            assert (result["scannedCount"], result["updatedCount"]) == (3, 0)
+        finally:
+            db.close()
+
+    def test_stop_requeues_interrupted_job(self, monkeypatch):
+        """停止で中断したジョブは失敗にせずqueuedに戻し、次回起動時に続きから再開する"""
+        from app.services import saju_jobs
+
+        user_id, _ = _login("test_jobs_stop@example.com")
+        _add_sajus(user_id, 5)
+        job_queue = JobQueue(SessionLocal, chunk_size=2)
+        job_id = job_queue.submit("recompute_daeun", user_id=user_id)
+
+        original = saju_jobs.reanalyze_daeun_lists
+        calls = []
+
+        def reanalyze_then_stop(rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                # 2チャンク目の処理中にアプリが停止した
+                asyncio.run(job_queue.stop())
+            return original(rows)
+
+        monkeypatch.setattr(saju_jobs, "reanalyze_daeun_lists", reanalyze_then_stop)
+        assert job_queue.run_job(job_id) is True
+
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            assert (job.status, job.error, job.progress) == (JOB_QUEUED, None, 4)
+        finally:
+            db.close()
+        # 停止中のキューは新しく実行しない
+        assert job_queue.run_job(job_id) is False
+
+        monkeypatch.setattr(saju_jobs, "reanalyze_daeun_lists", original)
+        restarted = JobQueue(SessionLocal, chunk_size=2)
+        assert restarted.run_job(job_id) is True
+        db = SessionLocal()
+        try:
+            job = db.get(Job, job_id)
+            assert (job.status, job.progress, job.total) == (JOB_SUCCEEDED, 5, 5)
+            assert json.loads(job.result)["scannedCount"] == 1
+        finally:
+            db.close()
@@ -0,0 +1,29 @@
+"""
+レスポンスのシリアライズ補助（app/core/responses.py）のテスト
+"""
+import orjson
+
+from app.core.responses import splice_json
+
+
+class TestSpliceJson:
+    """シリアライズ済みJSONの埋め込みのテストクラス"""
+
+    def test_appends_raw_json_as_last_key(self):
+        """辞書の末尾に1項目として埋め込む（文字列・バイト列どちらも可）"""
+        raw = '[{"id": 1, "fortuneLevel": "吉"}]'
+        expected = {
+            "id": "saju-1",
+            "name": "テスト",
+            "daeunList": [{"id": 1, "fortuneLevel": "吉"}],
+        }
+        for value in (raw, raw.encode("utf-8")):
+            body = splice_json({"id": "saju-1", "name": "テスト"}, "daeunList", value)
+            assert orjson.loads(body) == expected
+            assert list(orjson.loads(body)) == list(expected)
+
+    def test_empty_payload(self):
+        """埋め込み先が空の辞書なら区切りのカンマを付けない"""
+        body = splice_json({}, "daeunList", b"[]")
+        assert body == b'{"daeunList":[]}'
+        assert orjson.loads(body) == {"daeunList": []}
@@ -2,6 +2,7 @@
 命式削除API統合テスト
 テスト対象:
 - DELETE /api/saju/{id}
+- DELETE /api/saju（一括削除）
 
 要件:
 - 認証必須（JWT）
@@ -207,5 +208,62 @@ def test_delete_invalid_token():
     assert data["detail"] == "認証が必要です"
 
 
+
+# ==================== 一括削除テスト ====================
+
+
+def test_bulk_delete_by_ids():
+    """正常系：IDのリストで自分の命式だけを削除"""
+    access_token1, _ = create_test_user_and_login("test_delete_bulk1@example.com")
+    access_token2, _ = create_test_user_and_login("test_delete_bulk2@example.com")
+    own_ids = [create_test_saju(access_token1, f"命式{i}") for i in range(3)]
+    other_id = create_test_saju(access_token2, "他ユーザーの命式")
+
+    response = client.delete(
+        "/api/saju",
+        params={"ids": [*own_ids[:2], other_id, f"saju-{uuid.uuid4()}"]},
+        headers={"Authorization": f"Bearer {access_token1}"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["deletedCount"] == 2
+    assert data["message"] == "2件の命式を削除しました"
+
+    assert client.get(f"/api/saju/{own_ids[0]}").status_code == 404
+    assert client.get(f"/api/saju/{own_ids[2]}").status_code == 200
+    assert client.get(f"/api/saju/{other_id}").status_code == 200
+
+
+def test_bulk_delete_by_filter():
+    """正常系：絞り込み条件に一致する自分の命式を削除"""
+    access_token1, _ = create_test_user_and_login("test_delete_filter1@example.com")
+    access_token2, _ = create_test_user_and_login("test_delete_filter2@example.com")
+    own_ids = [create_test_saju(access_token1, f"命式{i}") for i in range(2)]
+    other_id = create_test_saju(access_token2, "他ユーザーの命式")
+
+    response = client.delete(
+        "/api/saju",
+        params={"gender": "male"},
+        headers={"Authorization": f"Bearer {access_token1}"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["deletedCount"] == 2
+    assert all(client.get(f"/api/saju/{saju_id}").status_code == 404 for saju_id in own_ids)
+    assert client.get(f"/api/saju/{other_id}").status_code == 200
+
+
+def test_bulk_delete_requires_criteria():
+    """異常系：IDも絞り込み条件もなければ400"""
+    access_token, _ = create_test_user_and_login("test_delete_nocriteria@example.com")
+    saju_id = create_test_saju(access_token)
+
+    response = client.delete("/api/saju", headers={"Authorization": f"Bearer {access_token}"})
+
+    assert response.status_code == 400
+    assert client.get(f"/api/saju/{saju_id}").status_code == 200
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -10,6 +10,8 @@ from sqlalchemy.orm import Session
 
 from app.main import app
 from app.models import Saju as SajuModel
+from app.schemas.saju import DaeunInfo, SajuResponse
+from app.services.fortune_analyzer import ANALYZER_VERSION, FORTUNE_LEVEL_CODES
 
 client = TestClient(app)
 
@@ -218,6 +220,59 @@ def test_get_saju_detail(db: Session):
     assert data["daeunList"][0]["daeunBranch"] == "卯"
 
 
+def test_get_saju_detail_trusted_daeun_list(db: Session):
+    """サーバーが書いた大運リストはJSONのまま埋め込み、検証した場合と同じ形で返す"""
+    db.query(SajuModel).delete()
+    db.commit()
+
+    daeun_list = [
+        DaeunInfo(
+            id=i,
+            sajuId="test-detail-trusted",
+            startAge=8 + 10 * i,
+            endAge=17 + 10 * i,
+            daeunStem=stem,
+            daeunBranch=branch,
+            fortuneLevel="平",
+            sipsin="偏印",
+            isCurrent=False,
+        ).model_dump()
+        for i, (stem, branch) in enumerate([("乙", "卯"), ("丙", "辰")])
+    ]
+    test_saju = SajuModel(
+        id="test-detail-trusted",
+        user_id=None,
+        name="埋め込みテスト",
+        birth_datetime=datetime(1990, 3, 15, 5, 30, 0),
+        gender="male",
+        year_stem="庚",
+        year_branch="午",
+        month_stem="己",
+        month_branch="卯",
+        day_stem="丙",
+        day_branch="午",
+        hour_stem="乙",
+        hour_branch="未",
+        daeun_list=json.dumps(daeun_list, ensure_ascii=False),
+        fortune_level=FORTUNE_LEVEL_CODES["吉"],
+    )
+    db.add(test_saju)
+    db.commit()
+    validated = client.get("/api/saju/test-detail-trusted")
+
+    test_saju.analyzer_version = ANALYZER_VERSION
+    db.commit()
+    response = client.get("/api/saju/test-detail-trusted")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+    data = response.json()
+    assert data == validated.json()
+    assert set(data) == set(SajuResponse.model_fields)
+    assert SajuResponse.model_validate(data).model_dump() == data
+    assert data["daeunList"] == daeun_list
+
+
 def test_get_saju_detail_not_found(db: Session):
     """存在しないIDで404が返されることを確認"""
     response = client.get("/api/saju/non-existent-id")
@@ -0,0 +1,150 @@
+"""
+相性検索API統合テスト
+テスト対象:
+- GET /api/saju/{id}/matches
+
+要件:
+- 認証必須（JWT）
+- 自分の命式のみ検索元・検索対象にできる
+- 異性の命式から合計点の高い順にk件返す
+"""
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.models import RefreshToken, Saju, User
+
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    """テスト用DBセッション"""
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_data():
+    """各テスト後にテストデータを削除"""
+    yield
+    db = TestingSessionLocal()
+    try:
+        user_ids = db.query(User.id).filter(User.email.like("test_matches_%@example.com"))
+        db.query(Saju).filter(Saju.user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(RefreshToken).filter(RefreshToken.user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(User).filter(User.email.like("test_matches_%@example.com")).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def create_test_user_and_login():
+    """テストユーザー作成＆ログイン"""
+    response = client.post(
+        "/api/auth/register",
+        json={
+            "email": f"test_matches_{uuid.uuid4().hex[:8]}@example.com",
+            "password": "TestPassword2025!",
+        },
+    )
+    assert response.status_code == 201
+    data = response.json()
+    return data["accessToken"], data["user"]["id"]
+
+
+def add_saju(user_id: str, gender: str, day: str, month: str, hour: str) -> str:
+    """命式をDBに直接追加"""
+    db = TestingSessionLocal()
+    try:
+        saju_id = str(uuid.uuid4())
+        db.add(
+            Saju(
+                id=saju_id,
+                user_id=user_id,
+                name=f"{gender}-{day}",
+                birth_datetime=datetime(1990, 1, 1, 12, 0, 0),
+                gender=gender,
+                year_stem="庚",
+                year_branch="午",
+                month_stem=month[0],
+                month_branch=month[1],
+                day_stem=day[0],
+                day_branch=day[1],
+                hour_stem=hour[0],
+                hour_branch=hour[1],
+                daeun_list=json.dumps([]),
+                fortune_level=3,
+            )
+        )
+        db.commit()
+        return saju_id
+    finally:
+        db.close()
+
+
+def test_matches_ranked_opposite_gender():
+    """異性の命式が合計点の降順で返される"""
+    token, user_id = create_test_user_and_login()
+    me = add_saju(user_id, "male", "戊子", "戊寅", "戊午")
+    best = add_saju(user_id, "female", "甲子", "甲申", "甲子")
+    add_saju(user_id, "female", "癸亥", "戊寅", "癸亥")
+    add_saju(user_id, "male", "甲子", "甲申", "甲子")
+
+    response = client.get(
+        f"/api/saju/{me}/matches?k=5", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["sajuId"] == me
+    assert data["scope"] == "account"
+    assert data["candidates"] == 2
+    assert [m["gender"] for m in data["matches"]] == ["female", "female"]
+    assert data["matches"][0]["id"] == best
+    assert data["matches"][0]["details"][0] == "日干：大吉 +40"
+    totals = [m["totalScore"] for m in data["matches"]]
+    assert totals == sorted(totals, reverse=True)
+    for m in data["matches"]:
+        assert m["totalScore"] == m["score"] + m["partnerScore"]
+
+
+def test_matches_other_user_not_found():
+    """他ユーザーの命式は検索元にできない"""
+    _, owner_id = create_test_user_and_login()
+    other_token, _ = create_test_user_and_login()
+    saju_id = add_saju(owner_id, "male", "戊子", "戊寅", "戊午")
+
+    response = client.get(
+        f"/api/saju/{saju_id}/matches", headers={"Authorization": f"Bearer {other_token}"}
+    )
+    assert response.status_code == 404
+
+
+def test_matches_scope_all_requires_admin():
+    """全体検索は管理者のみ"""
+    token, user_id = create_test_user_and_login()
+    saju_id = add_saju(user_id, "male", "戊子", "戊寅", "戊午")
+
+    response = client.get(
+        f"/api/saju/{saju_id}/matches?scope=all", headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 403
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 
 from app.core.auth import create_access_token, get_password_hash
 from app.models import Saju, User
+from app.services.fortune_analyzer import FORTUNE_LEVEL_CODES
 
 
 class TestMigrateAPI:
@@ -353,3 +354,34 @@ class TestMigrateAPI:
             assert saju.user_id == test_user.id
             # ゲストモード（user_id=null）ではない
             assert saju.user_id is not None
+
+    def test_migrate_fortune_level_encoding(
+        self,
+        client: TestClient,
+        db: Session,
+        test_user: User,
+        auth_headers: dict,
+        sample_guest_data: list,
+    ):
+        """
+        正常系: 吉凶レベルは他の保存経路と同じ7段階の数値で保存され、同じ文字列に戻る
+        """
+        response = client.post(
+            "/api/saju/migrate",
+            json={"guestData": sample_guest_data},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+
+        sajus = db.query(Saju).filter(Saju.user_id == test_user.id).all()
+        levels = {saju.name: saju.fortune_level for saju in sajus}
+        assert levels == {
+            "テスト太郎": FORTUNE_LEVEL_CODES["吉"],
+            "テスト花子": FORTUNE_LEVEL_CODES["大吉"],
+        }
+
+        listed = client.get("/api/saju/list", headers=auth_headers).json()["items"]
+        assert {item["name"]: item["fortuneLevel"] for item in listed} == {
+            "テスト太郎": "吉",
+            "テスト花子": "大吉",
+        }
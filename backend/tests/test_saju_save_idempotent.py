@@ -0,0 +1,177 @@
+"""
+命式保存APIのテスト（UPSERT・Idempotency-Key・一括保存）
+テスト対象:
+- POST /api/saju/save
+- POST /api/saju/save/bulk
+"""
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import IdempotencyKey, RefreshToken, Saju, User
+from app.services.fortune_analyzer import ANALYZER_VERSION
+
+client = TestClient(app)
+
+EMAIL_PATTERN = "test_save_idem_%@example.com"
+
+
+@pytest.fixture(autouse=True)
+def cleanup_test_data():
+    """各テスト後にテストデータを削除"""
+    yield
+    db = SessionLocal()
+    try:
+        user_ids = db.query(User.id).filter(User.email.like(EMAIL_PATTERN))
+        for model in (Saju, IdempotencyKey, RefreshToken):
+            db.query(model).filter(model.user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(User).filter(User.email.like(EMAIL_PATTERN)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _login(name: str) -> dict:
+    response = client.post(
+        "/api/auth/register",
+        json={"email": f"test_save_idem_{name}@example.com", "password": "TestPassword2025!"},
+    )
+    assert response.status_code == 201
+    return {"Authorization": f"Bearer {response.json()['accessToken']}"}
+
+
+def _calculate(name: str = "テスト太郎") -> dict:
+    response = client.post(
+        "/api/saju/calculate",
+        json={"name": name, "birthDatetime": "1990-01-15T14:30:00+09:00", "gender": "male"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _owner(saju_id: str):
+    db = SessionLocal()
+    try:
+        saju = db.get(Saju, saju_id)
+        return None if saju is None else (saju.user_id, saju.name)
+    finally:
+        db.close()
+
+
+def test_save_claims_guest_chart_and_updates_own_chart():
+    """ゲストの命式は自分のものになり、自分の命式は名前が更新される"""
+    headers = _login("claim")
+    saju = _calculate()
+
+    response = client.post("/api/saju/save", json=saju, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["id"] == saju["id"]
+    user_id = _owner(saju["id"])[0]
+    assert user_id is not None
+
+    response = client.post("/api/saju/save", json={**saju, "name": "改名"}, headers=headers)
+    assert response.status_code == 201
+    assert _owner(saju["id"]) == (user_id, "改名")
+
+
+def test_save_stamps_analyzer_version():
+    """保存した命式は大運の吉凶を判定し直してANALYZER_VERSIONを付ける（送られた判定は使わない）"""
+    headers = _login("version")
+    saju = _calculate()
+    forged = [{**daeun, "fortuneLevel": "大吉"} for daeun in saju["daeunList"]]
+    assert {daeun["fortuneLevel"] for daeun in saju["daeunList"]} != {"大吉"}
+
+    for path, body in (
+        ("/api/saju/save", {**saju, "daeunList": forged}),
+        ("/api/saju/save/bulk", {"items": [{**_calculate("一括"), "daeunList": forged}]}),
+    ):
+        response = client.post(path, json=body, headers=headers)
+        assert response.status_code == 201
+        saju_id = response.json()["id"] if path.endswith("save") else response.json()["ids"][0]
+        db = SessionLocal()
+        try:
+            row = db.get(Saju, saju_id)
+            assert row.analyzer_version == ANALYZER_VERSION
+            levels = [daeun["fortuneLevel"] for daeun in json.loads(row.daeun_list)]
+        finally:
+            db.close()
+        assert levels == [daeun["fortuneLevel"] for daeun in saju["daeunList"]]
+
+
+def test_save_rejects_other_users_chart():
+    """他のユーザーの命式は上書きできない"""
+    saju = _calculate()
+    client.post("/api/saju/save", json=saju, headers=_login("owner"))
+    owner = _owner(saju["id"])
+
+    other = _login("other")
+    response = client.post("/api/saju/save", json={**saju, "name": "横取り"}, headers=other)
+    assert response.status_code == 403
+    assert _owner(saju["id"]) == owner
+
+
+def test_save_replays_response_for_same_key():
+    """同じIdempotency-Keyの再送には最初のレスポンスを返す"""
+    headers = {**_login("replay"), "Idempotency-Key": str(uuid.uuid4())}
+    saju = _calculate()
+
+    first = client.post("/api/saju/save", json=saju, headers=headers)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    second = client.post("/api/saju/save", json=saju, headers=headers)
+    assert second.status_code == 201
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+
+
+def test_save_rejects_reused_key_with_different_body():
+    """同じIdempotency-Keyで内容の違うリクエストは422"""
+    headers = {**_login("reuse"), "Idempotency-Key": str(uuid.uuid4())}
+    saju = _calculate()
+
+    assert client.post("/api/saju/save", json=saju, headers=headers).status_code == 201
+    response = client.post("/api/saju/save", json={**saju, "name": "別名"}, headers=headers)
+    assert response.status_code == 422
+    assert _owner(saju["id"])[1] == saju["name"]
+
+
+def test_save_rejects_too_long_key():
+    """長すぎるIdempotency-Keyは400"""
+    headers = {**_login("longkey"), "Idempotency-Key": "x" * 256}
+    response = client.post("/api/saju/save", json=_calculate(), headers=headers)
+    assert response.status_code == 400
+
+
+def test_bulk_save_skips_other_users_charts():
+    """一括保存は他のユーザーの命式をskippedIdsに入れ、残りを保存する"""
+    taken = _calculate("他人")
+    client.post("/api/saju/save", json=taken, headers=_login("bulk_owner"))
+    items = [_calculate(f"一括{i}") for i in range(3)]
+
+    headers = {**_login("bulk"), "Idempotency-Key": str(uuid.uuid4())}
+    response = client.post("/api/saju/save/bulk", json={"items": [*items, taken]}, headers=headers)
+    assert response.status_code == 201
+    data = response.json()
+    assert data["savedCount"] == 3
+    assert data["ids"] == [item["id"] for item in items]
+    assert data["skippedIds"] == [taken["id"]]
+
+    replay = client.post("/api/saju/save/bulk", json={"items": [*items, taken]}, headers=headers)
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == data
+
+
+def test_bulk_save_rejects_empty_and_oversized_batches():
+    """空・上限超えの一括保存は400"""
+    headers = _login("bulk_limit")
+    assert (
+        client.post("/api/saju/save/bulk", json={"items": []}, headers=headers).status_code == 400
+    )
+    saju = _calculate()
+    response = client.post("/api/saju/save/bulk", json={"items": [saju] * 101}, headers=headers)
+    assert response.status_code == 400
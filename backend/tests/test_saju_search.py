@@ -0,0 +1,191 @@
+"""
+命式検索APIのテスト
+テスト対象: GET /api/saju/search
+"""
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import RefreshToken, Saju, User
+
+client = TestClient(app)
+
+EMAIL = "test_search@example.com"
+
+# (日柱, 年柱, 性別, 生年月日時（UTC）, 吉凶レベル)
+CHARTS = [
+    ("甲子", "庚午", "male", datetime(1990, 3, 15, 5, 30), 7),
+    ("甲子", "辛未", "female", datetime(1991, 6, 1, 0, 0), 5),
+    ("乙丑", "庚午", "male", datetime(1990, 12, 31, 16, 0), 7),
+    ("丙寅", "壬申", "female", datetime(1992, 1, 1, 0, 0), 1),
+]
+
+
+@pytest.fixture
+def headers():
+    """検索対象の命式を持つユーザー"""
+    response = client.post(
+        "/api/auth/register", json={"email": EMAIL, "password": "TestPassword2025!"}
+    )
+    data = response.json()
+    db = SessionLocal()
+    try:
+        for day, year, gender, birth, level in CHARTS:
+            db.add(
+                Saju(
+                    id=f"saju-{uuid.uuid4()}",
+                    user_id=data["user"]["id"],
+                    birth_datetime=birth,
+                    gender=gender,
+                    year_stem=year[0],
+                    year_branch=year[1],
+                    month_stem="己",
+                    month_branch="卯",
+                    day_stem=day[0],
+                    day_branch=day[1],
+                    hour_stem="乙",
+                    hour_branch="未",
+                    fortune_level=level,
+                )
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    yield {"Authorization": f"Bearer {data['accessToken']}"}
+
+    db = SessionLocal()
+    try:
+        user_ids = db.query(User.id).filter(User.email == EMAIL)
+        db.query(Saju).filter(Saju.user_id.in_(user_ids)).delete(synchronize_session=False)
+        db.query(RefreshToken).filter(RefreshToken.user_id.in_(user_ids)).delete(
+            synchronize_session=False
+        )
+        db.query(User).filter(User.email == EMAIL).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _search(headers: dict, query: str = "") -> dict:
+    response = client.get(f"/api/saju/search?{query}", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestSajuSearch:
+    """命式検索のテストクラス"""
+
+    def test_filter_by_pillar(self, headers):
+        """柱・天干地支・性別・吉凶レベルで絞り込む"""
+        assert _search(headers, "dayPillar=甲子")["total"] == 2
+        assert _search(headers, "dayStem=甲&gender=female")["total"] == 1
+        assert _search(headers, "yearPillar=庚午&fortuneLevel=大吉")["total"] == 2
+        assert _search(headers, "fortuneLevel=大凶,吉")["total"] == 2
+        assert _search(headers)["total"] == 4
+
+    def test_filter_by_birth_range(self, headers):
+        """生年月日時の範囲（日付のみはKST、終わりの日を含む）"""
+        # 1990-12-31T16:00Z は KSTで1991-01-01
+        assert _search(headers, "birthFrom=1991-01-01&birthTo=1991-12-31")["total"] == 2
+        assert _search(headers, "birthTo=1990-12-31")["total"] == 1
+
+    def test_facets(self, headers):
+        """ファセットは絞り込み後の件数を多い順に返す"""
+        data = _search(headers, "gender=male&facets=dayPillar,fortuneLevel,yearPillar")
+        assert data["facets"]["dayPillar"] == [
+            {"value": "乙丑", "count": 1},
+            {"value": "甲子", "count": 1},
+        ]
+        assert data["facets"]["fortuneLevel"] == [{"value": "大吉", "count": 2}]
+        assert data["facets"]["yearPillar"] == [{"value": "庚午", "count": 2}]
+
+        data = _search(headers, "facets=dayPillar&limit=1")
+        assert data["facets"]["dayPillar"][0] == {"value": "甲子", "count": 2}
+        assert len(data["items"]) == 1 and data["hasNext"] is True
+
+    def test_invalid_conditions(self, headers):
+        """不正な条件は400"""
+        for query in (
+            "dayPillar=甲丑",
+            "dayStem=子",
+            "dayPillar=甲子&dayStem=乙",
+            "fortuneLevel=最高",
+            "facets=unknown",
+            "birthFrom=yesterday",
+        ):
+            response = client.get(f"/api/saju/search?{query}", headers=headers)
+            assert response.status_code == 400, query
+
+    def test_requires_login(self):
+        """未ログインは403（HTTPBearer）"""
+        assert client.get("/api/saju/search").status_code == 403
+
+
+class TestSajuStats:
+    """命式集計のテストクラス"""
+
+    def test_distributions(self, headers):
+        """日干・五行・吉凶レベルの分布（0件の値も定義域の順に含む）"""
+        response = client.get("/api/saju/stats?as_of=2026-10-19", headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 4 and data["asOf"] == "2026-10-19"
+        day_stems = {item["value"]: item["count"] for item in data["dayStem"]}
+        assert [item["value"] for item in data["dayStem"]][:3] == ["甲", "乙", "丙"]
+        assert (day_stems["甲"], day_stems["乙"], day_stems["丙"], day_stems["丁"]) == (2, 1, 1, 0)
+        assert data["dayElement"][:3] == [
+            {"value": "wood", "count": 3},
+            {"value": "fire", "count": 1},
+            {"value": "earth", "count": 0},
+        ]
+        assert data["fortuneLevel"][0] == {"value": "大吉", "count": 2}
+        assert sum(item["count"] for item in data["currentDaeunLevel"]) == 0
+
+    def test_current_daeun_level(self, headers):
+        """現在の大運の吉凶レベルは基準日時点の年齢で決まる"""
+        daeun_list = [
+            {
+                "startAge": 26,
+                "endAge": 35,
+                "daeunStem": "甲",
+                "daeunBranch": "申",
+                "fortuneLevel": "凶",
+            },
+            {
+                "startAge": 36,
+                "endAge": 45,
+                "daeunStem": "乙",
+                "daeunBranch": "酉",
+                "fortuneLevel": "吉",
+            },
+        ]
+        db = SessionLocal()
+        try:
+            user_ids = db.query(User.id).filter(User.email == EMAIL)
+            db.query(Saju).filter(Saju.user_id.in_(user_ids)).update(
+                {Saju.daeun_list: json.dumps(daeun_list, ensure_ascii=False)},
+                synchronize_session=False,
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        data = client.get("/api/saju/stats?as_of=2026-10-19", headers=headers).json()
+        levels = {item["value"]: item["count"] for item in data["currentDaeunLevel"]}
+        # 36歳は1990-03-15生まれのみ（1990-12-31生まれはまだ35歳）
+        assert (levels["吉"], levels["凶"]) == (1, 3)
+
+    def test_cache_invalidated_on_delete(self, headers):
+        """キャッシュは命式の削除で破棄される"""
+        assert client.get("/api/saju/stats", headers=headers).json()["total"] == 4
+        saju_id = _search(headers, "dayPillar=丙寅")["items"][0]["id"]
+        assert client.delete(f"/api/saju/{saju_id}", headers=headers).status_code == 200
+        data = client.get("/api/saju/stats", headers=headers).json()
+        assert data["total"] == 3
+        assert {item["value"]: item["count"] for item in data["dayElement"]}["fire"] == 0
@@ -0,0 +1,73 @@
+"""
+十神計算エンジンのテスト
+"""
+import pytest
+
+from app.services.fortune_service import FortuneCalculator
+from app.services.sipsin import (
+    HIDDEN_STEMS,
+    SIPSIN,
+    SIPSIN_FLAT,
+    branch_sipsin,
+    branch_sipsin_all,
+    branch_sipsin_of,
+    sipsin_of,
+    stem_sipsin,
+)
+
+
+class TestSipsin:
+    """十神エンジンのテストクラス"""
+
+    def test_table_shape(self):
+        """10×10表が事前計算されている"""
+        assert len(SIPSIN_FLAT) == 100
+        assert SIPSIN.shape == (10, 10)
+
+    @pytest.mark.parametrize(
+        "day_stem,target_stem,expected",
+        [
+            ("甲", "甲", "比肩"),
+            ("甲", "乙", "劫財"),
+            ("甲", "丙", "食神"),
+            ("甲", "丁", "傷官"),
+            ("甲", "戊", "偏財"),
+            ("甲", "己", "正財"),
+            ("甲", "庚", "偏官"),
+            ("甲", "辛", "正官"),
+            ("甲", "壬", "偏印"),
+            ("甲", "癸", "印綬"),
+            ("辛", "丙", "正官"),
+            ("癸", "戊", "正官"),
+            ("丁", "甲", "印綬"),
+        ],
+    )
+    def test_stem_sipsin(self, day_stem, target_stem, expected):
+        """天干の十神（五行＋陰陽）"""
+        assert sipsin_of(day_stem, target_stem) == expected
+
+    def test_each_row_has_all_ten(self):
+        """各日干の行に10種の十神が1つずつ現れる"""
+        for day_stem in range(10):
+            assert len({stem_sipsin(day_stem, t) for t in range(10)}) == 10
+
+    def test_branch_sipsin(self):
+        """地支の十神は蔵干の本気で判定"""
+        assert branch_sipsin_of("甲", "子") == "印綬"  # 子の本気は癸
+        assert branch_sipsin_of("甲", "寅") == "比肩"  # 寅の本気は甲
+        assert branch_sipsin(0, 1) == "正財"  # 丑の本気は己
+        assert branch_sipsin_all(0, 1) == ("正財", "印綬", "正官")  # 己・癸・辛
+        assert all(len(stems) >= 1 for stems in HIDDEN_STEMS)
+
+    def test_invalid(self):
+        """不正な天干はValueError"""
+        with pytest.raises(ValueError):
+            sipsin_of("甲", "X")
+
+    def test_fortune_calculator_lists_use_engine(self):
+        """年月日運リストの十神がエンジンの値と一致する"""
+        calculator = FortuneCalculator()
+        for row in calculator.calculate_day_list("甲", 2025, 1):
+            assert row["sipsin"] == sipsin_of("甲", row["dayStem"])
+        for row in calculator.calculate_month_list("庚", 2025):
+            assert row["sipsin"] == sipsin_of("庚", row["monthStem"])
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+境界テストコーパス生成（1900〜2109年）
+四柱が切り替わる境界の前後に密集したテスト日時を作り、列指向のNumPy .npzに保存する
+
+境界の種類（kind列）:
+- 0 JIEQI: 節入時刻の前後（節気DBの時刻をKSTに変換したものと、lunar-pythonの時刻の両方）
+- 1 ZI_START: 子時の始まり（23:00）の前後
+- 2 MIDNIGHT: 日付の変わり目（00:00）の前後
+- 3 HOUR: その他の時支の境界（奇数時00分、--all-hours指定時のみ）
+
+列:
+- instant: KST壁時計の日時（datetime64[s]）
+- kind: 境界の種類（uint8）
+- offset: 境界からの秒数（int32、負は境界より前）
+- term: 節の番号（立春=0〜小寒=11、節入り以外は-1）
+- source: 境界時刻の出典（0=節気DB/暦、1=lunar-python）
+
+使い方:
+    python boundary_corpus_generator.py --out boundary_corpus.npz
+    python boundary_corpus_generator.py --years 1980-2020 --jieqi-window 60 --day-window 5 \
+        --all-hours
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# backendへのパス追加はsrc.manseryeok.matrixが行う
+from src.manseryeok.matrix import JEOL_MONTHS, load_jieqi_index  # noqa: E402
+
+DB_PATH = os.path.join(ROOT_DIR, 'solar_terms_1900_2109_JIEQI_ONLY.json')
+
+JIEQI, ZI_START, MIDNIGHT, HOUR = 0, 1, 2, 3
+SOURCE_DB, SOURCE_LUNAR = 0, 1
+
+# 節名 → 節の番号（立春=0〜小寒=11）
+TERM_NUMBER: Dict[str, int] = {name: i for i, name in enumerate(JEOL_MONTHS)}
+
+# lunar-pythonの節名（簡体字）→ 節名
+_LUNAR_JEOL_NAMES = {
+    '立春': '立春', '惊蛰': '驚蟄', '清明': '清明', '立夏': '立夏', '芒种': '芒種', '小暑': '小暑',
+    '立秋': '立秋', '白露': '白露', '寒露': '寒露', '立冬': '立冬', '大雪': '大雪', '小寒': '小寒',
+}
+
+COLUMNS = ('instant', 'kind', 'offset', 'term', 'source')
+
+
+def lunar_jeol_instants(year: int) -> List[tuple]:
+    """
+    lunar-pythonが計算する指定年の12節の節入時刻
+
+    Returns:
+        [(節名, 節入時刻（lunar-pythonの壁時計、naive）), ...]
+    """
+    from lunar_python import Solar
+
+    table = Solar.fromYmd(year, 6, 1).getLunar().getJieQiTable()
+    result = []
+    for name, solar in table.items():
+        if name in _LUNAR_JEOL_NAMES and solar.getYear() == year:
+            result.append(
+                (
+                    _LUNAR_JEOL_NAMES[name],
+                    datetime(
+                        solar.getYear(), solar.getMonth(), solar.getDay(),
+                        solar.getHour(), solar.getMinute(), solar.getSecond(),
+                    ),
+                )
+            )
+    return result
+
+
+def db_jeol_instants(years: range, db_path: str = DB_PATH) -> List[tuple]:
+    """節気DBの節入時刻（KST壁時計、naive）"""
+    from app.services.saju_calculator import BEIJING, KST
+
+    index = load_jieqi_index(db_path, BEIJING)
+    result = []
+    for name, instant in zip(index.names, index.instants):
+        kst = instant.astimezone(KST).replace(tzinfo=None)
+        if kst.year in years:
+            result.append((name, kst))
+    return result
+
+
+def _around(centers: np.ndarray, window: int, step: int) -> tuple:
+    """各境界の前後window秒をstep秒刻みで展開（境界ちょうどと前後1秒は必ず含める）"""
+    offsets = np.union1d(np.arange(-window, window + 1, step), [-1, 0, 1]).astype(np.int32)
+    instants = centers[:, None] + offsets[None, :].astype('timedelta64[s]')
+    return instants.ravel(), np.broadcast_to(offsets, instants.shape).ravel()
+
+
+def generate(
+    years: range,
+    jieqi_window: int = 30,
+    jieqi_step: int = 60,
+    day_window: int = 2,
+    day_step: int = 60,
+    all_hours: bool = False,
+    db_path: str = DB_PATH,
+) -> Dict[str, np.ndarray]:
+    """
+    境界コーパスを生成
+
+    Args:
+        years: 対象年
+        jieqi_window: 節入時刻の前後（分）
+        jieqi_step: 節入時刻まわりの刻み（秒）
+        day_window: 23:00・00:00（・奇数時）の前後（分）
+        day_step: 日・時の境界まわりの刻み（秒）
+        all_hours: 全ての時支の境界（奇数時00分）を含めるか
+        db_path: 節気DBのパス
+
+    Returns:
+        列名 → 配列
+    """
+    parts = []
+
+    # 節入り（節気DBとlunar-pythonの両方）
+    jeol = [(name, dt, SOURCE_DB) for name, dt in db_jeol_instants(years, db_path)]
+    for year in years:
+        jeol += [(name, dt, SOURCE_LUNAR) for name, dt in lunar_jeol_instants(year)]
+    if jeol:
+        centers = np.array([dt for _, dt, _ in jeol], dtype='datetime64[s]')
+        instants, offsets = _around(centers, jieqi_window * 60, jieqi_step)
+        per = len(offsets) // len(jeol)
+        parts.append(
+            {
+                'instant': instants,
+                'kind': np.full(len(instants), JIEQI, dtype=np.uint8),
+                'offset': offsets,
+                'term': np.repeat(
+                    np.array([TERM_NUMBER[name] for name, _, _ in jeol], dtype=np.int8), per
+                ),
+                'source': np.repeat(
+                    np.array([source for _, _, source in jeol], dtype=np.uint8), per
+                ),
+            }
+        )
+
+    # 日・時の境界
+    days = np.arange(
+        np.datetime64(f'{years.start}-01-01', 'D'), np.datetime64(f'{years.stop}-01-01', 'D')
+    ).astype('datetime64[s]')
+    hours = {ZI_START: [23], MIDNIGHT: [0]}
+    if all_hours:
+        hours[HOUR] = [1, 3, 5, 7, 9, 11, 13, 15, 17, 19, 21]
+    for kind, hour_list in hours.items():
+        for hour in hour_list:
+            instants, offsets = _around(days + np.timedelta64(hour, 'h'), day_window * 60, day_step)
+            parts.append(
+                {
+                    'instant': instants,
+                    'kind': np.full(len(instants), kind, dtype=np.uint8),
+                    'offset': offsets,
+                    'term': np.full(len(instants), -1, dtype=np.int8),
+                    'source': np.full(len(instants), SOURCE_DB, dtype=np.uint8),
+                }
+            )
+
+    corpus = {column: np.concatenate([part[column] for part in parts]) for column in COLUMNS}
+    # 対象年からはみ出した前後の日時は除く（1900年より前は計算エンジンが受け付けない）
+    instant_years = corpus['instant'].astype('datetime64[Y]').astype(np.int64) + 1970
+    keep = (instant_years >= years.start) & (instant_years < years.stop)
+    order = np.argsort(corpus['instant'][keep], kind='stable')
+    return {column: values[keep][order] for column, values in corpus.items()}
+
+
+def save_corpus(path: str, corpus: Dict[str, np.ndarray], compress: bool = False):
+    """コーパスを.npzに保存（非圧縮ならmmap無しでも数十ミリ秒で読める）"""
+    (np.savez_compressed if compress else np.savez)(path, **corpus)
+
+
+def load_corpus(path: str) -> Dict[str, np.ndarray]:
+    """
+    .npzのコーパスを読み込み
+
+    Returns:
+        列名 → 配列
+    """
+    with np.load(path) as data:
+        return {column: data[column] for column in COLUMNS}
+
+
+def parse_years(text: str) -> range:
+    start, _, end = text.partition('-')
+    return range(int(start), int(end or start) + 1)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='境界テストコーパス生成')
+    parser.add_argument('--years', default='1900-2109', help='対象年（例: 1900-2109, 1986）')
+    parser.add_argument('--jieqi-window', type=int, default=30, help='節入時刻の前後（分）')
+    parser.add_argument('--jieqi-step', type=int, default=60, help='節入時刻まわりの刻み（秒）')
+    parser.add_argument('--day-window', type=int, default=2, help='日・時の境界の前後（分）')
+    parser.add_argument('--day-step', type=int, default=60, help='日・時の境界まわりの刻み（秒）')
+    parser.add_argument('--all-hours', action='store_true', help='全ての時支の境界を含める')
+    parser.add_argument('--compress', action='store_true', help='圧縮して保存')
+    parser.add_argument('--out', default='boundary_corpus.npz')
+    args = parser.parse_args(argv)
+
+    years = parse_years(args.years)
+    started = time.time()
+    corpus = generate(
+        years,
+        jieqi_window=args.jieqi_window,
+        jieqi_step=args.jieqi_step,
+        day_window=args.day_window,
+        day_step=args.day_step,
+        all_hours=args.all_hours,
+    )
+    save_corpus(args.out, corpus, compress=args.compress)
+
+    counts = np.bincount(corpus['kind'], minlength=4)
+    print(f'✅ {len(corpus["instant"]):,}件を{time.time() - started:.1f}秒で生成 → {args.out}')
+    print(
+        f'  節入り {counts[JIEQI]:,} / 子時 {counts[ZI_START]:,} / '
+        f'0時 {counts[MIDNIGHT]:,} / 時支 {counts[HOUR]:,}'
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
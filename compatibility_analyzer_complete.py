@@ -11,59 +11,19 @@ import re
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.manseryeok.calculator import ManseryeokCalculator
+from src.manseryeok.matrix import (  # noqa: E402
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    JOHOO_FLAT,
+    TENGAN_FLAT,
+    Ganzhi,
+    as_dict,
+    score_pair,
+)
 from accurate_daeun_calculator import AccurateDaeunCalculator
 
-# 調候表（月支別の吉凶判定）
-JOHU_TABLE = {
-    '寅': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '中吉', '午': '大吉', '未': '中吉',
-           '申': '大凶', '酉': '大凶', '戌': '大凶',
-           '亥': '大凶', '子': '大凶', '丑': '大凶'},
-    '卯': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '大吉', '午': '大吉', '未': '大吉',
-           '申': '凶', '酉': '凶', '戌': '凶',
-           '亥': '凶', '子': '凶', '丑': '凶'},
-    '辰': {'寅': '吉', '卯': '吉', '辰': '吉',
-           '巳': '吉', '午': '吉', '未': '吉',
-           '申': '吉', '酉': '吉', '戌': '凶',
-           '亥': '凶', '子': '凶', '丑': '凶'},
-    '巳': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '凶', '午': '凶', '未': '凶',
-           '申': '小吉', '酉': '小吉', '戌': '小吉',
-           '亥': '吉', '子': '吉', '丑': '吉'},
-    '午': {'寅': '中吉', '卯': '小吉', '辰': '小吉',
-           '巳': '凶', '午': '凶', '未': '凶',
-           '申': '吉', '酉': '吉', '戌': '吉',
-           '亥': '大吉', '子': '大吉', '丑': '大吉'},
-    '未': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '凶', '午': '凶', '未': '凶',
-           '申': '小吉', '酉': '小吉', '戌': '凶',
-           '亥': '大吉', '子': '大吉', '丑': '吉'},
-    '申': {'寅': '吉', '卯': '吉', '辰': '吉',
-           '巳': '大吉', '午': '大吉', '未': '大吉',
-           '申': '凶', '酉': '凶', '戌': '吉',
-           '亥': '凶', '子': '凶', '丑': '凶'},
-    '酉': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '大吉', '午': '大吉', '未': '大吉',
-           '申': '凶', '酉': '凶', '戌': '凶',
-           '亥': '凶', '子': '凶', '丑': '凶'},
-    '戌': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '吉', '午': '吉', '未': '吉',
-           '申': '小吉', '酉': '小吉', '戌': '小吉',
-           '亥': '凶', '子': '凶', '丑': '凶'},
-    '亥': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '大吉', '午': '大吉', '未': '大吉',
-           '申': '凶', '酉': '凶', '戌': '中吉',
-           '亥': '中大凶', '子': '中大凶', '丑': '中大凶'},
-    '子': {'寅': '小吉', '卯': '小吉', '辰': '小吉',
-           '巳': '大吉', '午': '大吉', '未': '大吉',
-           '申': '凶', '酉': '凶', '戌': '大吉',
-           '亥': '中大凶', '子': '中大凶', '丑': '中大凶'},
-    '丑': {'寅': '吉', '卯': '吉', '辰': '吉',
-           '巳': '大吉', '午': '大吉', '未': '大吉',
-           '申': '凶', '酉': '凶', '戌': '吉',
-           '亥': '中大吉', '子': '中大吉', '丑': '凶'}
-}
+# 調候表（月支別の吉凶判定、src/manseryeok/matrix.py の共有マトリックス）
+JOHU_TABLE = as_dict(JOHOO_FLAT, EARTHLY_BRANCHES)
 
 # 調候の吉凶を点数に変換
 JOHU_SCORES = {
@@ -78,130 +38,137 @@ JOHU_SCORES = {
     '大凶': 5
 }
 
-# 天干マトリックス完全ハードコーディング
-CHEONGAN_MATRIX = {
+# 天干関係の解説（吉凶レベルは共有マトリックスから付与）
+CHEONGAN_NOTES = {
     '甲': {
-        '甲': ('平', '原局で一緒にある時は凶'),
-        '乙': ('凶', '乙が甲を乗っ取る'),
-        '丙': ('吉', '副名になる'),
-        '丁': ('吉凶', '季節による'),
-        '戊': ('吉', '貴名'),
-        '己': ('大凶', '甲己合。木を倒す'),
-        '庚': ('大凶', '甲庚冲。木を割る'),
-        '辛': ('凶', '礼儀正しくなるが神経質に'),
-        '壬': ('凶', '病置例'),
-        '癸': ('吉凶', '水生木、木を強くする')
+        '甲': '原局で一緒にある時は凶',
+        '乙': '乙が甲を乗っ取る',
+        '丙': '副名になる',
+        '丁': '季節による',
+        '戊': '貴名',
+        '己': '甲己合。木を倒す',
+        '庚': '甲庚冲。木を割る',
+        '辛': '礼儀正しくなるが神経質に',
+        '壬': '病置例',
+        '癸': '水生木、木を強くする'
     },
     '乙': {
-        '甲': ('吉', '同僚制感 - 甲木に乗って上昇'),
-        '乙': ('平', '原局で一緒にある時は凶'),
-        '丙': ('大吉', '花が太陽に会って貴くなる'),
-        '丁': ('吉凶', '季節による'),
-        '戊': ('吉', '風を防いで富になる'),
-        '己': ('吉', '野原に花が咲く'),
-        '庚': ('大凶', '乙庚合。花が死ぬ'),
-        '辛': ('凶', 'ハサミで花を切る'),
-        '壬': ('凶', '水をやって花を育てる'),
-        '癸': ('吉凶', '露を与えてより美しい花に')
+        '甲': '同僚制感 - 甲木に乗って上昇',
+        '乙': '原局で一緒にある時は凶',
+        '丙': '花が太陽に会って貴くなる',
+        '丁': '季節による',
+        '戊': '風を防いで富になる',
+        '己': '野原に花が咲く',
+        '庚': '乙庚合。花が死ぬ',
+        '辛': 'ハサミで花を切る',
+        '壬': '水をやって花を育てる',
+        '癸': '露を与えてより美しい花に'
     },
     '丙': {
-        '甲': ('吉', '合一が生じる - 木を育てる'),
-        '乙': ('吉', '合一が生じる - 花を育てる'),
-        '丙': ('平', '原局で一緒にある時は凶'),
-        '丁': ('凶', '火、夏は勝ち秋冬は負ける'),
-        '戊': ('無', '感嘆があって価値がある'),
-        '己': ('無', '太陽で乙を育てるので価値が少ない'),
-        '庚': ('凶', '丙庚合。太陽が鉄で消える'),
-        '辛': ('大凶', '丙辛合。光が無意味になる'),
-        '壬': ('吉', '解決者の役割'),
-        '癸': ('吉凶', '季節による')
+        '甲': '合一が生じる - 木を育てる',
+        '乙': '合一が生じる - 花を育てる',
+        '丙': '原局で一緒にある時は凶',
+        '丁': '火、夏は勝ち秋冬は負ける',
+        '戊': '感嘆があって価値がある',
+        '己': '太陽で乙を育てるので価値が少ない',
+        '庚': '丙庚合。太陽が鉄で消える',
+        '辛': '丙辛合。光が無意味になる',
+        '壬': '解決者の役割',
+        '癸': '季節による'
     },
     '丁': {
-        '甲': ('吉', 'ランプが木を照らす'),
-        '乙': ('吉', '花とランプの調和'),
-        '丙': ('凶', '太陽にランプは無意味'),
-        '丁': ('平', '原局で一緒にある時は凶'),
-        '戊': ('吉', '火生土'),
-        '己': ('吉', '火生土'),
-        '庚': ('吉', '丁火が金を鍛錬'),
-        '辛': ('吉', '宝石を作る'),
-        '壬': ('凶', '水が火を消す'),
-        '癸': ('凶', '露がランプを消す')
+        '甲': 'ランプが木を照らす',
+        '乙': '花とランプの調和',
+        '丙': '太陽にランプは無意味',
+        '丁': '原局で一緒にある時は凶',
+        '戊': '火生土',
+        '己': '火生土',
+        '庚': '丁火が金を鍛錬',
+        '辛': '宝石を作る',
+        '壬': '水が火を消す',
+        '癸': '露がランプを消す'
     },
     '戊': {
-        '甲': ('大吉', '山に木が育ち名山になる。富名'),
-        '乙': ('小吉', '大きな山が苗木に会い小山に'),
-        '丙': ('吉', '火生土、強くしてくれる'),
-        '丁': ('吉凶', '強くする。木と一緒にいると駄目'),
-        '戊': ('平', '原局で一緒にある時は凶'),
-        '己': ('凶', '山が地に降りた。格が下がる'),
-        '庚': ('凶', '土生金で力が抜ける'),
-        '辛': ('凶', '甲木は弱く、乙木は壊れる'),
-        '壬': ('平', 'ダムのように山が川を止める'),
-        '癸': ('大凶', '戊癸合。丙火を消して良くない')
+        '甲': '山に木が育ち名山になる。富名',
+        '乙': '大きな山が苗木に会い小山に',
+        '丙': '火生土、強くしてくれる',
+        '丁': '強くする。木と一緒にいると駄目',
+        '戊': '原局で一緒にある時は凶',
+        '己': '山が地に降りた。格が下がる',
+        '庚': '土生金で力が抜ける',
+        '辛': '甲木は弱く、乙木は壊れる',
+        '壬': 'ダムのように山が川を止める',
+        '癸': '戊癸合。丙火を消して良くない'
     },
     '己': {
-        '甲': ('凶', '甲己合。欲張りになる'),
-        '乙': ('吉', '野原に花を咲かせる'),
-        '丙': ('吉', '乙が来れば収穫物が生じる'),
-        '丁': ('吉', '火生土。秋冬には必要'),
-        '戊': ('凶', 'いつでも奪われる危険'),
-        '己': ('平', '原局で一緒にある時は凶'),
-        '庚': ('凶', '甲木が雹に打たれる'),
-        '辛': ('凶', '甲木が雹に打たれる'),
-        '壬': ('凶', '水浸しになる'),
-        '癸': ('平', '堤防、堤のようだ')
+        '甲': '甲己合。欲張りになる',
+        '乙': '野原に花を咲かせる',
+        '丙': '乙が来れば収穫物が生じる',
+        '丁': '火生土。秋冬には必要',
+        '戊': 'いつでも奪われる危険',
+        '己': '原局で一緒にある時は凶',
+        '庚': '甲木が雹に打たれる',
+        '辛': '甲木が雹に打たれる',
+        '壬': '水浸しになる',
+        '癸': '堤防、堤のようだ'
     },
     '庚': {
-        '甲': ('吉', '丁火と一緒なら大吉'),
-        '乙': ('凶', '乙庚合。お互い疲れる'),
-        '丙': ('吉', '冷たい金の性向が温かくなる'),
-        '丁': ('吉', '道具になって用途が良くなる'),
-        '戊': ('吉', '土生金で力が強くなる、やや鈍感'),
-        '己': ('吉', '土生金で力が強くなる'),
-        '庚': ('平', '原局で一緒にある時は凶'),
-        '辛': ('凶', '私のものを分けて食べるので良くない'),
-        '壬': ('吉', '水を作り出す'),
-        '癸': ('吉凶', '水を作るが錆びる')
+        '甲': '丁火と一緒なら大吉',
+        '乙': '乙庚合。お互い疲れる',
+        '丙': '冷たい金の性向が温かくなる',
+        '丁': '道具になって用途が良くなる',
+        '戊': '土生金で力が強くなる、やや鈍感',
+        '己': '土生金で力が強くなる',
+        '庚': '原局で一緒にある時は凶',
+        '辛': '私のものを分けて食べるので良くない',
+        '壬': '水を作り出す',
+        '癸': '水を作るが錆びる'
     },
     '辛': {
-        '甲': ('凶', '宝石が木に埋もれる'),
-        '乙': ('吉', '宝石が花を飾る'),
-        '丙': ('大吉', '丙辛合。宝石が輝く'),
-        '丁': ('吉', '丁火が宝石を鍛錬'),
-        '戊': ('凶', '宝石が土に埋もれる'),
-        '己': ('凶', '宝石が汚れる'),
-        '庚': ('凶', '大きな金が小さな金を圧倒'),
-        '辛': ('平', '原局で一緒にある時は凶'),
-        '壬': ('吉', '金生水'),
-        '癸': ('吉', '金生水')
+        '甲': '宝石が木に埋もれる',
+        '乙': '宝石が花を飾る',
+        '丙': '丙辛合。宝石が輝く',
+        '丁': '丁火が宝石を鍛錬',
+        '戊': '宝石が土に埋もれる',
+        '己': '宝石が汚れる',
+        '庚': '大きな金が小さな金を圧倒',
+        '辛': '原局で一緒にある時は凶',
+        '壬': '金生水',
+        '癸': '金生水'
     },
     '壬': {
-        '甲': ('吉', '水生木'),
-        '乙': ('吉', '水生木'),
-        '丙': ('凶', '水克火'),
-        '丁': ('凶', '水克火'),
-        '戊': ('平', '土克水だがダムの役割'),
-        '己': ('凶', '土克水'),
-        '庚': ('吉', '金生水'),
-        '辛': ('吉', '金生水'),
-        '壬': ('平', '原局で一緒にある時は凶'),
-        '癸': ('凶', '大きな水が小さな水を吸収')
+        '甲': '水生木',
+        '乙': '水生木',
+        '丙': '水克火',
+        '丁': '水克火',
+        '戊': '土克水だがダムの役割',
+        '己': '土克水',
+        '庚': '金生水',
+        '辛': '金生水',
+        '壬': '原局で一緒にある時は凶',
+        '癸': '大きな水が小さな水を吸収'
     },
     '癸': {
-        '甲': ('吉', '水生木'),
-        '乙': ('吉', '水生木'),
-        '丙': ('吉凶', '季節による'),
-        '丁': ('凶', '露がランプを消す'),
-        '戊': ('大凶', '戊癸合'),
-        '己': ('平', '己土が癸水を止める'),
-        '庚': ('吉', '金生水'),
-        '辛': ('吉', '金生水'),
-        '壬': ('凶', '小さな水が大きな水に吸収'),
-        '癸': ('平', '原局で一緒にある時は凶')
+        '甲': '水生木',
+        '乙': '水生木',
+        '丙': '季節による',
+        '丁': '露がランプを消す',
+        '戊': '戊癸合',
+        '己': '己土が癸水を止める',
+        '庚': '金生水',
+        '辛': '金生水',
+        '壬': '小さな水が大きな水に吸収',
+        '癸': '原局で一緒にある時は凶'
     }
 }
 
+# 天干マトリックス（吉凶レベル: src/manseryeok/matrix.py の共有マトリックス、解説: CHEONGAN_NOTES）
+_TENGAN_LEVELS = as_dict(TENGAN_FLAT, HEAVENLY_STEMS)
+CHEONGAN_MATRIX = {
+    stem: {target: (_TENGAN_LEVELS[stem][target], note) for target, note in notes.items()}
+    for stem, notes in CHEONGAN_NOTES.items()
+}
+
 def parse_input_flexible(input_str):
     """柔軟な入力解析"""
     input_str = input_str.replace('　', ' ').replace('，', ',').replace('、', ',')
@@ -363,6 +330,15 @@ def evaluate_daeun_for_person(person_saju, current_daeun):
         'johu_rating': johu_rating if month_branch in JOHU_TABLE and daeun_branch in JOHU_TABLE[month_branch] else '平'
     }
 
+_daeun_calculator = None
+
+def _get_daeun_calculator():
+    """起運年齢計算機を取得（節入日DBの索引を共有し、計算過程のprintは省略）"""
+    global _daeun_calculator
+    if _daeun_calculator is None:
+        _daeun_calculator = AccurateDaeunCalculator(quiet=True)
+    return _daeun_calculator
+
 def calculate_daeun(saju, gender, birth_date):
     """詳細大運計算 - 正確な節入日データベースを使用"""
     stems = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
@@ -393,12 +369,13 @@ def calculate_daeun(saju, gender, birth_date):
         else:
             birth_date_kst = birth_date.astimezone(KST)
             
-        accurate_calc = AccurateDaeunCalculator()
-        starting_age = accurate_calc.calculate_starting_age(
+        starting_age = _get_daeun_calculator().calculate_starting_age(
             birth_date_kst, 
             gender, 
             saju.year_stem
         )
+        if isinstance(starting_age, dict):
+            starting_age = starting_age['starting_age']
         print(f"📌 正確な起運年齢計算完了: {starting_age}歳（{direction_str}）")
     except Exception as e:
         # データベースエラーの場合は簡易計算にフォールバック
@@ -437,106 +414,19 @@ def calculate_daeun(saju, gender, birth_date):
         'list': daeun_list
     }
 
+def _compat_features(saju, current_daeun):
+    """相性エンジン用の (日柱, 月柱, 時柱, 大運) を作成"""
+    daeun = (
+        Ganzhi.from_chars(current_daeun['stem'], current_daeun['branch']) if current_daeun else None
+    )
+    return (saju.day_pillar, saju.month_pillar, saju.hour_pillar, daeun)
+
 def calculate_score(male_saju, female_saju, male_current_daeun=None, female_current_daeun=None):
-    """詳細スコア計算"""
-    score_male = 50
-    score_female = 50
-    details_male = []
-    details_female = []
-    
-    # 日干関係（最重要 - 30点）
-    male_day_rel = analyze_cheongan_relation(male_saju.day_stem, female_saju.day_stem)
-    female_day_rel = analyze_cheongan_relation(female_saju.day_stem, male_saju.day_stem)
-    
-    if '大吉' in male_day_rel[0]:
-        score_male += 40
-        details_male.append("日干：大吉 +40")
-    elif '吉' in male_day_rel[0]:
-        score_male += 30
-        details_male.append("日干：吉 +30")
-    elif '大凶' in male_day_rel[0]:
-        score_male -= 30
-        details_male.append("日干：大凶 -30")
-    elif '凶' in male_day_rel[0]:
-        score_male -= 20
-        details_male.append("日干：凶 -20")
-    
-    if '大吉' in female_day_rel[0]:
-        score_female += 40
-        details_female.append("日干：大吉 +40")
-    elif '吉' in female_day_rel[0]:
-        score_female += 30
-        details_female.append("日干：吉 +30")
-    elif '大凶' in female_day_rel[0]:
-        score_female -= 30
-        details_female.append("日干：大凶 -30")
-    elif '凶' in female_day_rel[0]:
-        score_female -= 20
-        details_female.append("日干：凶 -20")
-    
-    # 月干関係（15点）
-    male_month_rel = analyze_cheongan_relation(male_saju.month_stem, female_saju.month_stem)
-    female_month_rel = analyze_cheongan_relation(female_saju.month_stem, male_saju.month_stem)
-    
-    if '吉' in male_month_rel[0]:
-        score_male += 15
-        details_male.append("月干：吉 +15")
-    elif '凶' in male_month_rel[0]:
-        score_male -= 10
-        details_male.append("月干：凶 -10")
-        
-    if '吉' in female_month_rel[0]:
-        score_female += 15
-        details_female.append("月干：吉 +15")
-    elif '凶' in female_month_rel[0]:
-        score_female -= 10
-        details_female.append("月干：凶 -10")
-    
-    # 時干関係（10点）
-    male_hour_rel = analyze_cheongan_relation(male_saju.hour_stem, female_saju.hour_stem)
-    female_hour_rel = analyze_cheongan_relation(female_saju.hour_stem, male_saju.hour_stem)
-    
-    if '吉' in male_hour_rel[0]:
-        score_male += 10
-        details_male.append("時干：吉 +10")
-    elif '凶' in male_hour_rel[0]:
-        score_male -= 5
-        details_male.append("時干：凶 -5")
-        
-    if '吉' in female_hour_rel[0]:
-        score_female += 10
-        details_female.append("時干：吉 +10")
-    elif '凶' in female_hour_rel[0]:
-        score_female -= 5
-        details_female.append("時干：凶 -5")
-    
-    # 季節相性（15点）
-    male_season = get_season_from_branch(male_saju.month_branch)
-    female_season = get_season_from_branch(female_saju.month_branch)
-    
-    opposite_seasons = {'春': '秋', '夏': '冬', '秋': '春', '冬': '夏'}
-    if male_season == opposite_seasons.get(female_season):
-        score_male += 15
-        score_female += 15
-        details_male.append("季節：反対 +15")
-        details_female.append("季節：反対 +15")
-    elif male_season == female_season:
-        score_male -= 5
-        score_female -= 5
-        details_male.append("季節：同じ -5")
-        details_female.append("季節：同じ -5")
-    
-    # 大運と日柱の一致ボーナス
-    if male_current_daeun and female_current_daeun:
-        if f"{male_current_daeun['stem']}{male_current_daeun['branch']}" == f"{female_saju.day_stem}{female_saju.day_branch}":
-            score_male += 5
-            details_male.append("大運ボーナス +5")
-        
-        if f"{female_current_daeun['stem']}{female_current_daeun['branch']}" == f"{male_saju.day_stem}{male_saju.day_branch}":
-            score_female += 5
-            details_female.append("大運ボーナス +5")
-    
-    return score_male, score_female, details_male, details_female
+    """詳細スコア計算（採点は backend の相性エンジンと共通）"""
+    return score_pair(
+        _compat_features(male_saju, male_current_daeun),
+        _compat_features(female_saju, female_current_daeun),
+    )
 
 def main():
     print("="*60)
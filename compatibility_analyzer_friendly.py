@@ -11,131 +11,139 @@ import re
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.manseryeok.calculator import ManseryeokCalculator
+from src.manseryeok.matrix import HEAVENLY_STEMS, TENGAN_FLAT, as_dict  # noqa: E402
 
-# 天干マトリックス完全ハードコーディング
-CHEONGAN_MATRIX = {
+# 天干関係の解説（吉凶レベルは共有マトリックスから付与）
+CHEONGAN_NOTES = {
     '甲': {  # 甲木日干 → 他の天干
-        '甲': ('平', '原局で一緒にある時は凶'),
-        '乙': ('凶', '乙が甲を乗っ取る'),
-        '丙': ('吉', '副名になる'),
-        '丁': ('吉凶', '季節による'),
-        '戊': ('吉', '貴名'),
-        '己': ('大凶', '甲己合。木を倒す'),
-        '庚': ('大凶', '甲庚冲。木を割る'),
-        '辛': ('凶', '礼儀正しくなるが神経質に'),
-        '壬': ('凶', '病置例'),
-        '癸': ('吉凶', '水生木、木を強くする')
+        '甲': '原局で一緒にある時は凶',
+        '乙': '乙が甲を乗っ取る',
+        '丙': '副名になる',
+        '丁': '季節による',
+        '戊': '貴名',
+        '己': '甲己合。木を倒す',
+        '庚': '甲庚冲。木を割る',
+        '辛': '礼儀正しくなるが神経質に',
+        '壬': '病置例',
+        '癸': '水生木、木を強くする'
     },
     '乙': {  # 乙木日干 → 他の天干
-        '甲': ('吉', '同僚制感 - 甲木に乗って上昇'),
-        '乙': ('平', '原局で一緒にある時は凶'),
-        '丙': ('大吉', '花が太陽に会って貴くなる'),
-        '丁': ('吉凶', '季節による'),
-        '戊': ('吉', '風を防いで富になる'),
-        '己': ('吉', '野原に花が咲く'),
-        '庚': ('大凶', '乙庚合。花が死ぬ'),
-        '辛': ('凶', 'ハサミで花を切る'),
-        '壬': ('凶', '水をやって花を育てる'),
-        '癸': ('吉凶', '露を与えてより美しい花に')
+        '甲': '同僚制感 - 甲木に乗って上昇',
+        '乙': '原局で一緒にある時は凶',
+        '丙': '花が太陽に会って貴くなる',
+        '丁': '季節による',
+        '戊': '風を防いで富になる',
+        '己': '野原に花が咲く',
+        '庚': '乙庚合。花が死ぬ',
+        '辛': 'ハサミで花を切る',
+        '壬': '水をやって花を育てる',
+        '癸': '露を与えてより美しい花に'
     },
     '丙': {  # 丙火日干 → 他の天干
-        '甲': ('吉', '合一が生じる - 木を育てる'),
-        '乙': ('吉', '合一が生じる - 花を育てる'),
-        '丙': ('平', '原局で一緒にある時は凶'),
-        '丁': ('凶', '火、夏は勝ち秋冬は負ける'),
-        '戊': ('無', '感嘆があって価値がある'),
-        '己': ('無', '太陽で乙を育てるので価値が少ない'),
-        '庚': ('凶', '丙庚合。太陽が鉄で消える'),
-        '辛': ('大凶', '丙辛合。光が無意味になる'),
-        '壬': ('吉', '解決者の役割'),
-        '癸': ('吉凶', '季節による')
+        '甲': '合一が生じる - 木を育てる',
+        '乙': '合一が生じる - 花を育てる',
+        '丙': '原局で一緒にある時は凶',
+        '丁': '火、夏は勝ち秋冬は負ける',
+        '戊': '感嘆があって価値がある',
+        '己': '太陽で乙を育てるので価値が少ない',
+        '庚': '丙庚合。太陽が鉄で消える',
+        '辛': '丙辛合。光が無意味になる',
+        '壬': '解決者の役割',
+        '癸': '季節による'
     },
     '丁': {  # 丁火日干 → 他の天干
-        '甲': ('吉', 'ランプが木を照らす'),
-        '乙': ('吉', '花とランプの調和'),
-        '丙': ('凶', '太陽にランプは無意味'),
-        '丁': ('平', '原局で一緒にある時は凶'),
-        '戊': ('吉', '火生土'),
-        '己': ('吉', '火生土'),
-        '庚': ('吉', '丁火が金を鍛錬'),
-        '辛': ('吉', '宝石を作る'),
-        '壬': ('凶', '水が火を消す'),
-        '癸': ('凶', '露がランプを消す')
+        '甲': 'ランプが木を照らす',
+        '乙': '花とランプの調和',
+        '丙': '太陽にランプは無意味',
+        '丁': '原局で一緒にある時は凶',
+        '戊': '火生土',
+        '己': '火生土',
+        '庚': '丁火が金を鍛錬',
+        '辛': '宝石を作る',
+        '壬': '水が火を消す',
+        '癸': '露がランプを消す'
     },
     '戊': {  # 戊土日干 → 他の天干
-        '甲': ('大吉', '山に木が育ち名山になる。富名'),
-        '乙': ('小吉', '大きな山が苗木に会い小山に'),
-        '丙': ('吉', '火生土、強くしてくれる'),
-        '丁': ('吉凶', '強くする。木と一緒にいると駄目'),
-        '戊': ('平', '原局で一緒にある時は凶'),
-        '己': ('凶', '山が地に降りた。格が下がる'),
-        '庚': ('凶', '土生金で力が抜ける'),
-        '辛': ('凶', '甲木は弱く、乙木は壊れる'),
-        '壬': ('平', 'ダムのように山が川を止める'),
-        '癸': ('大凶', '戊癸合。丙火を消して良くない')
+        '甲': '山に木が育ち名山になる。富名',
+        '乙': '大きな山が苗木に会い小山に',
+        '丙': '火生土、強くしてくれる',
+        '丁': '強くする。木と一緒にいると駄目',
+        '戊': '原局で一緒にある時は凶',
+        '己': '山が地に降りた。格が下がる',
+        '庚': '土生金で力が抜ける',
+        '辛': '甲木は弱く、乙木は壊れる',
+        '壬': 'ダムのように山が川を止める',
+        '癸': '戊癸合。丙火を消して良くない'
     },
     '己': {  # 己土日干 → 他の天干
-        '甲': ('凶', '甲己合。欲張りになる'),
-        '乙': ('吉', '野原に花を咲かせる'),
-        '丙': ('吉', '乙が来れば収穫物が生じる'),
-        '丁': ('吉', '火生土。秋冬には必要'),
-        '戊': ('凶', 'いつでも奪われる危険'),
-        '己': ('平', '原局で一緒にある時は凶'),
-        '庚': ('凶', '甲木が雹に打たれる'),
-        '辛': ('凶', '甲木が雹に打たれる'),
-        '壬': ('凶', '水浸しになる'),
-        '癸': ('平', '堤防、堤のようだ')
+        '甲': '甲己合。欲張りになる',
+        '乙': '野原に花を咲かせる',
+        '丙': '乙が来れば収穫物が生じる',
+        '丁': '火生土。秋冬には必要',
+        '戊': 'いつでも奪われる危険',
+        '己': '原局で一緒にある時は凶',
+        '庚': '甲木が雹に打たれる',
+        '辛': '甲木が雹に打たれる',
+        '壬': '水浸しになる',
+        '癸': '堤防、堤のようだ'
     },
     '庚': {  # 庚金日干 → 他の天干
-        '甲': ('吉', '丁火と一緒なら大吉'),
-        '乙': ('凶', '乙庚合。お互い疲れる'),
-        '丙': ('吉', '冷たい金の性向が温かくなる'),
-        '丁': ('吉', '道具になって用途が良くなる'),
-        '戊': ('吉', '土生金で力が強くなる、やや鈍感'),
-        '己': ('吉', '土生金で力が強くなる'),
-        '庚': ('平', '原局で一緒にある時は凶'),
-        '辛': ('凶', '私のものを分けて食べるので良くない'),
-        '壬': ('吉', '水を作り出す'),
-        '癸': ('吉凶', '水を作るが錆びる')
+        '甲': '丁火と一緒なら大吉',
+        '乙': '乙庚合。お互い疲れる',
+        '丙': '冷たい金の性向が温かくなる',
+        '丁': '道具になって用途が良くなる',
+        '戊': '土生金で力が強くなる、やや鈍感',
+        '己': '土生金で力が強くなる',
+        '庚': '原局で一緒にある時は凶',
+        '辛': '私のものを分けて食べるので良くない',
+        '壬': '水を作り出す',
+        '癸': '水を作るが錆びる'
     },
     '辛': {  # 辛金日干 → 他の天干
-        '甲': ('凶', '宝石が木に埋もれる'),
-        '乙': ('吉', '宝石が花を飾る'),
-        '丙': ('大吉', '丙辛合。宝石が輝く'),
-        '丁': ('吉', '丁火が宝石を鍛錬'),
-        '戊': ('凶', '宝石が土に埋もれる'),
-        '己': ('凶', '宝石が汚れる'),
-        '庚': ('凶', '大きな金が小さな金を圧倒'),
-        '辛': ('平', '原局で一緒にある時は凶'),
-        '壬': ('吉', '金生水'),
-        '癸': ('吉', '金生水')
+        '甲': '宝石が木に埋もれる',
+        '乙': '宝石が花を飾る',
+        '丙': '丙辛合。宝石が輝く',
+        '丁': '丁火が宝石を鍛錬',
+        '戊': '宝石が土に埋もれる',
+        '己': '宝石が汚れる',
+        '庚': '大きな金が小さな金を圧倒',
+        '辛': '原局で一緒にある時は凶',
+        '壬': '金生水',
+        '癸': '金生水'
     },
     '壬': {  # 壬水日干 → 他の天干
-        '甲': ('吉', '水生木'),
-        '乙': ('吉', '水生木'),
-        '丙': ('凶', '水克火'),
-        '丁': ('凶', '水克火'),
-        '戊': ('平', '土克水だがダムの役割'),
-        '己': ('凶', '土克水'),
-        '庚': ('吉', '金生水'),
-        '辛': ('吉', '金生水'),
-        '壬': ('平', '原局で一緒にある時は凶'),
-        '癸': ('凶', '大きな水が小さな水を吸収')
+        '甲': '水生木',
+        '乙': '水生木',
+        '丙': '水克火',
+        '丁': '水克火',
+        '戊': '土克水だがダムの役割',
+        '己': '土克水',
+        '庚': '金生水',
+        '辛': '金生水',
+        '壬': '原局で一緒にある時は凶',
+        '癸': '大きな水が小さな水を吸収'
     },
     '癸': {  # 癸水日干 → 他の天干
-        '甲': ('吉', '水生木'),
-        '乙': ('吉', '水生木'),
-        '丙': ('吉凶', '季節による'),
-        '丁': ('凶', '露がランプを消す'),
-        '戊': ('大凶', '戊癸合'),
-        '己': ('平', '己土が癸水を止める'),
-        '庚': ('吉', '金生水'),
-        '辛': ('吉', '金生水'),
-        '壬': ('凶', '小さな水が大きな水に吸収'),
-        '癸': ('平', '原局で一緒にある時は凶')
+        '甲': '水生木',
+        '乙': '水生木',
+        '丙': '季節による',
+        '丁': '露がランプを消す',
+        '戊': '戊癸合',
+        '己': '己土が癸水を止める',
+        '庚': '金生水',
+        '辛': '金生水',
+        '壬': '小さな水が大きな水に吸収',
+        '癸': '原局で一緒にある時は凶'
     }
 }
 
+# 天干マトリックス（吉凶レベル: src/manseryeok/matrix.py の共有マトリックス、解説: CHEONGAN_NOTES）
+_TENGAN_LEVELS = as_dict(TENGAN_FLAT, HEAVENLY_STEMS)
+CHEONGAN_MATRIX = {
+    stem: {target: (_TENGAN_LEVELS[stem][target], note) for target, note in notes.items()}
+    for stem, notes in CHEONGAN_NOTES.items()
+}
+
 def parse_input_flexible(input_str):
     """柔軟な入力解析"""
     # 全角スペースや特殊文字を半角に正規化
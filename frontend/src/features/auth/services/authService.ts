@@ -4,7 +4,13 @@
  * プロジェクト標準のapiClient（fetch-based）を使用
  */
 import { apiClient } from '../../../services/api/client';
-import type { AuthResponse, LoginRequest, RegisterRequest, User } from '../../../types';
+import type {
+  AuthResponse,
+  LoginRequest,
+  RefreshTokenResponse,
+  RegisterRequest,
+  User,
+} from '../../../types';
 
 export const authService = {
   /**
@@ -72,6 +78,32 @@ export const authService = {
     }
   },
 
+  /**
+   * POST /api/auth/refresh
+   * リフレッシュトークンのローテーション（使ったトークンは失効するため必ず保存し直す）
+   */
+  async refresh(): Promise<void> {
+    const saved = JSON.parse(localStorage.getItem('auth') || '{}');
+    if (!saved.refreshToken) {
+      throw new Error('リフレッシュトークンがありません');
+    }
+
+    const response = await apiClient.post<RefreshTokenResponse>('/api/auth/refresh', {
+      refreshToken: saved.refreshToken,
+    });
+
+    if (!response.data) {
+      localStorage.removeItem('auth');
+      throw new Error('セッションの更新に失敗しました');
+    }
+
+    localStorage.setItem('auth', JSON.stringify({
+      ...saved,
+      token: response.data.accessToken,
+      refreshToken: response.data.refreshToken,
+    }));
+  },
+
   /**
    * GET /api/auth/me
    * 現在のユーザー情報取得
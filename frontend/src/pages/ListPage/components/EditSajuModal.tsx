@@ -83,7 +83,7 @@ export const EditSajuModal: React.FC<EditSajuModalProps> = ({ open, sajuData, on
       name: name || undefined,
       birthDatetime,
       gender,
-      timezoneOffset: 9, // KST
+      // 出生時刻ポリシー（timezoneOffset等）は送らず、保存済みの値を引き継ぐ
     };
 
     setIsSaving(true);
@@ -27,6 +27,29 @@ import { calculateSaju, saveSaju } from '../../services/api/sajuCalculationServi
 import { AuthContext } from '../../features/auth/contexts/AuthContext';
 import type { BirthDataRequest, SajuResponse } from '../../types';
 
+// ゲストが同じ入力で計算し直したときに、サーバーに保存済みの命式を再利用する期間
+// （サーバーのゲスト命式の保持期間 GUEST_TTL_DAYS より十分短くする）
+const GUEST_REUSE_MS = 24 * 60 * 60 * 1000;
+
+// LocalStorageから同じ入力の最近のゲスト命式を探す
+const findRecentGuestSaju = (
+  birthDatetime: string,
+  gender: string,
+  name: string
+): SajuResponse | undefined => {
+  const existingData = localStorage.getItem('saju_data');
+  const sajuList: SajuResponse[] = existingData ? JSON.parse(existingData) : [];
+  const now = Date.now();
+  return sajuList.find(
+    item =>
+      item.birthDatetime === birthDatetime &&
+      item.gender === gender &&
+      (item.name || '') === name &&
+      !item.birthTimePolicy &&
+      now - Date.parse(item.createdAt) < GUEST_REUSE_MS
+  );
+};
+
 export const TopPage: React.FC = () => {
   const navigate = useNavigate();
   const authContext = useContext(AuthContext);
@@ -97,11 +120,23 @@ export const TopPage: React.FC = () => {
 
     console.log('[TopPage DEBUG] 生成されたbirthDatetime:', birthDatetime);
 
+    // ゲストモード: 同じ入力の命式を最近保存済みなら計算・保存せずにその詳細ページへ
+    if (!isAuthenticated) {
+      const recent = findRecentGuestSaju(birthDatetime, gender, name);
+      if (recent) {
+        navigate(`/detail/${recent.id}`);
+        return;
+      }
+    }
+
     const requestData: BirthDataRequest = {
       birthDatetime,
       gender,
       name: name || undefined,
       timezoneOffset: 9, // KST
+      // ゲストは遷移先の詳細画面が年運・月運・日運をサーバーの行から取得するため保存する
+      // （同じ入力の計算し直しは上で保存済みの命式を再利用し、行を増やさない）
+      persist: !isAuthenticated,
     };
 
     console.log('[TopPage DEBUG] APIリクエストデータ:', JSON.stringify(requestData, null, 2));
@@ -27,6 +27,11 @@ export interface LoginRequest {
   rememberMe?: boolean;
 }
 
+export interface RefreshTokenResponse {
+  accessToken: string;
+  refreshToken: string;
+}
+
 export interface RegisterRequest {
   email: string;
   password: string;
@@ -41,7 +46,11 @@ export interface BirthDataRequest {
   birthDatetime: string; // ISO 8601 format
   gender: 'male' | 'female';
   name?: string;
-  timezoneOffset?: number; // KST = 9
+  timezoneOffset?: number; // KST = 9（9は韓国の歴史的なオフセットを使う）
+  timeZone?: string; // 出生地のIANAタイムゾーン名（例: 'America/New_York'）
+  longitude?: number; // 出生地の経度（指定時は地方平均時で日柱・時柱を判定）
+  dayBoundary?: 'yaja' | 'joja'; // 子時の扱い（夜子時説 / 朝子時説）
+  persist?: boolean; // ゲスト命式としてサーバーに保存するか（省略時は保存しない）
 }
 
 // 命式更新用リクエスト型（Phase 2-A: 命式修正機能）
@@ -49,7 +58,10 @@ export interface SajuUpdateRequest {
   name?: string;
   birthDatetime: string; // ISO 8601 format
   gender: 'male' | 'female';
-  timezoneOffset?: number; // KST = 9
+  timezoneOffset?: number; // KST = 9（9は韓国の歴史的なオフセットを使う）
+  timeZone?: string; // 出生地のIANAタイムゾーン名（例: 'America/New_York'）
+  longitude?: number; // 出生地の経度（指定時は地方平均時で日柱・時柱を判定）
+  dayBoundary?: 'yaja' | 'joja'; // 子時の扱い（夜子時説 / 朝子時説）
 }
 
 export interface SajuResponse {
@@ -75,6 +87,15 @@ export interface SajuResponse {
   afterBirthMonths?: number; // 生後月数
   afterBirthDays?: number; // 生後日数
   firstDaeunDate?: string; // 第一大運開始日
+  birthTimePolicy?: BirthTimePolicy | null; // 計算に使った出生時刻ポリシー（nullは既定）
+}
+
+// 出生時刻ポリシー（既定と違う項目のみ）
+export interface BirthTimePolicy {
+  timezoneOffset?: number;
+  timeZone?: string;
+  longitude?: number;
+  dayBoundary?: 'yaja' | 'joja';
 }
 
 export interface DaeunInfo {
@@ -134,6 +155,8 @@ export interface FortuneDetail {
   fortuneLevel: FortuneLevel;
   description: string;
   element?: FiveElement | null;
+  sipsin?: string | null; // 十神（天干）
+  branchSipsin?: string | null; // 十神（地支・蔵干本気）
 }
 
 export interface CurrentFortuneResponse {
@@ -157,11 +180,29 @@ export interface SaveResponse {
   message: string;
 }
 
+export interface BulkSaveRequest {
+  items: SajuResponse[];
+}
+
+export interface BulkSaveResponse {
+  success: boolean;
+  savedCount: number;
+  ids: string[];
+  skippedIds: string[];
+  message: string;
+}
+
 export interface DeleteResponse {
   success: boolean;
   message: string;
 }
 
+export interface BulkDeleteResponse {
+  success: boolean;
+  deletedCount: number;
+  message: string;
+}
+
 export interface MigrateResponse {
   success: boolean;
   migratedCount: number;
@@ -186,6 +227,31 @@ export interface SajuSummary {
   hourBranch: string;
 }
 
+// 命式検索（GET /api/saju/search）
+export interface FacetCount {
+  value: string; // 柱は「甲子」形式
+  count: number;
+}
+
+export interface SajuSearchResponse {
+  items: SajuSummary[];
+  total: number;
+  page: number;
+  limit: number;
+  hasNext: boolean;
+  facets: Record<string, FacetCount[]>;
+}
+
+// 命式集計（GET /api/saju/stats）
+export interface SajuStatsResponse {
+  asOf: string; // YYYY-MM-DD
+  total: number;
+  dayStem: FacetCount[];
+  dayElement: FacetCount[];
+  fortuneLevel: FacetCount[];
+  currentDaeunLevel: FacetCount[];
+}
+
 // ==================== ローカルストレージ用型 ====================
 
 export interface LocalStorageSaju {
@@ -283,6 +349,43 @@ export interface DayFortuneListResponse {
   days: DayFortuneInfo[];
 }
 
+// 相性検索の候補
+export interface MatchInfo {
+  id: string;
+  name?: string | null;
+  birthDatetime: string;
+  gender: string;
+  dayStem: string;
+  dayBranch: string;
+  totalScore: number; // 合計点（本人視点＋相手視点）
+  score: number; // 本人から見た点数
+  partnerScore: number; // 相手から見た点数
+  details: string[];
+  partnerDetails: string[];
+}
+
+export interface MatchListResponse {
+  sajuId: string;
+  scope: 'account' | 'all';
+  candidates: number;
+  matches: MatchInfo[];
+}
+
+// タイムライン（大運→年運→月運）
+export interface TimelineYearInfo extends YearFortuneInfo {
+  months: MonthFortuneInfo[];
+}
+
+export interface TimelineDaeunInfo extends DaeunInfo {
+  years: TimelineYearInfo[];
+}
+
+export interface TimelineResponse {
+  sajuId: string;
+  currentAge: number; // 基準日時点の年齢
+  daeunList: TimelineDaeunInfo[];
+}
+
 // 現在の運勢詳細応答（拡張版）
 export interface CurrentFortuneDetailResponse {
   date: string; // 対象日付
@@ -343,3 +446,26 @@ export interface UserSettings {
   rememberMe: boolean;
   sessionDuration: '7d' | '30d' | 'forever';
 }
+
+// ==================== バックグラウンドジョブ ====================
+
+export type JobKind = 'export' | 'import' | 'recompute_daeun';
+export type JobStatus = 'queued' | 'running' | 'succeeded' | 'failed';
+
+export interface JobCreateRequest {
+  kind: JobKind;
+  params?: Record<string, unknown>;
+}
+
+export interface JobResponse {
+  id: string;
+  kind: JobKind;
+  status: JobStatus;
+  progress: number; // 処理済み件数
+  total: number | null; // 全件数（未確定ならnull）
+  result: unknown | null; // 成功時のみ
+  error: string | null; // 失敗時のみ
+  createdAt: string;
+  startedAt: string | null;
+  finishedAt: string | null;
+}
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+タイムゾーン遷移表の生成（1900〜2109年、韓国・日本・中国）
+システムのtzdata（zoneinfo）から各ゾーンのUTCオフセットの切り替わりを抜き出し、
+backend/app/data/tz_transitions_1900_2109.json に保存する
+
+- 韓国の+8:30時代（1908〜1911年、1954〜1961年）、夏時間（1948〜1951年、1955〜1960年、1987〜1988年）
+- 日本の夏時間（1948〜1951年）、中国の夏時間（1919年、1940年代、1986〜1991年）
+- 各遷移は [UTCのエポック秒, UTCオフセット秒, 夏時間分の秒]。先頭は1900年1月1日時点の状態
+
+使い方:
+    python generate_tz_transitions.py
+    python generate_tz_transitions.py --zones Asia/Seoul,Asia/Tokyo --out /tmp/tz.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence
+from zoneinfo import ZoneInfo
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_PATH = os.path.join(ROOT_DIR, 'backend', 'app', 'data', 'tz_transitions_1900_2109.json')
+
+ZONES = ('Asia/Seoul', 'Asia/Tokyo', 'Asia/Shanghai')
+START = datetime(1900, 1, 1, tzinfo=timezone.utc)
+END = datetime(2110, 1, 1, tzinfo=timezone.utc)
+
+
+def _state(tz: ZoneInfo, instant: datetime) -> tuple:
+    local = instant.astimezone(tz)
+    offset = local.utcoffset().total_seconds()
+    dst = (local.dst() or timedelta(0)).total_seconds()
+    return int(offset), int(dst)
+
+
+def transitions(zone: str) -> List[list]:
+    """
+    ゾーンの遷移表を作成
+
+    Returns:
+        [[UTCのエポック秒, UTCオフセット秒, 夏時間分の秒], ...]（昇順）
+    """
+    tz = ZoneInfo(zone)
+    rows = [[int(START.timestamp()), *_state(tz, START)]]
+    day = START
+    while day < END:
+        following = day + timedelta(days=1)
+        if _state(tz, following) != _state(tz, day):
+            # 1日の中で切り替わり時刻を秒単位まで二分探索
+            lo, hi = int(day.timestamp()), int(following.timestamp())
+            before = _state(tz, day)
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _state(tz, datetime.fromtimestamp(mid, timezone.utc)) == before:
+                    lo = mid
+                else:
+                    hi = mid
+            rows.append([hi, *_state(tz, datetime.fromtimestamp(hi, timezone.utc))])
+        day = following
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='タイムゾーン遷移表の生成')
+    parser.add_argument('--zones', default=','.join(ZONES), help='対象ゾーン（カンマ区切り）')
+    parser.add_argument('--out', default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    zones = {zone: transitions(zone) for zone in args.zones.split(',')}
+    table = {
+        'metadata': {
+            'title': 'Historical UTC offsets 1900-2109',
+            'description': (
+                'UTC offset transitions [utc_epoch_seconds, utc_offset_seconds, dst_seconds]'
+            ),
+            'source': 'IANA tzdata (zoneinfo)',
+            'range': [START.year, END.year - 1],
+        },
+        'zones': zones,
+    }
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+
+    for zone, rows in zones.items():
+        print(f'✅ {zone}: 遷移 {len(rows) - 1}件')
+    print(f'→ {args.out}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
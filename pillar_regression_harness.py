@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+四柱エンジン回帰テストハーネス（1900〜2109年）
+複数の四柱計算エンジンを同じ日時で一斉に計算し、lunar-pythonとの差分を集計する
+
+比較するエンジン:
+- lunar: lunar-pythonのEightChar（基準）
+- saju: backend/app/services/saju_calculator.py の SajuCalculator
+- manseryeok: src/manseryeok/calculator.py の ManseryeokCalculator
+- adhoc: test_random_saju_cases.py の簡易計算（RandomSajuTester）
+- table: 節気DB索引＋六十甲子の順送りによるnumpyベクトル計算
+
+掃引モード:
+- hours: 各日の毎時（--minute 分）
+- boundaries: 各節入時刻の前後 --window 分（lunar-pythonの節入時刻と節気DBの節入時刻の両方）
+- corpus: boundary_corpus_generator.py で作った.npzの日時（--corpus）
+
+年ごとにワーカープロセスへ分配し、差分をコンパクトなJSONレポートに書き出す
+
+使い方:
+    python pillar_regression_harness.py --mode boundaries --window 5
+    python pillar_regression_harness.py --mode hours --years 1980-2020 --workers 8
+    python pillar_regression_harness.py --mode corpus --corpus boundary_corpus.npz \
+        --engines saju,table
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# backendへのパス追加はsrc.manseryeok.matrixが行う
+from boundary_corpus_generator import load_corpus, lunar_jeol_instants  # noqa: E402
+from src.manseryeok.matrix import Ganzhi, load_jieqi_index, pillars_from_eight_char  # noqa: E402
+
+DB_PATH = os.path.join(ROOT_DIR, 'solar_terms_1900_2109_JIEQI_ONLY.json')
+
+PILLARS = ('year', 'month', 'day', 'hour')
+REFERENCE = 'lunar'
+ENGINES = ('saju', 'manseryeok', 'adhoc', 'table')
+
+# date.toordinal()とnumpyのdatetime64[D]（1970-01-01起点）の差
+_ORDINAL_1970 = 719163
+
+
+class TableEngine:
+    """
+    節気DB索引を使うベクトル計算エンジン
+
+    - 年柱: 立春で切り替え、(年-4) mod 60
+    - 月柱: 節入りで切り替え、節入りした西暦年・月から (年×12＋月＋12) mod 60
+    - 日柱: 序数日から (序数＋14) mod 60
+    - 時柱: 時支は((時＋1)÷2) mod 12、23時台は翌日の日干で時干を決める（lunar-pythonの流派2と同じ）
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        from app.services.saju_calculator import BEIJING, KST
+
+        index = load_jieqi_index(db_path, BEIJING)
+        kst = [dt.astimezone(KST).replace(tzinfo=None) for dt in index.instants]
+        self.jie = np.array(kst, dtype='datetime64[s]')
+        self.jie_month = np.array(
+            [(dt.year * 12 + dt.month + 12) % 60 for dt in kst], dtype=np.int16
+        )
+        lichun = [dt for dt, name in zip(kst, index.names) if name == '立春']
+        self.lichun = np.array(lichun, dtype='datetime64[s]')
+        self.lichun_year = np.array([(dt.year - 4) % 60 for dt in lichun], dtype=np.int16)
+
+    def pillars(self, instants: np.ndarray) -> np.ndarray:
+        """
+        四柱を一括計算
+
+        Args:
+            instants: KST壁時計の日時（datetime64[s]）
+
+        Returns:
+            (件数, 4)の干支コード配列（データ範囲外は-1）
+        """
+        days = instants.astype('datetime64[D]')
+        day = (days.astype(np.int64) + _ORDINAL_1970 + 14) % 60
+        hour = (instants - days).astype(np.int64) // 3600
+        hour_branch = ((hour + 1) // 2) % 12
+        stem_day = np.where(hour == 23, day + 1, day) % 10
+        hour_stem = ((stem_day % 5) * 2 + hour_branch) % 10
+
+        month_i = np.searchsorted(self.jie, instants, side='right') - 1
+        year_i = np.searchsorted(self.lichun, instants, side='right') - 1
+
+        result = np.empty((len(instants), 4), dtype=np.int16)
+        result[:, 0] = np.where(year_i >= 0, self.lichun_year[np.maximum(year_i, 0)], -1)
+        result[:, 1] = np.where(month_i >= 0, self.jie_month[np.maximum(month_i, 0)], -1)
+        result[:, 2] = day
+        # 干支コードは天干≡コード mod 10、地支≡コード mod 12 を満たす唯一の値
+        result[:, 3] = (6 * hour_stem - 5 * hour_branch) % 60
+        return result
+
+
+class ScalarEngines:
+    """1件ずつ計算するエンジン群（ワーカープロセスごとに1度だけ初期化）"""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = [name for name in names if name != 'table']
+        if 'saju' in self.names:
+            from app.services.saju_calculator import SajuCalculator, SolarTermsDB
+
+            self.saju = SajuCalculator(SolarTermsDB(DB_PATH))
+        if 'manseryeok' in self.names:
+            from src.manseryeok.calculator import ManseryeokCalculator
+
+            self.manseryeok = ManseryeokCalculator(os.path.basename(DB_PATH))
+        if 'adhoc' in self.names:
+            from test_random_saju_cases import RandomSajuTester
+
+            cwd = os.getcwd()
+            os.chdir(ROOT_DIR)  # RandomSajuTesterは相対パスで節気DBを読む
+            try:
+                self.adhoc = RandomSajuTester()
+            finally:
+                os.chdir(cwd)
+
+    def lunar_pillars(self, dt: datetime) -> List[int]:
+        from lunar_python import Solar
+
+        eight_char = (
+            Solar.fromYmdHms(dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second)
+            .getLunar()
+            .getEightChar()
+        )
+        return [int(p) for p in pillars_from_eight_char(eight_char)]
+
+    def pillars(self, name: str, dt: datetime) -> List[int]:
+        if name == 'saju':
+            r = self.saju.calculate(dt, 'male')
+            return [
+                int(Ganzhi.from_chars(r[f'{p}Stem'], r[f'{p}Branch']))
+                for p in ('year', 'month', 'day', 'hour')
+            ]
+        if name == 'manseryeok':
+            s = self.manseryeok.calculate_saju(dt, 'male')
+            return [int(s.year_pillar), int(s.month_pillar), int(s.day_pillar), int(s.hour_pillar)]
+        if name == 'adhoc':
+            r = self.adhoc.calculate_saju({'birth_datetime': dt})
+            return [_code_or_missing(r[f'{p}_pillar']) for p in PILLARS]
+        raise ValueError(f'未知のエンジン: {name}')
+
+
+def _code_or_missing(text: str) -> int:
+    try:
+        return int(Ganzhi.from_str(text))
+    except (KeyError, ValueError):
+        return -1
+
+
+# ==================== 掃引対象の日時 ====================
+
+
+def hour_instants(year: int, minute: int = 30) -> np.ndarray:
+    """指定年の毎時（KST壁時計）"""
+    start = np.datetime64(f'{year}-01-01T00:{minute:02d}:00', 's')
+    end = np.datetime64(f'{year + 1}-01-01T00:00:00', 's')
+    return np.arange(start, end, np.timedelta64(1, 'h'))
+
+
+def boundary_instants(year: int, window: int, table: TableEngine) -> np.ndarray:
+    """指定年の各節入時刻の前後window分（1分刻み）"""
+    centers = [np.datetime64(dt, 's') for _, dt in lunar_jeol_instants(year)]
+    centers += [t for t in table.jie if t.astype(object).year == year]
+    if not centers:
+        return np.array([], dtype='datetime64[s]')
+    minutes = np.array(centers, dtype='datetime64[m]')
+    offsets = np.arange(-window, window + 1).astype('timedelta64[m]')
+    return np.unique((minutes[:, None] + offsets[None, :]).ravel().astype('datetime64[s]'))
+
+
+# ==================== ワーカー ====================
+
+_worker_engines: Optional[ScalarEngines] = None
+_worker_table: Optional[TableEngine] = None
+
+
+def _init_worker(engine_names: Sequence[str]):
+    global _worker_engines, _worker_table
+    _worker_engines = ScalarEngines(engine_names)
+    _worker_table = TableEngine()  # boundariesモードの節入時刻にも使う
+
+
+def _run_year(task) -> Dict:
+    year, mode, minute, window, instants, engine_names, max_samples = task
+    if mode == 'hours':
+        instants = hour_instants(year, minute)
+    elif mode == 'boundaries':
+        instants = boundary_instants(year, window, _worker_table)
+    return compare(instants, engine_names, max_samples)
+
+
+def corpus_by_year(path: str, years: range) -> Dict[int, np.ndarray]:
+    """コーパスの日時を年ごとに分割（対象年のみ）"""
+    instants = load_corpus(path)['instant']
+    instant_years = instants.astype('datetime64[Y]').astype(np.int64) + 1970
+    bounds = np.searchsorted(instant_years, [years.start, years.stop])
+    instants, instant_years = instants[bounds[0]:bounds[1]], instant_years[bounds[0]:bounds[1]]
+    cuts = np.flatnonzero(np.diff(instant_years)) + 1
+    return {
+        int(chunk_years[0]): chunk
+        for chunk, chunk_years in zip(np.split(instants, cuts), np.split(instant_years, cuts))
+        if len(chunk)
+    }
+
+
+def compare(instants: np.ndarray, engine_names: Sequence[str], max_samples: int = 20) -> Dict:
+    """
+    日時配列を全エンジンで計算してlunar-pythonと比較
+
+    Args:
+        instants: KST壁時計の日時（datetime64[s]）
+        engine_names: 比較するエンジン名
+        max_samples: エンジンごとに記録する不一致例の上限
+
+    Returns:
+        部分レポート（merge_reportsで結合できる形）
+    """
+    datetimes = instants.astype(object)
+    expected = np.array(
+        [_worker_engines.lunar_pillars(dt) for dt in datetimes], dtype=np.int16
+    ).reshape(-1, 4)
+    years = instants.astype('datetime64[Y]').astype(np.int64) + 1970
+
+    report = {'cases': int(len(instants)), 'engines': {}}
+    for name in engine_names:
+        if name == 'table':
+            got = _worker_table.pillars(instants)
+        else:
+            got = np.array(
+                [_worker_engines.pillars(name, dt) for dt in datetimes], dtype=np.int16
+            ).reshape(-1, 4)
+        diff = got != expected
+        rows = np.flatnonzero(diff.any(axis=1))
+        by_year = dict(zip(*(v.tolist() for v in np.unique(years[rows], return_counts=True))))
+        report['engines'][name] = {
+            'total': int(len(rows)),
+            'by_pillar': dict(zip(PILLARS, diff.sum(axis=0).tolist())),
+            'by_year': {str(y): n for y, n in by_year.items()},
+            'samples': [
+                {
+                    'datetime': datetimes[i].isoformat(),
+                    'expected': [_label(c) for c in expected[i]],
+                    'got': [_label(c) for c in got[i]],
+                }
+                for i in rows[:max_samples]
+            ],
+        }
+    return report
+
+
+def _label(code: int) -> str:
+    return str(Ganzhi(int(code))) if code >= 0 else '-'
+
+
+def merge_reports(parts: Sequence[Dict], max_samples: int = 20) -> Dict:
+    """部分レポートを結合"""
+    merged = {'cases': 0, 'engines': {}}
+    for part in parts:
+        merged['cases'] += part['cases']
+        for name, stats in part['engines'].items():
+            total = merged['engines'].setdefault(
+                name,
+                {'total': 0, 'by_pillar': dict.fromkeys(PILLARS, 0), 'by_year': {}, 'samples': []},
+            )
+            total['total'] += stats['total']
+            for pillar, n in stats['by_pillar'].items():
+                total['by_pillar'][pillar] += n
+            total['by_year'].update(stats['by_year'])
+            total['samples'].extend(stats['samples'][: max_samples - len(total['samples'])])
+    return merged
+
+
+# ==================== メイン ====================
+
+
+def parse_years(text: str) -> range:
+    start, _, end = text.partition('-')
+    return range(int(start), int(end or start) + 1)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='四柱エンジン回帰テストハーネス')
+    parser.add_argument('--mode', choices=('hours', 'boundaries', 'corpus'), default='boundaries')
+    parser.add_argument('--years', default='1900-2109', help='対象年（例: 1900-2109, 1986）')
+    parser.add_argument('--minute', type=int, default=30, help='hoursモードで使う分')
+    parser.add_argument('--window', type=int, default=5, help='boundariesモードの前後分数')
+    parser.add_argument(
+        '--corpus', help='corpusモードで読む.npz（boundary_corpus_generator.pyの出力）'
+    )
+    parser.add_argument(
+        '--engines', default=','.join(ENGINES), help='比較するエンジン（カンマ区切り）'
+    )
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--max-samples', type=int, default=20)
+    parser.add_argument('--out', default='pillar_regression_report.json')
+    args = parser.parse_args(argv)
+
+    engine_names = [name for name in args.engines.split(',') if name]
+    unknown = set(engine_names) - set(ENGINES)
+    if unknown:
+        parser.error(f'未知のエンジン: {", ".join(sorted(unknown))}')
+
+    years = parse_years(args.years)
+    if args.mode == 'corpus':
+        if not args.corpus:
+            parser.error('corpusモードには--corpusが必要です')
+        chunks = corpus_by_year(args.corpus, years)
+    else:
+        chunks = dict.fromkeys(years)
+    tasks = [
+        (year, args.mode, args.minute, args.window, instants, engine_names, args.max_samples)
+        for year, instants in chunks.items()
+    ]
+
+    print(
+        f'🔍 {args.mode}モード: {years.start}〜{years.stop - 1}年 / '
+        f'エンジン: {", ".join(engine_names)} / {args.workers}プロセス'
+    )
+    started = time.time()
+    if args.workers > 1:
+        with ProcessPoolExecutor(
+            args.workers, initializer=_init_worker, initargs=(engine_names,)
+        ) as pool:
+            parts = list(pool.map(_run_year, tasks))
+    else:
+        _init_worker(engine_names)
+        parts = [_run_year(task) for task in tasks]
+
+    report = merge_reports(parts, args.max_samples)
+    report.update(
+        {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'mode': args.mode,
+            'years': [years.start, years.stop - 1],
+            'reference': REFERENCE,
+            'elapsed_sec': round(time.time() - started, 1),
+        }
+    )
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+
+    print(f'✅ {report["cases"]:,}件を{report["elapsed_sec"]}秒で比較 → {args.out}')
+    for name, stats in report['engines'].items():
+        pillars = ' '.join(f'{p}:{n}' for p, n in stats['by_pillar'].items())
+        mark = '✅' if stats['total'] == 0 else '❌'
+        print(f'  {mark} {name:<11} 不一致 {stats["total"]:,}件 ({pillars})')
+    return 0 if all(stats['total'] == 0 for stats in report['engines'].values()) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,6 +9,8 @@ import re
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+from .matrix import LEVELS_KO, STEM_INDEX, tengan_level
+
 
 @dataclass
 class TenganRelation:
@@ -109,8 +111,11 @@ class DonsagongDataLoader:
             table_rows = re.findall(r'\|\s*([甲乙丙丁戊己庚辛壬癸])\s*\|\s*([^|]+)\s*\|\s*([^|]+)\s*\|\s*([^|]*)\s*\|', section_content)
             
             for to_gan, fortune, description, note in table_rows:
-                # 데이터 정리
-                fortune = fortune.strip()
+                # 데이터 정리 (길흉 레벨은 문서 표기가 아닌 공유 매트릭스 값을 사용)
+                if from_gan in STEM_INDEX:
+                    fortune = LEVELS_KO[tengan_level(from_gan, to_gan)]
+                else:
+                    fortune = fortune.strip()
                 description = description.strip()
                 note = note.strip() if note else ""
                 
@@ -0,0 +1,60 @@
+"""
+돈사공 관계 매트릭스 공유 모듈
+
+천간/지지/조후 길흉표의 실체는 backend/app/services/donsagong_matrix.py 하나뿐이며,
+루트 스크립트와 src 모듈은 이 모듈을 통해 같은 표를 참조한다.
+간지 값 타입(Ganzhi), 궁합 점수 엔진, 절입일 색인, 출생 시각 정책도 backend와 같은 구현을 공유한다.
+"""
+
+import os
+import sys
+
+_BACKEND_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'backend'
+)
+if _BACKEND_DIR not in sys.path:
+    sys.path.append(_BACKEND_DIR)
+
+from app.services.birth_time import (  # noqa: E402
+    DEFAULT_POLICY,
+    JOJA,
+    YAJA,
+    BirthTime,
+    BirthTimePolicy,
+    day_hour_pillars,
+)
+from app.services.compatibility import ChartColumns, score_matrix, score_pair  # noqa: E402
+from app.services.donsagong_matrix import (  # noqa: E402
+    BRANCH_INDEX,
+    COLLAPSE_5,
+    EARTHLY_BRANCHES,
+    HEAVENLY_STEMS,
+    JIJI,
+    JIJI_FLAT,
+    JOHOO,
+    JOHOO_FLAT,
+    LEVEL_INDEX,
+    LEVELS,
+    LEVELS_KO,
+    SCORE_5,
+    STEM_INDEX,
+    TENGAN,
+    TENGAN_FLAT,
+    as_dict,
+    jiji_level,
+    johoo_level,
+    tengan_level,
+)
+from app.services.ganzhi import Ganzhi, pillars_from_eight_char  # noqa: E402
+from app.services.jieqi_index import JEOL_MONTHS, JieqiIndex, load_jieqi_index  # noqa: E402
+
+__all__ = [
+    'BRANCH_INDEX', 'COLLAPSE_5', 'EARTHLY_BRANCHES', 'HEAVENLY_STEMS',
+    'JIJI', 'JIJI_FLAT', 'JOHOO', 'JOHOO_FLAT', 'LEVEL_INDEX', 'LEVELS', 'LEVELS_KO',
+    'SCORE_5', 'STEM_INDEX', 'TENGAN', 'TENGAN_FLAT',
+    'as_dict', 'jiji_level', 'johoo_level', 'tengan_level',
+    'Ganzhi', 'pillars_from_eight_char',
+    'ChartColumns', 'score_matrix', 'score_pair',
+    'JEOL_MONTHS', 'JieqiIndex', 'load_jieqi_index',
+    'DEFAULT_POLICY', 'JOJA', 'YAJA', 'BirthTime', 'BirthTimePolicy', 'day_hour_pillars',
+]
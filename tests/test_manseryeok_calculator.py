@@ -0,0 +1,76 @@
+"""
+만세력 계산 엔진 (ManseryeokCalculator) 절기 조회 테스트
+
+- 12월 → 1월, 소한 → 입춘 경계의 다음/이전 절기
+- 연도별 24절기 표 캐시 크기 제한
+"""
+from datetime import datetime
+
+import pytest
+
+from src.manseryeok.calculator import (
+    KST,
+    SOLAR_TERM_TABLE_CACHE_SIZE,
+    ManseryeokCalculator,
+)
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return ManseryeokCalculator()
+
+
+# (입력 시각, 다음 절기, 이전 절기)
+# 1905~1906년은 절기 데이터베이스, 1950~1951년은 추정값
+BOUNDARY_CASES = [
+    # 12월 → 1월: 대설 이후 다음 절기는 다음해 1월 소한
+    (datetime(1905, 12, 31, 12, 0), datetime(1906, 1, 6, 13, 20), datetime(1905, 12, 8, 2, 23)),
+    # 1월 소한 이전: 이전 절기는 작년 12월 대설 (작년 표에서 찾음)
+    (datetime(1906, 1, 1, 0, 0), datetime(1906, 1, 6, 13, 20), datetime(1905, 12, 8, 2, 23)),
+    # 소한 → 입춘 사이: 데이터베이스의 대한은 입춘으로 대체되므로 다음 절기는 입춘
+    (datetime(1906, 1, 10, 0, 0), datetime(1906, 2, 5, 1, 10), datetime(1906, 1, 6, 13, 20)),
+    # 입춘 직후
+    (datetime(1906, 2, 6, 0, 0), datetime(1906, 3, 6, 19, 45), datetime(1906, 2, 5, 1, 10)),
+    # 추정값 연도: 동지 → 소한 → 대한 → 입춘
+    (datetime(1950, 12, 31, 0, 0), datetime(1951, 1, 6, 12, 0), datetime(1950, 12, 22, 12, 0)),
+    (datetime(1951, 1, 2, 0, 0), datetime(1951, 1, 6, 12, 0), datetime(1950, 12, 22, 12, 0)),
+    (datetime(1951, 1, 10, 0, 0), datetime(1951, 1, 20, 12, 0), datetime(1951, 1, 6, 12, 0)),
+    (datetime(1951, 2, 3, 0, 0), datetime(1951, 2, 4, 12, 0), datetime(1951, 1, 20, 12, 0)),
+]
+
+
+@pytest.mark.parametrize("dt, expected_next, expected_previous", BOUNDARY_CASES)
+def test_next_and_previous_solar_term_across_year_boundary(
+    calculator, dt, expected_next, expected_previous
+):
+    """연말연시·소한~입춘 경계에서 다음/이전 절기"""
+    dt = dt.replace(tzinfo=KST)
+    next_term = calculator._get_next_solar_term(dt)
+    previous_term = calculator._get_previous_solar_term(dt)
+
+    assert next_term == expected_next.replace(tzinfo=KST)
+    assert previous_term == expected_previous.replace(tzinfo=KST)
+    assert previous_term < dt < next_term
+
+
+def test_solar_term_exactly_at_boundary(calculator):
+    """절입 시각 그 자체는 다음 절기에도 이전 절기에도 포함하지 않음"""
+    risshun = datetime(1906, 2, 5, 1, 10, tzinfo=KST)
+
+    assert calculator._get_next_solar_term(risshun) > risshun
+    assert calculator._get_previous_solar_term(risshun) < risshun
+
+
+def test_solar_term_cache_is_bounded():
+    """연도별 절기 표 캐시는 SOLAR_TERM_TABLE_CACHE_SIZE 이하로 유지"""
+    calculator = ManseryeokCalculator()
+    for year in range(1900, 1900 + SOLAR_TERM_TABLE_CACHE_SIZE + 50):
+        calculator._get_next_solar_term(datetime(year, 6, 1, tzinfo=KST))
+
+    assert calculator._solar_term_table.cache_info().currsize == SOLAR_TERM_TABLE_CACHE_SIZE
+    assert calculator._solar_term_window.cache_info().currsize == SOLAR_TERM_TABLE_CACHE_SIZE
+
+    # 같은 연도는 다시 만들지 않음
+    misses = calculator._solar_term_table.cache_info().misses
+    calculator._get_next_solar_term(datetime(2200, 6, 1, tzinfo=KST))
+    assert calculator._solar_term_table.cache_info().misses == misses